@@ -0,0 +1,139 @@
+"""Add denormalised child counters
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-01-10
+
+Adds domain_count, entity_count, attribute_count and relationship_count
+columns and keeps them current with statement-level triggers, so list and
+detail responses no longer run COUNT(*) queries per parent row.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+# (child table, foreign key column, parent table, counter column)
+CHILD_COUNTERS = [
+    ('domain', 'superdomain_id', 'superdomain', 'domain_count'),
+    ('entity', 'domain_id', 'domain', 'entity_count'),
+    ('attribute', 'entity_id', 'entity', 'attribute_count'),
+]
+
+# A relationship counts once for each distinct entity it touches, so a
+# self-referential relationship is not counted twice.
+RELATIONSHIP_ENDPOINTS = """
+    SELECT source_entity_id AS parent_id FROM {rows}
+    UNION ALL
+    SELECT target_entity_id FROM {rows} WHERE target_entity_id <> source_entity_id
+"""
+
+
+def _child_rows(child_table: str, fk_column: str, rows: str) -> str:
+    """SQL selecting the parent ID of every row in a transition table."""
+    if child_table == 'relationship':
+        return RELATIONSHIP_ENDPOINTS.format(rows=rows)
+    return f"SELECT {fk_column} AS parent_id FROM {rows}"
+
+
+def _counter_function(child_table: str, fk_column: str, parent_table: str, counter: str) -> str:
+    """Build the trigger function maintaining one counter column."""
+    new_rows = _child_rows(child_table, fk_column, 'new_rows')
+    old_rows = _child_rows(child_table, fk_column, 'old_rows')
+    return f"""
+    CREATE OR REPLACE FUNCTION maintain_{parent_table}_{counter}() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE {parent_table} p SET {counter} = p.{counter} + d.n
+            FROM (SELECT parent_id, count(*) AS n FROM ({new_rows}) c GROUP BY parent_id) d
+            WHERE p.id = d.parent_id;
+        ELSIF TG_OP = 'DELETE' THEN
+            UPDATE {parent_table} p SET {counter} = p.{counter} - d.n
+            FROM (SELECT parent_id, count(*) AS n FROM ({old_rows}) c GROUP BY parent_id) d
+            WHERE p.id = d.parent_id;
+        ELSE
+            -- Only re-parented rows change a counter; renames net out to zero
+            UPDATE {parent_table} p SET {counter} = p.{counter} + d.n
+            FROM (
+                SELECT parent_id, sum(delta) AS n FROM (
+                    SELECT parent_id, 1 AS delta FROM ({new_rows}) c
+                    UNION ALL
+                    SELECT parent_id, -1 AS delta FROM ({old_rows}) c
+                ) moved
+                GROUP BY parent_id
+                HAVING sum(delta) <> 0
+            ) d
+            WHERE p.id = d.parent_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$;
+    """
+
+
+def _counter_triggers(child_table: str, parent_table: str, counter: str) -> list:
+    """Build the INSERT, DELETE and UPDATE triggers for one counter column."""
+    function = f"maintain_{parent_table}_{counter}()"
+    prefix = f"trg_{child_table}_{counter}"
+    return [
+        f"CREATE TRIGGER {prefix}_ins AFTER INSERT ON {child_table} "
+        f"REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}",
+        f"CREATE TRIGGER {prefix}_del AFTER DELETE ON {child_table} "
+        f"REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}",
+        f"CREATE TRIGGER {prefix}_upd AFTER UPDATE ON {child_table} "
+        f"REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION {function}",
+    ]
+
+
+def _all_counters() -> list:
+    """Every maintained counter, including entity.relationship_count."""
+    return CHILD_COUNTERS + [('relationship', None, 'entity', 'relationship_count')]
+
+
+def upgrade() -> None:
+    """Add counter columns, backfill them and install maintenance triggers."""
+
+    for _, _, parent_table, counter in _all_counters():
+        op.add_column(
+            parent_table,
+            sa.Column(counter, sa.Integer(), nullable=False, server_default='0'),
+        )
+
+    # Backfill from current data
+    for child_table, fk_column, parent_table, counter in CHILD_COUNTERS:
+        op.execute(
+            f"UPDATE {parent_table} p SET {counter} = c.n "
+            f"FROM (SELECT {fk_column} AS parent_id, count(*) AS n "
+            f"FROM {child_table} GROUP BY {fk_column}) c "
+            f"WHERE p.id = c.parent_id"
+        )
+    op.execute(
+        "UPDATE entity p SET relationship_count = c.n "
+        f"FROM (SELECT parent_id, count(*) AS n FROM ({_child_rows('relationship', None, 'relationship')}) r "
+        "GROUP BY parent_id) c "
+        "WHERE p.id = c.parent_id"
+    )
+
+    # Triggers keep the counters current inside the writing transaction
+    for child_table, fk_column, parent_table, counter in _all_counters():
+        op.execute(_counter_function(child_table, fk_column, parent_table, counter))
+        for statement in _counter_triggers(child_table, parent_table, counter):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Drop maintenance triggers and counter columns."""
+
+    for child_table, _, parent_table, counter in _all_counters():
+        prefix = f"trg_{child_table}_{counter}"
+        for suffix in ('ins', 'del', 'upd'):
+            op.execute(f"DROP TRIGGER IF EXISTS {prefix}_{suffix} ON {child_table}")
+        op.execute(f"DROP FUNCTION IF EXISTS maintain_{parent_table}_{counter}()")
+        op.drop_column(parent_table, counter)
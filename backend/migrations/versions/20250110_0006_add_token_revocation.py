@@ -0,0 +1,31 @@
+"""Add token revocation watermark
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-01-10
+
+Adds user.tokens_valid_after: tokens issued before this timestamp are
+rejected by the auth middleware.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add revocation watermark column."""
+    op.add_column('user', sa.Column('tokens_valid_after', sa.DateTime(), nullable=True))
+
+    # Workers poll recently revoked users only
+    op.create_index('ix_user_tokens_valid_after', 'user', ['tokens_valid_after'])
+
+
+def downgrade() -> None:
+    """Drop revocation watermark column."""
+    op.drop_index('ix_user_tokens_valid_after', table_name='user')
+    op.drop_column('user', 'tokens_valid_after')
@@ -0,0 +1,150 @@
+"""Add diagram change version
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-01-17
+
+Adds diagram.change_version, bumped by triggers whenever anything an
+editor bundle contains changes: the diagram row, its placed objects and
+relationships, and the repository rows they reference. Bundles are cached
+keyed on (diagram id, change_version).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+# Diagrams showing an entity, domain or superdomain, directly or through
+# the entities placed on them
+TOUCH_DIAGRAMS_FUNCTION = """
+CREATE OR REPLACE FUNCTION touch_diagrams_showing(kind text, ids bigint[]) RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF ids IS NULL OR cardinality(ids) = 0 THEN
+        RETURN;
+    END IF;
+
+    UPDATE diagram d SET change_version = d.change_version + 1
+    WHERE d.id IN (
+        SELECT o.diagram_id FROM diagram_object o
+        WHERE (o.object_type::text = kind AND o.object_id = ANY(ids))
+           OR (kind = 'DOMAIN' AND o.object_type::text = 'ENTITY' AND o.object_id IN (
+                   SELECT e.id FROM entity e WHERE e.domain_id = ANY(ids)))
+           OR (kind = 'SUPERDOMAIN' AND o.object_type::text = 'DOMAIN' AND o.object_id IN (
+                   SELECT dm.id FROM domain dm WHERE dm.superdomain_id = ANY(ids)))
+           OR (kind = 'SUPERDOMAIN' AND o.object_type::text = 'ENTITY' AND o.object_id IN (
+                   SELECT e.id FROM entity e JOIN domain dm ON dm.id = e.domain_id
+                   WHERE dm.superdomain_id = ANY(ids)))
+    );
+END;
+$$;
+"""
+
+# Bump on any direct edit of the diagram row (nested bumps already changed it)
+DIAGRAM_SELF_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_diagram_change_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.change_version = OLD.change_version THEN
+        NEW.change_version := OLD.change_version + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$;
+"""
+
+# (table, trigger function body selecting affected IDs from {rows})
+TOUCH_TRIGGERS = [
+    (
+        'diagram_object',
+        "UPDATE diagram d SET change_version = d.change_version + 1 "
+        "WHERE d.id IN (SELECT diagram_id FROM {rows})",
+    ),
+    (
+        'diagram_relationship',
+        "UPDATE diagram d SET change_version = d.change_version + 1 "
+        "WHERE d.id IN (SELECT diagram_id FROM {rows})",
+    ),
+    (
+        'relationship',
+        "UPDATE diagram d SET change_version = d.change_version + 1 "
+        "WHERE d.id IN (SELECT dr.diagram_id FROM diagram_relationship dr "
+        "WHERE dr.relationship_id IN (SELECT id FROM {rows}))",
+    ),
+    ('attribute', "PERFORM touch_diagrams_showing('ENTITY', ARRAY(SELECT entity_id::bigint FROM {rows}))"),
+    ('entity', "PERFORM touch_diagrams_showing('ENTITY', ARRAY(SELECT id::bigint FROM {rows}))"),
+    ('domain', "PERFORM touch_diagrams_showing('DOMAIN', ARRAY(SELECT id::bigint FROM {rows}))"),
+    ('superdomain', "PERFORM touch_diagrams_showing('SUPERDOMAIN', ARRAY(SELECT id::bigint FROM {rows}))"),
+]
+
+
+def _touch_function(table: str, body: str) -> str:
+    """Build the statement-level trigger function for one table."""
+    return f"""
+    CREATE OR REPLACE FUNCTION touch_diagrams_on_{table}() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            {body.format(rows='new_rows')};
+        END IF;
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            {body.format(rows='old_rows')};
+        END IF;
+        RETURN NULL;
+    END;
+    $$;
+    """
+
+
+def _touch_triggers(table: str) -> list:
+    """Build the INSERT, DELETE and UPDATE triggers for one table."""
+    function = f"touch_diagrams_on_{table}()"
+    prefix = f"trg_{table}_diagram_version"
+    return [
+        f"CREATE TRIGGER {prefix}_ins AFTER INSERT ON {table} "
+        f"REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}",
+        f"CREATE TRIGGER {prefix}_del AFTER DELETE ON {table} "
+        f"REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}",
+        f"CREATE TRIGGER {prefix}_upd AFTER UPDATE ON {table} "
+        f"REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION {function}",
+    ]
+
+
+def upgrade() -> None:
+    """Add change_version and install the triggers that bump it."""
+    op.add_column(
+        'diagram',
+        sa.Column('change_version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+
+    op.execute(DIAGRAM_SELF_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER trg_diagram_change_version BEFORE UPDATE ON diagram "
+        "FOR EACH ROW EXECUTE FUNCTION bump_diagram_change_version()"
+    )
+
+    op.execute(TOUCH_DIAGRAMS_FUNCTION)
+    for table, body in TOUCH_TRIGGERS:
+        op.execute(_touch_function(table, body))
+        for statement in _touch_triggers(table):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Drop the triggers and the change_version column."""
+    for table, _ in TOUCH_TRIGGERS:
+        prefix = f"trg_{table}_diagram_version"
+        for suffix in ('ins', 'del', 'upd'):
+            op.execute(f"DROP TRIGGER IF EXISTS {prefix}_{suffix} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS touch_diagrams_on_{table}()")
+
+    op.execute("DROP FUNCTION IF EXISTS touch_diagrams_showing(text, bigint[])")
+    op.execute("DROP TRIGGER IF EXISTS trg_diagram_change_version ON diagram")
+    op.execute("DROP FUNCTION IF EXISTS bump_diagram_change_version()")
+    op.drop_column('diagram', 'change_version')
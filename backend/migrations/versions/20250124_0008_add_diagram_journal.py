@@ -0,0 +1,56 @@
+"""Add diagram operation journal
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-01-24
+
+Adds diagram_operation, an append-only per-diagram journal of canvas edits
+holding before/after deltas for undo and redo, and diagram_snapshot, the
+compacted state the oldest retained operation applies to.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create journal and snapshot tables."""
+    op.create_table(
+        'diagram_operation',
+        sa.Column('id', sa.BigInteger(), nullable=False, autoincrement=True),
+        sa.Column('diagram_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(20), nullable=False),
+        sa.Column('changes', JSONB, nullable=False),
+        sa.Column('undone', sa.Boolean(), nullable=False, server_default='false'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['diagram_id'], ['diagram.id'], name='fk_diagram_operation_diagram', ondelete='CASCADE'),
+    )
+    # Undo/redo pick the newest active / oldest undone operation of a diagram
+    op.create_index('ix_diagram_operation_diagram_id', 'diagram_operation', ['diagram_id', 'undone', 'id'])
+
+    op.create_table(
+        'diagram_snapshot',
+        sa.Column('id', sa.BigInteger(), nullable=False, autoincrement=True),
+        sa.Column('diagram_id', sa.Integer(), nullable=False),
+        sa.Column('operation_id', sa.BigInteger(), nullable=False),
+        sa.Column('state', JSONB, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['diagram_id'], ['diagram.id'], name='fk_diagram_snapshot_diagram', ondelete='CASCADE'),
+    )
+    op.create_index('ix_diagram_snapshot_diagram_id', 'diagram_snapshot', ['diagram_id'])
+
+
+def downgrade() -> None:
+    """Drop journal and snapshot tables."""
+    op.drop_index('ix_diagram_snapshot_diagram_id', table_name='diagram_snapshot')
+    op.drop_table('diagram_snapshot')
+    op.drop_index('ix_diagram_operation_diagram_id', table_name='diagram_operation')
+    op.drop_table('diagram_operation')
@@ -0,0 +1,34 @@
+"""Add per-field clocks to diagram placements
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-01-31
+
+Adds field_clocks to diagram_object and diagram_relationship: column name
+-> hybrid logical clock timestamp of the write that set it. Concurrent
+edits are merged per field, last writer (by clock) wins.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add field_clocks columns."""
+    for table in ('diagram_object', 'diagram_relationship'):
+        op.add_column(
+            table,
+            sa.Column('field_clocks', JSONB, nullable=False, server_default=sa.text("'{}'::jsonb")),
+        )
+
+
+def downgrade() -> None:
+    """Drop field_clocks columns."""
+    for table in ('diagram_relationship', 'diagram_object'):
+        op.drop_column(table, 'field_clocks')
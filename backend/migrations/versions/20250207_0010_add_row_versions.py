@@ -0,0 +1,33 @@
+"""Add row versions for optimistic concurrency
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2025-02-07
+
+Adds version to the repository tables and diagram. Every write bumps it;
+PUT and DELETE requests carrying If-Match only apply when the row is
+still at the version the client saw (UPDATE ... WHERE id = ? AND
+version = ?), and fail with 412 otherwise.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ('superdomain', 'domain', 'entity', 'attribute', 'relationship', 'diagram')
+
+
+def upgrade() -> None:
+    """Add version columns."""
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Drop version columns."""
+    for table in reversed(VERSIONED_TABLES):
+        op.drop_column(table, 'version')
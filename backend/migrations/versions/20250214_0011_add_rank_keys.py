@@ -0,0 +1,80 @@
+"""Replace integer z-order with rank keys and order attributes
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2025-02-14
+
+Replaces diagram_object.z_index with z_rank and adds attribute.position:
+fractional rank keys (base-62 text compared bytewise, see utils.rank), so
+moving an item in the order rewrites that one row. Existing rows are
+seeded in their current order (z_index, or created_at for attributes)
+with fixed-width keys. Composite indexes serve the ordered reads and the
+neighbour lookups of a move.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def _seed_ranks(table: str, rank: str, scope: str, order_by: str) -> None:
+    """Number each scope's rows in order as keys like '0000000042V'."""
+    op.execute(
+        f"""
+        UPDATE {table} AS t
+        SET {rank} = ranked.key
+        FROM (
+            SELECT id,
+                   lpad((row_number() OVER (PARTITION BY {scope} ORDER BY {order_by}))::text, 10, '0')
+                   || 'V' AS key
+            FROM {table}
+        ) AS ranked
+        WHERE t.id = ranked.id
+        """
+    )
+
+
+def upgrade() -> None:
+    """Add rank key columns, seed them and index them per scope."""
+    op.add_column(
+        'diagram_object',
+        sa.Column('z_rank', sa.String(128, collation='C'), nullable=False, server_default='V'),
+    )
+    _seed_ranks('diagram_object', 'z_rank', 'diagram_id', 'z_index, id')
+    op.drop_column('diagram_object', 'z_index')
+    op.create_index('ix_diagram_object_diagram_z_rank', 'diagram_object', ['diagram_id', 'z_rank'])
+
+    op.add_column(
+        'attribute',
+        sa.Column('position', sa.String(128, collation='C'), nullable=False, server_default='V'),
+    )
+    _seed_ranks('attribute', 'position', 'entity_id', 'created_at, id')
+    op.create_index('ix_attribute_entity_position', 'attribute', ['entity_id', 'position'])
+
+
+def downgrade() -> None:
+    """Restore integer z_index from the rank order and drop rank keys."""
+    op.drop_index('ix_attribute_entity_position', table_name='attribute')
+    op.drop_column('attribute', 'position')
+
+    op.add_column(
+        'diagram_object',
+        sa.Column('z_index', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute(
+        """
+        UPDATE diagram_object AS t
+        SET z_index = ranked.z_index
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY diagram_id ORDER BY z_rank, id) - 1 AS z_index
+            FROM diagram_object
+        ) AS ranked
+        WHERE t.id = ranked.id
+        """
+    )
+    op.drop_index('ix_diagram_object_diagram_z_rank', table_name='diagram_object')
+    op.drop_column('diagram_object', 'z_rank')
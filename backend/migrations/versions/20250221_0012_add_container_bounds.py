@@ -0,0 +1,90 @@
+"""Add fitted bounds to container objects
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2025-02-21
+
+Adds bounds_x/y/width/height to diagram_object: the box the server fits
+around what a superdomain or domain placed on a diagram holds (entities
+of the domain, domains and entities of the superdomain), with room for
+padding and a title. The server keeps them current when contents are
+placed, moved, resized or removed; existing containers are fitted here,
+domains first so superdomains fit around their domains' bounds.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+# Must match utils.layout (default box, container padding and title)
+NODE_WIDTH = 220
+NODE_HEIGHT = 140
+CONTAINER_PADDING = 40
+CONTAINER_HEADER = 32
+
+BOUNDS_COLUMNS = ('bounds_x', 'bounds_y', 'bounds_width', 'bounds_height')
+
+
+def _fit(contents: str) -> None:
+    """Set the bounds of the containers listed by ``contents`` (id, x0, y0, x1, y1)."""
+    op.execute(
+        f"""
+        UPDATE diagram_object AS c
+        SET bounds_x = f.x0 - {CONTAINER_PADDING},
+            bounds_y = f.y0 - {CONTAINER_PADDING + CONTAINER_HEADER},
+            bounds_width = f.x1 - f.x0 + {2 * CONTAINER_PADDING},
+            bounds_height = f.y1 - f.y0 + {2 * CONTAINER_PADDING + CONTAINER_HEADER}
+        FROM ({contents}) AS f
+        WHERE c.id = f.id
+        """
+    )
+
+
+def upgrade() -> None:
+    """Add bounds columns and fit existing containers."""
+    for name in BOUNDS_COLUMNS:
+        op.add_column('diagram_object', sa.Column(name, sa.Float(), nullable=True))
+
+    _fit(
+        f"""
+        SELECT d.id,
+               min(o.position_x) AS x0,
+               min(o.position_y) AS y0,
+               max(o.position_x + coalesce(o.width, {NODE_WIDTH})) AS x1,
+               max(o.position_y + coalesce(o.height, {NODE_HEIGHT})) AS y1
+        FROM diagram_object AS d
+        JOIN entity AS e ON e.domain_id = d.object_id
+        JOIN diagram_object AS o
+          ON o.diagram_id = d.diagram_id AND o.object_type = 'ENTITY' AND o.object_id = e.id
+        WHERE d.object_type = 'DOMAIN'
+        GROUP BY d.id
+        """
+    )
+    _fit(
+        f"""
+        SELECT s.id,
+               min(coalesce(o.bounds_x, o.position_x)) AS x0,
+               min(coalesce(o.bounds_y, o.position_y)) AS y0,
+               max(coalesce(o.bounds_x + o.bounds_width,
+                            o.position_x + coalesce(o.width, {NODE_WIDTH}))) AS x1,
+               max(coalesce(o.bounds_y + o.bounds_height,
+                            o.position_y + coalesce(o.height, {NODE_HEIGHT}))) AS y1
+        FROM diagram_object AS s
+        JOIN diagram_object AS o ON o.diagram_id = s.diagram_id AND o.id <> s.id
+        LEFT JOIN entity AS e ON o.object_type = 'ENTITY' AND e.id = o.object_id
+        JOIN domain AS dm
+          ON dm.id = CASE WHEN o.object_type = 'DOMAIN' THEN o.object_id ELSE e.domain_id END
+        WHERE s.object_type = 'SUPERDOMAIN' AND dm.superdomain_id = s.object_id
+        GROUP BY s.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop bounds columns."""
+    for name in reversed(BOUNDS_COLUMNS):
+        op.drop_column('diagram_object', name)
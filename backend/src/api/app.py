@@ -1,7 +1,11 @@
 """Flask application factory."""
+import click
 from flask import Flask, jsonify
 from flask_cors import CORS
 
+from .json_provider import FastJSONProvider
+from .middleware import compression, session
+
 
 def create_app():
     """Create and configure Flask application.
@@ -10,6 +14,7 @@ def create_app():
         Flask app instance
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     # Configuration
     app.config["JSON_SORT_KEYS"] = False
@@ -21,9 +26,18 @@ def create_app():
     # Register error handlers
     register_error_handlers(app)
 
+    # gzip/brotli response compression (registered first so it runs last)
+    compression.init_app(app)
+
+    # Request-scoped database sessions (one unit of work per request)
+    session.init_app(app)
+
     # Register blueprints
     register_blueprints(app)
 
+    # Register CLI commands
+    register_commands(app)
+
     # Health check endpoint
     @app.route("/health")
     def health_check():
@@ -93,6 +107,7 @@ def register_blueprints(app):
     from .routes.attributes import attributes_bp
     from .routes.relationships import relationships_bp
     from .routes.diagrams import diagrams_bp
+    from .routes.batch import batch_bp
 
     # Register all blueprints with /api/v1 prefix
     app.register_blueprint(auth_bp, url_prefix="/api/v1/auth")
@@ -102,3 +117,24 @@ def register_blueprints(app):
     app.register_blueprint(attributes_bp, url_prefix="/api/v1/attributes")
     app.register_blueprint(relationships_bp, url_prefix="/api/v1/relationships")
     app.register_blueprint(diagrams_bp, url_prefix="/api/v1/diagrams")
+    app.register_blueprint(batch_bp, url_prefix="/api/v1/batch")
+
+
+def register_commands(app):
+    """Register Flask CLI commands for maintenance jobs.
+
+    Args:
+        app: Flask app instance
+    """
+
+    @app.cli.command("reconcile-counters")
+    def reconcile_counters():
+        """Repair drift in denormalised child counters."""
+        from ..services.counter_service import CounterService
+        from ..utils.database import get_db_context
+
+        with get_db_context() as db:
+            fixed = CounterService(db).reconcile()
+
+        for counter, rows in fixed.items():
+            click.echo(f"{counter}: {rows} row(s) corrected")
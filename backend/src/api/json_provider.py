@@ -0,0 +1,116 @@
+"""Fast JSON encoding for API responses."""
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Iterator
+
+from flask import Response
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Serialise types neither encoder handles natively."""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_default(value: Any) -> Any:
+    """Fallback serialiser matching orjson's output for common types."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return _default(value)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode an object as compact UTF-8 JSON.
+
+    Uses orjson when installed (datetimes as ISO 8601, enums by value);
+    otherwise the stdlib encoder with an equivalent ``default``.
+
+    Args:
+        obj: Object to encode
+
+    Returns:
+        Encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        obj, default=_stdlib_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def iter_dumps(obj: Any, batch_size: int = 500) -> Iterator[bytes]:
+    """Encode an object as JSON piece by piece.
+
+    Produces the same bytes as ``dumps_bytes``, but lists longer than
+    ``batch_size`` (at any depth inside string-keyed dicts) are encoded a
+    batch of items at a time, so the whole document never has to exist as
+    one buffer.
+
+    Args:
+        obj: Object to encode
+        batch_size: Items encoded per list piece
+
+    Yields:
+        Consecutive pieces of the encoded JSON
+    """
+    if isinstance(obj, dict) and all(isinstance(key, str) for key in obj):
+        yield b"{"
+        for index, (key, value) in enumerate(obj.items()):
+            yield (b"," if index else b"") + dumps_bytes(key) + b":"
+            yield from iter_dumps(value, batch_size)
+        yield b"}"
+    elif isinstance(obj, list) and len(obj) > batch_size:
+        yield b"["
+        for start in range(0, len(obj), batch_size):
+            # Strip the brackets of each batch's own array
+            batch = dumps_bytes(obj[start : start + batch_size])[1:-1]
+            yield (b"," if start else b"") + batch
+        yield b"]"
+    else:
+        yield dumps_bytes(obj)
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (stdlib fallback).
+
+    Models and services can hand ``datetime``/``Enum`` values straight to
+    ``jsonify``; they are serialised as ISO 8601 strings and enum values
+    without per-field conversion code. Responses are built from bytes, so
+    the payload is never round-tripped through a ``str``.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialise data as a JSON string."""
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialise a JSON string or bytes."""
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a JSON response (used by ``jsonify``)."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype="application/json")
@@ -2,13 +2,20 @@
 from functools import wraps
 from typing import Optional, Dict, Any
 from flask import request, jsonify, g
+import hashlib
 import jwt
 import os
 
+from ...services.token_revocation import revocation_list
+from ...utils.cache import LRUCache
+
 
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-key-change-in-production")
 ALGORITHM = "HS256"
 
+# Verified token payloads keyed by token hash; entries expire at the token's exp
+_verified_tokens = LRUCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "10000")))
+
 
 def get_token_from_header() -> Optional[str]:
     """Extract JWT token from Authorization header.
@@ -30,20 +37,33 @@ def get_token_from_header() -> Optional[str]:
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """Decode and validate JWT token.
 
+    Signature verification is skipped for tokens already verified by this
+    worker, but the revocation watermark is checked on every call.
+
     Args:
         token: JWT token string
 
     Returns:
-        Decoded payload or None if invalid
+        Decoded payload or None if invalid or revoked
     """
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _verified_tokens.get(key)
+
+    if payload is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except jwt.ExpiredSignatureError:
+            return None
+        except jwt.InvalidTokenError:
+            return None
+
+        _verified_tokens.set(key, payload, expires_at=payload.get("exp"))
+
+    if revocation_list.is_revoked(payload.get("user_id"), payload.get("iat")):
         return None
 
+    return payload
+
 
 def get_current_user() -> Optional[Dict[str, Any]]:
     """Get current authenticated user from request context.
@@ -0,0 +1,161 @@
+"""Response compression negotiated via Accept-Encoding."""
+import gzip
+import os
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Responses smaller than this are sent as-is (compression would not pay off)
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "application/json",
+        "application/vnd.diagramdesigner.columnar+json",
+        "application/msgpack",
+        "application/x-msgpack",
+        "text/plain",
+        "text/html",
+        "text/csv",
+    }
+)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw header value
+
+    Returns:
+        "br", "gzip" or None
+    """
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        offered[coding.strip()] = quality
+
+    def accepts(coding: str) -> bool:
+        return offered.get(coding, offered.get("*", 0.0)) > 0
+
+    if brotli is not None and accepts("br"):
+        return "br"
+    if accepts("gzip"):
+        return "gzip"
+    return None
+
+
+def identity_etag(etag: str) -> str:
+    """Get the ETag of the uncompressed representation behind an ETag.
+
+    Strong ETags of compressed responses carry the coding as a suffix
+    (``"7-gzip"``); clients send them back as-is in If-Match.
+
+    Args:
+        etag: ETag value (without quotes)
+
+    Returns:
+        The ETag without a known coding suffix
+    """
+    base, _, coding = etag.rpartition("-")
+    return base if base and coding in ("br", "gzip") else etag
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    """Compress a whole body at once."""
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+def _compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk as it is produced."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        compress, finish = compressor.process, compressor.finish
+    else:
+        # wbits=31 selects the gzip container
+        compressor = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)
+        compress, finish = compressor.compress, compressor.flush
+
+    try:
+        for chunk in chunks:
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _add_vary(response: Response) -> None:
+    """Mark the response as varying by Accept-Encoding."""
+    if "accept-encoding" not in response.vary:
+        response.vary.add("Accept-Encoding")
+
+
+def init_app(app: Flask) -> None:
+    """Register the response compression hook.
+
+    Responses of a compressible type are gzip- or brotli-encoded according
+    to the request's Accept-Encoding. Buffered bodies are compressed in one
+    pass if they are at least ``COMPRESS_MIN_SIZE`` bytes; streamed bodies
+    (see ``representation.STREAM_MIN_SIZE``) are compressed chunk by chunk
+    as the generator produces them.
+
+    Args:
+        app: Flask app instance
+    """
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        """Compress the response body."""
+        if (
+            response.direct_passthrough
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or request.method == "HEAD"
+        ):
+            return response
+
+        body = None if response.is_streamed else response.get_data()
+        if body is not None and len(body) < COMPRESS_MIN_SIZE:
+            return response
+
+        _add_vary(response)
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        response.headers["Content-Encoding"] = encoding
+        if body is None:
+            response.response = _compress_stream(response.response, encoding)
+        else:
+            response.set_data(_compress(body, encoding))
+
+        # The representation changed, so any strong validator must too
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f"{etag}-{encoding}")
+
+        return response
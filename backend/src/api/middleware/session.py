@@ -0,0 +1,67 @@
+"""Request-scoped database session management."""
+from flask import Flask, g, jsonify, request
+from sqlalchemy.orm import Session
+
+from ...utils.database import SessionLocal
+
+# Methods served from a read-only transaction
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def get_session() -> Session:
+    """Get the database session bound to the current request.
+
+    The session is opened lazily on first use, so every service in a request
+    shares one pooled connection, and requests that never touch the database
+    never check one out. GET requests run in a read-only transaction.
+
+    Returns:
+        Session: SQLAlchemy database session
+    """
+    session = g.get("db_session")
+    if session is None:
+        session = g.db_session = SessionLocal()
+        if request.method in READ_ONLY_METHODS:
+            # Begins the transaction as READ ONLY (no extra round trip)
+            session.connection(execution_options={"postgresql_readonly": True})
+    return session
+
+
+def init_app(app: Flask) -> None:
+    """Register unit-of-work commit and session cleanup handlers.
+
+    Successful write requests (status < 400) are committed once after the
+    view returns; anything else is rolled back. The session is always
+    released when the app context tears down.
+
+    Args:
+        app: Flask app instance
+    """
+
+    @app.after_request
+    def commit_session(response):
+        """Commit the request's unit of work."""
+        session = g.get("db_session")
+        if session is None:
+            return response
+
+        if request.method in READ_ONLY_METHODS or response.status_code >= 400:
+            session.rollback()
+            return response
+
+        try:
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+
+        return response
+
+    @app.teardown_appcontext
+    def close_session(error=None):
+        """Release the request's session back to the pool."""
+        session = g.pop("db_session", None)
+        if session is not None:
+            if error is not None:
+                session.rollback()
+            session.close()
@@ -0,0 +1,52 @@
+"""Conditional writes: row versions exposed as ETags and checked via If-Match."""
+from typing import Optional
+
+from flask import Response, jsonify, request
+
+from ..repositories.base_repository import StaleVersionError
+from .middleware.compression import identity_etag
+
+
+def if_match_version() -> Optional[int]:
+    """Get the row version the current write is conditional on.
+
+    Returns:
+        Version from the request's If-Match ETag, or None if the write is
+        unconditional (no If-Match, or ``If-Match: *``)
+
+    Raises:
+        StaleVersionError: If the ETag cannot match any version
+        ValueError: If more than one ETag is given
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+
+    tags = if_match.as_set()
+    if len(tags) > 1:
+        raise ValueError("If-Match must carry a single ETag")
+
+    # A compressed response's ETag names the same version
+    tag = identity_etag(next(iter(tags), ""))
+    if not tag.isdigit():
+        raise StaleVersionError("If-Match does not match the current version")
+    return int(tag)
+
+
+def set_version_etag(response: Response, version: int) -> Response:
+    """Expose a row version as the response's (strong) ETag.
+
+    Args:
+        response: Response of a GET, PUT or POST returning one row
+        version: Row version
+
+    Returns:
+        The same response
+    """
+    response.set_etag(str(version))
+    return response
+
+
+def precondition_failed(error: StaleVersionError):
+    """Build the 412 response for a failed compare-and-set."""
+    return jsonify({"error": "Precondition Failed", "message": str(error)}), 412
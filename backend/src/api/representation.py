@@ -0,0 +1,116 @@
+"""Content negotiation for bulk read responses."""
+import itertools
+import os
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Iterable, Iterator, Tuple
+
+from flask import Response, current_app, request
+
+from .json_provider import iter_dumps
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+JSON_MIMETYPE = "application/json"
+COLUMNAR_MIMETYPE = "application/vnd.diagramdesigner.columnar+json"
+MSGPACK_MIMETYPES = ("application/msgpack", "application/x-msgpack")
+
+# JSON bodies larger than this are streamed instead of buffered
+STREAM_MIN_SIZE = int(os.getenv("STREAM_MIN_SIZE", str(1024 * 1024)))
+
+# Approximate size of each chunk of a streamed body
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _msgpack_default(value: Any) -> Any:
+    """Serialise types msgpack does not handle natively (as the JSON encoder does)."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not msgpack serializable")
+
+
+def negotiate() -> Tuple[str, bool]:
+    """Choose the response encoding and shape for the current request.
+
+    ``Accept: application/msgpack`` selects MessagePack (when installed);
+    ``Accept: application/vnd.diagramdesigner.columnar+json`` or
+    ``?format=columnar`` selects the columnar shape, which may be combined
+    with MessagePack.
+
+    Returns:
+        Tuple of (mimetype, columnar)
+    """
+    offered = [JSON_MIMETYPE, COLUMNAR_MIMETYPE]
+    if msgpack is not None:
+        offered.extend(MSGPACK_MIMETYPES)
+
+    mimetype = request.accept_mimetypes.best_match(offered, default=JSON_MIMETYPE)
+    columnar = mimetype == COLUMNAR_MIMETYPE or request.args.get("format") == "columnar"
+    return mimetype, columnar
+
+
+def wants_columnar() -> bool:
+    """Check whether the client asked for the columnar shape."""
+    return negotiate()[1]
+
+
+def _coalesce(pieces: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """Join small pieces into chunks of roughly ``size`` bytes."""
+    buffer, buffered = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _json_response(payload: Any, status: int, mimetype: str) -> Response:
+    """Encode a payload as JSON, streaming it once it outgrows STREAM_MIN_SIZE.
+
+    Encoding is lazy: chunks are buffered until the threshold is reached,
+    then the response carries the buffered head followed by the rest of
+    the generator, which is encoded as the client reads it.
+    """
+    chunks = _coalesce(iter_dumps(payload), STREAM_CHUNK_SIZE)
+    head, size = [], 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if size > STREAM_MIN_SIZE:
+            return current_app.response_class(
+                itertools.chain(head, chunks), status=status, mimetype=mimetype
+            )
+
+    return current_app.response_class(b"".join(head), status=status, mimetype=mimetype)
+
+
+def render(payload: Any, status: int = 200) -> Response:
+    """Encode a payload in the negotiated representation.
+
+    Args:
+        payload: Response data (as produced by the service layer)
+        status: HTTP status code
+
+    Returns:
+        Response with a matching Content-Type and ``Vary: Accept``; JSON
+        bodies over ``STREAM_MIN_SIZE`` bytes are streamed
+    """
+    mimetype, _ = negotiate()
+    if mimetype in MSGPACK_MIMETYPES:
+        body = msgpack.packb(payload, default=_msgpack_default, use_bin_type=True)
+        response = current_app.response_class(body, status=status, mimetype=mimetype)
+    else:
+        response = _json_response(payload, status, mimetype)
+
+    response.vary.add("Accept")
+    return response
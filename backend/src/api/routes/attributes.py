@@ -1,17 +1,14 @@
 """Attribute routes."""
 from flask import Blueprint, request, jsonify
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
 
 from ..middleware.auth import require_auth, get_current_user
-from ..schemas.attribute import (
-    AttributeCreate,
-    AttributeUpdate,
-    AttributeResponse,
-    AttributeListResponse,
-)
+from .. import representation
+from ..middleware.session import get_session
+from ..preconditions import if_match_version, precondition_failed, set_version_etag
+from ..schemas.attribute import AttributeUpdate
+from ...repositories.base_repository import StaleVersionError
 from ...services.attribute_service import AttributeService
-from ...utils.database import get_db
 
 attributes_bp = Blueprint("attributes", __name__)
 
@@ -19,32 +16,29 @@ attributes_bp = Blueprint("attributes", __name__)
 @attributes_bp.route("", methods=["GET"])
 @require_auth
 def list_attributes():
-    """List attributes, optionally filtered by entity.
+    """List attributes of an entity.
 
-    GET /api/v1/attributes?entity_id=1&skip=0&limit=100
-    Response: {"attributes": [...], "total": 15}
+    GET /api/v1/attributes?entityId=1&fields=id,name,dataType
+    Response: {"data": [...]}
     """
     try:
-        user = get_current_user()
-        entity_id = request.args.get("entity_id", type=int)
-        skip = request.args.get("skip", 0, type=int)
-        limit = request.args.get("limit", 100, type=int)
-
-        db: Session = next(get_db())
-        try:
-            service = AttributeService(db)
-            attributes = service.list_attributes(user["user_id"], entity_id, skip, limit)
-            total = service.count_attributes(user["user_id"], entity_id)
-
-            response = AttributeListResponse(
-                attributes=[AttributeResponse.model_validate(a) for a in attributes],
-                total=total,
-            )
-            return jsonify(response.model_dump()), 200
-
-        finally:
-            db.close()
+        entity_id = request.args.get("entityId", type=int)
+        if entity_id is None:
+            return jsonify({"error": "Bad Request", "message": "entityId is required"}), 400
+
+        db = get_session()
+        service = AttributeService(db)
+        result = service.list_by_entity(
+            entity_id,
+            fields=request.args.get("fields"),
+            columnar=representation.wants_columnar(),
+        )
+        return representation.render(result)
 
+    except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
@@ -56,40 +50,26 @@ def create_attribute():
 
     POST /api/v1/attributes
     Request body: {
-        "entity_id": 1,
+        "entityId": 1,
         "name": "email",
-        "data_type": "String",
-        "is_nullable": false,
-        "is_primary_key": false
+        "dataType": "String",
+        "isNullable": false
     }
-    Response: AttributeResponse
+    Response: Attribute
     """
     try:
         user = get_current_user()
-        data = AttributeCreate(**request.json)
-
-        db: Session = next(get_db())
-        try:
-            service = AttributeService(db)
-            attribute = service.create_attribute(
-                user_id=user["user_id"],
-                entity_id=data.entity_id,
-                name=data.name,
-                data_type=data.data_type,
-                is_nullable=data.is_nullable,
-                is_primary_key=data.is_primary_key,
-                default_value=data.default_value,
-                constraints=data.constraints,
-            )
-
-            response = AttributeResponse.model_validate(attribute)
-            return jsonify(response.model_dump()), 201
-
-        finally:
-            db.close()
+        data = request.json or {}
+
+        entity_id = data.get("entityId")
+        if not entity_id:
+            raise ValueError("Entity ID is required")
+
+        db = get_session()
+        service = AttributeService(db)
+        attribute = service.create(entity_id, data, user_id=user["user_id"])
+        return jsonify(attribute), 201
 
-    except ValidationError as e:
-        return jsonify({"error": "Validation Error", "message": str(e)}), 400
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -102,24 +82,17 @@ def get_attribute(id: int):
     """Get attribute by ID.
 
     GET /api/v1/attributes/{id}
-    Response: AttributeResponse
+    Response: Attribute (ETag: its version)
     """
     try:
-        user = get_current_user()
-
-        db: Session = next(get_db())
-        try:
-            service = AttributeService(db)
-            attribute = service.get_attribute(id, user["user_id"])
-
-            if not attribute:
-                return jsonify({"error": "Not Found", "message": "Attribute not found"}), 404
+        db = get_session()
+        service = AttributeService(db)
+        attribute = service.get_by_id(id)
 
-            response = AttributeResponse.model_validate(attribute)
-            return jsonify(response.model_dump()), 200
+        if not attribute:
+            return jsonify({"error": "Not Found", "message": "Attribute not found"}), 404
 
-        finally:
-            db.close()
+        return set_version_etag(representation.render(attribute), attribute["version"])
 
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -131,38 +104,56 @@ def update_attribute(id: int):
     """Update attribute.
 
     PUT /api/v1/attributes/{id}
-    Request body: {"name": "new_name", "data_type": "Integer", ...}
-    Response: AttributeResponse
+    If-Match: "<version>" (optional; 412 if the attribute changed since)
+    Request body: {"name": "new_name", "dataType": "...", ...}
+    Response: Attribute (ETag: its new version)
     """
     try:
-        user = get_current_user()
-        data = AttributeUpdate(**request.json)
-
-        db: Session = next(get_db())
-        try:
-            service = AttributeService(db)
-            attribute = service.update_attribute(
-                id=id,
-                user_id=user["user_id"],
-                name=data.name,
-                data_type=data.data_type,
-                is_nullable=data.is_nullable,
-                is_primary_key=data.is_primary_key,
-                default_value=data.default_value,
-                constraints=data.constraints,
-            )
-
-            if not attribute:
-                return jsonify({"error": "Not Found", "message": "Attribute not found"}), 404
-
-            response = AttributeResponse.model_validate(attribute)
-            return jsonify(response.model_dump()), 200
-
-        finally:
-            db.close()
+        data = AttributeUpdate(**(request.json or {}))
+
+        db = get_session()
+        service = AttributeService(db)
+        attribute = service.update(
+            id, data.model_dump(exclude_unset=True), expected_version=if_match_version()
+        )
+
+        if not attribute:
+            return jsonify({"error": "Not Found", "message": "Attribute not found"}), 404
+
+        return set_version_etag(jsonify(attribute), attribute["version"])
 
     except ValidationError as e:
         return jsonify({"error": "Validation Error", "message": str(e)}), 400
+    except StaleVersionError as e:
+        return precondition_failed(e)
+    except ValueError as e:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+
+
+@attributes_bp.route("/<int:id>/position", methods=["PUT"])
+@require_auth
+def move_attribute(id: int):
+    """Move attribute within its entity's column order.
+
+    PUT /api/v1/attributes/{id}/position
+    If-Match: "<version>" (optional; 412 if the attribute changed since)
+    Request body: {"after": 12} | {"before": 12} | {"to": "first" | "last"}
+    Response: Attribute (ETag: its new version)
+    """
+    try:
+        db = get_session()
+        service = AttributeService(db)
+        attribute = service.move(id, request.json or {}, expected_version=if_match_version())
+
+        if not attribute:
+            return jsonify({"error": "Not Found", "message": "Attribute not found"}), 404
+
+        return set_version_etag(jsonify(attribute), attribute["version"])
+
+    except StaleVersionError as e:
+        return precondition_failed(e)
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -175,23 +166,20 @@ def delete_attribute(id: int):
     """Delete attribute.
 
     DELETE /api/v1/attributes/{id}
+    If-Match: "<version>" (optional; 412 if the attribute changed since)
     Response: {"message": "Attribute deleted"}
     """
     try:
-        user = get_current_user()
-
-        db: Session = next(get_db())
-        try:
-            service = AttributeService(db)
-            success = service.delete_attribute(id, user["user_id"])
-
-            if not success:
-                return jsonify({"error": "Not Found", "message": "Attribute not found"}), 404
-
-            return jsonify({"message": "Attribute deleted successfully"}), 200
-
-        finally:
-            db.close()
+        db = get_session()
+        service = AttributeService(db)
+        result = service.delete(id, expected_version=if_match_version())
+        return jsonify(result), 200
 
+    except StaleVersionError as e:
+        return precondition_failed(e)
+    except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -1,11 +1,12 @@
 """Authentication routes."""
 from flask import Blueprint, request, jsonify
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
 
+from ..middleware.auth import get_current_user, require_auth
+from ..middleware.session import get_session
 from ..schemas.auth import LoginRequest, LoginResponse, RegisterRequest, RegisterResponse
 from ...services.auth_service import AuthService
-from ...utils.database import get_db
+from ...utils.password_hasher import HasherBusyError
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -23,26 +24,24 @@ def login():
         data = LoginRequest(**request.json)
 
         # Get database session
-        db: Session = next(get_db())
+        db = get_session()
 
-        try:
-            # Authenticate user
-            auth_service = AuthService(db)
-            result = auth_service.login(data.email, data.password)
+        # Authenticate user
+        auth_service = AuthService(db)
+        result = auth_service.login(data.email, data.password)
 
-            if not result:
-                return (
-                    jsonify({"error": "Unauthorized", "message": "Invalid credentials"}),
-                    401,
-                )
-
-            # Return token and user info
-            response = LoginResponse(**result)
-            return jsonify(response.model_dump()), 200
+        if not result:
+            return (
+                jsonify({"error": "Unauthorized", "message": "Invalid credentials"}),
+                401,
+            )
 
-        finally:
-            db.close()
+        # Return token and user info
+        response = LoginResponse(**result)
+        return jsonify(response.model_dump()), 200
 
+    except HasherBusyError as e:
+        return _busy_response(e)
     except ValidationError as e:
         return jsonify({"error": "Validation Error", "message": str(e)}), 400
     except ValueError as e:
@@ -69,28 +68,67 @@ def register():
         data = RegisterRequest(**request.json)
 
         # Get database session
-        db: Session = next(get_db())
-
-        try:
-            # Register user
-            auth_service = AuthService(db)
-            result = auth_service.register(
-                email=data.email,
-                username=data.username,
-                password=data.password,
-                full_name=data.full_name,
-            )
-
-            # Return token and user info
-            response = RegisterResponse(**result)
-            return jsonify(response.model_dump()), 201
-
-        finally:
-            db.close()
-
+        db = get_session()
+
+        # Register user
+        auth_service = AuthService(db)
+        result = auth_service.register(
+            {
+                "email": data.email,
+                "username": data.username,
+                "password": data.password,
+                "fullName": data.full_name,
+            }
+        )
+
+        # Return token and user info
+        response = RegisterResponse(**result)
+        return jsonify(response.model_dump()), 201
+
+    except HasherBusyError as e:
+        return _busy_response(e)
     except ValidationError as e:
         return jsonify({"error": "Validation Error", "message": str(e)}), 400
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+
+
+@auth_bp.route("/logout", methods=["POST"])
+@require_auth
+def logout():
+    """Sign the current user out on every device.
+
+    POST /api/v1/auth/logout
+    Response: {"message": "Logged out"}
+
+    Every token issued to the user so far stops working, including the
+    one used for this request; other workers pick the revocation up
+    within TOKEN_REVOCATION_REFRESH seconds.
+    """
+    try:
+        user = get_current_user()
+
+        db = get_session()
+        auth_service = AuthService(db)
+        return jsonify(auth_service.logout(user["user_id"])), 200
+
+    except ValueError as e:
+        return jsonify({"error": "Not Found", "message": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+
+
+def _busy_response(error: HasherBusyError):
+    """Build a fast 503 response when password hashing is saturated.
+
+    Args:
+        error: Busy error carrying the retry delay
+
+    Returns:
+        Flask response tuple with Retry-After header
+    """
+    response = jsonify({"error": "Service Unavailable", "message": str(error)})
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response, 503
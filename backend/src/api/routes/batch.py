@@ -0,0 +1,205 @@
+"""Batch routes."""
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+from ..middleware.auth import require_auth
+from ..middleware.session import get_session
+
+batch_bp = Blueprint("batch", __name__)
+
+# Upper bound on operations per batch (one transaction holds their locks)
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "200"))
+
+BATCH_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE"})
+
+# Streaming endpoints: their open-ended responses (and the subscriptions
+# behind them) cannot be collected into a batch result
+BATCH_EXCLUDED_ENDPOINTS = frozenset(
+    {"diagrams.stream_diagram_events", "diagrams.stream_diagram_presence"}
+)
+
+# "$0.id", "$2.data.0.name" -- a reference to an earlier operation's result
+REFERENCE = re.compile(r"\$(\d+)((?:\.[A-Za-z0-9_]+)*)")
+
+
+class BatchError(ValueError):
+    """Raised when an operation cannot be built from the batch request."""
+
+
+def _lookup(results: List[Any], index: int, path: str, current: int) -> Any:
+    """Resolve a reference against the bodies of earlier operations."""
+    if index >= current:
+        raise BatchError(f"Operation {current} references ${index}, which has not run yet")
+
+    value = results[index]
+    for key in filter(None, path.split(".")):
+        if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        elif isinstance(value, dict) and key in value:
+            value = value[key]
+        else:
+            raise BatchError(f"Operation {current} references ${index}{path}, which does not exist")
+    return value
+
+
+def _resolve(value: Any, results: List[Any], current: int) -> Any:
+    """Substitute references in an operation's path or body.
+
+    A string that is exactly one reference is replaced by the referenced
+    value (keeping its type); references embedded in longer strings are
+    replaced by their string form.
+    """
+    if isinstance(value, dict):
+        return {key: _resolve(item, results, current) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results, current) for item in value]
+    if not isinstance(value, str) or "$" not in value:
+        return value
+
+    match = REFERENCE.fullmatch(value)
+    if match:
+        return _lookup(results, int(match.group(1)), match.group(2), current)
+
+    return REFERENCE.sub(
+        lambda m: str(_lookup(results, int(m.group(1)), m.group(2), current)), value
+    )
+
+
+def _endpoint(method: str, path: str) -> Optional[str]:
+    """Get the endpoint an operation routes to (None if it does not route)."""
+    adapter = current_app.url_map.bind(request.host)
+    try:
+        endpoint, _ = adapter.match(path.split("?")[0], method=method)
+    except HTTPException:
+        return None
+    return endpoint
+
+
+def _dispatch(method: str, path: str, body: Any) -> Dict[str, Any]:
+    """Run one operation through the normal routing and view stack.
+
+    The nested request shares the batch's application context, so it uses
+    the same ``g.db_session`` (and therefore the same transaction) and the
+    batch's Authorization header. Per-request hooks such as the
+    unit-of-work commit do not run; the batch commits once at the end.
+    """
+    app = current_app._get_current_object()
+    headers = {}
+    if request.headers.get("Authorization"):
+        headers["Authorization"] = request.headers["Authorization"]
+
+    with app.test_request_context(
+        path, method=method, json=body, headers=headers, base_url=request.host_url
+    ):
+        try:
+            response = app.make_response(app.dispatch_request())
+        except Exception as e:
+            # Routing errors (404/405) and the app's registered error handlers
+            response = app.make_response(app.handle_user_exception(e))
+
+        if response.mimetype == "text/event-stream":
+            response.close()
+            return {
+                "status": 400,
+                "body": {"error": "Bad Request", "message": "Event streams cannot be batched"},
+            }
+
+        return {
+            "status": response.status_code,
+            "body": response.get_json(silent=True),
+        }
+
+
+@batch_bp.route("", methods=["POST"])
+@require_auth
+def run_batch():
+    """Execute several API operations in one transaction.
+
+    POST /api/v1/batch
+    Request body: {
+        "operations": [
+            {"method": "POST", "path": "/api/v1/entities", "body": {...}},
+            {"method": "POST", "path": "/api/v1/entities/$0.id/attributes", "body": {...}},
+            {"method": "POST", "path": "/api/v1/diagrams/3/objects",
+             "body": {"objectType": "ENTITY", "objectId": "$0.id", ...}}
+        ]
+    }
+    Response: {"results": [{"status": 201, "body": {...}}, ...]}
+
+    Operations run in order on the request's session. References such as
+    "$0.id" are replaced with values from earlier results. The first
+    operation that fails (status >= 400) stops the batch and everything is
+    rolled back; the response then carries that operation's status.
+    Streaming endpoints (events, presence) cannot be batched.
+    """
+    payload = request.get_json(silent=True) or {}
+    operations = payload.get("operations")
+
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "Bad Request", "message": "operations must be a non-empty list"}), 400
+
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        return (
+            jsonify(
+                {
+                    "error": "Bad Request",
+                    "message": f"A batch may contain at most {BATCH_MAX_OPERATIONS} operations",
+                }
+            ),
+            400,
+        )
+
+    # Open the shared session up front so every operation joins it
+    get_session()
+
+    results: List[Dict[str, Any]] = []
+    bodies: List[Any] = []
+    for index, operation in enumerate(operations):
+        try:
+            if not isinstance(operation, dict):
+                raise BatchError(f"Operation {index} must be an object")
+
+            method = str(operation.get("method", "")).upper()
+            if method not in BATCH_METHODS:
+                raise BatchError(f"Operation {index} has unsupported method '{method}'")
+
+            path = _resolve(operation.get("path"), bodies, index)
+            if not isinstance(path, str) or not path.startswith("/api/"):
+                raise BatchError(f"Operation {index} must have an /api/ path")
+            if path.split("?")[0].rstrip("/") == request.path.rstrip("/"):
+                raise BatchError("Batches cannot be nested")
+            if _endpoint(method, path) in BATCH_EXCLUDED_ENDPOINTS:
+                raise BatchError(f"Operation {index} targets a streaming endpoint")
+
+            body = _resolve(operation.get("body"), bodies, index)
+        except BatchError as e:
+            return _failed(index, 400, {"error": "Bad Request", "message": str(e)}, results)
+
+        result = _dispatch(method, path, body)
+        results.append(result)
+        bodies.append(result["body"])
+
+        if result["status"] >= 400:
+            return _failed(index, result["status"], result["body"], results)
+
+    return jsonify({"results": results}), 200
+
+
+def _failed(index: int, status: int, body: Any, results: List[Dict[str, Any]]):
+    """Build the response for a batch aborted at ``index`` (rolled back)."""
+    message = body.get("message") if isinstance(body, dict) else None
+    return (
+        jsonify(
+            {
+                "error": "Batch Failed",
+                "message": f"Operation {index} failed" + (f": {message}" if message else ""),
+                "failedIndex": index,
+                "results": results,
+            }
+        ),
+        status,
+    )
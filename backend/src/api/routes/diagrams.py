@@ -1,47 +1,58 @@
 """Diagram routes."""
-from flask import Blueprint, request, jsonify
+import os
+import time
+
+from flask import Blueprint, Response, current_app, request, jsonify
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
 
 from ..middleware.auth import require_auth, get_current_user
-from ..schemas.diagram import (
-    DiagramCreate,
-    DiagramUpdate,
-    DiagramResponse,
-    DiagramObjectCreate,
-    DiagramObjectUpdate,
-    DiagramObjectResponse,
-)
+from .. import representation
+from ..middleware.session import get_session
+from ..preconditions import if_match_version, precondition_failed, set_version_etag
+from ..schemas.diagram import DiagramUpdate
+from ...repositories.base_repository import StaleVersionError
+from ...services import level_of_detail, position_buffer
+from ...services.bundle_service import DiagramBundleService
+from ...services.diagram_events import event_hub, format_sse
 from ...services.diagram_service import DiagramService
-from ...utils.database import get_db
+from ...services.merge_service import DiagramMergeService
+from ...services.presence import presence_hub
 
 diagrams_bp = Blueprint("diagrams", __name__)
 
+# Seconds between SSE keep-alive comments on an idle event stream
+DIAGRAM_EVENTS_HEARTBEAT = float(os.getenv("DIAGRAM_EVENTS_HEARTBEAT", "15"))
+
 
 @diagrams_bp.route("", methods=["GET"])
 @require_auth
 def list_diagrams():
-    """List all diagrams for current user.
+    """List diagrams, optionally filtered by tag or creator.
 
-    GET /api/v1/diagrams?skip=0&limit=100
-    Response: [DiagramResponse, ...]
+    GET /api/v1/diagrams?tag=sales&mine=true&page=1&pageSize=100&fields=id,name
+    Response: {"data": [...], "pagination": {...}}
     """
     try:
         user = get_current_user()
-        skip = request.args.get("skip", 0, type=int)
-        limit = request.args.get("limit", 100, type=int)
-
-        db: Session = next(get_db())
-        try:
-            service = DiagramService(db)
-            diagrams = service.list_diagrams(user["user_id"], skip, limit)
-
-            response = [DiagramResponse.model_validate(d) for d in diagrams]
-            return jsonify(response), 200
-
-        finally:
-            db.close()
+        tag = request.args.get("tag")
+        mine = request.args.get("mine", "false").lower() == "true"
+        page = max(request.args.get("page", 1, type=int), 1)
+        page_size = max(request.args.get("pageSize", 100, type=int), 1)
+
+        db = get_session()
+        service = DiagramService(db)
+        result = service.list(
+            page,
+            page_size,
+            tag=tag,
+            user_id=user["user_id"] if mine else None,
+            fields=request.args.get("fields"),
+            columnar=representation.wants_columnar(),
+        )
+        return representation.render(result)
 
+    except ValueError as e:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
@@ -55,35 +66,50 @@ def create_diagram():
     Request body: {
         "name": "Sales Overview",
         "description": "...",
+        "purpose": "...",
         "tags": ["sales", "customer"],
-        "canvas_settings": {...}
+        "canvasSettings": {...}
     }
-    Response: DiagramResponse
+    Response: Diagram (with empty objects and relationships)
     """
     try:
         user = get_current_user()
-        data = DiagramCreate(**request.json)
 
-        db: Session = next(get_db())
-        try:
-            service = DiagramService(db)
-            diagram = service.create_diagram(
-                user_id=user["user_id"],
-                name=data.name,
-                description=data.description,
-                tags=data.tags,
-                canvas_settings=data.canvas_settings,
-            )
+        db = get_session()
+        service = DiagramService(db)
+        diagram = service.create(request.json or {}, user_id=user["user_id"])
+        return jsonify(diagram), 201
 
-            response = DiagramResponse.model_validate(diagram)
-            return jsonify(response.model_dump()), 201
+    except ValueError as e:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
-        finally:
-            db.close()
 
-    except ValidationError as e:
-        return jsonify({"error": "Validation Error", "message": str(e)}), 400
+@diagrams_bp.route("/generate", methods=["POST"])
+@require_auth
+def generate_diagram():
+    """Generate a diagram from a domain, a superdomain or an entity neighbourhood.
+
+    POST /api/v1/diagrams/generate
+    Request body: {
+        "domainId": 1 | "superdomainId": 1 | "entityId": 1, "depth": 2,
+        "layout": "grid" | "layered",
+        "name": "Sales Overview"
+    }
+    Response: Diagram (with objects and relationships)
+    """
+    try:
+        user = get_current_user()
+
+        db = get_session()
+        service = DiagramService(db)
+        diagram = service.generate(request.json or {}, user_id=user["user_id"])
+        return jsonify(diagram), 201
+
     except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -94,26 +120,202 @@ def create_diagram():
 def get_diagram(id: int):
     """Get diagram by ID with full details.
 
-    GET /api/v1/diagrams/{id}
-    Response: DiagramResponse (with objects and relationships)
+    GET /api/v1/diagrams/{id}?lod=overview|normal|full
+    Accept: application/json | application/msgpack |
+            application/vnd.diagramdesigner.columnar+json
+    Response: Diagram (with objects and relationships; ETag: its version)
+
+    lod=overview replaces the collections with packed boxes and lines
+    ({"objects": {"ids", "types", "rects"}, "edges"}) with containers
+    collapsed; lod=full adds relationship routing points. Objects come in
+    paint order (containers directly below their contents) and containers
+    carry their fitted "bounds".
     """
     try:
-        user = get_current_user()
+        lod = level_of_detail.parse_lod(request.args.get("lod"))
+
+        db = get_session()
+        service = DiagramService(db)
+        diagram = service.get_by_id(id, columnar=representation.wants_columnar(), lod=lod)
+
+        if not diagram:
+            return jsonify({"error": "Not Found", "message": "Diagram not found"}), 404
+
+        return set_version_etag(representation.render(diagram), diagram["version"])
+
+    except ValueError as e:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+
+
+@diagrams_bp.route("/<int:id>/bundle", methods=["GET"])
+@require_auth
+def get_diagram_bundle(id: int):
+    """Get everything the editor needs to open a diagram.
+
+    GET /api/v1/diagrams/{id}/bundle?lod=overview|normal|full
+    Response: {"diagram", "objects", "diagramRelationships", "superdomains",
+               "domains", "entities", "attributes", "relationships"}
+              or, with lod=overview, {"diagram", "lod", "objects", "edges"}
+
+    The ETag is the diagram's change version, so revalidation with
+    If-None-Match costs one indexed lookup and returns 304 when unchanged.
+    While moves of the diagram's objects are still buffered, the response
+    carries them and has no ETag.
+    """
+    try:
+        lod = level_of_detail.parse_lod(request.args.get("lod"))
+
+        db = get_session()
+        service = DiagramBundleService(db)
+
+        version = service.get_version(id)
+        if version is None:
+            return jsonify({"error": "Not Found", "message": "Diagram not found"}), 404
+
+        pending = position_buffer.pending_positions(id)
+        etag = f"bundle-{id}-{version}"
+        if lod != level_of_detail.DEFAULT_LOD:
+            etag = f"{etag}-{lod}"
+        if not pending and request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+
+        bundle = service.get(id, version=version, pending=pending, lod=lod)
+        if bundle is None:
+            return jsonify({"error": "Not Found", "message": "Diagram not found"}), 404
+
+        response = representation.render(bundle)
+        if not pending:
+            response.set_etag(etag, weak=True)
+        return response
+
+    except ValueError as e:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
-        db: Session = next(get_db())
+
+@diagrams_bp.route("/<int:id>/events", methods=["GET"])
+@require_auth
+def stream_diagram_events(id: int):
+    """Stream a diagram's changes as Server-Sent Events.
+
+    GET /api/v1/diagrams/{id}/events
+    Accept: text/event-stream
+    Response: "ready" (with the current changeVersion), then one event per
+    committed change: place, move (coalesced, data is a list), restack,
+    remove, merge, undo, redo, bounds, update, delete. "resync" means events may
+    have been missed and the client should reload the diagram bundle.
+    """
+    # Subscribe before reading the version so no change falls in between
+    subscription = event_hub.subscribe(id)
+    try:
+        db = get_session()
+        service = DiagramService(db)
+        version = service.get_change_version(id)
+        if version is None:
+            event_hub.unsubscribe(subscription)
+            return jsonify({"error": "Not Found", "message": "Diagram not found"}), 404
+
+    except Exception as e:
+        event_hub.unsubscribe(subscription)
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+
+    def stream():
         try:
-            service = DiagramService(db)
-            diagram = service.get_diagram(id, user["user_id"])
+            yield "retry: 3000\n\n"
+            yield format_sse(None, "ready", {"kind": "ready", "data": {"changeVersion": version}})
+            while True:
+                frame = subscription.get(timeout=DIAGRAM_EVENTS_HEARTBEAT)
+                yield frame if frame is not None else ": keep-alive\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
 
-            if not diagram:
-                return jsonify({"error": "Not Found", "message": "Diagram not found"}), 404
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-            response = DiagramResponse.model_validate(diagram)
-            return jsonify(response.model_dump()), 200
 
+@diagrams_bp.route("/<int:id>/presence", methods=["GET"])
+@require_auth
+def stream_diagram_presence(id: int):
+    """Join a diagram's collaborators and stream their presence.
+
+    GET /api/v1/diagrams/{id}/presence
+    Accept: text/event-stream
+    Response: "ready" (with this stream's sessionId and the current
+    members), then join, leave, update (selection) and cursors (batched)
+    events. The caller stays a member while the stream is open.
+    """
+    try:
+        db = get_session()
+        if DiagramService(db).get_change_version(id) is None:
+            return jsonify({"error": "Not Found", "message": "Diagram not found"}), 404
+
+        session_id, subscription = presence_hub.join(id, get_current_user())
+        members = presence_hub.members(id)
+
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+
+    def stream():
+        try:
+            yield "retry: 3000\n\n"
+            yield format_sse(
+                None, "ready", {"kind": "ready", "data": {"sessionId": session_id, "members": members}}
+            )
+            last_heartbeat = time.monotonic()
+            while True:
+                frame = subscription.get(timeout=DIAGRAM_EVENTS_HEARTBEAT)
+                if time.monotonic() - last_heartbeat >= DIAGRAM_EVENTS_HEARTBEAT:
+                    presence_hub.heartbeat(id, session_id)
+                    last_heartbeat = time.monotonic()
+                yield frame if frame is not None else ": keep-alive\n\n"
         finally:
-            db.close()
+            presence_hub.leave(id, session_id, subscription)
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
+
+@diagrams_bp.route("/<int:id>/presence", methods=["POST"])
+@require_auth
+def update_diagram_presence(id: int):
+    """Share this collaborator's cursor and/or selection.
+
+    POST /api/v1/diagrams/{id}/presence
+    Request body: {"sessionId": "...", "cursor": {"x": 10, "y": 20}, "selection": [1, 2]}
+    Response: 202 Accepted
+
+    Presence is kept in memory only; this never touches the database.
+    """
+    try:
+        data = request.json or {}
+        if not data.get("sessionId"):
+            raise ValueError("sessionId is required")
+
+        user = get_current_user()
+        presence_hub.update(
+            id,
+            data["sessionId"],
+            user["user_id"],
+            cursor=data.get("cursor"),
+            selection=data.get("selection"),
+        )
+        return jsonify({"sessionId": data["sessionId"]}), 202
+
+    except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
@@ -124,36 +326,33 @@ def update_diagram(id: int):
     """Update diagram metadata.
 
     PUT /api/v1/diagrams/{id}
+    If-Match: "<version>" (optional; 412 if the diagram changed since)
     Request body: {"name": "New Name", "description": "...", ...}
-    Response: DiagramResponse
+    Response: Diagram metadata, without objects and relationships
+              (ETag: its new version)
     """
     try:
         user = get_current_user()
-        data = DiagramUpdate(**request.json)
-
-        db: Session = next(get_db())
-        try:
-            service = DiagramService(db)
-            diagram = service.update_diagram(
-                id=id,
-                user_id=user["user_id"],
-                name=data.name,
-                description=data.description,
-                tags=data.tags,
-                canvas_settings=data.canvas_settings,
-            )
+        data = DiagramUpdate(**(request.json or {}))
 
-            if not diagram:
-                return jsonify({"error": "Not Found", "message": "Diagram not found"}), 404
+        db = get_session()
+        service = DiagramService(db)
+        diagram = service.update(
+            id,
+            data.model_dump(exclude_unset=True),
+            user_id=user["user_id"],
+            expected_version=if_match_version(),
+        )
 
-            response = DiagramResponse.model_validate(diagram)
-            return jsonify(response.model_dump()), 200
+        if not diagram:
+            return jsonify({"error": "Not Found", "message": "Diagram not found"}), 404
 
-        finally:
-            db.close()
+        return set_version_etag(jsonify(diagram), diagram["version"])
 
     except ValidationError as e:
         return jsonify({"error": "Validation Error", "message": str(e)}), 400
+    except StaleVersionError as e:
+        return precondition_failed(e)
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -166,24 +365,21 @@ def delete_diagram(id: int):
     """Delete diagram.
 
     DELETE /api/v1/diagrams/{id}
+    If-Match: "<version>" (optional; 412 if the diagram changed since)
     Response: {"message": "Diagram deleted"}
     """
     try:
-        user = get_current_user()
-
-        db: Session = next(get_db())
-        try:
-            service = DiagramService(db)
-            success = service.delete_diagram(id, user["user_id"])
-
-            if not success:
-                return jsonify({"error": "Not Found", "message": "Diagram not found"}), 404
-
-            return jsonify({"message": "Diagram deleted successfully"}), 200
-
-        finally:
-            db.close()
+        db = get_session()
+        service = DiagramService(db)
+        result = service.delete(id, expected_version=if_match_version())
+        return jsonify(result), 200
 
+    except StaleVersionError as e:
+        return precondition_failed(e)
+    except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
@@ -196,42 +392,64 @@ def delete_diagram(id: int):
 def add_diagram_object(diagram_id: int):
     """Add an object to diagram.
 
-    POST /api/v1/diagrams/{diagram_id}/objects
+    POST /api/v1/diagrams/{diagram_id}/objects?placement=auto
     Request body: {
-        "object_type": "ENTITY",
-        "object_id": 1,
-        "position_x": 100,
-        "position_y": 200,
-        "visual_style": {...}
+        "objectType": "ENTITY",
+        "objectId": 1,
+        "positionX": 100,
+        "positionY": 200,
+        "visualStyle": {...}
     }
-    Response: DiagramObjectResponse
+    Response: DiagramObject plus "relationships" placed alongside it
+
+    With placement=auto the position is optional and only a wish: the
+    object goes to the nearest spot where it overlaps nothing.
     """
     try:
-        user = get_current_user()
-        data = DiagramObjectCreate(**request.json)
+        db = get_session()
+        service = DiagramService(db)
+        diagram_object = service.add_object(
+            diagram_id, request.json or {}, placement=request.args.get("placement")
+        )
+        return jsonify(diagram_object), 201
 
-        db: Session = next(get_db())
-        try:
-            service = DiagramService(db)
-            diagram_object = service.add_object(
-                diagram_id=diagram_id,
-                user_id=user["user_id"],
-                object_type=data.object_type,
-                object_id=data.object_id,
-                position_x=data.position_x,
-                position_y=data.position_y,
-                visual_style=data.visual_style,
-            )
+    except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
-            response = DiagramObjectResponse.model_validate(diagram_object)
-            return jsonify(response.model_dump()), 201
 
-        finally:
-            db.close()
+@diagrams_bp.route("/<int:diagram_id>/objects/bulk", methods=["POST"])
+@require_auth
+def add_diagram_objects(diagram_id: int):
+    """Add several objects to a diagram at once.
+
+    POST /api/v1/diagrams/{diagram_id}/objects/bulk?placement=auto
+    Request body: {"objects": [{"objectType": "ENTITY", "objectId": 1,
+                                "positionX": 100, "positionY": 200}, ...]}
+    Response: {"objects": [...], "relationships": [...], "containers": [...]}
+
+    Relationships between the placed entities and those already on the
+    diagram are placed in the same transaction, and the containers they
+    sit in are refitted ("containers": [{"id", "bounds"}] that changed). With placement=auto,
+    objects are moved (in the order given) to the free spots nearest
+    their positions, so they overlap neither each other nor the diagram.
+    """
+    try:
+        db = get_session()
+        service = DiagramService(db)
+        result = service.add_objects(
+            diagram_id,
+            (request.json or {}).get("objects"),
+            placement=request.args.get("placement"),
+        )
+        return jsonify(result), 201
 
-    except ValidationError as e:
-        return jsonify({"error": "Validation Error", "message": str(e)}), 400
     except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -240,42 +458,74 @@ def add_diagram_object(diagram_id: int):
 @diagrams_bp.route("/<int:diagram_id>/objects/<int:object_id>", methods=["PUT"])
 @require_auth
 def update_diagram_object(diagram_id: int, object_id: int):
-    """Update diagram object position or style.
+    """Move a diagram object.
 
     PUT /api/v1/diagrams/{diagram_id}/objects/{object_id}
-    Request body: {"position_x": 150, "position_y": 250, "visual_style": {...}}
-    Response: DiagramObjectResponse
+    Request body: {"positionX": 150, "positionY": 250, "final": true}
+    Response: {"id", "positionX", "positionY", "containers"}
+
+    Send intermediate drag positions with "final": false; they are
+    buffered and persisted in bulk (202 Accepted). The final position
+    (the default) is written immediately and becomes one undoable move;
+    "containers" lists the enclosing containers whose bounds changed.
     """
     try:
-        user = get_current_user()
-        data = DiagramObjectUpdate(**request.json)
-
-        db: Session = next(get_db())
-        try:
-            service = DiagramService(db)
-            diagram_object = service.update_object_position(
-                diagram_id=diagram_id,
-                object_id=object_id,
-                user_id=user["user_id"],
-                position_x=data.position_x,
-                position_y=data.position_y,
-                visual_style=data.visual_style,
+        data = request.json or {}
+        if "positionX" not in data or "positionY" not in data:
+            raise ValueError("Position (x, y) is required")
+
+        final = data.get("final", True)
+        if not isinstance(final, bool):
+            raise ValueError("final must be a boolean")
+
+        db = get_session()
+        service = DiagramService(db)
+        diagram_object = service.update_object_position(
+            diagram_id, object_id, data["positionX"], data["positionY"], final=final
+        )
+
+        if not diagram_object:
+            return (
+                jsonify({"error": "Not Found", "message": "Diagram object not found"}),
+                404,
             )
 
-            if not diagram_object:
-                return (
-                    jsonify({"error": "Not Found", "message": "Diagram object not found"}),
-                    404,
-                )
+        return jsonify(diagram_object), 200 if final else 202
 
-            response = DiagramObjectResponse.model_validate(diagram_object)
-            return jsonify(response.model_dump()), 200
+    except ValueError as e:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
-        finally:
-            db.close()
 
-    except ValidationError as e:
-        return jsonify({"error": "Validation Error", "message": str(e)}), 400
+@diagrams_bp.route("/<int:diagram_id>/objects/<int:object_id>/z-order", methods=["PUT"])
+@require_auth
+def restack_diagram_object(diagram_id: int, object_id: int):
+    """Move a diagram object up or down the stacking order.
+
+    PUT /api/v1/diagrams/{diagram_id}/objects/{object_id}/z-order
+    Request body: {"after": 12} (directly above object 12) |
+                  {"before": 12} (directly below it) |
+                  {"to": "front" | "back"}
+    Response: {"id", "zRank"}
+
+    Only the moved object is written. zRank orders siblings (compare as
+    plain bytes); containers are drawn below their contents, so restacking
+    a container moves everything inside it along.
+    """
+    try:
+        db = get_session()
+        service = DiagramService(db)
+        result = service.restack_object(diagram_id, object_id, request.json or {})
+
+        if not result:
+            return (
+                jsonify({"error": "Not Found", "message": "Diagram object not found"}),
+                404,
+            )
+
+        return jsonify(result), 200
+
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -288,30 +538,90 @@ def remove_diagram_object(diagram_id: int, object_id: int):
     """Remove object from diagram (doesn't delete from repository).
 
     DELETE /api/v1/diagrams/{diagram_id}/objects/{object_id}
-    Response: {"message": "Object removed from diagram"}
+    Response: {"message": "Object removed from diagram", "containers": [...]}
     """
     try:
-        user = get_current_user()
+        db = get_session()
+        service = DiagramService(db)
+        result = service.remove_object(diagram_id, object_id)
+        return jsonify(result), 200
 
-        db: Session = next(get_db())
-        try:
-            service = DiagramService(db)
-            success = service.remove_object(
-                diagram_id=diagram_id,
-                object_id=object_id,
-                user_id=user["user_id"],
-            )
+    except ValueError as e:
+        return jsonify({"error": "Not Found", "message": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
-            if not success:
-                return (
-                    jsonify({"error": "Not Found", "message": "Diagram object not found"}),
-                    404,
-                )
 
-            return jsonify({"message": "Object removed from diagram successfully"}), 200
+# Merge endpoints
 
-        finally:
-            db.close()
 
+@diagrams_bp.route("/<int:diagram_id>/ops", methods=["POST"])
+@require_auth
+def apply_diagram_ops(diagram_id: int):
+    """Merge field edits of objects and relationship lines.
+
+    POST /api/v1/diagrams/{diagram_id}/ops
+    Request body: {"ops": [{"type": "object", "id": 12, "ts": "<HLC timestamp>",
+                            "fields": {"positionX": 150, "visualStyle": {...}}}, ...]}
+    Response: {"applied", "results": [{"type", "id", "values", "clocks"}],
+               "missing", "containers", "clock"}
+
+    Each field keeps the value with the newest clock, whatever order ops
+    arrive in, so clients can queue ops offline and replay them in bulk.
+    """
+    try:
+        data = request.json or {}
+
+        db = get_session()
+        service = DiagramMergeService(db)
+        result = service.apply(diagram_id, data.get("ops"))
+        return jsonify(result), 200
+
+    except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+
+
+# Undo/redo endpoints
+
+
+@diagrams_bp.route("/<int:diagram_id>/undo", methods=["POST"])
+@require_auth
+def undo_diagram_edit(diagram_id: int):
+    """Undo the most recent canvas edit.
+
+    POST /api/v1/diagrams/{diagram_id}/undo
+    Response: {"operationId", "kind", "changes": [{"type", "id", "values"}],
+               "canUndo", "canRedo", "containers"}
+    """
+    return _history_step(diagram_id, DiagramService.undo)
+
+
+@diagrams_bp.route("/<int:diagram_id>/redo", methods=["POST"])
+@require_auth
+def redo_diagram_edit(diagram_id: int):
+    """Redo the most recently undone canvas edit.
+
+    POST /api/v1/diagrams/{diagram_id}/redo
+    Response: {"operationId", "kind", "changes": [{"type", "id", "values"}],
+               "canUndo", "canRedo", "containers"}
+    """
+    return _history_step(diagram_id, DiagramService.redo)
+
+
+def _history_step(diagram_id: int, step):
+    """Run an undo or redo and map its errors to responses."""
+    try:
+        db = get_session()
+        result = step(DiagramService(db), diagram_id)
+        return jsonify(result), 200
+
+    except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -1,12 +1,14 @@
 """Domain routes."""
 from flask import Blueprint, request, jsonify
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
 
 from ..middleware.auth import require_auth, get_current_user
-from ..schemas.domain import DomainCreate, DomainUpdate, DomainResponse, DomainListResponse
+from .. import representation
+from ..middleware.session import get_session
+from ..preconditions import if_match_version, precondition_failed, set_version_etag
+from ..schemas.domain import DomainUpdate
+from ...repositories.base_repository import StaleVersionError
 from ...services.domain_service import DomainService
-from ...utils.database import get_db
 
 domains_bp = Blueprint("domains", __name__)
 
@@ -16,30 +18,27 @@ domains_bp = Blueprint("domains", __name__)
 def list_domains():
     """List domains, optionally filtered by superdomain.
 
-    GET /api/v1/domains?superdomain_id=1&skip=0&limit=100
-    Response: {"domains": [...], "total": 5}
+    GET /api/v1/domains?superdomainId=1&page=1&pageSize=100&fields=id,name
+    Response: {"data": [...], "pagination": {...}}
     """
     try:
-        user = get_current_user()
-        superdomain_id = request.args.get("superdomain_id", type=int)
-        skip = request.args.get("skip", 0, type=int)
-        limit = request.args.get("limit", 100, type=int)
-
-        db: Session = next(get_db())
-        try:
-            service = DomainService(db)
-            domains = service.list_domains(user["user_id"], superdomain_id, skip, limit)
-            total = service.count_domains(user["user_id"], superdomain_id)
-
-            response = DomainListResponse(
-                domains=[DomainResponse.model_validate(d) for d in domains],
-                total=total,
-            )
-            return jsonify(response.model_dump()), 200
-
-        finally:
-            db.close()
+        superdomain_id = request.args.get("superdomainId", type=int)
+        page = max(request.args.get("page", 1, type=int), 1)
+        page_size = max(request.args.get("pageSize", 100, type=int), 1)
+
+        db = get_session()
+        service = DomainService(db)
+        result = service.list(
+            page,
+            page_size,
+            superdomain_id=superdomain_id,
+            fields=request.args.get("fields"),
+            columnar=representation.wants_columnar(),
+        )
+        return representation.render(result)
 
+    except ValueError as e:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
@@ -50,31 +49,17 @@ def create_domain():
     """Create a new domain.
 
     POST /api/v1/domains
-    Request body: {"superdomain_id": 1, "name": "Sales", "description": "..."}
-    Response: DomainResponse
+    Request body: {"superdomainId": 1, "name": "Sales", "description": "..."}
+    Response: Domain
     """
     try:
         user = get_current_user()
-        data = DomainCreate(**request.json)
-
-        db: Session = next(get_db())
-        try:
-            service = DomainService(db)
-            domain = service.create_domain(
-                user_id=user["user_id"],
-                superdomain_id=data.superdomain_id,
-                name=data.name,
-                description=data.description,
-            )
-
-            response = DomainResponse.model_validate(domain)
-            return jsonify(response.model_dump()), 201
 
-        finally:
-            db.close()
+        db = get_session()
+        service = DomainService(db)
+        domain = service.create(request.json or {}, user_id=user["user_id"])
+        return jsonify(domain), 201
 
-    except ValidationError as e:
-        return jsonify({"error": "Validation Error", "message": str(e)}), 400
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -87,24 +72,17 @@ def get_domain(id: int):
     """Get domain by ID.
 
     GET /api/v1/domains/{id}
-    Response: DomainResponse
+    Response: Domain (ETag: its version)
     """
     try:
-        user = get_current_user()
-
-        db: Session = next(get_db())
-        try:
-            service = DomainService(db)
-            domain = service.get_domain(id, user["user_id"])
-
-            if not domain:
-                return jsonify({"error": "Not Found", "message": "Domain not found"}), 404
+        db = get_session()
+        service = DomainService(db)
+        domain = service.get_by_id(id)
 
-            response = DomainResponse.model_validate(domain)
-            return jsonify(response.model_dump()), 200
+        if not domain:
+            return jsonify({"error": "Not Found", "message": "Domain not found"}), 404
 
-        finally:
-            db.close()
+        return set_version_etag(representation.render(domain), domain["version"])
 
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -116,34 +94,28 @@ def update_domain(id: int):
     """Update domain.
 
     PUT /api/v1/domains/{id}
+    If-Match: "<version>" (optional; 412 if the domain changed since)
     Request body: {"name": "New Name", "description": "..."}
-    Response: DomainResponse
+    Response: Domain (ETag: its new version)
     """
     try:
-        user = get_current_user()
-        data = DomainUpdate(**request.json)
-
-        db: Session = next(get_db())
-        try:
-            service = DomainService(db)
-            domain = service.update_domain(
-                id=id,
-                user_id=user["user_id"],
-                name=data.name,
-                description=data.description,
-            )
+        data = DomainUpdate(**(request.json or {}))
 
-            if not domain:
-                return jsonify({"error": "Not Found", "message": "Domain not found"}), 404
+        db = get_session()
+        service = DomainService(db)
+        domain = service.update(
+            id, data.model_dump(exclude_unset=True), expected_version=if_match_version()
+        )
 
-            response = DomainResponse.model_validate(domain)
-            return jsonify(response.model_dump()), 200
+        if not domain:
+            return jsonify({"error": "Not Found", "message": "Domain not found"}), 404
 
-        finally:
-            db.close()
+        return set_version_etag(jsonify(domain), domain["version"])
 
     except ValidationError as e:
         return jsonify({"error": "Validation Error", "message": str(e)}), 400
+    except StaleVersionError as e:
+        return precondition_failed(e)
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -153,29 +125,23 @@ def update_domain(id: int):
 @domains_bp.route("/<int:id>", methods=["DELETE"])
 @require_auth
 def delete_domain(id: int):
-    """Delete domain with cascade.
+    """Delete domain.
 
-    DELETE /api/v1/domains/{id}?confirm=true
-    Response: {"message": "Domain deleted"}
+    DELETE /api/v1/domains/{id}
+    If-Match: "<version>" (optional; 412 if the domain changed since)
+    Response: {"message": "Domain deleted", "affectedEntities": N}
     """
     try:
-        user = get_current_user()
-        confirm = request.args.get("confirm", "false").lower() == "true"
-
-        db: Session = next(get_db())
-        try:
-            service = DomainService(db)
-            success = service.delete_domain(id, user["user_id"], confirm=confirm)
-
-            if not success:
-                return jsonify({"error": "Not Found", "message": "Domain not found"}), 404
-
-            return jsonify({"message": "Domain deleted successfully"}), 200
-
-        finally:
-            db.close()
+        db = get_session()
+        service = DomainService(db)
+        result = service.delete(id, expected_version=if_match_version())
+        return jsonify(result), 200
 
+    except StaleVersionError as e:
+        return precondition_failed(e)
     except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -1,12 +1,15 @@
 """Entity routes."""
 from flask import Blueprint, request, jsonify
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
 
 from ..middleware.auth import require_auth, get_current_user
-from ..schemas.entity import EntityCreate, EntityUpdate, EntityResponse, EntityListResponse
+from .. import representation
+from ..middleware.session import get_session
+from ..preconditions import if_match_version, precondition_failed, set_version_etag
+from ..schemas.entity import EntityUpdate
+from ...repositories.base_repository import StaleVersionError
+from ...services.attribute_service import AttributeService
 from ...services.entity_service import EntityService
-from ...utils.database import get_db
 
 entities_bp = Blueprint("entities", __name__)
 
@@ -16,30 +19,76 @@ entities_bp = Blueprint("entities", __name__)
 def list_entities():
     """List entities, optionally filtered by domain.
 
-    GET /api/v1/entities?domain_id=1&skip=0&limit=100
-    Response: {"entities": [...], "total": 20}
+    GET /api/v1/entities?domainId=1&page=1&pageSize=100&fields=id,name
+    Response: {"data": [...], "pagination": {...}}
     """
     try:
-        user = get_current_user()
-        domain_id = request.args.get("domain_id", type=int)
-        skip = request.args.get("skip", 0, type=int)
-        limit = request.args.get("limit", 100, type=int)
+        domain_id = request.args.get("domainId", type=int)
+        page = max(request.args.get("page", 1, type=int), 1)
+        page_size = max(request.args.get("pageSize", 100, type=int), 1)
+
+        db = get_session()
+        service = EntityService(db)
+        result = service.list(
+            page,
+            page_size,
+            domain_id=domain_id,
+            fields=request.args.get("fields"),
+            columnar=representation.wants_columnar(),
+        )
+        return representation.render(result)
+
+    except ValueError as e:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+
 
-        db: Session = next(get_db())
-        try:
-            service = EntityService(db)
-            entities = service.list_entities(user["user_id"], domain_id, skip, limit)
-            total = service.count_entities(user["user_id"], domain_id)
+@entities_bp.route("/<int:id>/attributes", methods=["GET"])
+@require_auth
+def list_entity_attributes(id: int):
+    """List attributes of an entity.
+
+    GET /api/v1/entities/{id}/attributes?fields=id,name,dataType
+    Response: {"data": [...]}
+    """
+    try:
+        db = get_session()
+        service = AttributeService(db)
+        result = service.list_by_entity(
+            id, fields=request.args.get("fields"), columnar=representation.wants_columnar()
+        )
+        return representation.render(result)
+
+    except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+
+
+@entities_bp.route("/<int:id>/attributes", methods=["POST"])
+@require_auth
+def create_entity_attribute(id: int):
+    """Create an attribute on an entity.
 
-            response = EntityListResponse(
-                entities=[EntityResponse.model_validate(e) for e in entities],
-                total=total,
-            )
-            return jsonify(response.model_dump()), 200
+    POST /api/v1/entities/{id}/attributes
+    Request body: {"name": "email", "dataType": "String", "isNullable": false}
+    Response: Attribute
+    """
+    try:
+        user = get_current_user()
 
-        finally:
-            db.close()
+        db = get_session()
+        service = AttributeService(db)
+        attribute = service.create(id, request.json or {}, user_id=user["user_id"])
+        return jsonify(attribute), 201
 
+    except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
@@ -50,31 +99,17 @@ def create_entity():
     """Create a new entity.
 
     POST /api/v1/entities
-    Request body: {"domain_id": 1, "name": "Customer", "description": "..."}
-    Response: EntityResponse
+    Request body: {"domainId": 1, "name": "Customer", "description": "..."}
+    Response: Entity
     """
     try:
         user = get_current_user()
-        data = EntityCreate(**request.json)
 
-        db: Session = next(get_db())
-        try:
-            service = EntityService(db)
-            entity = service.create_entity(
-                user_id=user["user_id"],
-                domain_id=data.domain_id,
-                name=data.name,
-                description=data.description,
-            )
+        db = get_session()
+        service = EntityService(db)
+        entity = service.create(request.json or {}, user_id=user["user_id"])
+        return jsonify(entity), 201
 
-            response = EntityResponse.model_validate(entity)
-            return jsonify(response.model_dump()), 201
-
-        finally:
-            db.close()
-
-    except ValidationError as e:
-        return jsonify({"error": "Validation Error", "message": str(e)}), 400
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -87,24 +122,17 @@ def get_entity(id: int):
     """Get entity by ID.
 
     GET /api/v1/entities/{id}
-    Response: EntityResponse
+    Response: Entity (ETag: its version)
     """
     try:
-        user = get_current_user()
+        db = get_session()
+        service = EntityService(db)
+        entity = service.get_by_id(id)
 
-        db: Session = next(get_db())
-        try:
-            service = EntityService(db)
-            entity = service.get_entity(id, user["user_id"])
+        if not entity:
+            return jsonify({"error": "Not Found", "message": "Entity not found"}), 404
 
-            if not entity:
-                return jsonify({"error": "Not Found", "message": "Entity not found"}), 404
-
-            response = EntityResponse.model_validate(entity)
-            return jsonify(response.model_dump()), 200
-
-        finally:
-            db.close()
+        return set_version_etag(representation.render(entity), entity["version"])
 
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -116,34 +144,28 @@ def update_entity(id: int):
     """Update entity.
 
     PUT /api/v1/entities/{id}
+    If-Match: "<version>" (optional; 412 if the entity changed since)
     Request body: {"name": "New Name", "description": "..."}
-    Response: EntityResponse
+    Response: Entity (ETag: its new version)
     """
     try:
-        user = get_current_user()
-        data = EntityUpdate(**request.json)
+        data = EntityUpdate(**(request.json or {}))
 
-        db: Session = next(get_db())
-        try:
-            service = EntityService(db)
-            entity = service.update_entity(
-                id=id,
-                user_id=user["user_id"],
-                name=data.name,
-                description=data.description,
-            )
+        db = get_session()
+        service = EntityService(db)
+        entity = service.update(
+            id, data.model_dump(exclude_unset=True), expected_version=if_match_version()
+        )
 
-            if not entity:
-                return jsonify({"error": "Not Found", "message": "Entity not found"}), 404
+        if not entity:
+            return jsonify({"error": "Not Found", "message": "Entity not found"}), 404
 
-            response = EntityResponse.model_validate(entity)
-            return jsonify(response.model_dump()), 200
-
-        finally:
-            db.close()
+        return set_version_etag(jsonify(entity), entity["version"])
 
     except ValidationError as e:
         return jsonify({"error": "Validation Error", "message": str(e)}), 400
+    except StaleVersionError as e:
+        return precondition_failed(e)
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -153,29 +175,23 @@ def update_entity(id: int):
 @entities_bp.route("/<int:id>", methods=["DELETE"])
 @require_auth
 def delete_entity(id: int):
-    """Delete entity with cascade.
+    """Delete entity.
 
-    DELETE /api/v1/entities/{id}?confirm=true
-    Response: {"message": "Entity deleted"}
+    DELETE /api/v1/entities/{id}
+    If-Match: "<version>" (optional; 412 if the entity changed since)
+    Response: {"message": "Entity deleted", ...}
     """
     try:
-        user = get_current_user()
-        confirm = request.args.get("confirm", "false").lower() == "true"
-
-        db: Session = next(get_db())
-        try:
-            service = EntityService(db)
-            success = service.delete_entity(id, user["user_id"], confirm=confirm)
-
-            if not success:
-                return jsonify({"error": "Not Found", "message": "Entity not found"}), 404
-
-            return jsonify({"message": "Entity deleted successfully"}), 200
-
-        finally:
-            db.close()
+        db = get_session()
+        service = EntityService(db)
+        result = service.delete(id, expected_version=if_match_version())
+        return jsonify(result), 200
 
+    except StaleVersionError as e:
+        return precondition_failed(e)
     except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -1,12 +1,12 @@
 """Relationship routes."""
 from flask import Blueprint, request, jsonify
-from pydantic import ValidationError
-from sqlalchemy.orm import Session
 
 from ..middleware.auth import require_auth, get_current_user
-from ..schemas.relationship import RelationshipCreate, RelationshipResponse
+from .. import representation
+from ..middleware.session import get_session
+from ..preconditions import if_match_version, precondition_failed, set_version_etag
+from ...repositories.base_repository import StaleVersionError
 from ...services.relationship_service import RelationshipService
-from ...utils.database import get_db
 
 relationships_bp = Blueprint("relationships", __name__)
 
@@ -16,24 +16,23 @@ relationships_bp = Blueprint("relationships", __name__)
 def list_relationships():
     """List relationships, optionally filtered by entity.
 
-    GET /api/v1/relationships?entity_id=1
-    Response: [RelationshipResponse, ...]
+    GET /api/v1/relationships?entityId=1&fields=id,sourceEntityId,targetEntityId
+    Response: {"data": [...]}
     """
     try:
-        user = get_current_user()
-        entity_id = request.args.get("entity_id", type=int)
-
-        db: Session = next(get_db())
-        try:
-            service = RelationshipService(db)
-            relationships = service.list_relationships(user["user_id"], entity_id)
-
-            response = [RelationshipResponse.model_validate(r) for r in relationships]
-            return jsonify(response), 200
+        entity_id = request.args.get("entityId", type=int)
 
-        finally:
-            db.close()
+        db = get_session()
+        service = RelationshipService(db)
+        result = service.list(
+            entity_id=entity_id,
+            fields=request.args.get("fields"),
+            columnar=representation.wants_columnar(),
+        )
+        return representation.render(result)
 
+    except ValueError as e:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
@@ -45,41 +44,23 @@ def create_relationship():
 
     POST /api/v1/relationships
     Request body: {
-        "source_entity_id": 1,
-        "target_entity_id": 2,
-        "source_role": "customer",
-        "target_role": "orders",
-        "source_cardinality": "ONE",
-        "target_cardinality": "ZERO_MANY"
+        "sourceEntityId": 1,
+        "targetEntityId": 2,
+        "sourceRole": "customer",
+        "targetRole": "orders",
+        "sourceCardinality": "ONE",
+        "targetCardinality": "ZERO_MANY"
     }
-    Response: RelationshipResponse
+    Response: Relationship
     """
     try:
         user = get_current_user()
-        data = RelationshipCreate(**request.json)
-
-        db: Session = next(get_db())
-        try:
-            service = RelationshipService(db)
-            relationship = service.create_relationship(
-                user_id=user["user_id"],
-                source_entity_id=data.source_entity_id,
-                target_entity_id=data.target_entity_id,
-                source_role=data.source_role,
-                target_role=data.target_role,
-                source_cardinality=data.source_cardinality,
-                target_cardinality=data.target_cardinality,
-                description=data.description,
-            )
-
-            response = RelationshipResponse.model_validate(relationship)
-            return jsonify(response.model_dump()), 201
-
-        finally:
-            db.close()
-
-    except ValidationError as e:
-        return jsonify({"error": "Validation Error", "message": str(e)}), 400
+
+        db = get_session()
+        service = RelationshipService(db)
+        relationship = service.create(request.json or {}, user_id=user["user_id"])
+        return jsonify(relationship), 201
+
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -92,27 +73,17 @@ def get_relationship(id: int):
     """Get relationship by ID.
 
     GET /api/v1/relationships/{id}
-    Response: RelationshipResponse
+    Response: Relationship (ETag: its version)
     """
     try:
-        user = get_current_user()
-
-        db: Session = next(get_db())
-        try:
-            service = RelationshipService(db)
-            relationship = service.get_relationship(id, user["user_id"])
+        db = get_session()
+        service = RelationshipService(db)
+        relationship = service.get_by_id(id)
 
-            if not relationship:
-                return (
-                    jsonify({"error": "Not Found", "message": "Relationship not found"}),
-                    404,
-                )
+        if not relationship:
+            return jsonify({"error": "Not Found", "message": "Relationship not found"}), 404
 
-            response = RelationshipResponse.model_validate(relationship)
-            return jsonify(response.model_dump()), 200
-
-        finally:
-            db.close()
+        return set_version_etag(representation.render(relationship), relationship["version"])
 
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -124,26 +95,20 @@ def delete_relationship(id: int):
     """Delete relationship.
 
     DELETE /api/v1/relationships/{id}
+    If-Match: "<version>" (optional; 412 if the relationship changed since)
     Response: {"message": "Relationship deleted"}
     """
     try:
-        user = get_current_user()
-
-        db: Session = next(get_db())
-        try:
-            service = RelationshipService(db)
-            success = service.delete_relationship(id, user["user_id"])
-
-            if not success:
-                return (
-                    jsonify({"error": "Not Found", "message": "Relationship not found"}),
-                    404,
-                )
-
-            return jsonify({"message": "Relationship deleted successfully"}), 200
-
-        finally:
-            db.close()
+        db = get_session()
+        service = RelationshipService(db)
+        result = service.delete(id, expected_version=if_match_version())
+        return jsonify(result), 200
 
+    except StaleVersionError as e:
+        return precondition_failed(e)
+    except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -1,17 +1,14 @@
 """Superdomain routes."""
 from flask import Blueprint, request, jsonify
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
 
 from ..middleware.auth import require_auth, get_current_user
-from ..schemas.superdomain import (
-    SuperdomainCreate,
-    SuperdomainUpdate,
-    SuperdomainResponse,
-    SuperdomainListResponse,
-)
+from .. import representation
+from ..middleware.session import get_session
+from ..preconditions import if_match_version, precondition_failed, set_version_etag
+from ..schemas.superdomain import SuperdomainUpdate
+from ...repositories.base_repository import StaleVersionError
 from ...services.superdomain_service import SuperdomainService
-from ...utils.database import get_db
 
 superdomains_bp = Blueprint("superdomains", __name__)
 
@@ -19,31 +16,27 @@ superdomains_bp = Blueprint("superdomains", __name__)
 @superdomains_bp.route("", methods=["GET"])
 @require_auth
 def list_superdomains():
-    """List all superdomains for current user.
+    """List all superdomains.
 
-    GET /api/v1/superdomains?skip=0&limit=100
-    Response: {"superdomains": [...], "total": 10}
+    GET /api/v1/superdomains?page=1&pageSize=100&fields=id,name
+    Response: {"data": [...], "pagination": {...}}
     """
     try:
-        user = get_current_user()
-        skip = request.args.get("skip", 0, type=int)
-        limit = request.args.get("limit", 100, type=int)
-
-        db: Session = next(get_db())
-        try:
-            service = SuperdomainService(db)
-            superdomains = service.list_superdomains(user["user_id"], skip, limit)
-            total = service.count_superdomains(user["user_id"])
-
-            response = SuperdomainListResponse(
-                superdomains=[SuperdomainResponse.model_validate(s) for s in superdomains],
-                total=total,
-            )
-            return jsonify(response.model_dump()), 200
-
-        finally:
-            db.close()
+        page = max(request.args.get("page", 1, type=int), 1)
+        page_size = max(request.args.get("pageSize", 100, type=int), 1)
+
+        db = get_session()
+        service = SuperdomainService(db)
+        result = service.list(
+            page,
+            page_size,
+            fields=request.args.get("fields"),
+            columnar=representation.wants_columnar(),
+        )
+        return representation.render(result)
 
+    except ValueError as e:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
@@ -55,29 +48,16 @@ def create_superdomain():
 
     POST /api/v1/superdomains
     Request body: {"name": "Business", "description": "..."}
-    Response: SuperdomainResponse
+    Response: Superdomain
     """
     try:
         user = get_current_user()
-        data = SuperdomainCreate(**request.json)
-
-        db: Session = next(get_db())
-        try:
-            service = SuperdomainService(db)
-            superdomain = service.create_superdomain(
-                user_id=user["user_id"],
-                name=data.name,
-                description=data.description,
-            )
-
-            response = SuperdomainResponse.model_validate(superdomain)
-            return jsonify(response.model_dump()), 201
 
-        finally:
-            db.close()
+        db = get_session()
+        service = SuperdomainService(db)
+        superdomain = service.create(request.json or {}, user_id=user["user_id"])
+        return jsonify(superdomain), 201
 
-    except ValidationError as e:
-        return jsonify({"error": "Validation Error", "message": str(e)}), 400
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -90,24 +70,17 @@ def get_superdomain(id: int):
     """Get superdomain by ID.
 
     GET /api/v1/superdomains/{id}
-    Response: SuperdomainResponse
+    Response: Superdomain (ETag: its version)
     """
     try:
-        user = get_current_user()
+        db = get_session()
+        service = SuperdomainService(db)
+        superdomain = service.get_by_id(id)
 
-        db: Session = next(get_db())
-        try:
-            service = SuperdomainService(db)
-            superdomain = service.get_superdomain(id, user["user_id"])
+        if not superdomain:
+            return jsonify({"error": "Not Found", "message": "Superdomain not found"}), 404
 
-            if not superdomain:
-                return jsonify({"error": "Not Found", "message": "Superdomain not found"}), 404
-
-            response = SuperdomainResponse.model_validate(superdomain)
-            return jsonify(response.model_dump()), 200
-
-        finally:
-            db.close()
+        return set_version_etag(representation.render(superdomain), superdomain["version"])
 
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -119,34 +92,28 @@ def update_superdomain(id: int):
     """Update superdomain.
 
     PUT /api/v1/superdomains/{id}
+    If-Match: "<version>" (optional; 412 if the superdomain changed since)
     Request body: {"name": "New Name", "description": "..."}
-    Response: SuperdomainResponse
+    Response: Superdomain (ETag: its new version)
     """
     try:
-        user = get_current_user()
-        data = SuperdomainUpdate(**request.json)
-
-        db: Session = next(get_db())
-        try:
-            service = SuperdomainService(db)
-            superdomain = service.update_superdomain(
-                id=id,
-                user_id=user["user_id"],
-                name=data.name,
-                description=data.description,
-            )
+        data = SuperdomainUpdate(**(request.json or {}))
 
-            if not superdomain:
-                return jsonify({"error": "Not Found", "message": "Superdomain not found"}), 404
+        db = get_session()
+        service = SuperdomainService(db)
+        superdomain = service.update(
+            id, data.model_dump(exclude_unset=True), expected_version=if_match_version()
+        )
 
-            response = SuperdomainResponse.model_validate(superdomain)
-            return jsonify(response.model_dump()), 200
+        if not superdomain:
+            return jsonify({"error": "Not Found", "message": "Superdomain not found"}), 404
 
-        finally:
-            db.close()
+        return set_version_etag(jsonify(superdomain), superdomain["version"])
 
     except ValidationError as e:
         return jsonify({"error": "Validation Error", "message": str(e)}), 400
+    except StaleVersionError as e:
+        return precondition_failed(e)
     except ValueError as e:
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
@@ -159,46 +126,35 @@ def delete_superdomain(id: int):
     """Delete superdomain with cascade.
 
     DELETE /api/v1/superdomains/{id}?confirm=true
-    Response: {"message": "Superdomain deleted", "impact": {...}}
+    If-Match: "<version>" (optional; 412 if the superdomain changed since)
+    Response: {"message": "Superdomain deleted", "affectedDomains": ..., ...}
     """
     try:
-        user = get_current_user()
         confirm = request.args.get("confirm", "false").lower() == "true"
 
-        db: Session = next(get_db())
-        try:
-            service = SuperdomainService(db)
-
-            # Analyze impact
-            impact = service.analyze_delete_impact(id, user["user_id"])
-
-            if not confirm and impact.get("cascade"):
-                return (
-                    jsonify(
-                        {
-                            "error": "Confirmation Required",
-                            "message": "Cascade delete requires confirmation",
-                            "impact": impact,
-                        }
-                    ),
-                    400,
-                )
-
-            # Delete
-            success = service.delete_superdomain(id, user["user_id"], confirm=confirm)
-
-            if not success:
-                return jsonify({"error": "Not Found", "message": "Superdomain not found"}), 404
+        db = get_session()
+        service = SuperdomainService(db)
+        result = service.delete(id, confirm_cascade=confirm, expected_version=if_match_version())
 
+        if result.get("requiresConfirmation"):
             return (
-                jsonify({"message": "Superdomain deleted successfully", "impact": impact}),
-                200,
+                jsonify(
+                    {
+                        "error": "Confirmation Required",
+                        "message": "Cascade delete requires confirmation",
+                        "impact": result,
+                    }
+                ),
+                400,
             )
 
-        finally:
-            db.close()
+        return jsonify(result), 200
 
+    except StaleVersionError as e:
+        return precondition_failed(e)
     except ValueError as e:
+        if "not found" in str(e):
+            return jsonify({"error": "Not Found", "message": str(e)}), 404
         return jsonify({"error": "Bad Request", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -26,6 +26,7 @@ class DomainResponse(BaseModel):
     superdomain_id: int = Field(..., description="Parent superdomain ID")
     name: str = Field(..., description="Domain name")
     description: Optional[str] = Field(None, description="Domain description")
+    entity_count: int = Field(0, description="Number of entities")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
@@ -26,6 +26,8 @@ class EntityResponse(BaseModel):
     domain_id: int = Field(..., description="Parent domain ID")
     name: str = Field(..., description="Entity name")
     description: Optional[str] = Field(None, description="Entity description")
+    attribute_count: int = Field(0, description="Number of attributes")
+    relationship_count: int = Field(0, description="Number of relationships")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
@@ -24,6 +24,7 @@ class SuperdomainResponse(BaseModel):
     id: int = Field(..., description="Superdomain ID")
     name: str = Field(..., description="Superdomain name")
     description: Optional[str] = Field(None, description="Superdomain description")
+    domain_count: int = Field(0, description="Number of domains")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
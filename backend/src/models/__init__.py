@@ -1,16 +1,48 @@
 """SQLAlchemy models for DiagramDesigner."""
+from sqlalchemy import Column, Integer
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import declared_attr
 
-Base = declarative_base()
+
+class ModelBase:
+    """Mapper defaults shared by all models."""
+
+    # Fetch server-generated values with RETURNING on flush instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=ModelBase)
+
+
+class Versioned:
+    """Optimistic concurrency: rows carry a version bumped by every write.
+
+    ORM flushes only touch the row at the version it was loaded with
+    (``version_id_col``), and ``BaseRepository.update``/``delete`` can
+    compare-and-set against the version a client last saw (its ETag).
+    """
+
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    @declared_attr
+    def __mapper_args__(cls):
+        return {**ModelBase.__mapper_args__, "version_id_col": cls.version}
 
 # Import all models to ensure they're registered with SQLAlchemy
 from .user import User
 from .object_repository import Superdomain, Domain, Entity, Attribute
 from .relationship import Relationship
-from .diagram_repository import Diagram, DiagramObject, DiagramRelationship
+from .diagram_repository import (
+    Diagram,
+    DiagramObject,
+    DiagramOperation,
+    DiagramRelationship,
+    DiagramSnapshot,
+)
 
 __all__ = [
     'Base',
+    'Versioned',
     'User',
     'Superdomain',
     'Domain',
@@ -20,4 +52,6 @@ __all__ = [
     'Diagram',
     'DiagramObject',
     'DiagramRelationship',
+    'DiagramOperation',
+    'DiagramSnapshot',
 ]
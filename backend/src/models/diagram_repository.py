@@ -1,23 +1,27 @@
-"""Diagram Repository models: Diagram, DiagramObject, DiagramRelationship."""
+"""Diagram Repository models: Diagram, DiagramObject, DiagramRelationship, journal."""
 from datetime import datetime
 from enum import Enum as PyEnum
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Enum,
+    FetchedValue,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
-from . import Base
+from . import Base, Versioned
 
 
 class ObjectType(PyEnum):
@@ -28,7 +32,7 @@ class ObjectType(PyEnum):
     ENTITY = "ENTITY"
 
 
-class Diagram(Base):
+class Diagram(Versioned, Base):
     """Visual perspective on the data model with canvas settings."""
 
     __tablename__ = "diagram"
@@ -45,6 +49,15 @@ class Diagram(Base):
     tags = Column(JSONB, nullable=True)  # Array of tags for categorization
     canvas_settings = Column(JSONB, nullable=True)  # Zoom, pan, theme, grid settings
 
+    # Bumped by database triggers whenever the diagram or anything it shows changes
+    change_version = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+        server_onupdate=FetchedValue(),
+    )
+
     # Timestamps
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -82,6 +95,8 @@ class DiagramObject(Base):
         UniqueConstraint(
             "diagram_id", "object_type", "object_id", name="uq_diagram_object_unique"
         ),
+        # Objects are read and re-ranked in z-order within a diagram
+        Index("ix_diagram_object_diagram_z_rank", "diagram_id", "z_rank"),
     )
 
     # Primary key
@@ -105,11 +120,23 @@ class DiagramObject(Base):
     width = Column(Float, nullable=True)  # Null = auto
     height = Column(Float, nullable=True)  # Null = auto
 
+    # Box fitted around the objects a container (superdomain/domain) holds;
+    # maintained by the server, null for entities and empty containers
+    bounds_x = Column(Float, nullable=True)
+    bounds_y = Column(Float, nullable=True)
+    bounds_width = Column(Float, nullable=True)
+    bounds_height = Column(Float, nullable=True)
+
     # Visual properties
-    z_index = Column(Integer, nullable=False, default=0)
+    # Fractional rank key (see utils.rank); bytewise order is the stacking
+    # order among siblings, containers are drawn below their contents
+    z_rank = Column(String(128, collation="C"), nullable=False, server_default="V")
     visual_style = Column(JSONB, nullable=True)  # Custom styling overrides
     is_collapsed = Column(Boolean, nullable=False, default=False)
 
+    # Column name -> HLC timestamp of the write that set it (see utils.hlc)
+    field_clocks = Column(JSONB, nullable=False, default=dict, server_default=text("'{}'::jsonb"))
+
     # Timestamps
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -164,6 +191,9 @@ class DiagramRelationship(Base):
     # Visual properties
     visual_style = Column(JSONB, nullable=True)  # Custom line styling
 
+    # Column name -> HLC timestamp of the write that set it (see utils.hlc)
+    field_clocks = Column(JSONB, nullable=False, default=dict, server_default=text("'{}'::jsonb"))
+
     # Timestamps
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -178,3 +208,76 @@ class DiagramRelationship(Base):
             f"<DiagramRelationship(id={self.id}, diagram_id={self.diagram_id}, "
             f"relationship_id={self.relationship_id}, visible={self.is_visible})>"
         )
+
+
+class DiagramOperation(Base):
+    """Journaled canvas edit with the deltas needed to undo and redo it.
+
+    ``changes`` is a list of ``{"table", "id", "before", "after"}`` records
+    holding only the columns the edit touched: ``before`` is null for an
+    inserted row, ``after`` is null for a deleted one.
+    """
+
+    __tablename__ = "diagram_operation"
+    __table_args__ = (
+        # Undo/redo pick the newest active / oldest undone operation of a diagram
+        Index("ix_diagram_operation_diagram_id", "diagram_id", "undone", "id"),
+    )
+
+    # Primary key (also the journal order)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # Foreign keys
+    diagram_id = Column(
+        Integer,
+        ForeignKey("diagram.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Operation
+    kind = Column(String(20), nullable=False)  # place, move, remove
+    changes = Column(JSONB, nullable=False)
+    undone = Column(Boolean, nullable=False, default=False)
+
+    # Timestamps
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<DiagramOperation(id={self.id}, diagram_id={self.diagram_id}, "
+            f"kind='{self.kind}', undone={self.undone})>"
+        )
+
+
+class DiagramSnapshot(Base):
+    """Diagram state the oldest retained journal operation applies to."""
+
+    __tablename__ = "diagram_snapshot"
+
+    # Primary key
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # Foreign keys
+    diagram_id = Column(
+        Integer,
+        ForeignKey("diagram.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Last operation folded into the snapshot
+    operation_id = Column(BigInteger, nullable=False)
+
+    # {"diagram_object": [...], "diagram_relationship": [...]} rows
+    state = Column(JSONB, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<DiagramSnapshot(id={self.id}, diagram_id={self.diagram_id}, "
+            f"operation_id={self.operation_id})>"
+        )
@@ -7,6 +7,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -15,10 +16,10 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
-from . import Base
+from . import Base, Versioned
 
 
-class Superdomain(Base):
+class Superdomain(Versioned, Base):
     """Top-level container in data model hierarchy."""
 
     __tablename__ = "superdomain"
@@ -30,6 +31,9 @@ class Superdomain(Base):
     name = Column(String(100), nullable=False, unique=True)
     description = Column(Text, nullable=True)
 
+    # Denormalised child counters (maintained by database triggers)
+    domain_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Timestamps
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -51,7 +55,7 @@ class Superdomain(Base):
         return f"<Superdomain(id={self.id}, name='{self.name}')>"
 
 
-class Domain(Base):
+class Domain(Versioned, Base):
     """Mid-level grouping within a superdomain."""
 
     __tablename__ = "domain"
@@ -71,6 +75,9 @@ class Domain(Base):
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
 
+    # Denormalised child counters (maintained by database triggers)
+    entity_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Timestamps
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -92,7 +99,7 @@ class Domain(Base):
         return f"<Domain(id={self.id}, name='{self.name}', superdomain_id={self.superdomain_id})>"
 
 
-class Entity(Base):
+class Entity(Versioned, Base):
     """Business object or concept (equivalent to a database table)."""
 
     __tablename__ = "entity"
@@ -110,6 +117,10 @@ class Entity(Base):
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
 
+    # Denormalised child counters (maintained by database triggers)
+    attribute_count = Column(Integer, nullable=False, default=0, server_default="0")
+    relationship_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Timestamps
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -145,11 +156,15 @@ class Entity(Base):
         return f"<Entity(id={self.id}, name='{self.name}', domain_id={self.domain_id})>"
 
 
-class Attribute(Base):
+class Attribute(Versioned, Base):
     """Property or field of an entity (equivalent to a database column)."""
 
     __tablename__ = "attribute"
-    __table_args__ = (UniqueConstraint("entity_id", "name", name="uq_attribute_entity_name"),)
+    __table_args__ = (
+        UniqueConstraint("entity_id", "name", name="uq_attribute_entity_name"),
+        # Attributes are listed and re-ranked in column order within an entity
+        Index("ix_attribute_entity_position", "entity_id", "position"),
+    )
 
     # Primary key (BIGINT for 100K+ attributes)
     id = Column(BigInteger, primary_key=True, autoincrement=True)
@@ -166,6 +181,9 @@ class Attribute(Base):
     default_value = Column(String(255), nullable=True)
     description = Column(Text, nullable=True)
 
+    # Column order within the entity: fractional rank key (see utils.rank)
+    position = Column(String(128, collation="C"), nullable=False, server_default="V")
+
     # Extended fields (JSONB)
     constraints = Column(JSONB, nullable=True)
     data_quality_rules = Column(JSONB, nullable=True)
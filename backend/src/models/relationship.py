@@ -14,7 +14,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 
-from . import Base
+from . import Base, Versioned
 
 
 class Cardinality(PyEnum):
@@ -26,7 +26,7 @@ class Cardinality(PyEnum):
     ONE_MANY = "ONE_MANY"  # 1..N (at least one, many)
 
 
-class Relationship(Base):
+class Relationship(Versioned, Base):
     """Connection between two entities with cardinality configuration."""
 
     __tablename__ = "relationship"
@@ -2,7 +2,6 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-import bcrypt
 from sqlalchemy import Boolean, Column, DateTime, Enum, Integer, String
 from sqlalchemy.orm import relationship
 
@@ -43,6 +42,9 @@ class User(Base):
     # Status
     is_active = Column(Boolean, nullable=False, default=True)
 
+    # Tokens issued before this instant are rejected (revocation watermark)
+    tokens_valid_after = Column(DateTime, nullable=True)
+
     # Timestamps
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     last_login_at = Column(DateTime, nullable=True)
@@ -58,12 +60,17 @@ class User(Base):
     def set_password(self, password: str) -> None:
         """Hash and set the user's password.
 
+        Hashing runs in the shared bcrypt process pool.
+
         Args:
             password: Plain text password to hash
+
+        Raises:
+            HasherBusyError: If the hashing queue is full
         """
-        password_bytes = password.encode("utf-8")
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password_bytes, salt).decode("utf-8")
+        from ..utils.password_hasher import password_hasher
+
+        self.password_hash = password_hasher.hash_password(password)
 
     def check_password(self, password: str) -> bool:
         """Verify a password against the stored hash.
@@ -73,14 +80,16 @@ class User(Base):
 
         Returns:
             True if password matches, False otherwise
+
+        Raises:
+            HasherBusyError: If the hashing queue is full
         """
         if not self.password_hash:
             return False
 
-        password_bytes = password.encode("utf-8")
-        hash_bytes = self.password_hash.encode("utf-8")
+        from ..utils.password_hasher import password_hasher
 
-        return bcrypt.checkpw(password_bytes, hash_bytes)
+        return password_hasher.verify_password(password, self.password_hash)
 
     def __repr__(self) -> str:
         """String representation of User."""
@@ -6,6 +6,7 @@ from .entity_repository import EntityRepository
 from .attribute_repository import AttributeRepository
 from .relationship_repository import RelationshipRepository
 from .diagram_repository import DiagramRepository
+from .history_repository import DiagramHistoryRepository
 from .user_repository import UserRepository
 
 __all__ = [
@@ -16,5 +17,6 @@ __all__ = [
     'AttributeRepository',
     'RelationshipRepository',
     'DiagramRepository',
+    'DiagramHistoryRepository',
     'UserRepository',
 ]
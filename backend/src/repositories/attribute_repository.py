@@ -1,9 +1,10 @@
 """Attribute repository for data access."""
 from typing import List, Optional
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from ..models.object_repository import Attribute
+from ..models.object_repository import Attribute, Entity
 from .base_repository import BaseRepository
 
 
@@ -30,10 +31,23 @@ class AttributeRepository(BaseRepository[Attribute]):
         return (
             self.db.query(Attribute)
             .filter(Attribute.entity_id == entity_id)
-            .order_by(Attribute.created_at)
+            .order_by(Attribute.position, Attribute.id)
             .all()
         )
 
+    def get_last_position(self, entity_id: int) -> Optional[str]:
+        """Get the position key of an entity's last attribute.
+
+        Args:
+            entity_id: Parent entity ID
+
+        Returns:
+            Rank key, or None if the entity has no attributes
+        """
+        return self.db.scalar(
+            select(func.max(Attribute.position)).where(Attribute.entity_id == entity_id)
+        )
+
     def get_by_name_and_entity(
         self, name: str, entity_id: int
     ) -> Optional[Attribute]:
@@ -57,13 +71,16 @@ class AttributeRepository(BaseRepository[Attribute]):
     def count_by_entity(self, entity_id: int) -> int:
         """Count attributes for an entity.
 
+        Reads the denormalised ``entity.attribute_count`` counter.
+
         Args:
             entity_id: Parent entity ID
 
         Returns:
             Count of attributes
         """
-        return self.db.query(Attribute).filter(Attribute.entity_id == entity_id).count()
+        count = self.db.query(Entity.attribute_count).filter(Entity.id == entity_id).scalar()
+        return count or 0
 
     def validate_data_type(self, data_type: str) -> bool:
         """Validate that data_type is from allowed list.
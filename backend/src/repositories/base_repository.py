@@ -1,19 +1,57 @@
 """Base repository with generic CRUD operations."""
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, List, NamedTuple, Optional, Sequence, Type, TypeVar
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, String, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.sql.elements import ColumnElement
 
 from ..models import Base
+from ..utils.rank import spread
 
 # Generic type for SQLAlchemy models
 ModelType = TypeVar("ModelType", bound=Base)
 
+# PostgreSQL SQLSTATE codes for constraint violations
+FOREIGN_KEY_VIOLATION = "23503"
+UNIQUE_VIOLATION = "23505"
+
+
+class StaleVersionError(ValueError):
+    """Raised when a compare-and-set write finds the row at another version."""
+
+
+class Neighbours(NamedTuple):
+    """Where a row sits in a rank order and the gap it is moving into."""
+
+    scope: Any  # Value of the row's scope column
+    current: str  # The row's rank key
+    lo: Optional[str]  # Key of the row that will precede it (None = first)
+    hi: Optional[str]  # Key of the row that will follow it (None = last)
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    """Check whether an IntegrityError was raised by a foreign key constraint."""
+    return getattr(error.orig, "pgcode", None) == FOREIGN_KEY_VIOLATION
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """Check whether an IntegrityError was raised by a unique constraint."""
+    return getattr(error.orig, "pgcode", None) == UNIQUE_VIOLATION
+
 
 class BaseRepository(Generic[ModelType]):
     """Base repository with common CRUD operations.
 
     This provides a generic interface for database operations that can be
     extended by specific repositories.
+
+    Write methods only flush: the surrounding unit of work (the request
+    session, or ``get_db_context()`` outside requests) commits once, so a
+    multi-step service operation is atomic and pays for a single commit.
     """
 
     def __init__(self, model: Type[ModelType], db: Session):
@@ -63,6 +101,36 @@ class BaseRepository(Generic[ModelType]):
 
         return query.offset(skip).limit(limit).all()
 
+    def list_rows(
+        self,
+        columns: Sequence[ColumnElement],
+        *criteria: ColumnElement,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+        order_by: Optional[Sequence[ColumnElement]] = None,
+    ) -> List[Row]:
+        """List selected columns as plain rows, without hydrating models.
+
+        Args:
+            columns: Column expressions to select (see ``utils.projection``)
+            *criteria: WHERE clauses
+            skip: Number of records to skip (offset)
+            limit: Maximum number of records to return (None = no limit)
+            order_by: Sort order (defaults to primary key)
+
+        Returns:
+            List of result rows
+        """
+        stmt = (
+            select(*columns)
+            .select_from(self.model)
+            .where(*criteria)
+            .order_by(*(order_by if order_by is not None else [self.model.id]))
+            .offset(skip)
+            .limit(limit)
+        )
+        return self.db.execute(stmt).all()
+
     def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count total entities matching filters.
 
@@ -82,6 +150,18 @@ class BaseRepository(Generic[ModelType]):
 
         return query.count()
 
+    def count_where(self, *criteria: ColumnElement) -> int:
+        """Count entities matching arbitrary WHERE clauses.
+
+        Args:
+            *criteria: WHERE clauses
+
+        Returns:
+            Total count
+        """
+        stmt = select(func.count()).select_from(self.model).where(*criteria)
+        return self.db.scalar(stmt)
+
     def create(self, data: Dict[str, Any]) -> ModelType:
         """Create new entity.
 
@@ -93,47 +173,112 @@ class BaseRepository(Generic[ModelType]):
         """
         instance = self.model(**data)
         self.db.add(instance)
-        self.db.commit()
-        self.db.refresh(instance)
+        self.db.flush()
         return instance
 
-    def update(self, id: int, data: Dict[str, Any]) -> Optional[ModelType]:
+    def create_unique(self, data: Dict[str, Any], **conflict_target: Any) -> Optional[ModelType]:
+        """Create entity unless it collides with a unique constraint.
+
+        Issues a single ``INSERT ... ON CONFLICT DO NOTHING RETURNING``, so
+        uniqueness is enforced by the database instead of a prior SELECT.
+
+        Args:
+            data: Dictionary of field values
+            **conflict_target: ``constraint=`` name or ``index_elements=`` columns
+
+        Returns:
+            Created model instance, or None if the unique constraint matched
+
+        Raises:
+            IntegrityError: On any other constraint violation (e.g. a missing parent)
+        """
+        stmt = (
+            insert(self.model)
+            .values(**data)
+            .on_conflict_do_nothing(**conflict_target)
+            .returning(self.model)
+        )
+        return self.db.scalars(stmt).first()
+
+    def update(
+        self, id: int, data: Dict[str, Any], expected_version: Optional[int] = None
+    ) -> Optional[ModelType]:
         """Update entity by ID.
 
+        Issues a single ``UPDATE ... RETURNING``; keys that are not columns
+        of the model are ignored. Versioned models get their version bumped
+        and, given ``expected_version``, the version check is part of the
+        same statement (``WHERE id = ? AND version = ?``), so a conflicting
+        write is detected without locking or an extra round trip.
+
         Args:
             id: Primary key value
             data: Dictionary of field values to update
+            expected_version: Version the caller last saw (None = any)
 
         Returns:
             Updated model instance or None if not found
-        """
-        instance = self.get(id)
-        if not instance:
-            return None
-
-        for field, value in data.items():
-            if hasattr(instance, field):
-                setattr(instance, field, value)
-
-        self.db.commit()
-        self.db.refresh(instance)
-        return instance
 
-    def delete(self, id: int) -> bool:
+        Raises:
+            IntegrityError: If the update violates a constraint
+            StaleVersionError: If the row is at another version
+        """
+        version = getattr(self.model, "version", None)
+        columns = self.model.__table__.columns
+        values = {
+            field: value
+            for field, value in data.items()
+            if field in columns and field != "version"
+        }
+        if not values:
+            instance = self.get(id)
+            if instance is not None and expected_version is not None:
+                self._check_version(instance, expected_version)
+            return instance
+
+        criteria = [self.model.id == id]
+        if version is not None:
+            values["version"] = version + 1
+            if expected_version is not None:
+                criteria.append(version == expected_version)
+
+        stmt = update(self.model).where(*criteria).values(**values).returning(self.model)
+        updated = self.db.scalars(stmt).first()
+
+        # Only a failed compare-and-set pays for telling "gone" from "stale"
+        if updated is None and expected_version is not None and self.exists(id):
+            raise StaleVersionError(
+                f"{self.model.__name__} {id} was modified (expected version {expected_version})"
+            )
+        return updated
+
+    def delete(self, id: int, expected_version: Optional[int] = None) -> bool:
         """Delete entity by ID.
 
+        For versioned models the DELETE only matches the row at the version
+        it was loaded with, so a write that lands in between is detected.
+
         Args:
             id: Primary key value
+            expected_version: Version the caller last saw (None = any)
 
         Returns:
             True if deleted, False if not found
+
+        Raises:
+            StaleVersionError: If the row is at another version
         """
         instance = self.get(id)
         if not instance:
             return False
+        if expected_version is not None:
+            self._check_version(instance, expected_version)
 
         self.db.delete(instance)
-        self.db.commit()
+        try:
+            self.db.flush()
+        except StaleDataError as e:
+            raise StaleVersionError(f"{self.model.__name__} {id} was modified") from e
         return True
 
     def exists(self, id: int) -> bool:
@@ -146,3 +291,114 @@ class BaseRepository(Generic[ModelType]):
             True if exists, False otherwise
         """
         return self.db.query(self.model.id).filter(self.model.id == id).first() is not None
+
+    def neighbour_ranks(
+        self,
+        id: int,
+        scope_field: str,
+        rank_field: str,
+        anchor_id: Optional[int] = None,
+        after: bool = True,
+        scope: Optional[Any] = None,
+    ) -> Optional[Neighbours]:
+        """Find the gap a row moves into within its scope's rank order.
+
+        One SELECT with a correlated MIN/MAX over the ``(scope, rank)``
+        index; the row being moved is left out of the neighbours.
+
+        Args:
+            id: Primary key of the row to move
+            scope_field: Column whose value groups the order (e.g. entity_id)
+            rank_field: Rank key column
+            anchor_id: Row to move next to (None = an end of the order)
+            after: Place after the anchor (or last) rather than before it (or first)
+            scope: Required scope value of the row (None = any)
+
+        Returns:
+            Neighbours, or None if the row or the anchor does not exist or
+            they are in different scopes
+        """
+        moved = aliased(self.model, name="moved")
+        other = aliased(self.model, name="other")
+
+        criteria = [moved.id == id]
+        if scope is not None:
+            criteria.append(getattr(moved, scope_field) == scope)
+
+        neighbour_criteria = [
+            getattr(other, scope_field) == getattr(moved, scope_field),
+            other.id != moved.id,
+        ]
+        if anchor_id is None:
+            # The last (or first) other row
+            anchor_rank = None
+            bound = func.max if after else func.min
+        else:
+            # The nearest other row past the anchor
+            bound = func.min if after else func.max
+            anchor = aliased(self.model, name="anchor")
+            anchor_rank = getattr(anchor, rank_field)
+            criteria += [anchor.id == anchor_id, getattr(anchor, scope_field) == getattr(moved, scope_field)]
+            neighbour_criteria.append(
+                getattr(other, rank_field) > anchor_rank if after else getattr(other, rank_field) < anchor_rank
+            )
+
+        neighbour = select(bound(getattr(other, rank_field))).where(*neighbour_criteria).scalar_subquery()
+        columns = [getattr(moved, scope_field), getattr(moved, rank_field), neighbour]
+        if anchor_rank is not None:
+            columns.append(anchor_rank)
+
+        row = self.db.execute(select(*columns).where(*criteria)).first()
+        if row is None:
+            return None
+
+        if anchor_id is None:
+            lo, hi = (row[2], None) if after else (None, row[2])
+        else:
+            lo, hi = (row[3], row[2]) if after else (row[2], row[3])
+        return Neighbours(row[0], row[1], lo, hi)
+
+    def rebalance_ranks(self, scope_field: str, scope: Any, rank_field: str) -> List[Row]:
+        """Rewrite a scope's rank keys evenly spaced, keeping their order.
+
+        Repeated moves into the same gap lengthen keys; this resets them
+        to the shortest keys that fit. The scope's rows are locked while
+        their keys are rewritten with one multi-row UPDATE. Row versions
+        are left alone, since the order does not change.
+
+        Args:
+            scope_field: Column whose value groups the order
+            scope: Scope value
+            rank_field: Rank key column
+
+        Returns:
+            Rows with the id and new rank key of every row rewritten
+        """
+        table = self.model.__table__
+        ids = self.db.scalars(
+            select(table.c.id)
+            .where(table.c[scope_field] == scope)
+            .order_by(table.c[rank_field], table.c.id)
+            .with_for_update()
+        ).all()
+        if not ids:
+            return []
+
+        ranks = values(column("id", Integer), column("rank", String), name="ranks").data(
+            list(zip(ids, spread(len(ids)), strict=True))
+        )
+        stmt = (
+            update(table)
+            .where(table.c.id == ranks.c.id)
+            .values({rank_field: ranks.c.rank})
+            .returning(table.c.id, table.c[rank_field])
+        )
+        return self.db.execute(stmt).all()
+
+    def _check_version(self, instance: ModelType, expected_version: int) -> None:
+        """Raise StaleVersionError unless a loaded row is at the expected version."""
+        if getattr(instance, "version", expected_version) != expected_version:
+            raise StaleVersionError(
+                f"{self.model.__name__} {instance.id} was modified "
+                f"(expected version {expected_version}, found {instance.version})"
+            )
@@ -1,11 +1,104 @@
 """Diagram repository for data access."""
-from typing import List, Optional
-
-from sqlalchemy.orm import Session, joinedload
-
-from ..models.diagram_repository import Diagram, DiagramObject, DiagramRelationship
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    Table,
+    Text,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, aliased, joinedload
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..models.diagram_repository import Diagram, DiagramObject, DiagramRelationship, ObjectType
+from ..models.object_repository import Domain, Entity
+from ..models.relationship import Relationship
+from ..utils import layout
 from .base_repository import BaseRepository
 
+# The containers placed on the same diagram that an object sits in: an
+# entity in its domain's and that domain's superdomain's, a domain in its
+# superdomain's (see _with_containers)
+_domain_id = case(
+    (DiagramObject.object_type == ObjectType.DOMAIN, DiagramObject.object_id),
+    else_=Entity.domain_id,
+)
+_superdomain_id = case(
+    (DiagramObject.object_type == ObjectType.SUPERDOMAIN, DiagramObject.object_id),
+    else_=Domain.superdomain_id,
+)
+_domain_box = aliased(DiagramObject, name="domain_box")
+_superdomain_box = aliased(DiagramObject, name="superdomain_box")
+
+# Paint order derived from the hierarchy: the containers' rank keys,
+# outermost first, then the object's own. The separator sorts below every
+# rank digit, so a container's contents directly follow it, in their own
+# rank order, and restacking a container carries its contents along.
+_paint_path = func.concat_ws(
+    " ", _superdomain_box.z_rank, _domain_box.z_rank, DiagramObject.z_rank
+).collate("C")
+
+# Outer box of an object: a container's fitted bounds, else its own box
+_box_x0 = func.coalesce(DiagramObject.bounds_x, DiagramObject.position_x)
+_box_y0 = func.coalesce(DiagramObject.bounds_y, DiagramObject.position_y)
+_box_x1 = func.coalesce(
+    DiagramObject.bounds_x + DiagramObject.bounds_width,
+    DiagramObject.position_x + func.coalesce(DiagramObject.width, layout.NODE_WIDTH),
+)
+_box_y1 = func.coalesce(
+    DiagramObject.bounds_y + DiagramObject.bounds_height,
+    DiagramObject.position_y + func.coalesce(DiagramObject.height, layout.NODE_HEIGHT),
+)
+
+
+def _with_containers(stmt: Select) -> Select:
+    """Join the containers of each ``diagram_object`` row (as domain_box/superdomain_box)."""
+    return (
+        stmt.select_from(DiagramObject)
+        .outerjoin(
+            Entity,
+            and_(
+                DiagramObject.object_type == ObjectType.ENTITY,
+                Entity.id == DiagramObject.object_id,
+            ),
+        )
+        .outerjoin(Domain, Domain.id == _domain_id)
+        .outerjoin(
+            _domain_box,
+            and_(
+                _domain_box.diagram_id == DiagramObject.diagram_id,
+                _domain_box.object_type == ObjectType.DOMAIN,
+                _domain_box.object_id == _domain_id,
+                _domain_box.id != DiagramObject.id,
+            ),
+        )
+        .outerjoin(
+            _superdomain_box,
+            and_(
+                _superdomain_box.diagram_id == DiagramObject.diagram_id,
+                _superdomain_box.object_type == ObjectType.SUPERDOMAIN,
+                _superdomain_box.object_id == _superdomain_id,
+                _superdomain_box.id != DiagramObject.id,
+            ),
+        )
+    )
+
 
 class DiagramRepository(BaseRepository[Diagram]):
     """Repository for Diagram entities with full object and relationship loading."""
@@ -92,53 +185,357 @@ class DiagramRepository(BaseRepository[Diagram]):
         object_data["diagram_id"] = diagram_id
         diagram_object = DiagramObject(**object_data)
         self.db.add(diagram_object)
-        self.db.commit()
-        self.db.refresh(diagram_object)
+        self.db.flush()
         return diagram_object
 
+    def add_objects(
+        self,
+        diagram_id: int,
+        objects: Sequence[Dict[str, Any]],
+        columns: Sequence[ColumnElement],
+    ) -> List[Row]:
+        """Add several objects to a diagram with one multi-row INSERT.
+
+        Args:
+            diagram_id: Diagram ID
+            objects: Column value dicts (object_type, object_id, position_x, ...)
+            columns: DiagramObject column expressions to return
+
+        Returns:
+            Result rows of the inserted objects, in input order
+
+        Raises:
+            IntegrityError: If the diagram does not exist or an object is already placed
+        """
+        stmt = insert(DiagramObject).returning(*columns, sort_by_parameter_order=True)
+        values = [{**obj, "diagram_id": diagram_id} for obj in objects]
+        return self.db.execute(stmt, values).all()
+
+    def materialize_relationships(
+        self,
+        diagram_id: int,
+        entity_ids: Iterable[int],
+        columns: Sequence[ColumnElement],
+    ) -> List[Row]:
+        """Place every relationship between newly placed and present entities.
+
+        Runs a single ``INSERT ... SELECT`` over ``relationship``: a
+        relationship is placed when both of its ends are entities on the
+        diagram and at least one end is in ``entity_ids``. Relationships
+        that are already placed are skipped.
+
+        Args:
+            diagram_id: Diagram ID
+            entity_ids: IDs of the entities just placed on the diagram
+            columns: DiagramRelationship column expressions to return
+
+        Returns:
+            Result rows of the newly placed relationships
+        """
+        entity_ids = list(entity_ids)
+        if not entity_ids:
+            return []
+
+        placed = select(DiagramObject.object_id).where(
+            DiagramObject.diagram_id == diagram_id,
+            DiagramObject.object_type == ObjectType.ENTITY,
+        )
+        now = datetime.utcnow()
+        source = select(
+            literal(diagram_id),
+            Relationship.id,
+            true(),
+            literal(now),
+            literal(now),
+        ).where(
+            Relationship.source_entity_id.in_(placed),
+            Relationship.target_entity_id.in_(placed),
+            or_(
+                Relationship.source_entity_id.in_(entity_ids),
+                Relationship.target_entity_id.in_(entity_ids),
+            ),
+        )
+        stmt = (
+            insert(DiagramRelationship)
+            .from_select(
+                ["diagram_id", "relationship_id", "is_visible", "created_at", "updated_at"],
+                source,
+            )
+            .on_conflict_do_nothing(constraint="uq_diagram_relationship_unique")
+            .returning(*columns)
+        )
+        return self.db.execute(stmt).all()
+
+    def has_object(self, diagram_id: int, object_id: int) -> bool:
+        """Check whether an object is on a diagram.
+
+        Args:
+            diagram_id: Diagram ID
+            object_id: DiagramObject ID
+
+        Returns:
+            True if the object exists on that diagram
+        """
+        stmt = select(DiagramObject.id).where(
+            DiagramObject.id == object_id, DiagramObject.diagram_id == diagram_id
+        )
+        return self.db.scalar(stmt) is not None
+
     def update_object_position(
-        self, object_id: int, position_x: float, position_y: float
-    ) -> Optional[DiagramObject]:
+        self,
+        diagram_id: int,
+        object_id: int,
+        position_x: float,
+        position_y: float,
+        clock: Optional[str] = None,
+    ) -> Optional[Row]:
         """Update object position on diagram.
 
+        One ``UPDATE ... FROM`` joined to the row itself, so RETURNING
+        reports the position before the update as well as after it.
+
         Args:
+            diagram_id: Diagram ID
             object_id: DiagramObject ID
             position_x: New X coordinate
             position_y: New Y coordinate
+            clock: HLC timestamp to record as the fields' clock
+
+        Returns:
+            Row with id, position_x, position_y, old_position_x and
+            old_position_y, or None if the object is not on the diagram
+        """
+        table = DiagramObject.__table__
+        old = table.alias("old")
+        stmt = (
+            update(table)
+            .where(
+                table.c.id == object_id,
+                table.c.diagram_id == diagram_id,
+                old.c.id == table.c.id,
+            )
+            .values(
+                position_x=position_x,
+                position_y=position_y,
+                **self._stamp(table, ("position_x", "position_y"), clock),
+            )
+            .returning(
+                table.c.id,
+                table.c.position_x,
+                table.c.position_y,
+                old.c.position_x.label("old_position_x"),
+                old.c.position_y.label("old_position_y"),
+            )
+        )
+        return self.db.execute(stmt).first()
+
+    def update_object_rank(
+        self, diagram_id: int, object_id: int, z_rank: str, clock: Optional[str] = None
+    ) -> Optional[Row]:
+        """Restack one object by giving it a new z-order rank key.
+
+        Args:
+            diagram_id: Diagram ID
+            object_id: DiagramObject ID
+            z_rank: New rank key (see utils.rank)
+            clock: HLC timestamp to record as the field's clock
 
         Returns:
-            Updated DiagramObject or None
+            Row with id and z_rank, or None if the object is not on the diagram
         """
-        diagram_object = (
-            self.db.query(DiagramObject).filter(DiagramObject.id == object_id).first()
+        table = DiagramObject.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == object_id, table.c.diagram_id == diagram_id)
+            .values(z_rank=z_rank, **self._stamp(table, ("z_rank",), clock))
+            .returning(table.c.id, table.c.z_rank)
         )
-        if not diagram_object:
-            return None
+        return self.db.execute(stmt).first()
 
-        diagram_object.position_x = position_x
-        diagram_object.position_y = position_y
-        self.db.commit()
-        self.db.refresh(diagram_object)
-        return diagram_object
+    def get_top_rank(self, diagram_id: int) -> Optional[str]:
+        """Get the z-order rank key of a diagram's topmost object.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Rank key, or None if the diagram has no objects
+        """
+        return self.db.scalar(
+            select(func.max(DiagramObject.z_rank)).where(DiagramObject.diagram_id == diagram_id)
+        )
+
+    def bulk_update_positions(
+        self, positions: Dict[int, Tuple[int, float, float]], clock: Optional[str] = None
+    ) -> List[Row]:
+        """Move many objects with one multi-row UPDATE.
+
+        Args:
+            positions: DiagramObject ID -> (diagram ID, X, Y); objects no
+                longer on that diagram are skipped
+            clock: HLC timestamp to record as the fields' clock
+
+        Returns:
+            Rows with id, diagram_id, position_x, position_y, old_position_x
+            and old_position_y of the objects moved
+        """
+        if not positions:
+            return []
+
+        rows = values(
+            column("id", Integer),
+            column("diagram_id", Integer),
+            column("position_x", Float),
+            column("position_y", Float),
+            name="positions",
+        ).data([(id, *position) for id, position in positions.items()])
+
+        table = DiagramObject.__table__
+        old = table.alias("old")
+        stmt = (
+            update(table)
+            .where(
+                table.c.id == rows.c.id,
+                table.c.diagram_id == rows.c.diagram_id,
+                old.c.id == table.c.id,
+            )
+            .values(
+                position_x=rows.c.position_x,
+                position_y=rows.c.position_y,
+                **self._stamp(table, ("position_x", "position_y"), clock),
+            )
+            .returning(
+                table.c.id,
+                table.c.diagram_id,
+                table.c.position_x,
+                table.c.position_y,
+                old.c.position_x.label("old_position_x"),
+                old.c.position_y.label("old_position_y"),
+            )
+        )
+        return self.db.execute(stmt).all()
+
+    def merge_field(
+        self,
+        table: Table,
+        diagram_id: int,
+        column_name: str,
+        writes: Sequence[Tuple[int, Any, str]],
+    ) -> List[int]:
+        """Apply last-writer-wins writes of one column with one UPDATE.
+
+        A write only lands if its clock is newer than the clock stored for
+        that column in ``field_clocks``. The condition is part of the
+        UPDATE, which Postgres re-checks against the latest row version
+        when writers collide, so no lock is taken up front and concurrent
+        writes to different columns of a row both survive.
+
+        Args:
+            table: diagram_object or diagram_relationship table
+            diagram_id: Diagram ID (rows of other diagrams are skipped)
+            column_name: Column to write
+            writes: (row ID, value, HLC timestamp text) per row
+
+        Returns:
+            IDs of the rows whose column was written
+        """
+        if not writes:
+            return []
+
+        target = table.c[column_name]
+        rows = values(
+            column("id", Integer),
+            column("value", target.type),
+            column("clock", Text),
+            name="writes",
+        ).data(list(writes))
+
+        stored = table.c.field_clocks[column_name].astext
+        stmt = (
+            update(table)
+            .where(
+                table.c.id == rows.c.id,
+                table.c.diagram_id == diagram_id,
+                or_(stored.is_(None), stored < rows.c.clock.collate("C")),
+            )
+            .values(
+                {
+                    column_name: cast(rows.c.value, target.type),
+                    "field_clocks": table.c.field_clocks.op("||", return_type=JSONB)(
+                        func.jsonb_build_object(column_name, rows.c.clock)
+                    ),
+                }
+            )
+            .returning(table.c.id)
+        )
+        return list(self.db.scalars(stmt))
+
+    def get_field_states(
+        self, table: Table, diagram_id: int, ids: Iterable[int], column_names: Sequence[str]
+    ) -> List[Row]:
+        """Read columns and their clocks for rows of a diagram.
+
+        Args:
+            table: diagram_object or diagram_relationship table
+            diagram_id: Diagram ID
+            ids: Row IDs
+            column_names: Columns to read
+
+        Returns:
+            Rows with id, the columns and field_clocks, ordered by id
+        """
+        ids = sorted(set(ids))
+        if not ids:
+            return []
+
+        stmt = (
+            select(table.c.id, *(table.c[name] for name in column_names), table.c.field_clocks)
+            .where(table.c.id.in_(ids), table.c.diagram_id == diagram_id)
+            .order_by(table.c.id)
+        )
+        return self.db.execute(stmt).all()
 
-    def remove_object(self, object_id: int) -> bool:
+    def remove_object(self, diagram_id: int, object_id: int) -> Optional[Row]:
         """Remove object from diagram.
 
         Args:
+            diagram_id: Diagram ID
             object_id: DiagramObject ID
 
         Returns:
-            True if removed, False if not found
+            The deleted row (all columns), or None if the object is not on the diagram
         """
-        diagram_object = (
-            self.db.query(DiagramObject).filter(DiagramObject.id == object_id).first()
+        table = DiagramObject.__table__
+        stmt = (
+            delete(table)
+            .where(table.c.id == object_id, table.c.diagram_id == diagram_id)
+            .returning(*table.columns)
         )
-        if not diagram_object:
-            return False
+        return self.db.execute(stmt).first()
+
+    def remove_entity_relationships(self, diagram_id: int, entity_id: int) -> List[Row]:
+        """Remove the placements of an entity's relationships from a diagram.
 
-        self.db.delete(diagram_object)
-        self.db.commit()
-        return True
+        Args:
+            diagram_id: Diagram ID
+            entity_id: Entity whose relationship lines to remove
+
+        Returns:
+            The deleted rows (all columns)
+        """
+        table = DiagramRelationship.__table__
+        touching = select(Relationship.id).where(
+            or_(
+                Relationship.source_entity_id == entity_id,
+                Relationship.target_entity_id == entity_id,
+            )
+        )
+        stmt = (
+            delete(table)
+            .where(table.c.diagram_id == diagram_id, table.c.relationship_id.in_(touching))
+            .returning(*table.columns)
+        )
+        return self.db.execute(stmt).all()
 
     def get_objects_by_diagram(self, diagram_id: int) -> List[DiagramObject]:
         """Get all objects in a diagram.
@@ -152,7 +549,7 @@ class DiagramRepository(BaseRepository[Diagram]):
         return (
             self.db.query(DiagramObject)
             .filter(DiagramObject.diagram_id == diagram_id)
-            .order_by(DiagramObject.z_index)
+            .order_by(DiagramObject.z_rank, DiagramObject.id)
             .all()
         )
 
@@ -173,6 +570,233 @@ class DiagramRepository(BaseRepository[Diagram]):
             .all()
         )
 
+    def get_change_version(self, id: int) -> Optional[int]:
+        """Get a diagram's change version without loading the row.
+
+        Args:
+            id: Diagram ID
+
+        Returns:
+            Current change version, or None if the diagram does not exist
+        """
+        return self.db.scalar(select(Diagram.change_version).where(Diagram.id == id))
+
+    def get_object_rows(self, diagram_id: int, columns: Sequence[ColumnElement]) -> List[Row]:
+        """Get selected columns of all objects in a diagram as plain rows.
+
+        Args:
+            diagram_id: Diagram ID
+            columns: DiagramObject column expressions to select
+
+        Returns:
+            List of result rows in paint order (bottom first): containers
+            below their contents, siblings by z_rank
+        """
+        stmt = (
+            _with_containers(select(*columns))
+            .where(DiagramObject.diagram_id == diagram_id)
+            .order_by(_paint_path, DiagramObject.id)
+        )
+        return self.db.execute(stmt).all()
+
+    def get_relationship_rows(
+        self, diagram_id: int, columns: Sequence[ColumnElement]
+    ) -> List[Row]:
+        """Get selected columns of all relationships in a diagram as plain rows.
+
+        Args:
+            diagram_id: Diagram ID
+            columns: DiagramRelationship column expressions to select
+
+        Returns:
+            List of result rows
+        """
+        stmt = (
+            select(*columns)
+            .where(DiagramRelationship.diagram_id == diagram_id)
+            .order_by(DiagramRelationship.id)
+        )
+        return self.db.execute(stmt).all()
+
+    def get_object_hierarchy_rows(self, diagram_id: int) -> List[Row]:
+        """Get every object's outer box with the containers it sits in.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Rows of (id, object_type, x0, y0, x1, y1, domain_box_id,
+            superdomain_box_id) in paint order; the box is a container's
+            fitted bounds or the object's own (auto sizes as the default
+            box), and the container IDs are None when not placed
+        """
+        stmt = _with_containers(
+            select(
+                DiagramObject.id,
+                DiagramObject.object_type,
+                _box_x0.label("x0"),
+                _box_y0.label("y0"),
+                _box_x1.label("x1"),
+                _box_y1.label("y1"),
+                _domain_box.id.label("domain_box_id"),
+                _superdomain_box.id.label("superdomain_box_id"),
+            )
+        ).where(DiagramObject.diagram_id == diagram_id).order_by(_paint_path, DiagramObject.id)
+        return self.db.execute(stmt).all()
+
+    def get_container_chain(self, diagram_id: int, object_ids: Iterable[int]) -> List[int]:
+        """Get the containers whose bounds depend on some objects.
+
+        Args:
+            diagram_id: Diagram ID
+            object_ids: DiagramObject IDs
+
+        Returns:
+            IDs of the containers the objects sit in, and of the objects
+            that are containers themselves
+        """
+        object_ids = list(object_ids)
+        if not object_ids:
+            return []
+
+        stmt = _with_containers(
+            select(
+                case(
+                    (DiagramObject.object_type == ObjectType.ENTITY, None),
+                    else_=DiagramObject.id,
+                ),
+                _domain_box.id,
+                _superdomain_box.id,
+            )
+        ).where(DiagramObject.diagram_id == diagram_id, DiagramObject.id.in_(object_ids))
+        return sorted({id for row in self.db.execute(stmt) for id in row if id is not None})
+
+    def refit_containers(
+        self,
+        diagram_id: int,
+        columns: Sequence[ColumnElement],
+        container_ids: Optional[Iterable[int]] = None,
+    ) -> List[Row]:
+        """Fit containers' bounds around the objects they hold.
+
+        Domains are fitted around their entities first, then superdomains
+        around their domains' new bounds and entities, each level with one
+        ``UPDATE ... FROM`` over an aggregate of the contents. Bounds that
+        come out unchanged are not written, so a box moved inside its
+        container costs no container write. An empty container's bounds
+        are cleared.
+
+        Args:
+            diagram_id: Diagram ID
+            columns: DiagramObject column expressions to return
+            container_ids: Containers to refit (None = all on the diagram);
+                IDs of other objects are ignored
+
+        Returns:
+            Result rows of the containers whose bounds changed
+        """
+        if container_ids is not None:
+            container_ids = list(container_ids)
+            if not container_ids:
+                return []
+
+        rows = []
+        for level, holder in (
+            (ObjectType.DOMAIN, _domain_box),
+            (ObjectType.SUPERDOMAIN, _superdomain_box),
+        ):
+            contents = _with_containers(
+                select(
+                    holder.id.label("container_id"),
+                    func.min(_box_x0).label("x0"),
+                    func.min(_box_y0).label("y0"),
+                    func.max(_box_x1).label("x1"),
+                    func.max(_box_y1).label("y1"),
+                )
+            ).where(DiagramObject.diagram_id == diagram_id, holder.id.is_not(None))
+            if container_ids is not None:
+                contents = contents.where(holder.id.in_(container_ids))
+            contents = contents.group_by(holder.id).subquery("contents")
+
+            container = aliased(DiagramObject, name="container")
+            padding, header = layout.CONTAINER_PADDING, layout.CONTAINER_HEADER
+            fit = (
+                select(
+                    container.id,
+                    (contents.c.x0 - padding).label("x"),
+                    (contents.c.y0 - padding - header).label("y"),
+                    (contents.c.x1 - contents.c.x0 + 2 * padding).label("width"),
+                    (contents.c.y1 - contents.c.y0 + 2 * padding + header).label("height"),
+                )
+                .outerjoin(contents, contents.c.container_id == container.id)
+                .where(container.diagram_id == diagram_id, container.object_type == level)
+            )
+            if container_ids is not None:
+                fit = fit.where(container.id.in_(container_ids))
+            fit = fit.subquery("fit")
+
+            table = DiagramObject.__table__
+            stmt = (
+                update(table)
+                .where(
+                    table.c.id == fit.c.id,
+                    or_(
+                        table.c.bounds_x.is_distinct_from(fit.c.x),
+                        table.c.bounds_y.is_distinct_from(fit.c.y),
+                        table.c.bounds_width.is_distinct_from(fit.c.width),
+                        table.c.bounds_height.is_distinct_from(fit.c.height),
+                    ),
+                )
+                .values(
+                    bounds_x=fit.c.x,
+                    bounds_y=fit.c.y,
+                    bounds_width=fit.c.width,
+                    bounds_height=fit.c.height,
+                )
+                .returning(*columns)
+            )
+            rows.extend(self.db.execute(stmt).all())
+        return rows
+
+    def get_edge_rows(self, diagram_id: int) -> List[Row]:
+        """Get the objects at both ends of each visible relationship line.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Rows of (source_object_id, target_object_id)
+        """
+        source = aliased(DiagramObject, name="source")
+        target = aliased(DiagramObject, name="target")
+        stmt = (
+            select(source.id.label("source_object_id"), target.id.label("target_object_id"))
+            .select_from(DiagramRelationship)
+            .join(Relationship, Relationship.id == DiagramRelationship.relationship_id)
+            .join(
+                source,
+                and_(
+                    source.diagram_id == diagram_id,
+                    source.object_type == ObjectType.ENTITY,
+                    source.object_id == Relationship.source_entity_id,
+                ),
+            )
+            .join(
+                target,
+                and_(
+                    target.diagram_id == diagram_id,
+                    target.object_type == ObjectType.ENTITY,
+                    target.object_id == Relationship.target_entity_id,
+                ),
+            )
+            .where(
+                DiagramRelationship.diagram_id == diagram_id,
+                DiagramRelationship.is_visible.is_(True),
+            )
+            .order_by(DiagramRelationship.id)
+        )
+        return self.db.execute(stmt).all()
+
     def get_diagrams_containing_object(
         self, object_type: str, object_id: int
     ) -> List[Diagram]:
@@ -194,3 +818,14 @@ class DiagramRepository(BaseRepository[Diagram]):
             )
             .all()
         )
+
+    @staticmethod
+    def _stamp(table: Table, column_names: Sequence[str], clock: Optional[str]) -> Dict[str, Any]:
+        """Build the SET clause recording ``clock`` for columns (empty without a clock)."""
+        if clock is None:
+            return {}
+        return {
+            "field_clocks": table.c.field_clocks.op("||", return_type=JSONB)(
+                func.jsonb_build_object(*[arg for name in column_names for arg in (name, clock)])
+            )
+        }
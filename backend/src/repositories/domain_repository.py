@@ -1,9 +1,10 @@
 """Domain repository for data access."""
 from typing import List, Optional
 
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
-from ..models.object_repository import Domain
+from ..models.object_repository import Domain, Entity, Superdomain
 from .base_repository import BaseRepository
 
 
@@ -62,10 +63,37 @@ class DomainRepository(BaseRepository[Domain]):
     def count_by_superdomain(self, superdomain_id: int) -> int:
         """Count domains in a superdomain.
 
+        Reads the denormalised ``superdomain.domain_count`` counter.
+
         Args:
             superdomain_id: Parent superdomain ID
 
         Returns:
             Count of domains
         """
-        return self.db.query(Domain).filter(Domain.superdomain_id == superdomain_id).count()
+        count = (
+            self.db.query(Superdomain.domain_count)
+            .filter(Superdomain.id == superdomain_id)
+            .scalar()
+        )
+        return count or 0
+
+    def reconcile_entity_counts(self) -> int:
+        """Repair drift in the denormalised ``domain.entity_count`` column.
+
+        Returns:
+            Number of domains whose counter was corrected
+        """
+        actual = (
+            select(func.count(Entity.id))
+            .where(Entity.domain_id == Domain.id)
+            .correlate(Domain)
+            .scalar_subquery()
+        )
+        result = self.db.execute(
+            update(Domain)
+            .where(Domain.entity_count != actual)
+            .values(entity_count=actual, updated_at=Domain.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
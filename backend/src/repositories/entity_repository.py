@@ -1,9 +1,11 @@
 """Entity repository for data access."""
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from sqlalchemy import func, literal, select, union_all, update
 from sqlalchemy.orm import Session, joinedload
 
-from ..models.object_repository import Entity
+from ..models.object_repository import Attribute, Domain, Entity
+from ..models.relationship import Relationship
 from .base_repository import BaseRepository
 
 
@@ -76,13 +78,127 @@ class EntityRepository(BaseRepository[Entity]):
     def count_by_domain(self, domain_id: int) -> int:
         """Count entities in a domain.
 
+        Reads the denormalised ``domain.entity_count`` counter.
+
         Args:
             domain_id: Parent domain ID
 
         Returns:
             Count of entities
         """
-        return self.db.query(Entity).filter(Entity.domain_id == domain_id).count()
+        count = self.db.query(Domain.entity_count).filter(Domain.id == domain_id).scalar()
+        return count or 0
+
+    def reconcile_counts(self) -> dict:
+        """Repair drift in ``entity.attribute_count`` and ``entity.relationship_count``.
+
+        Returns:
+            Dictionary with the number of entities corrected per counter
+        """
+        attributes = (
+            select(func.count(Attribute.id))
+            .where(Attribute.entity_id == Entity.id)
+            .correlate(Entity)
+            .scalar_subquery()
+        )
+        relationships = (
+            select(func.count(Relationship.id))
+            .where(
+                (Relationship.source_entity_id == Entity.id)
+                | (Relationship.target_entity_id == Entity.id)
+            )
+            .correlate(Entity)
+            .scalar_subquery()
+        )
+
+        fixed_attributes = self.db.execute(
+            update(Entity)
+            .where(Entity.attribute_count != attributes)
+            .values(attribute_count=attributes, updated_at=Entity.updated_at)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        fixed_relationships = self.db.execute(
+            update(Entity)
+            .where(Entity.relationship_count != relationships)
+            .values(relationship_count=relationships, updated_at=Entity.updated_at)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        return {
+            "attribute_count": fixed_attributes,
+            "relationship_count": fixed_relationships,
+        }
+
+    def get_ids_by_domain(self, domain_id: int) -> List[int]:
+        """Get the IDs of a domain's entities, ordered by name.
+
+        Args:
+            domain_id: Parent domain ID
+
+        Returns:
+            List of entity IDs
+        """
+        stmt = select(Entity.id).where(Entity.domain_id == domain_id).order_by(Entity.name, Entity.id)
+        return list(self.db.scalars(stmt))
+
+    def get_ids_by_superdomain(self, superdomain_id: int) -> List[int]:
+        """Get the IDs of all entities under a superdomain, grouped by domain.
+
+        Args:
+            superdomain_id: Superdomain ID
+
+        Returns:
+            List of entity IDs ordered by domain name, then entity name
+        """
+        stmt = (
+            select(Entity.id)
+            .join(Domain, Domain.id == Entity.domain_id)
+            .where(Domain.superdomain_id == superdomain_id)
+            .order_by(Domain.name, Entity.name, Entity.id)
+        )
+        return list(self.db.scalars(stmt))
+
+    def get_neighbourhood(self, entity_id: int, depth: int) -> List[Tuple[int, int]]:
+        """Get the entities within ``depth`` relationship hops of an entity.
+
+        Walks relationships in both directions with one recursive CTE.
+        ``UNION`` drops repeated (entity, hops) pairs, so the walk is
+        bounded by entities x depth even when relationships form cycles.
+
+        Args:
+            entity_id: Starting entity ID
+            depth: Maximum number of hops
+
+        Returns:
+            (entity ID, hops) pairs ordered by distance; empty if the entity
+            does not exist
+        """
+        # Relationships as undirected edges (each one in both directions)
+        edges = union_all(
+            select(
+                Relationship.source_entity_id.label("entity_id"),
+                Relationship.target_entity_id.label("neighbour_id"),
+            ),
+            select(
+                Relationship.target_entity_id.label("entity_id"),
+                Relationship.source_entity_id.label("neighbour_id"),
+            ),
+        ).subquery("edges")
+
+        hood = (
+            select(Entity.id.label("id"), literal(0).label("hops"))
+            .where(Entity.id == entity_id)
+            .cte("neighbourhood", recursive=True)
+        )
+        hood = hood.union(
+            select(edges.c.neighbour_id, hood.c.hops + 1)
+            .join(hood, edges.c.entity_id == hood.c.id)
+            .where(hood.c.hops < depth)
+        )
+
+        hops = func.min(hood.c.hops)
+        stmt = select(hood.c.id, hops).group_by(hood.c.id).order_by(hops, hood.c.id)
+        return [(row[0], row[1]) for row in self.db.execute(stmt)]
 
     def search_by_name(self, search_term: str, limit: int = 50) -> List[Entity]:
         """Search entities by name (case-insensitive partial match).
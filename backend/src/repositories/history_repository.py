@@ -0,0 +1,250 @@
+"""Diagram operation journal repository for data access."""
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models.diagram_repository import (
+    DiagramObject,
+    DiagramOperation,
+    DiagramRelationship,
+    DiagramSnapshot,
+)
+from .base_repository import BaseRepository
+
+# Tables whose rows journal changes may touch
+JOURNALED_TABLES = {
+    DiagramObject.__tablename__: DiagramObject.__table__,
+    DiagramRelationship.__tablename__: DiagramRelationship.__table__,
+}
+
+
+class DiagramHistoryRepository(BaseRepository[DiagramOperation]):
+    """Repository for the per-diagram operation journal and its snapshots."""
+
+    def __init__(self, db: Session):
+        """Initialize history repository.
+
+        Args:
+            db: Database session
+        """
+        super().__init__(DiagramOperation, db)
+
+    def append(self, diagram_id: int, kind: str, changes: List[Dict[str, Any]]) -> DiagramOperation:
+        """Append an operation to a diagram's journal.
+
+        Args:
+            diagram_id: Diagram ID
+            kind: Operation kind (place, move, remove)
+            changes: Change records
+
+        Returns:
+            Created DiagramOperation instance
+        """
+        return self.create({"diagram_id": diagram_id, "kind": kind, "changes": changes})
+
+    def latest_active(self, diagram_id: int) -> Optional[DiagramOperation]:
+        """Get (and lock) the operation the next undo reverts.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Newest operation that is not undone, or None
+        """
+        stmt = (
+            select(DiagramOperation)
+            .where(DiagramOperation.diagram_id == diagram_id, DiagramOperation.undone.is_(False))
+            .order_by(DiagramOperation.id.desc())
+            .limit(1)
+            .with_for_update()
+        )
+        return self.db.scalars(stmt).first()
+
+    def earliest_undone(self, diagram_id: int) -> Optional[DiagramOperation]:
+        """Get (and lock) the operation the next redo re-applies.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Oldest undone operation, or None
+        """
+        stmt = (
+            select(DiagramOperation)
+            .where(DiagramOperation.diagram_id == diagram_id, DiagramOperation.undone.is_(True))
+            .order_by(DiagramOperation.id)
+            .limit(1)
+            .with_for_update()
+        )
+        return self.db.scalars(stmt).first()
+
+    def has_operations(self, diagram_id: int, undone: bool) -> bool:
+        """Check whether a diagram has active (or undone) operations.
+
+        Args:
+            diagram_id: Diagram ID
+            undone: Look for undone operations instead of active ones
+
+        Returns:
+            True if at least one matches
+        """
+        stmt = select(DiagramOperation.id).where(
+            DiagramOperation.diagram_id == diagram_id, DiagramOperation.undone.is_(undone)
+        )
+        return self.db.scalar(stmt.limit(1)) is not None
+
+    def count_active(self, diagram_id: int) -> int:
+        """Count a diagram's undoable operations.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Number of operations that are not undone
+        """
+        return self.count_where(
+            DiagramOperation.diagram_id == diagram_id, DiagramOperation.undone.is_(False)
+        )
+
+    def discard_undone(self, diagram_id: int) -> int:
+        """Drop a diagram's redo stack (a new edit branches the history).
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Number of operations deleted
+        """
+        stmt = delete(DiagramOperation).where(
+            DiagramOperation.diagram_id == diagram_id, DiagramOperation.undone.is_(True)
+        )
+        return self.db.execute(stmt, execution_options={"synchronize_session": False}).rowcount
+
+    def set_undone(self, operation: DiagramOperation, undone: bool) -> None:
+        """Move an operation between the undo and redo stacks.
+
+        Args:
+            operation: DiagramOperation instance
+            undone: New state
+        """
+        operation.undone = undone
+        self.db.flush()
+
+    def apply(self, changes: Iterable[Dict[str, Any]], side: str) -> None:
+        """Apply one side of a sequence of change records set-wise.
+
+        Consecutive records of the same table and action are applied with
+        one statement: a DELETE ... IN for removals, one multi-row INSERT
+        for restored rows (skipping rows that exist again) and one
+        executemany UPDATE per column set. Columns dropped from a table
+        since the change was journaled are skipped.
+
+        Args:
+            changes: Change records in application order
+            side: "before" (undo) or "after" (redo)
+        """
+        other = "after" if side == "before" else "before"
+
+        def action(change: Dict[str, Any]) -> str:
+            if change[side] is None:
+                return "delete"
+            if change[other] is None:
+                return "insert"
+            return "update"
+
+        def side_values(change: Dict[str, Any]) -> Dict[str, Any]:
+            columns = JOURNALED_TABLES[change["table"]].c
+            return {column: value for column, value in change[side].items() if column in columns}
+
+        def group_key(change: Dict[str, Any]):
+            kind = action(change)
+            columns = tuple(sorted(side_values(change))) if kind != "delete" else ()
+            return change["table"], kind, columns
+
+        for (table_name, kind, columns), group in groupby(changes, key=group_key):
+            table = JOURNALED_TABLES[table_name]
+            group = list(group)
+
+            if kind == "delete":
+                ids = [change["id"] for change in group]
+                self.db.execute(delete(table).where(table.c.id.in_(ids)))
+            elif kind == "insert":
+                rows = [{**side_values(change), "id": change["id"]} for change in group]
+                self.db.execute(insert(table).values(rows).on_conflict_do_nothing())
+            elif columns:
+                stmt = (
+                    update(table)
+                    .where(table.c.id == bindparam("_id"))
+                    .values({column: bindparam(f"_{column}") for column in columns})
+                )
+                self.db.execute(
+                    stmt,
+                    [
+                        {"_id": change["id"], **{f"_{k}": v for k, v in side_values(change).items()}}
+                        for change in group
+                    ],
+                )
+
+    def get_state(self, diagram_id: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Read a diagram's current objects and relationship placements.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Table name -> list of row dicts (all columns)
+        """
+        state = {}
+        for name, table in JOURNALED_TABLES.items():
+            stmt = select(table).where(table.c.diagram_id == diagram_id).order_by(table.c.id)
+            state[name] = [dict(row._mapping) for row in self.db.execute(stmt)]
+        return state
+
+    def active_operations(self, diagram_id: int) -> List[DiagramOperation]:
+        """Get a diagram's undoable operations, newest first.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            List of DiagramOperation instances
+        """
+        stmt = (
+            select(DiagramOperation)
+            .where(DiagramOperation.diagram_id == diagram_id, DiagramOperation.undone.is_(False))
+            .order_by(DiagramOperation.id.desc())
+        )
+        return list(self.db.scalars(stmt))
+
+    def replace_snapshot(
+        self, diagram_id: int, operation_id: int, state: Dict[str, Any]
+    ) -> DiagramSnapshot:
+        """Store a diagram's snapshot and drop the operations it folds in.
+
+        Args:
+            diagram_id: Diagram ID
+            operation_id: Last operation folded into the snapshot
+            state: Diagram state after that operation
+
+        Returns:
+            Created DiagramSnapshot instance
+        """
+        self.db.execute(
+            delete(DiagramSnapshot).where(DiagramSnapshot.diagram_id == diagram_id),
+            execution_options={"synchronize_session": False},
+        )
+        self.db.execute(
+            delete(DiagramOperation).where(
+                DiagramOperation.diagram_id == diagram_id,
+                DiagramOperation.id <= operation_id,
+            ),
+            execution_options={"synchronize_session": False},
+        )
+
+        snapshot = DiagramSnapshot(diagram_id=diagram_id, operation_id=operation_id, state=state)
+        self.db.add(snapshot)
+        self.db.flush()
+        return snapshot
@@ -1,8 +1,10 @@
 """Relationship repository for data access."""
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
+from ..models.object_repository import Entity
 from ..models.relationship import Cardinality, Relationship
 from .base_repository import BaseRepository
 
@@ -87,6 +89,24 @@ class RelationshipRepository(BaseRepository[Relationship]):
             .all()
         )
 
+    def get_edges_among(self, entity_ids: Sequence[int]) -> List[Tuple[int, int]]:
+        """Get the (source, target) pairs of relationships within a set of entities.
+
+        Args:
+            entity_ids: Entity IDs; both ends must be in the set
+
+        Returns:
+            List of (source entity ID, target entity ID) pairs
+        """
+        if not entity_ids:
+            return []
+
+        stmt = select(Relationship.source_entity_id, Relationship.target_entity_id).where(
+            Relationship.source_entity_id.in_(entity_ids),
+            Relationship.target_entity_id.in_(entity_ids),
+        )
+        return [(row[0], row[1]) for row in self.db.execute(stmt)]
+
     def get_with_entities(self, id: int) -> Optional[Relationship]:
         """Get relationship by ID with source and target entities eagerly loaded.
 
@@ -142,17 +162,15 @@ class RelationshipRepository(BaseRepository[Relationship]):
     def count_by_entity(self, entity_id: int) -> int:
         """Count relationships involving an entity.
 
+        Reads the denormalised ``entity.relationship_count`` counter.
+
         Args:
             entity_id: Entity ID
 
         Returns:
             Count of relationships
         """
-        return (
-            self.db.query(Relationship)
-            .filter(
-                (Relationship.source_entity_id == entity_id)
-                | (Relationship.target_entity_id == entity_id)
-            )
-            .count()
+        count = (
+            self.db.query(Entity.relationship_count).filter(Entity.id == entity_id).scalar()
         )
+        return count or 0
@@ -1,6 +1,7 @@
 """Superdomain repository for data access."""
 from typing import Dict, List
 
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from ..models.object_repository import Domain, Entity, Superdomain
@@ -82,21 +83,32 @@ class SuperdomainRepository(BaseRepository[Superdomain]):
         Returns:
             List of dictionaries with superdomain and domain_count
         """
-        from sqlalchemy import func
-
-        results = (
-            self.db.query(Superdomain, func.count(Domain.id).label("domain_count"))
-            .outerjoin(Domain)
-            .group_by(Superdomain.id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        superdomains = self.list(skip=skip, limit=limit)
 
         return [
             {
                 "superdomain": superdomain,
-                "domain_count": domain_count,
+                "domain_count": superdomain.domain_count,
             }
-            for superdomain, domain_count in results
+            for superdomain in superdomains
         ]
+
+    def reconcile_domain_counts(self) -> int:
+        """Repair drift in the denormalised ``superdomain.domain_count`` column.
+
+        Returns:
+            Number of superdomains whose counter was corrected
+        """
+        actual = (
+            select(func.count(Domain.id))
+            .where(Domain.superdomain_id == Superdomain.id)
+            .correlate(Superdomain)
+            .scalar_subquery()
+        )
+        result = self.db.execute(
+            update(Superdomain)
+            .where(Superdomain.domain_count != actual)
+            .values(domain_count=actual, updated_at=Superdomain.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
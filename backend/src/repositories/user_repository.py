@@ -1,6 +1,8 @@
 """User repository for data access."""
-from typing import Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 
+from sqlalchemy import DateTime, Integer, column, update, values
 from sqlalchemy.orm import Session
 
 from ..models.user import User
@@ -61,6 +63,25 @@ class UserRepository(BaseRepository[User]):
             .first()
         )
 
+    def get_projections(self, ids: List[int]) -> List[Dict]:
+        """Get the public {id, username, email} projection for several users.
+
+        Args:
+            ids: User IDs
+
+        Returns:
+            List of projection dicts for the users that exist
+        """
+        if not ids:
+            return []
+
+        rows = (
+            self.db.query(User.id, User.username, User.email)
+            .filter(User.id.in_(ids))
+            .all()
+        )
+        return [{"id": id, "username": username, "email": email} for id, username, email in rows]
+
     def authenticate(self, email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password.
 
@@ -78,13 +99,33 @@ class UserRepository(BaseRepository[User]):
         if not user.check_password(password):
             return None
 
-        # Update last login timestamp
-        from datetime import datetime
+        return user
 
-        user.last_login_at = datetime.utcnow()
-        self.db.commit()
+    def bulk_update_last_login(self, logins: Dict[int, datetime]) -> int:
+        """Set last_login_at for many users in a single UPDATE.
 
-        return user
+        Args:
+            logins: Mapping of user ID to login timestamp
+
+        Returns:
+            Number of rows updated
+        """
+        if not logins:
+            return 0
+
+        rows = values(
+            column("id", Integer),
+            column("last_login_at", DateTime),
+            name="logins",
+        ).data(list(logins.items()))
+
+        result = self.db.execute(
+            update(User)
+            .where(User.id == rows.c.id)
+            .values(last_login_at=rows.c.last_login_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     def email_exists(self, email: str) -> bool:
         """Check if email is already registered.
@@ -142,9 +183,44 @@ class UserRepository(BaseRepository[User]):
             return False
 
         user.is_active = False
-        self.db.commit()
+        user.tokens_valid_after = datetime.utcnow()
+        self.db.flush()
+        return True
+
+    def revoke_tokens(self, id: int, at: Optional[datetime] = None) -> bool:
+        """Revoke every token issued to a user up to a point in time.
+
+        Args:
+            id: User ID
+            at: Watermark (defaults to now)
+
+        Returns:
+            True if revoked, False if not found
+        """
+        user = self.get(id)
+        if not user:
+            return False
+
+        user.tokens_valid_after = at or datetime.utcnow()
+        self.db.flush()
         return True
 
+    def get_revocation_watermarks(self, since: datetime) -> Dict[int, datetime]:
+        """Get revocation watermarks set after a given time.
+
+        Args:
+            since: Only watermarks newer than this are returned
+
+        Returns:
+            Mapping of user ID to tokens_valid_after
+        """
+        rows = (
+            self.db.query(User.id, User.tokens_valid_after)
+            .filter(User.tokens_valid_after > since)
+            .all()
+        )
+        return dict(rows)
+
     def activate_user(self, id: int) -> bool:
         """Reactivate a user.
 
@@ -159,5 +235,5 @@ class UserRepository(BaseRepository[User]):
             return False
 
         user.is_active = True
-        self.db.commit()
+        self.db.flush()
         return True
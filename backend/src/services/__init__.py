@@ -6,6 +6,10 @@ from .attribute_service import AttributeService
 from .relationship_service import RelationshipService
 from .diagram_service import DiagramService
 from .auth_service import AuthService
+from .counter_service import CounterService
+from .bundle_service import DiagramBundleService
+from .history_service import DiagramHistoryService
+from .merge_service import DiagramMergeService
 
 __all__ = [
     'SuperdomainService',
@@ -15,4 +19,8 @@ __all__ = [
     'RelationshipService',
     'DiagramService',
     'AuthService',
+    'CounterService',
+    'DiagramBundleService',
+    'DiagramHistoryService',
+    'DiagramMergeService',
 ]
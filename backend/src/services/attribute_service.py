@@ -1,10 +1,37 @@
 """Attribute service for business logic."""
 from typing import Dict, List, Optional
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..models.object_repository import Attribute
 from ..repositories.attribute_repository import AttributeRepository
+from ..repositories.base_repository import is_foreign_key_violation, is_unique_violation
 from ..repositories.entity_repository import EntityRepository
+from ..utils.projection import Projection
+from ..utils.rank import key_between
+from . import ranking
+
+# Fields selectable on list endpoints (?fields=...); the JSONB rule
+# documents are only fetched when requested explicitly
+ATTRIBUTE_FIELDS = Projection(
+    {
+        "id": Attribute.id,
+        "entityId": Attribute.entity_id,
+        "name": Attribute.name,
+        "dataType": Attribute.data_type,
+        "isNullable": Attribute.is_nullable,
+        "defaultValue": Attribute.default_value,
+        "description": Attribute.description,
+        "constraints": Attribute.constraints,
+        "dataQualityRules": Attribute.data_quality_rules,
+        "position": Attribute.position,
+        "createdAt": Attribute.created_at,
+        "updatedAt": Attribute.updated_at,
+        "version": Attribute.version,
+    },
+    default_exclude=("constraints", "dataQualityRules"),
+)
 
 
 class AttributeService:
@@ -35,23 +62,36 @@ class AttributeService:
 
         return self._to_dict(attribute)
 
-    def list_by_entity(self, entity_id: int) -> Dict:
+    def list_by_entity(
+        self, entity_id: int, fields: Optional[str] = None, columnar: bool = False
+    ) -> Dict:
         """List attributes for an entity.
 
         Args:
             entity_id: Entity ID
+            fields: Optional sparse fieldset (comma-separated field names)
+            columnar: Return {"columns", "rows"} instead of a list of objects
 
         Returns:
-            Dictionary with data list
+            Dictionary with data list (or columns and rows)
+
+        Raises:
+            ValueError: If the entity does not exist or an unknown field is requested
         """
-        # Verify entity exists
-        entity = self.entity_repository.get(entity_id)
-        if not entity:
-            raise ValueError(f"Entity with ID {entity_id} not found")
+        fields = ATTRIBUTE_FIELDS.parse_fields(fields)
 
-        attributes = self.repository.get_by_entity(entity_id)
+        rows = self.repository.list_rows(
+            ATTRIBUTE_FIELDS.columns(fields),
+            Attribute.entity_id == entity_id,
+            limit=None,
+            order_by=[Attribute.position, Attribute.id],
+        )
 
-        return {"data": [self._to_dict(a) for a in attributes]}
+        # An empty page is ambiguous; only then check that the entity exists
+        if not rows and not self.entity_repository.get(entity_id):
+            raise ValueError(f"Entity with ID {entity_id} not found")
+
+        return ATTRIBUTE_FIELDS.render(rows, fields, columnar)
 
     def create(self, entity_id: int, data: Dict, user_id: Optional[int] = None) -> Dict:
         """Create new attribute.
@@ -67,11 +107,6 @@ class AttributeService:
         Raises:
             ValueError: If validation fails
         """
-        # Verify entity exists
-        entity = self.entity_repository.get(entity_id)
-        if not entity:
-            raise ValueError(f"Entity with ID {entity_id} not found")
-
         # Validation
         name = data.get("name", "").strip()
         if not name:
@@ -80,27 +115,23 @@ class AttributeService:
         if len(name) > 100:
             raise ValueError("Attribute name must be 100 characters or less")
 
-        # Check unique constraint: (entity_id, name)
-        existing = self.repository.get_by_name_and_entity(name, entity_id)
-        if existing:
-            raise ValueError(
-                f"Attribute with name '{name}' already exists in entity '{entity.name}'"
-            )
-
         # Validate data type
         data_type = data.get("dataType")
         if not data_type:
             raise ValueError("Data type is required")
 
         if not self.repository.validate_data_type(data_type):
-            from ..models.object_repository import Attribute
-
             valid_types = ", ".join(Attribute.VALID_DATA_TYPES)
             raise ValueError(
                 f"Invalid data type '{data_type}'. Must be one of: {valid_types}"
             )
 
-        # Create
+        # New attributes go last
+        position = key_between(self.repository.get_last_position(entity_id), None)
+        ranking.rebalance_if_long(position, Attribute, "entity_id", entity_id, "position")
+
+        # Create; the entity FK and (entity_id, name) unique constraint are
+        # enforced by the INSERT itself
         create_data = {
             "entity_id": entity_id,
             "name": name,
@@ -110,29 +141,44 @@ class AttributeService:
             "description": data.get("description"),
             "constraints": data.get("constraints"),
             "data_quality_rules": data.get("dataQualityRules"),
+            "position": position,
             "created_by": user_id,
         }
 
-        attribute = self.repository.create(create_data)
+        try:
+            attribute = self.repository.create_unique(
+                create_data, constraint="uq_attribute_entity_name"
+            )
+        except IntegrityError as e:
+            if is_foreign_key_violation(e):
+                raise ValueError(f"Entity with ID {entity_id} not found") from e
+            raise
+
+        if attribute is None:
+            entity = self.entity_repository.get(entity_id)
+            raise ValueError(
+                f"Attribute with name '{name}' already exists in entity '{entity.name}'"
+            )
+
         return self._to_dict(attribute)
 
-    def update(self, id: int, data: Dict) -> Optional[Dict]:
+    def update(
+        self, id: int, data: Dict, expected_version: Optional[int] = None
+    ) -> Optional[Dict]:
         """Update attribute.
 
         Args:
             id: Attribute ID
             data: Fields to update
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Updated attribute dict or None
 
         Raises:
             ValueError: If validation fails
+            StaleVersionError: If the row changed since ``expected_version``
         """
-        attribute = self.repository.get(id)
-        if not attribute:
-            return None
-
         # Validation
         if "name" in data:
             name = data["name"].strip()
@@ -142,44 +188,82 @@ class AttributeService:
             if len(name) > 100:
                 raise ValueError("Attribute name must be 100 characters or less")
 
-            # Check unique constraint (excluding current attribute)
-            existing = self.repository.get_by_name_and_entity(name, attribute.entity_id)
-            if existing and existing.id != id:
-                raise ValueError(
-                    f"Attribute with name '{name}' already exists in this entity"
-                )
-
         if "dataType" in data:
-            data_type = data["dataType"]
-            if not self.repository.validate_data_type(data_type):
-                from ..models.object_repository import Attribute
+            data["data_type"] = data.pop("dataType")
 
+        if "data_type" in data:
+            data_type = data["data_type"]
+            if not self.repository.validate_data_type(data_type):
                 valid_types = ", ".join(Attribute.VALID_DATA_TYPES)
                 raise ValueError(
                     f"Invalid data type '{data_type}'. Must be one of: {valid_types}"
                 )
 
-        # Update
-        updated = self.repository.update(id, data)
+        # Update; the (entity_id, name) unique constraint is enforced by the UPDATE
+        try:
+            updated = self.repository.update(id, data, expected_version)
+        except IntegrityError as e:
+            if is_unique_violation(e):
+                raise ValueError(
+                    f"Attribute with name '{data['name'].strip()}' already exists in this entity"
+                ) from e
+            raise
+
+        return self._to_dict(updated) if updated else None
+
+    def move(
+        self, id: int, data: Dict, expected_version: Optional[int] = None
+    ) -> Optional[Dict]:
+        """Move an attribute within its entity's column order.
+
+        ``data`` is ``{"after": <id>}``, ``{"before": <id>}`` or
+        ``{"to": "first" | "last"}``. Only the moved attribute is
+        rewritten: it gets a position key between its new neighbours'
+        (see ``ranking.move``).
+
+        Args:
+            id: Attribute ID
+            data: Move instruction
+            expected_version: Version the client last saw (None = any)
+
+        Returns:
+            Updated attribute dict, or None if the attribute or the anchor
+            does not exist (or they belong to different entities)
+
+        Raises:
+            ValueError: If the move instruction is invalid
+            StaleVersionError: If the row changed since ``expected_version``
+        """
+        anchor_id, after = ranking.parse_move(data, first="first", last="last")
+        moved = ranking.move(self.repository, id, "entity_id", "position", anchor_id, after)
+        if moved is None:
+            return None
+
+        # Already in place: nothing to write, but still honour If-Match
+        _, current, position = moved
+        changes = {"position": position} if position != current else {}
+        updated = self.repository.update(id, changes, expected_version)
         return self._to_dict(updated) if updated else None
 
-    def delete(self, id: int) -> Dict:
+    def delete(self, id: int, expected_version: Optional[int] = None) -> Dict:
         """Delete attribute.
 
         Args:
             id: Attribute ID
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Success message
 
         Raises:
             ValueError: If attribute not found
+            StaleVersionError: If the row changed since ``expected_version``
         """
         attribute = self.repository.get(id)
         if not attribute:
             raise ValueError("Attribute not found")
 
-        self.repository.delete(id)
+        self.repository.delete(id, expected_version)
 
         return {
             "message": f"Attribute '{attribute.name}' deleted successfully",
@@ -204,6 +288,8 @@ class AttributeService:
             "description": attribute.description,
             "constraints": attribute.constraints,
             "dataQualityRules": attribute.data_quality_rules,
-            "createdAt": attribute.created_at.isoformat() if attribute.created_at else None,
-            "updatedAt": attribute.updated_at.isoformat() if attribute.updated_at else None,
+            "position": attribute.position,
+            "createdAt": attribute.created_at,
+            "updatedAt": attribute.updated_at,
+            "version": attribute.version,
         }
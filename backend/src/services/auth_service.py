@@ -1,5 +1,6 @@
 """Authentication service for business logic."""
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 
@@ -8,6 +9,8 @@ from sqlalchemy.orm import Session
 
 from ..models.user import AuthProvider
 from ..repositories.user_repository import UserRepository
+from .login_tracker import record_login
+from .token_revocation import revocation_list
 
 
 class AuthService:
@@ -116,6 +119,9 @@ class AuthService:
         if not user.is_active:
             raise ValueError("Account is deactivated")
 
+        # Buffered; flushed in bulk by the login tracker
+        record_login(user.id)
+
         # Generate token
         token = self._generate_token(user.id, user.email)
 
@@ -124,6 +130,28 @@ class AuthService:
             "user": self._user_to_dict(user),
         }
 
+    def logout(self, user_id: int) -> Dict:
+        """Sign a user out everywhere by revoking every token issued so far.
+
+        The watermark is written to the user row (polled by every worker)
+        and applied to this worker's revocation list right away.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Success message
+
+        Raises:
+            ValueError: If the user is not found
+        """
+        revoked_at = datetime.utcnow()
+        if not self.repository.revoke_tokens(user_id, at=revoked_at):
+            raise ValueError("User not found")
+
+        revocation_list.revoke(user_id, at=revoked_at)
+        return {"message": "Logged out"}
+
     def verify_token(self, token: str) -> Optional[Dict]:
         """Verify JWT token and return user data.
 
@@ -182,7 +210,9 @@ class AuthService:
             "user_id": user_id,
             "email": email,
             "exp": expiry,
-            "iat": datetime.utcnow(),
+            # Sub-second, so a token issued right after a revocation in the
+            # same second is not mistaken for an older one
+            "iat": time.time(),
         }
 
         token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
@@ -202,5 +232,5 @@ class AuthService:
             "email": user.email,
             "username": user.username,
             "fullName": user.full_name,
-            "createdAt": user.created_at.isoformat() if user.created_at else None,
+            "createdAt": user.created_at,
         }
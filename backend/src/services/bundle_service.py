@@ -0,0 +1,236 @@
+"""Editor bootstrap bundles: a diagram plus everything it references."""
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.diagram_repository import Diagram, ObjectType
+from ..models.object_repository import Attribute, Domain, Entity, Superdomain
+from ..models.relationship import Relationship
+from ..repositories.attribute_repository import AttributeRepository
+from ..repositories.diagram_repository import DiagramRepository
+from ..repositories.domain_repository import DomainRepository
+from ..repositories.entity_repository import EntityRepository
+from ..repositories.relationship_repository import RelationshipRepository
+from ..repositories.superdomain_repository import SuperdomainRepository
+from ..utils.cache import LRUCache
+from ..utils.projection import Projection
+from . import level_of_detail, position_buffer
+from .attribute_service import ATTRIBUTE_FIELDS
+from .diagram_service import DIAGRAM_FIELDS, DIAGRAM_OBJECT_FIELDS, DIAGRAM_RELATIONSHIP_FIELDS
+from .domain_service import DOMAIN_FIELDS
+from .entity_service import ENTITY_FIELDS
+from .relationship_service import RELATIONSHIP_FIELDS
+from .superdomain_service import SUPERDOMAIN_FIELDS
+
+# Bundles keyed on (diagram id, change version, level of detail); a bump
+# makes old keys unreachable
+_bundle_cache = LRUCache(
+    maxsize=int(os.getenv("DIAGRAM_BUNDLE_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("DIAGRAM_BUNDLE_CACHE_TTL", "300")),
+)
+
+# The editor renders creators elsewhere; skip the per-bundle user lookup
+_SUPERDOMAIN_BUNDLE_FIELDS = tuple(f for f in SUPERDOMAIN_FIELDS.default_fields if f != "createdBy")
+
+
+class DiagramBundleService:
+    """Assembles the data ``DiagramEditor`` needs to open a diagram.
+
+    A bundle is built from a fixed number of queries regardless of diagram
+    size: the diagram, its objects and relationship placements, then one
+    ``IN``-list query each for the entities, domains, superdomains,
+    attributes and relationships they reference. Bundles are cached per
+    ``diagram.change_version``, which database triggers bump whenever any
+    of that data changes, so a cache hit costs a single version lookup.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize bundle service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+        self.diagram_repository = DiagramRepository(db)
+        self.entity_repository = EntityRepository(db)
+        self.domain_repository = DomainRepository(db)
+        self.superdomain_repository = SuperdomainRepository(db)
+        self.attribute_repository = AttributeRepository(db)
+        self.relationship_repository = RelationshipRepository(db)
+
+    def get_version(self, diagram_id: int) -> Optional[int]:
+        """Get the change version a bundle would be built for.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Change version, or None if the diagram does not exist
+        """
+        return self.diagram_repository.get_change_version(diagram_id)
+
+    def get(
+        self,
+        diagram_id: int,
+        version: Optional[int] = None,
+        pending: Optional[Dict[int, Tuple[float, float]]] = None,
+        lod: str = level_of_detail.DEFAULT_LOD,
+    ) -> Optional[Dict]:
+        """Get the editor bundle for a diagram.
+
+        Object positions still waiting in ``position_buffer`` are merged
+        into a copy of the (cached) bundle.
+
+        At ``lod="overview"`` the bundle is only the diagram with its
+        packed boxes and lines (see ``level_of_detail.pack_overview``): no
+        referenced entities, attributes or styles, which is all a
+        zoomed-out canvas draws. ``lod="full"`` adds the fields left out by
+        default: relationship routing points and attribute rules.
+
+        Args:
+            diagram_id: Diagram ID
+            version: Change version if already known (saves a query)
+            pending: Buffered positions if already known
+            lod: Level of detail ("overview", "normal" or "full")
+
+        Returns:
+            Bundle dict or None if the diagram does not exist
+        """
+        if version is None:
+            version = self.get_version(diagram_id)
+            if version is None:
+                return None
+
+        key = (diagram_id, version, lod)
+        bundle = _bundle_cache.get(key)
+        if bundle is None:
+            bundle = self._build(diagram_id, version, lod)
+            if bundle is None:
+                return None
+            _bundle_cache.set(key, bundle)
+
+        if pending is None:
+            pending = position_buffer.pending_positions(diagram_id)
+        if pending and lod == "overview":
+            bundle = level_of_detail.with_positions(bundle, pending)
+        elif pending:
+            bundle = {
+                **bundle,
+                "objects": [
+                    {**obj, "positionX": pending[obj["id"]][0], "positionY": pending[obj["id"]][1]}
+                    if obj["id"] in pending
+                    else obj
+                    for obj in bundle["objects"]
+                ],
+            }
+
+        return bundle
+
+    def _build(self, diagram_id: int, version: int, lod: str) -> Optional[Dict]:
+        """Run the bundle queries."""
+        diagram_fields = DIAGRAM_FIELDS.field_names
+        diagram_rows = self.diagram_repository.list_rows(
+            DIAGRAM_FIELDS.columns(diagram_fields),
+            Diagram.id == diagram_id,
+            limit=1,
+        )
+        if not diagram_rows:
+            return None
+
+        diagram = DIAGRAM_FIELDS.to_dicts(diagram_rows, diagram_fields)[0]
+        diagram["changeVersion"] = version
+
+        if lod == "overview":
+            return {
+                "diagram": diagram,
+                "lod": lod,
+                **level_of_detail.pack_overview(
+                    self.diagram_repository.get_object_hierarchy_rows(diagram_id),
+                    self.diagram_repository.get_edge_rows(diagram_id),
+                ),
+            }
+
+        object_fields = level_of_detail.fields(DIAGRAM_OBJECT_FIELDS, lod)
+        objects = DIAGRAM_OBJECT_FIELDS.to_dicts(
+            self.diagram_repository.get_object_rows(
+                diagram_id, DIAGRAM_OBJECT_FIELDS.columns(object_fields)
+            ),
+            object_fields,
+        )
+        placement_fields = level_of_detail.fields(DIAGRAM_RELATIONSHIP_FIELDS, lod)
+        placements = DIAGRAM_RELATIONSHIP_FIELDS.to_dicts(
+            self.diagram_repository.get_relationship_rows(
+                diagram_id, DIAGRAM_RELATIONSHIP_FIELDS.columns(placement_fields)
+            ),
+            placement_fields,
+        )
+
+        placed = {object_type.value: set() for object_type in ObjectType}
+        for obj in objects:
+            placed[obj["objectType"]].add(obj["objectId"])
+
+        entities = self._fetch(
+            self.entity_repository, ENTITY_FIELDS, Entity.id, placed[ObjectType.ENTITY.value]
+        )
+        domains = self._fetch(
+            self.domain_repository,
+            DOMAIN_FIELDS,
+            Domain.id,
+            placed[ObjectType.DOMAIN.value] | {e["domainId"] for e in entities},
+        )
+        superdomains = self._fetch(
+            self.superdomain_repository,
+            SUPERDOMAIN_FIELDS,
+            Superdomain.id,
+            placed[ObjectType.SUPERDOMAIN.value] | {d["superdomainId"] for d in domains},
+            fields=_SUPERDOMAIN_BUNDLE_FIELDS,
+        )
+        attributes = self._fetch(
+            self.attribute_repository,
+            ATTRIBUTE_FIELDS,
+            Attribute.entity_id,
+            {e["id"] for e in entities},
+            fields=level_of_detail.fields(ATTRIBUTE_FIELDS, lod),
+            order_by=[Attribute.entity_id, Attribute.position, Attribute.id],
+        )
+        relationships = self._fetch(
+            self.relationship_repository,
+            RELATIONSHIP_FIELDS,
+            Relationship.id,
+            {p["relationshipId"] for p in placements},
+        )
+
+        return {
+            "diagram": diagram,
+            "objects": objects,
+            "diagramRelationships": placements,
+            "superdomains": superdomains,
+            "domains": domains,
+            "entities": entities,
+            "attributes": attributes,
+            "relationships": relationships,
+        }
+
+    @staticmethod
+    def _fetch(
+        repository,
+        projection: Projection,
+        key_column,
+        ids: Iterable[int],
+        fields: Optional[Sequence[str]] = None,
+        order_by: Optional[Sequence] = None,
+    ) -> List[Dict]:
+        """Fetch projected rows whose key is in ``ids`` with one query."""
+        ids = sorted(ids)
+        if not ids:
+            return []
+
+        fields = fields or projection.default_fields
+        rows = repository.list_rows(
+            projection.columns(fields),
+            key_column.in_(ids),
+            limit=None,
+            order_by=order_by,
+        )
+        return projection.to_dicts(rows, fields)
@@ -0,0 +1,61 @@
+"""Container (superdomain/domain) bounds kept fitted around their contents."""
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from ..models.diagram_repository import DiagramObject
+from ..repositories.diagram_repository import DiagramRepository
+from . import diagram_events
+
+# A container's fitted bounds as {"x", "y", "width", "height"}, or null
+BOUNDS = case(
+    (DiagramObject.bounds_x.is_(None), None),
+    else_=func.json_build_object(
+        "x", DiagramObject.bounds_x,
+        "y", DiagramObject.bounds_y,
+        "width", DiagramObject.bounds_width,
+        "height", DiagramObject.bounds_height,
+    ),
+)
+
+
+def refit(
+    db: Session,
+    diagram_id: int,
+    object_ids: Optional[Iterable[int]] = None,
+    exclude: Iterable[int] = (),
+) -> List[Dict[str, Any]]:
+    """Refit the containers affected by a write and announce new bounds.
+
+    Only the containers the written objects sit in (and written
+    containers themselves) are refitted, so a move touches its ancestor
+    chain rather than the whole diagram. Call after the write, or collect
+    the chain with ``DiagramRepository.get_container_chain()`` before a
+    delete and pass it as ``object_ids``.
+
+    Args:
+        db: Database session of the write
+        diagram_id: Diagram ID
+        object_ids: DiagramObject IDs written (None = refit every container)
+        exclude: Container IDs not to refit (e.g. deleted ones)
+
+    Returns:
+        [{"id", "bounds"}] of the containers whose bounds changed
+    """
+    repository = DiagramRepository(db)
+    container_ids = None
+    if object_ids is not None:
+        exclude = set(exclude)
+        container_ids = [
+            id for id in repository.get_container_chain(diagram_id, object_ids)
+            if id not in exclude
+        ]
+
+    rows = repository.refit_containers(
+        diagram_id, [DiagramObject.id.label("id"), BOUNDS.label("bounds")], container_ids
+    )
+    changed = [{"id": row.id, "bounds": row.bounds} for row in rows]
+    if changed:
+        diagram_events.publish(db, diagram_id, "bounds", changed)
+    return changed
@@ -0,0 +1,41 @@
+"""Counter service for denormalised child counts."""
+from typing import Dict
+
+from sqlalchemy.orm import Session
+
+from ..repositories.domain_repository import DomainRepository
+from ..repositories.entity_repository import EntityRepository
+from ..repositories.superdomain_repository import SuperdomainRepository
+
+
+class CounterService:
+    """Service for reconciling denormalised child counters with actual row counts."""
+
+    def __init__(self, db: Session):
+        """Initialize counter service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+        self.superdomain_repository = SuperdomainRepository(db)
+        self.domain_repository = DomainRepository(db)
+        self.entity_repository = EntityRepository(db)
+
+    def reconcile(self) -> Dict[str, int]:
+        """Recompute every child counter and repair rows that drifted.
+
+        The triggers keep counters exact during normal operation; this job
+        catches drift from manual data fixes or restores that bypassed them.
+
+        Returns:
+            Number of corrected rows per counter
+        """
+        entity_fixes = self.entity_repository.reconcile_counts()
+
+        return {
+            "domainCount": self.superdomain_repository.reconcile_domain_counts(),
+            "entityCount": self.domain_repository.reconcile_entity_counts(),
+            "attributeCount": entity_fixes["attribute_count"],
+            "relationshipCount": entity_fixes["relationship_count"],
+        }
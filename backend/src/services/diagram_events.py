@@ -0,0 +1,335 @@
+"""Real-time diagram change feed: NOTIFY on write, one LISTEN fan-out per worker."""
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+from collections import defaultdict
+from itertools import count
+from typing import Any, Dict, Optional, Set
+
+import psycopg2
+import psycopg2.extensions
+from sqlalchemy import func
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import Session
+
+from ..utils.database import engine
+
+logger = logging.getLogger(__name__)
+
+DIAGRAM_EVENTS_CHANNEL = "diagram_events"
+
+# Upper bound on coalesced (drag) events per diagram per second
+DIAGRAM_EVENTS_MAX_RATE = float(os.getenv("DIAGRAM_EVENTS_MAX_RATE", "10"))
+
+# Events buffered per subscriber; a subscriber that falls this far behind
+# is told to resync instead of being sent the backlog
+DIAGRAM_EVENTS_QUEUE_SIZE = int(os.getenv("DIAGRAM_EVENTS_QUEUE_SIZE", "256"))
+
+# Seconds between reconnection attempts of the listener
+DIAGRAM_EVENTS_RECONNECT_SECONDS = float(os.getenv("DIAGRAM_EVENTS_RECONNECT_SECONDS", "2"))
+
+# NOTIFY payloads must stay below 8000 bytes
+_MAX_PAYLOAD_BYTES = 7900
+
+# Event kinds where only the latest value per object matters
+COALESCED_KINDS = frozenset({"move"})
+
+
+def publish(db: Session, diagram_id: int, kind: str, data: Any = None) -> None:
+    """Emit a diagram change event from a write path.
+
+    The event is sent with ``pg_notify`` on the caller's transaction, so
+    listeners only see it once (and if) the unit of work commits. Payloads
+    too large for NOTIFY are sent without data and marked ``truncated``;
+    clients then reload the diagram.
+
+    Args:
+        db: Database session of the write
+        diagram_id: Diagram ID
+        kind: Event kind (place, move, restack, remove, merge, undo, redo, bounds,
+            update, delete)
+        data: JSON-serialisable event data
+    """
+    payload = json.dumps(
+        {"diagramId": diagram_id, "kind": kind, "data": data},
+        separators=(",", ":"),
+        default=str,
+    )
+    if len(payload.encode()) > _MAX_PAYLOAD_BYTES:
+        payload = json.dumps(
+            {"diagramId": diagram_id, "kind": kind, "data": None, "truncated": True},
+            separators=(",", ":"),
+        )
+
+    db.execute(sql_select(func.pg_notify(DIAGRAM_EVENTS_CHANNEL, payload)))
+
+
+def format_sse(event_id: Optional[int], kind: str, data: Any) -> str:
+    """Format one Server-Sent Events frame.
+
+    Args:
+        event_id: Event ID (None to omit)
+        kind: Event name
+        data: JSON-serialisable data
+
+    Returns:
+        SSE frame text
+    """
+    frame = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{frame}event: {kind}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+class Subscription:
+    """One client's view of a diagram's event stream."""
+
+    def __init__(self, diagram_id: int, maxsize: int):
+        """Initialize subscription.
+
+        Args:
+            diagram_id: Diagram ID
+            maxsize: Frames buffered before the client is told to resync
+        """
+        self.diagram_id = diagram_id
+        self._frames: "queue.Queue[str]" = queue.Queue(maxsize)
+
+    def get(self, timeout: float) -> Optional[str]:
+        """Wait for the next SSE frame.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            Frame text, or None if nothing arrived in time
+        """
+        try:
+            return self._frames.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def put(self, frame: str, resync: str) -> None:
+        """Deliver a frame, replacing the backlog with ``resync`` if full."""
+        try:
+            self._frames.put_nowait(frame)
+        except queue.Full:
+            while True:
+                try:
+                    self._frames.get_nowait()
+                except queue.Empty:
+                    break
+            self._frames.put_nowait(resync)
+
+
+class DiagramEventHub:
+    """Fans diagram change notifications out to this worker's subscribers.
+
+    A single daemon thread holds one dedicated connection that LISTENs on
+    ``DIAGRAM_EVENTS_CHANNEL``, however many editors are open. Each
+    notification is formatted into an SSE frame once and queued to every
+    subscriber of its diagram. ``move`` events are coalesced per diagram:
+    only the latest position of each object is kept and they go out as a
+    single batched event at most ``max_rate`` times a second. After a
+    listener reconnect (when notifications may have been missed) every
+    subscriber gets a ``resync`` event.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = DIAGRAM_EVENTS_MAX_RATE,
+        queue_size: int = DIAGRAM_EVENTS_QUEUE_SIZE,
+    ):
+        """Initialize hub.
+
+        Args:
+            max_rate: Coalesced events per diagram per second
+            queue_size: Frames buffered per subscriber
+        """
+        self.interval = 1.0 / max_rate
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._pending: Dict[int, Dict[Any, Any]] = {}
+        self._due: Dict[int, float] = {}
+        self._last_flush: Dict[int, float] = {}
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, diagram_id: int) -> Subscription:
+        """Start receiving a diagram's events.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Subscription to read frames from
+        """
+        subscription = Subscription(diagram_id, self.queue_size)
+        with self._lock:
+            self._subscribers[diagram_id].add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="diagram-events", daemon=True
+                )
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop receiving events.
+
+        Args:
+            subscription: Subscription returned by ``subscribe()``
+        """
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.diagram_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.diagram_id]
+                    self._pending.pop(subscription.diagram_id, None)
+                    self._due.pop(subscription.diagram_id, None)
+                    self._last_flush.pop(subscription.diagram_id, None)
+
+    def dispatch(self, payload: str, now: Optional[float] = None) -> None:
+        """Route one NOTIFY payload to the diagram's subscribers.
+
+        Args:
+            payload: JSON payload written by ``publish()``
+            now: Current monotonic time (for tests)
+        """
+        now = time.monotonic() if now is None else now
+        try:
+            event = json.loads(payload)
+            diagram_id = event["diagramId"]
+            kind = event["kind"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed diagram event: %.200s", payload)
+            return
+
+        with self._lock:
+            if diagram_id not in self._subscribers:
+                return
+
+            data = event.get("data")
+            # One object's change, or a list of them (bulk position flushes)
+            changes = [data] if isinstance(data, dict) else data
+            if (
+                kind in COALESCED_KINDS
+                and isinstance(changes, list)
+                and changes
+                and all(isinstance(change, dict) and "id" in change for change in changes)
+            ):
+                pending = self._pending.setdefault(diagram_id, {})
+                for change in changes:
+                    pending[change["id"]] = change
+                if diagram_id not in self._due:
+                    self._due[diagram_id] = max(
+                        now, self._last_flush.get(diagram_id, 0.0) + self.interval
+                    )
+                if self._due[diagram_id] <= now:
+                    self._flush(diagram_id, now)
+                return
+
+            # Keep order: positions dragged before this event go out first
+            self._flush(diagram_id, now)
+            body = {"kind": kind, "data": data}
+            if event.get("truncated"):
+                body["truncated"] = True
+            self._broadcast(diagram_id, kind, body)
+
+    def flush_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Send coalesced events whose interval has elapsed.
+
+        Args:
+            now: Current monotonic time (for tests)
+
+        Returns:
+            Seconds until the next coalesced event is due, or None
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for diagram_id, due in list(self._due.items()):
+                if due <= now:
+                    self._flush(diagram_id, now)
+            if not self._due:
+                return None
+            return max(0.0, min(self._due.values()) - now)
+
+    def shutdown(self) -> None:
+        """Stop the listener thread."""
+        self._stop.set()
+
+    def _flush(self, diagram_id: int, now: float) -> None:
+        """Send a diagram's pending coalesced moves (caller holds the lock)."""
+        self._due.pop(diagram_id, None)
+        pending = self._pending.pop(diagram_id, None)
+        if not pending:
+            return
+
+        self._last_flush[diagram_id] = now
+        self._broadcast(diagram_id, "move", {"kind": "move", "data": list(pending.values())})
+
+    def _broadcast(self, diagram_id: int, kind: str, body: Dict[str, Any]) -> None:
+        """Queue one event to every subscriber of a diagram (caller holds the lock)."""
+        event_id = next(self._ids)
+        frame = format_sse(event_id, kind, body)
+        resync = format_sse(event_id, "resync", {"kind": "resync", "data": None})
+        for subscription in self._subscribers.get(diagram_id, ()):
+            subscription.put(frame, resync)
+
+    def _resync_all(self) -> None:
+        """Tell every subscriber it may have missed events."""
+        with self._lock:
+            self._pending.clear()
+            self._due.clear()
+            for diagram_id in list(self._subscribers):
+                self._broadcast(diagram_id, "resync", {"kind": "resync", "data": None})
+
+    def _connect(self):
+        """Open the dedicated LISTEN connection (outside the request pool)."""
+        args = engine.url.translate_connect_args(username="user", database="dbname")
+        connection = psycopg2.connect(**args, **engine.url.query)
+        connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {DIAGRAM_EVENTS_CHANNEL}")
+        return connection
+
+    def _run(self) -> None:
+        """Listen for notifications and flush coalesced events until stopped."""
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                connection = self._connect()
+            except Exception:
+                logger.exception("Diagram event listener could not connect; retrying")
+                self._stop.wait(DIAGRAM_EVENTS_RECONNECT_SECONDS)
+                continue
+
+            if connected_before:
+                self._resync_all()
+            connected_before = True
+
+            try:
+                while not self._stop.is_set():
+                    timeout = self.flush_due()
+                    if timeout is None:
+                        timeout = DIAGRAM_EVENTS_RECONNECT_SECONDS
+                    ready, _, _ = select.select([connection], [], [], timeout)
+                    if ready:
+                        connection.poll()
+                        while connection.notifies:
+                            self.dispatch(connection.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Diagram event listener failed; reconnecting")
+            finally:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+
+# Shared by all requests of this worker
+event_hub = DiagramEventHub()
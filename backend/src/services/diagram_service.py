@@ -1,9 +1,88 @@
 """Diagram service for business logic."""
-from typing import Dict, List, Optional
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..models.diagram_repository import Diagram, DiagramObject, DiagramRelationship, ObjectType
+from ..repositories.base_repository import is_foreign_key_violation, is_unique_violation
 from ..repositories.diagram_repository import DiagramRepository
+from ..repositories.domain_repository import DomainRepository
+from ..repositories.entity_repository import EntityRepository
+from ..repositories.relationship_repository import RelationshipRepository
+from ..repositories.superdomain_repository import SuperdomainRepository
+from ..utils import layout
+from ..utils.hlc import server_clock
+from ..utils.placement import OccupancyGrid, place_many
+from ..utils.projection import Projection, enum_value
+from ..utils.rank import is_rank, keys_between
+from . import containers, diagram_events, level_of_detail, position_buffer, ranking
+from .history_service import DiagramHistoryService, change
+
+# Fields selectable on list endpoints (?fields=...); canvas settings are
+# only needed to render a diagram, so lists skip them unless requested
+DIAGRAM_FIELDS = Projection(
+    {
+        "id": Diagram.id,
+        "name": Diagram.name,
+        "description": Diagram.description,
+        "purpose": Diagram.purpose,
+        "tags": (Diagram.tags, lambda tags: tags or []),
+        "canvasSettings": Diagram.canvas_settings,
+        "createdAt": Diagram.created_at,
+        "updatedAt": Diagram.updated_at,
+        "version": Diagram.version,
+    },
+    default_exclude=("canvasSettings",),
+)
+
+DIAGRAM_OBJECT_FIELDS = Projection(
+    {
+        "id": DiagramObject.id,
+        "objectType": (DiagramObject.object_type, enum_value),
+        "objectId": DiagramObject.object_id,
+        "positionX": DiagramObject.position_x,
+        "positionY": DiagramObject.position_y,
+        "width": DiagramObject.width,
+        "height": DiagramObject.height,
+        "zRank": DiagramObject.z_rank,
+        "bounds": containers.BOUNDS,
+        "visualStyle": DiagramObject.visual_style,
+        "isCollapsed": DiagramObject.is_collapsed,
+    }
+)
+
+DIAGRAM_RELATIONSHIP_FIELDS = Projection(
+    {
+        "id": DiagramRelationship.id,
+        "relationshipId": DiagramRelationship.relationship_id,
+        "isVisible": DiagramRelationship.is_visible,
+        "sourceAnchor": DiagramRelationship.source_anchor,
+        "targetAnchor": DiagramRelationship.target_anchor,
+        "visualStyle": DiagramRelationship.visual_style,
+        "pathPoints": DiagramRelationship.path_points,
+    },
+    default_exclude=("pathPoints",),
+)
+
+# Upper bound on objects placed by one bulk add (one INSERT statement)
+DIAGRAM_BULK_MAX_OBJECTS = int(os.getenv("DIAGRAM_BULK_MAX_OBJECTS", "500"))
+
+# Limits for generated diagrams
+DIAGRAM_GENERATE_MAX_OBJECTS = int(os.getenv("DIAGRAM_GENERATE_MAX_OBJECTS", "2000"))
+DIAGRAM_GENERATE_MAX_DEPTH = int(os.getenv("DIAGRAM_GENERATE_MAX_DEPTH", "5"))
+
+DIAGRAM_LAYOUTS = ("grid", "layered")
+
+DIAGRAM_PLACEMENTS = ("auto",)
+
+
+def _publish_restack(db: Session, diagram_id: int, rows: List) -> None:
+    """Announce the z-order keys a rebalance gave a diagram's objects."""
+    diagram_events.publish(
+        db, diagram_id, "restack", [{"id": row.id, "zRank": row.z_rank} for row in rows]
+    )
 
 
 class DiagramService:
@@ -17,26 +96,77 @@ class DiagramService:
         """
         self.db = db
         self.repository = DiagramRepository(db)
+        self.entity_repository = EntityRepository(db)
+        self.domain_repository = DomainRepository(db)
+        self.superdomain_repository = SuperdomainRepository(db)
+        self.relationship_repository = RelationshipRepository(db)
+        self.history = DiagramHistoryService(db)
 
-    def get_by_id(self, id: int, include_details: bool = True) -> Optional[Dict]:
+    def get_by_id(
+        self,
+        id: int,
+        include_details: bool = True,
+        columnar: bool = False,
+        lod: str = level_of_detail.DEFAULT_LOD,
+    ) -> Optional[Dict]:
         """Get diagram by ID.
 
+        Objects and relationships are read as plain rows with one query
+        each, rather than through a joined eager load whose result set is
+        the product of both collections. Object positions still waiting in
+        ``position_buffer`` are merged in, so a client reads back its own
+        drags before they are flushed. Objects come in paint order
+        (containers directly below their contents) with containers' fitted
+        bounds, so clients draw them without walking the hierarchy.
+
         Args:
             id: Diagram ID
             include_details: Whether to include objects and relationships
+            columnar: Return each collection as {"columns", "rows"}
+            lod: Level of detail of the collections: "overview" (packed
+                boxes and lines, see ``level_of_detail.pack_overview``),
+                "normal" or "full" (adds relationship routing points)
 
         Returns:
             Diagram dict or None
         """
-        if include_details:
-            diagram = self.repository.get_with_details(id)
-        else:
-            diagram = self.repository.get(id)
-
+        diagram = self.repository.get(id)
         if not diagram:
             return None
 
-        return self._to_dict(diagram, include_details=include_details)
+        result = self._to_dict(diagram)
+        if not include_details:
+            return result
+
+        pending = position_buffer.pending_positions(id)
+        if lod == "overview":
+            result["lod"] = lod
+            result.update(
+                level_of_detail.with_positions(
+                    level_of_detail.pack_overview(
+                        self.repository.get_object_hierarchy_rows(id),
+                        self.repository.get_edge_rows(id),
+                    ),
+                    pending,
+                )
+            )
+            return result
+
+        result["objects"] = self._render_rows(
+            DIAGRAM_OBJECT_FIELDS,
+            level_of_detail.fields(DIAGRAM_OBJECT_FIELDS, lod),
+            lambda columns, fields: position_buffer.merge_positions(
+                self.repository.get_object_rows(id, columns), fields, pending
+            ),
+            columnar,
+        )
+        result["relationships"] = self._render_rows(
+            DIAGRAM_RELATIONSHIP_FIELDS,
+            level_of_detail.fields(DIAGRAM_RELATIONSHIP_FIELDS, lod),
+            lambda columns, fields: self.repository.get_relationship_rows(id, columns),
+            columnar,
+        )
+        return result
 
     def list(
         self,
@@ -44,6 +174,8 @@ class DiagramService:
         page_size: int = 100,
         tag: Optional[str] = None,
         user_id: Optional[int] = None,
+        fields: Optional[str] = None,
+        columnar: bool = False,
     ) -> Dict:
         """List diagrams with pagination and optional filtering.
 
@@ -52,24 +184,38 @@ class DiagramService:
             page_size: Number of items per page
             tag: Optional tag filter
             user_id: Optional user filter
+            fields: Optional sparse fieldset (comma-separated field names)
+            columnar: Return {"columns", "rows"} instead of a list of objects
 
         Returns:
             Dictionary with data and pagination info
+
+        Raises:
+            ValueError: If an unknown field is requested
         """
+        fields = DIAGRAM_FIELDS.parse_fields(fields)
         skip = (page - 1) * page_size
 
+        criteria = []
+        order_by = None
         if tag:
-            diagrams = self.repository.search_by_tag(tag, skip=skip, limit=page_size)
-            total = len(self.repository.search_by_tag(tag, skip=0, limit=10000))
+            # PostgreSQL JSONB containment operator
+            criteria.append(Diagram.tags.contains([tag]))
         elif user_id:
-            diagrams = self.repository.get_by_user(user_id, skip=skip, limit=page_size)
-            total = len(self.repository.get_by_user(user_id, skip=0, limit=10000))
-        else:
-            diagrams = self.repository.list(skip=skip, limit=page_size)
-            total = self.repository.count()
+            criteria.append(Diagram.created_by == user_id)
+            order_by = [Diagram.updated_at.desc(), Diagram.id]
+
+        rows = self.repository.list_rows(
+            DIAGRAM_FIELDS.columns(fields),
+            *criteria,
+            skip=skip,
+            limit=page_size,
+            order_by=order_by,
+        )
+        total = self.repository.count_where(*criteria)
 
         return {
-            "data": [self._to_dict(d, include_details=False) for d in diagrams],
+            **DIAGRAM_FIELDS.render(rows, fields, columnar),
             "pagination": {
                 "page": page,
                 "pageSize": page_size,
@@ -78,12 +224,15 @@ class DiagramService:
             },
         }
 
-    def create(self, data: Dict, user_id: Optional[int] = None) -> Dict:
+    def create(
+        self, data: Dict, user_id: Optional[int] = None, include_details: bool = True
+    ) -> Dict:
         """Create new diagram.
 
         Args:
             data: Diagram data (name, description, purpose, tags)
             user_id: Creator user ID
+            include_details: Whether to include the (empty) objects and relationships
 
         Returns:
             Created diagram dict
@@ -111,21 +260,136 @@ class DiagramService:
         }
 
         diagram = self.repository.create(create_data)
-        return self._to_dict(diagram, include_details=True)
+        result = self._to_dict(diagram)
+        if include_details:
+            # A new diagram has nothing on it yet; skip loading the collections
+            result["objects"] = []
+            result["relationships"] = []
+        return result
+
+    def generate(self, data: Dict, user_id: Optional[int] = None) -> Dict:
+        """Generate a diagram showing a domain, a superdomain or an entity's neighbourhood.
 
-    def update(self, id: int, data: Dict, user_id: Optional[int] = None) -> Optional[Dict]:
+        The entities are selected with one query (a recursive CTE for a
+        neighbourhood), placed by ``utils.layout``, inserted with one
+        multi-row INSERT, and their relationships placed with one
+        ``INSERT ... SELECT`` -- a fixed number of statements whatever the
+        number of entities.
+
+        Args:
+            data: Source (exactly one of domainId, superdomainId, entityId),
+                optional depth (hops, for entityId), layout ("grid" or
+                "layered"), name, description, purpose and tags
+            user_id: Creator user ID
+
+        Returns:
+            Created diagram dict with objects and relationships
+
+        Raises:
+            ValueError: If validation fails or the source does not exist
+        """
+        sources = [key for key in ("domainId", "superdomainId", "entityId") if data.get(key)]
+        if len(sources) != 1:
+            raise ValueError("Exactly one of domainId, superdomainId or entityId is required")
+        source = sources[0]
+        source_id = data[source]
+
+        layout_name = data.get("layout") or ("layered" if source == "entityId" else "grid")
+        if layout_name not in DIAGRAM_LAYOUTS:
+            raise ValueError(f"Layout must be one of: {', '.join(DIAGRAM_LAYOUTS)}")
+
+        roots = None
+        if source == "domainId":
+            parent = self.domain_repository.get(source_id)
+            if not parent:
+                raise ValueError(f"Domain with ID {source_id} not found")
+            entity_ids = self.entity_repository.get_ids_by_domain(source_id)
+        elif source == "superdomainId":
+            parent = self.superdomain_repository.get(source_id)
+            if not parent:
+                raise ValueError(f"Superdomain with ID {source_id} not found")
+            entity_ids = self.entity_repository.get_ids_by_superdomain(source_id)
+        else:
+            depth = data.get("depth", 1)
+            if not isinstance(depth, int) or not 0 <= depth <= DIAGRAM_GENERATE_MAX_DEPTH:
+                raise ValueError(f"Depth must be between 0 and {DIAGRAM_GENERATE_MAX_DEPTH}")
+            parent = self.entity_repository.get(source_id)
+            if not parent:
+                raise ValueError(f"Entity with ID {source_id} not found")
+            entity_ids = [
+                entity_id
+                for entity_id, _ in self.entity_repository.get_neighbourhood(source_id, depth)
+            ]
+            roots = [source_id]
+
+        if len(entity_ids) > DIAGRAM_GENERATE_MAX_OBJECTS:
+            raise ValueError(
+                f"Source has {len(entity_ids)} entities; at most "
+                f"{DIAGRAM_GENERATE_MAX_OBJECTS} can be placed on a generated diagram"
+            )
+
+        if layout_name == "layered":
+            edges = self.relationship_repository.get_edges_among(entity_ids)
+            positions = layout.layered_layout(entity_ids, edges, roots=roots)
+        else:
+            positions = layout.grid_layout(entity_ids)
+
+        diagram = self.create(
+            {
+                "name": data.get("name") or f"{parent.name} overview"[:100],
+                "description": data.get("description"),
+                "purpose": data.get("purpose"),
+                "tags": data.get("tags", []),
+                "canvasSettings": data.get("canvasSettings"),
+            },
+            user_id=user_id,
+            include_details=False,
+        )
+
+        objects: List[Dict] = []
+        relationships: List[Dict] = []
+        if entity_ids:
+            placed = self.add_objects(
+                diagram["id"],
+                [
+                    {
+                        "objectType": ObjectType.ENTITY.value,
+                        "objectId": entity_id,
+                        "positionX": positions[entity_id][0],
+                        "positionY": positions[entity_id][1],
+                        "width": layout.NODE_WIDTH,
+                        "height": layout.NODE_HEIGHT,
+                    }
+                    for entity_id in entity_ids
+                ],
+                max_objects=DIAGRAM_GENERATE_MAX_OBJECTS,
+            )
+            objects, relationships = placed["objects"], placed["relationships"]
+
+        return {**diagram, "objects": objects, "relationships": relationships}
+
+    def update(
+        self,
+        id: int,
+        data: Dict,
+        user_id: Optional[int] = None,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Dict]:
         """Update diagram metadata.
 
         Args:
             id: Diagram ID
             data: Fields to update
             user_id: User making the update
+            expected_version: Version the client last saw (None = any)
 
         Returns:
-            Updated diagram dict or None
+            Updated diagram metadata (no objects or relationships; read
+            those with ``get_by_id``) or None
 
         Raises:
             ValueError: If validation fails
+            StaleVersionError: If the row changed since ``expected_version``
         """
         diagram = self.repository.get(id)
         if not diagram:
@@ -145,123 +409,555 @@ class DiagramService:
             data["last_modified_by"] = user_id
 
         # Update
-        updated = self.repository.update(id, data)
-        return self._to_dict(updated, include_details=True) if updated else None
+        updated = self.repository.update(id, data, expected_version)
+        if not updated:
+            return None
 
-    def delete(self, id: int) -> Dict:
+        result = self._to_dict(updated)
+        diagram_events.publish(
+            self.db,
+            id,
+            "update",
+            {key: result[key] for key in ("name", "description", "purpose", "tags", "canvasSettings")},
+        )
+        return result
+
+    def delete(self, id: int, expected_version: Optional[int] = None) -> Dict:
         """Delete diagram.
 
         Args:
             id: Diagram ID
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Success message
 
         Raises:
             ValueError: If diagram not found
+            StaleVersionError: If the row changed since ``expected_version``
         """
         diagram = self.repository.get(id)
         if not diagram:
             raise ValueError("Diagram not found")
 
-        self.repository.delete(id)
+        self.repository.delete(id, expected_version)
+        diagram_events.publish(self.db, id, "delete")
 
         return {
             "message": f"Diagram '{diagram.name}' deleted successfully",
         }
 
-    def add_object(self, diagram_id: int, object_data: Dict) -> Dict:
+    def add_object(
+        self, diagram_id: int, object_data: Dict, placement: Optional[str] = None
+    ) -> Dict:
         """Add object to diagram.
 
+        Placing an entity also places its relationships to entities already
+        on the diagram (see ``add_objects``).
+
         Args:
             diagram_id: Diagram ID
             object_data: Object data (objectType, objectId, positionX, positionY, etc.)
+            placement: "auto" to move the object to the nearest free spot
 
         Returns:
-            Created diagram object dict
+            Created diagram object dict with the relationships placed alongside it
 
         Raises:
             ValueError: If validation fails
         """
-        # Verify diagram exists
-        diagram = self.repository.get(diagram_id)
-        if not diagram:
-            raise ValueError(f"Diagram with ID {diagram_id} not found")
+        result = self.add_objects(diagram_id, [object_data], placement=placement)
+        return {
+            **result["objects"][0],
+            "diagramId": diagram_id,
+            "relationships": result["relationships"],
+        }
 
-        # Validation
-        if "objectType" not in object_data:
-            raise ValueError("Object type is required")
+    def add_objects(
+        self,
+        diagram_id: int,
+        objects: List[Dict],
+        max_objects: int = DIAGRAM_BULK_MAX_OBJECTS,
+        placement: Optional[str] = None,
+    ) -> Dict:
+        """Add several objects to a diagram in one transaction.
+
+        With ``placement="auto"`` positions are optional: each object is
+        moved to the free spot nearest its position (or the canvas origin),
+        clear of the objects already on the diagram and of those placed
+        before it, and never at negative coordinates. The objects are inserted with one multi-row INSERT; those
+        without a ``zRank`` are stacked on top, in the order given. Then one
+        ``INSERT ... SELECT`` places every relationship between the new
+        entities and the entities already on the diagram (or among the new
+        ones), so relationship lines show up without further requests. The
+        whole placement is journaled as one undoable operation. Finally the
+        containers the new objects sit in are refitted around them (see
+        ``containers.refit``).
 
-        if "objectId" not in object_data:
-            raise ValueError("Object ID is required")
+        Args:
+            diagram_id: Diagram ID
+            objects: Object data dicts (objectType, objectId, positionX, positionY, etc.)
+            max_objects: Maximum number of objects accepted
+            placement: "auto" to place objects in free space (None = as given)
 
-        if "positionX" not in object_data or "positionY" not in object_data:
-            raise ValueError("Position (x, y) is required")
+        Returns:
+            Dictionary with the created "objects", the placed "relationships"
+            and the "containers" whose bounds changed
 
-        # Create
-        diagram_object = self.repository.add_object(diagram_id, object_data)
+        Raises:
+            ValueError: If validation fails, the diagram does not exist or an
+                object is already on the diagram
+        """
+        if not isinstance(objects, list) or not objects:
+            raise ValueError("At least one object is required")
+
+        if len(objects) > max_objects:
+            raise ValueError(f"At most {max_objects} objects can be added at once")
+
+        if placement is not None and placement not in DIAGRAM_PLACEMENTS:
+            raise ValueError(f"Placement must be one of: {', '.join(DIAGRAM_PLACEMENTS)}")
+
+        values = [
+            self._object_values(object_data, require_position=placement is None)
+            for object_data in objects
+        ]
+
+        seen = set()
+        for value in values:
+            key = (value["object_type"], value["object_id"])
+            if key in seen:
+                raise ValueError(
+                    f"{key[0].value.capitalize()} {key[1]} is listed more than once"
+                )
+            seen.add(key)
+
+        if placement == "auto":
+            self._place_in_free_space(diagram_id, values)
+
+        unranked = [value for value in values if value["z_rank"] is None]
+        if unranked:
+            # Stack new objects above the existing ones, in the order given
+            top = self.repository.get_top_rank(diagram_id)
+            keys = keys_between(top, None, len(unranked))
+            for value, z_rank in zip(unranked, keys, strict=True):
+                value["z_rank"] = z_rank
+            ranking.rebalance_if_long(
+                unranked[-1]["z_rank"], DiagramObject, "diagram_id", diagram_id, "z_rank",
+                _publish_restack,
+            )
+
+        try:
+            object_rows = self.repository.add_objects(
+                diagram_id, values, DIAGRAM_OBJECT_FIELDS.columns()
+            )
+        except IntegrityError as e:
+            if is_foreign_key_violation(e):
+                raise ValueError(f"Diagram with ID {diagram_id} not found") from e
+            if is_unique_violation(e):
+                raise ValueError("One or more objects are already on this diagram") from e
+            raise
+
+        entity_ids = [
+            value["object_id"] for value in values if value["object_type"] is ObjectType.ENTITY
+        ]
+        relationship_rows = self.repository.materialize_relationships(
+            diagram_id, entity_ids, DIAGRAM_RELATIONSHIP_FIELDS.columns()
+        )
+
+        self.history.record(
+            diagram_id,
+            "place",
+            [
+                change(DiagramObject.__tablename__, row.id, after={**value, "diagram_id": diagram_id})
+                for row, value in zip(object_rows, values, strict=True)
+            ]
+            + [
+                change(
+                    DiagramRelationship.__tablename__,
+                    row.id,
+                    after={
+                        "diagram_id": diagram_id,
+                        "relationship_id": row.relationshipId,
+                        "is_visible": row.isVisible,
+                    },
+                )
+                for row in relationship_rows
+            ],
+        )
 
-        return {
-            "id": diagram_object.id,
-            "diagramId": diagram_object.diagram_id,
-            "objectType": diagram_object.object_type.value,
-            "objectId": diagram_object.object_id,
-            "positionX": diagram_object.position_x,
-            "positionY": diagram_object.position_y,
+        result = {
+            "objects": DIAGRAM_OBJECT_FIELDS.to_dicts(
+                object_rows, DIAGRAM_OBJECT_FIELDS.default_fields
+            ),
+            "relationships": DIAGRAM_RELATIONSHIP_FIELDS.to_dicts(
+                relationship_rows, DIAGRAM_RELATIONSHIP_FIELDS.default_fields
+            ),
         }
+        diagram_events.publish(self.db, diagram_id, "place", result)
+
+        result["containers"] = containers.refit(
+            self.db, diagram_id, [row.id for row in object_rows]
+        )
+        bounds = {item["id"]: item["bounds"] for item in result["containers"]}
+        for item in result["objects"]:
+            if item["id"] in bounds:
+                item["bounds"] = bounds[item["id"]]
+        return result
 
     def update_object_position(
-        self, diagram_id: int, object_id: int, position_x: float, position_y: float
+        self,
+        diagram_id: int,
+        object_id: int,
+        position_x: float,
+        position_y: float,
+        final: bool = True,
     ) -> Optional[Dict]:
         """Update object position on diagram.
 
+        Intermediate positions of a drag (``final=False``) are only
+        buffered; ``position_buffer`` persists the latest one per object in
+        bulk shortly after. The final position is written synchronously and
+        journaled as one move from where the drag started, and the
+        containers the object sits in are refitted.
+
         Args:
             diagram_id: Diagram ID
             object_id: DiagramObject ID
             position_x: New X coordinate
             position_y: New Y coordinate
+            final: Whether this ends the move
 
         Returns:
-            Updated object dict or None
+            Updated object dict (with the "containers" whose bounds changed
+            when final) or None if the object is not on the diagram
+
+        Raises:
+            ValueError: If a coordinate is not a number
         """
-        updated = self.repository.update_object_position(object_id, position_x, position_y)
+        for field, value in (("positionX", position_x), ("positionY", position_y)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{field} must be a number")
+
+        if not final:
+            # Checked once per flush interval: later positions of the drag
+            # find the object already buffered
+            if not position_buffer.is_pending(
+                diagram_id, object_id
+            ) and not self.repository.has_object(diagram_id, object_id):
+                return None
+            position_buffer.record_position(diagram_id, object_id, position_x, position_y)
+            return {"id": object_id, "positionX": position_x, "positionY": position_y}
+
+        origin = position_buffer.discard_position(object_id)
+        updated = self.repository.update_object_position(
+            diagram_id, object_id, position_x, position_y, clock=str(server_clock.now())
+        )
         if not updated:
             return None
 
-        return {
+        before_x, before_y = origin or (updated.old_position_x, updated.old_position_y)
+        self.history.record(
+            diagram_id,
+            "move",
+            [
+                change(
+                    DiagramObject.__tablename__,
+                    updated.id,
+                    before={"position_x": before_x, "position_y": before_y},
+                    after={"position_x": updated.position_x, "position_y": updated.position_y},
+                )
+            ],
+        )
+
+        result = {
             "id": updated.id,
             "positionX": updated.position_x,
             "positionY": updated.position_y,
         }
+        diagram_events.publish(self.db, diagram_id, "move", result)
+        result["containers"] = containers.refit(self.db, diagram_id, [updated.id])
+        return result
+
+    def restack_object(self, diagram_id: int, object_id: int, data: Dict) -> Optional[Dict]:
+        """Move an object up or down the diagram's z-order.
+
+        ``data`` is ``{"after": <id>}`` (directly above that object),
+        ``{"before": <id>}`` (directly below it) or ``{"to": "front" |
+        "back"}``. Only the moved object is rewritten: it gets a rank key
+        between its new neighbours' (see ``ranking.move``). The restack is
+        journaled as one undoable operation.
+
+        Args:
+            diagram_id: Diagram ID
+            object_id: DiagramObject ID
+            data: Move instruction
+
+        Returns:
+            Dict with the object's id and new zRank, or None if the object
+            or the anchor is not on the diagram
+
+        Raises:
+            ValueError: If the move instruction is invalid
+        """
+        anchor_id, after = ranking.parse_move(data, first="back", last="front")
+        moved = ranking.move(
+            self.repository,
+            object_id,
+            "diagram_id",
+            "z_rank",
+            anchor_id,
+            after,
+            scope=diagram_id,
+            on_rebalance=_publish_restack,
+        )
+        if moved is None:
+            return None
+
+        _, current, z_rank = moved
+        result = {"id": object_id, "zRank": z_rank}
+        if z_rank == current:
+            return result
+
+        if not self.repository.update_object_rank(
+            diagram_id, object_id, z_rank, clock=str(server_clock.now())
+        ):
+            return None
+
+        self.history.record(
+            diagram_id,
+            "restack",
+            [
+                change(
+                    DiagramObject.__tablename__,
+                    object_id,
+                    before={"z_rank": current},
+                    after={"z_rank": z_rank},
+                )
+            ],
+        )
+        diagram_events.publish(self.db, diagram_id, "restack", [result])
+        return result
+
+    def get_change_version(self, id: int) -> Optional[int]:
+        """Get a diagram's change version.
+
+        Args:
+            id: Diagram ID
+
+        Returns:
+            Change version, or None if the diagram does not exist
+        """
+        return self.repository.get_change_version(id)
 
     def remove_object(self, diagram_id: int, object_id: int) -> Dict:
         """Remove object from diagram.
 
+        Removing an entity also removes its relationship lines from the
+        diagram, mirroring ``add_objects``. The containers it sat in are
+        refitted around what is left.
+
         Args:
             diagram_id: Diagram ID
             object_id: DiagramObject ID
 
         Returns:
-            Success message
+            Success message and the "containers" whose bounds changed
 
         Raises:
             ValueError: If object not found
         """
-        success = self.repository.remove_object(object_id)
-        if not success:
+        # Collected before the delete: the removed object's containers
+        chain = self.repository.get_container_chain(diagram_id, [object_id])
+        removed = self.repository.remove_object(diagram_id, object_id)
+        if not removed:
             raise ValueError("Diagram object not found")
 
-        return {"message": "Object removed from diagram"}
+        removed_relationships = []
+        if removed.object_type is ObjectType.ENTITY:
+            removed_relationships = self.repository.remove_entity_relationships(
+                diagram_id, removed.object_id
+            )
+
+        self.history.record(
+            diagram_id,
+            "remove",
+            [
+                change(DiagramRelationship.__tablename__, row.id, before=row._mapping)
+                for row in removed_relationships
+            ]
+            + [change(DiagramObject.__tablename__, removed.id, before=removed._mapping)],
+        )
+        diagram_events.publish(
+            self.db,
+            diagram_id,
+            "remove",
+            {"id": removed.id, "relationshipIds": [row.id for row in removed_relationships]},
+        )
+
+        return {
+            "message": "Object removed from diagram",
+            "containers": containers.refit(self.db, diagram_id, chain, exclude=[removed.id]),
+        }
 
-    def _to_dict(self, diagram, include_details: bool = False) -> Dict:
-        """Convert diagram model to dictionary.
+    def undo(self, diagram_id: int) -> Dict:
+        """Undo the most recent canvas edit of a diagram.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Applied changes, undo/redo availability and the "containers"
+            whose bounds changed
+
+        Raises:
+            ValueError: If the diagram does not exist or there is nothing to undo
+        """
+        result = self.history.undo(diagram_id)
+        diagram_events.publish(self.db, diagram_id, "undo", result)
+        result["containers"] = containers.refit(self.db, diagram_id)
+        return result
+
+    def redo(self, diagram_id: int) -> Dict:
+        """Redo the most recently undone canvas edit of a diagram.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Applied changes, undo/redo availability and the "containers"
+            whose bounds changed
+
+        Raises:
+            ValueError: If the diagram does not exist or there is nothing to redo
+        """
+        result = self.history.redo(diagram_id)
+        diagram_events.publish(self.db, diagram_id, "redo", result)
+        result["containers"] = containers.refit(self.db, diagram_id)
+        return result
+
+    def _place_in_free_space(self, diagram_id: int, values: List[Dict[str, Any]]) -> None:
+        """Move new objects to the free spots nearest their positions.
+
+        Existing objects are read with their buffered positions, so objects
+        being dragged are avoided where they are now. Objects without a
+        size count as default-sized boxes.
+
+        Args:
+            diagram_id: Diagram ID
+            values: Column value dicts from ``_object_values``; positions are
+                updated in place
+
+        Raises:
+            ValueError: If a position or size is not a number
+        """
+        fields = ["id", "positionX", "positionY", "width", "height"]
+        rows = position_buffer.merge_positions(
+            self.repository.get_object_rows(diagram_id, DIAGRAM_OBJECT_FIELDS.columns(fields)),
+            fields,
+            position_buffer.pending_positions(diagram_id),
+        )
+        grid = OccupancyGrid(
+            (x, y, width or layout.NODE_WIDTH, height or layout.NODE_HEIGHT)
+            for _, x, y, width, height in rows
+        )
+
+        boxes = []
+        for value in values:
+            for column, field in (
+                ("position_x", "positionX"),
+                ("position_y", "positionY"),
+                ("width", "width"),
+                ("height", "height"),
+            ):
+                number = value[column]
+                if number is not None and (
+                    isinstance(number, bool) or not isinstance(number, (int, float))
+                ):
+                    raise ValueError(f"{field} must be a number")
+            boxes.append(
+                (
+                    layout.ORIGIN_X if value["position_x"] is None else value["position_x"],
+                    layout.ORIGIN_Y if value["position_y"] is None else value["position_y"],
+                    value["width"] or layout.NODE_WIDTH,
+                    value["height"] or layout.NODE_HEIGHT,
+                )
+            )
+
+        # New objects stay right of and below the canvas origin
+        placed = place_many(grid, boxes, min_x=0, min_y=0)
+        for value, (x, y) in zip(values, placed, strict=True):
+            value["position_x"], value["position_y"] = x, y
+
+    @staticmethod
+    def _object_values(object_data: Dict, require_position: bool = True) -> Dict[str, Any]:
+        """Validate one object's data and map it to DiagramObject columns.
+
+        Args:
+            object_data: Object data (objectType, objectId, positionX, positionY, etc.)
+            require_position: Whether positionX and positionY must be given
+
+        Returns:
+            Column value dict
+
+        Raises:
+            ValueError: If validation fails
+        """
+        if not isinstance(object_data, dict):
+            raise ValueError("Each object must be an object")
+
+        if "objectType" not in object_data:
+            raise ValueError("Object type is required")
+
+        if "objectId" not in object_data:
+            raise ValueError("Object ID is required")
+
+        if require_position and ("positionX" not in object_data or "positionY" not in object_data):
+            raise ValueError("Position (x, y) is required")
+
+        try:
+            object_type = ObjectType(object_data["objectType"])
+        except ValueError:
+            raise ValueError(f"Invalid object type '{object_data['objectType']}'") from None
+
+        # Unranked objects are stacked on top by add_objects
+        z_rank = object_data.get("zRank")
+        if z_rank is not None and not is_rank(z_rank):
+            raise ValueError("zRank must be a rank key (base-62 digits, not ending in 0)")
+
+        # Every row carries the same keys, as the multi-row INSERT requires
+        return {
+            "object_type": object_type,
+            "object_id": object_data["objectId"],
+            "position_x": object_data.get("positionX"),
+            "position_y": object_data.get("positionY"),
+            "width": object_data.get("width"),
+            "height": object_data.get("height"),
+            "z_rank": z_rank,
+            "visual_style": object_data.get("visualStyle"),
+            "is_collapsed": object_data.get("isCollapsed", False),
+        }
+
+    def _render_rows(
+        self,
+        projection: Projection,
+        fields: Sequence[str],
+        fetch: Callable[[List, Sequence[str]], List],
+        columnar: bool,
+    ) -> Union[List[Dict], Dict]:
+        """Fetch a diagram collection and render it as a list or columnar block."""
+        rows = fetch(projection.columns(fields), fields)
+        if columnar:
+            return projection.render(rows, fields, columnar=True)
+        return projection.to_dicts(rows, fields)
+
+    def _to_dict(self, diagram) -> Dict:
+        """Convert diagram model to a metadata dictionary.
 
         Args:
             diagram: Diagram model instance
-            include_details: Whether to include objects and relationships
 
         Returns:
-            Dictionary representation
+            Dictionary representation (without objects or relationships)
         """
         result = {
             "id": diagram.id,
@@ -270,37 +966,9 @@ class DiagramService:
             "purpose": diagram.purpose,
             "tags": diagram.tags or [],
             "canvasSettings": diagram.canvas_settings,
-            "createdAt": diagram.created_at.isoformat() if diagram.created_at else None,
-            "updatedAt": diagram.updated_at.isoformat() if diagram.updated_at else None,
+            "createdAt": diagram.created_at,
+            "updatedAt": diagram.updated_at,
+            "version": diagram.version,
         }
 
-        if include_details:
-            result["objects"] = [
-                {
-                    "id": obj.id,
-                    "objectType": obj.object_type.value,
-                    "objectId": obj.object_id,
-                    "positionX": obj.position_x,
-                    "positionY": obj.position_y,
-                    "width": obj.width,
-                    "height": obj.height,
-                    "zIndex": obj.z_index,
-                    "visualStyle": obj.visual_style,
-                    "isCollapsed": obj.is_collapsed,
-                }
-                for obj in (diagram.objects or [])
-            ]
-
-            result["relationships"] = [
-                {
-                    "id": rel.id,
-                    "relationshipId": rel.relationship_id,
-                    "isVisible": rel.is_visible,
-                    "sourceAnchor": rel.source_anchor,
-                    "targetAnchor": rel.target_anchor,
-                    "visualStyle": rel.visual_style,
-                }
-                for rel in (diagram.diagram_relationships or [])
-            ]
-
         return result
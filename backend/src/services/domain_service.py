@@ -1,10 +1,28 @@
 """Domain service for business logic."""
 from typing import Dict, List, Optional
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..models.object_repository import Domain
+from ..repositories.base_repository import is_foreign_key_violation, is_unique_violation
 from ..repositories.domain_repository import DomainRepository
 from ..repositories.superdomain_repository import SuperdomainRepository
+from ..utils.projection import Projection
+
+# Fields selectable on list endpoints (?fields=...)
+DOMAIN_FIELDS = Projection(
+    {
+        "id": Domain.id,
+        "superdomainId": Domain.superdomain_id,
+        "name": Domain.name,
+        "description": Domain.description,
+        "entityCount": Domain.entity_count,
+        "createdAt": Domain.created_at,
+        "updatedAt": Domain.updated_at,
+        "version": Domain.version,
+    }
+)
 
 
 class DomainService:
@@ -40,6 +58,8 @@ class DomainService:
         page: int = 1,
         page_size: int = 100,
         superdomain_id: Optional[int] = None,
+        fields: Optional[str] = None,
+        columnar: bool = False,
     ) -> Dict:
         """List domains with pagination and optional filtering.
 
@@ -47,23 +67,31 @@ class DomainService:
             page: Page number (1-indexed)
             page_size: Number of items per page
             superdomain_id: Optional superdomain filter
+            fields: Optional sparse fieldset (comma-separated field names)
+            columnar: Return {"columns", "rows"} instead of a list of objects
 
         Returns:
             Dictionary with data and pagination info
+
+        Raises:
+            ValueError: If an unknown field is requested
         """
+        fields = DOMAIN_FIELDS.parse_fields(fields)
         skip = (page - 1) * page_size
 
+        criteria = []
         if superdomain_id:
-            domains = self.repository.get_by_superdomain(
-                superdomain_id, skip=skip, limit=page_size
-            )
+            criteria.append(Domain.superdomain_id == superdomain_id)
             total = self.repository.count_by_superdomain(superdomain_id)
         else:
-            domains = self.repository.list(skip=skip, limit=page_size)
             total = self.repository.count()
 
+        rows = self.repository.list_rows(
+            DOMAIN_FIELDS.columns(fields), *criteria, skip=skip, limit=page_size
+        )
+
         return {
-            "data": [self._to_dict(d) for d in domains],
+            **DOMAIN_FIELDS.render(rows, fields, columnar),
             "pagination": {
                 "page": page,
                 "pageSize": page_size,
@@ -90,11 +118,6 @@ class DomainService:
         if not superdomain_id:
             raise ValueError("Superdomain ID is required")
 
-        # Verify superdomain exists
-        superdomain = self.superdomain_repository.get(superdomain_id)
-        if not superdomain:
-            raise ValueError(f"Superdomain with ID {superdomain_id} not found")
-
         name = data.get("name", "").strip()
         if not name:
             raise ValueError("Domain name is required")
@@ -102,14 +125,8 @@ class DomainService:
         if len(name) > 100:
             raise ValueError("Domain name must be 100 characters or less")
 
-        # Check unique constraint: (superdomain_id, name)
-        existing = self.repository.get_by_name_and_superdomain(name, superdomain_id)
-        if existing:
-            raise ValueError(
-                f"Domain with name '{name}' already exists in superdomain '{superdomain.name}'"
-            )
-
-        # Create
+        # Create; the superdomain FK and (superdomain_id, name) unique
+        # constraint are enforced by the INSERT itself
         create_data = {
             "superdomain_id": superdomain_id,
             "name": name,
@@ -117,26 +134,40 @@ class DomainService:
             "created_by": user_id,
         }
 
-        domain = self.repository.create(create_data)
+        try:
+            domain = self.repository.create_unique(
+                create_data, constraint="uq_domain_superdomain_name"
+            )
+        except IntegrityError as e:
+            if is_foreign_key_violation(e):
+                raise ValueError(f"Superdomain with ID {superdomain_id} not found") from e
+            raise
+
+        if domain is None:
+            superdomain = self.superdomain_repository.get(superdomain_id)
+            raise ValueError(
+                f"Domain with name '{name}' already exists in superdomain '{superdomain.name}'"
+            )
+
         return self._to_dict(domain)
 
-    def update(self, id: int, data: Dict) -> Optional[Dict]:
+    def update(
+        self, id: int, data: Dict, expected_version: Optional[int] = None
+    ) -> Optional[Dict]:
         """Update domain.
 
         Args:
             id: Domain ID
             data: Fields to update
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Updated domain dict or None
 
         Raises:
             ValueError: If validation fails
+            StaleVersionError: If the row changed since ``expected_version``
         """
-        domain = self.repository.get(id)
-        if not domain:
-            return None
-
         # Validation
         if "name" in data:
             name = data["name"].strip()
@@ -146,30 +177,31 @@ class DomainService:
             if len(name) > 100:
                 raise ValueError("Domain name must be 100 characters or less")
 
-            # Check unique constraint (excluding current domain)
-            existing = self.repository.get_by_name_and_superdomain(
-                name, domain.superdomain_id
-            )
-            if existing and existing.id != id:
+        # Update; the (superdomain_id, name) unique constraint is enforced by the UPDATE
+        try:
+            updated = self.repository.update(id, data, expected_version)
+        except IntegrityError as e:
+            if is_unique_violation(e):
                 raise ValueError(
-                    f"Domain with name '{name}' already exists in this superdomain"
-                )
+                    f"Domain with name '{data['name'].strip()}' already exists in this superdomain"
+                ) from e
+            raise
 
-        # Update
-        updated = self.repository.update(id, data)
         return self._to_dict(updated) if updated else None
 
-    def delete(self, id: int) -> Dict:
+    def delete(self, id: int, expected_version: Optional[int] = None) -> Dict:
         """Delete domain.
 
         Args:
             id: Domain ID
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Delete impact report
 
         Raises:
             ValueError: If domain not found
+            StaleVersionError: If the row changed since ``expected_version``
         """
         domain = self.repository.get(id)
         if not domain:
@@ -178,7 +210,7 @@ class DomainService:
         # Could add cascade impact analysis like SuperdomainService
         # For now, rely on database CASCADE DELETE
 
-        self.repository.delete(id)
+        self.repository.delete(id, expected_version)
 
         return {
             "message": f"Domain '{domain.name}' deleted successfully",
@@ -199,6 +231,8 @@ class DomainService:
             "superdomainId": domain.superdomain_id,
             "name": domain.name,
             "description": domain.description,
-            "createdAt": domain.created_at.isoformat() if domain.created_at else None,
-            "updatedAt": domain.updated_at.isoformat() if domain.updated_at else None,
+            "entityCount": domain.entity_count,
+            "createdAt": domain.created_at,
+            "updatedAt": domain.updated_at,
+            "version": domain.version,
         }
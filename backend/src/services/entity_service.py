@@ -1,11 +1,30 @@
 """Entity service for business logic."""
 from typing import Dict, List, Optional
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..models.object_repository import Entity
+from ..repositories.base_repository import is_foreign_key_violation, is_unique_violation
 from ..repositories.domain_repository import DomainRepository
 from ..repositories.entity_repository import EntityRepository
 from ..repositories.relationship_repository import RelationshipRepository
+from ..utils.projection import Projection
+
+# Fields selectable on list endpoints (?fields=...)
+ENTITY_FIELDS = Projection(
+    {
+        "id": Entity.id,
+        "domainId": Entity.domain_id,
+        "name": Entity.name,
+        "description": Entity.description,
+        "attributeCount": Entity.attribute_count,
+        "relationshipCount": Entity.relationship_count,
+        "createdAt": Entity.created_at,
+        "updatedAt": Entity.updated_at,
+        "version": Entity.version,
+    }
+)
 
 
 class EntityService:
@@ -47,6 +66,8 @@ class EntityService:
         page: int = 1,
         page_size: int = 100,
         domain_id: Optional[int] = None,
+        fields: Optional[str] = None,
+        columnar: bool = False,
     ) -> Dict:
         """List entities with pagination and optional filtering.
 
@@ -54,21 +75,31 @@ class EntityService:
             page: Page number (1-indexed)
             page_size: Number of items per page
             domain_id: Optional domain filter
+            fields: Optional sparse fieldset (comma-separated field names)
+            columnar: Return {"columns", "rows"} instead of a list of objects
 
         Returns:
             Dictionary with data and pagination info
+
+        Raises:
+            ValueError: If an unknown field is requested
         """
+        fields = ENTITY_FIELDS.parse_fields(fields)
         skip = (page - 1) * page_size
 
+        criteria = []
         if domain_id:
-            entities = self.repository.get_by_domain(domain_id, skip=skip, limit=page_size)
+            criteria.append(Entity.domain_id == domain_id)
             total = self.repository.count_by_domain(domain_id)
         else:
-            entities = self.repository.list(skip=skip, limit=page_size)
             total = self.repository.count()
 
+        rows = self.repository.list_rows(
+            ENTITY_FIELDS.columns(fields), *criteria, skip=skip, limit=page_size
+        )
+
         return {
-            "data": [self._to_dict(e) for e in entities],
+            **ENTITY_FIELDS.render(rows, fields, columnar),
             "pagination": {
                 "page": page,
                 "pageSize": page_size,
@@ -95,11 +126,6 @@ class EntityService:
         if not domain_id:
             raise ValueError("Domain ID is required")
 
-        # Verify domain exists
-        domain = self.domain_repository.get(domain_id)
-        if not domain:
-            raise ValueError(f"Domain with ID {domain_id} not found")
-
         name = data.get("name", "").strip()
         if not name:
             raise ValueError("Entity name is required")
@@ -107,14 +133,8 @@ class EntityService:
         if len(name) > 100:
             raise ValueError("Entity name must be 100 characters or less")
 
-        # Check unique constraint: (domain_id, name)
-        existing = self.repository.get_by_name_and_domain(name, domain_id)
-        if existing:
-            raise ValueError(
-                f"Entity with name '{name}' already exists in domain '{domain.name}'"
-            )
-
-        # Create
+        # Create; the domain FK and (domain_id, name) unique constraint are
+        # enforced by the INSERT itself
         create_data = {
             "domain_id": domain_id,
             "name": name,
@@ -122,26 +142,40 @@ class EntityService:
             "created_by": user_id,
         }
 
-        entity = self.repository.create(create_data)
+        try:
+            entity = self.repository.create_unique(
+                create_data, constraint="uq_entity_domain_name"
+            )
+        except IntegrityError as e:
+            if is_foreign_key_violation(e):
+                raise ValueError(f"Domain with ID {domain_id} not found") from e
+            raise
+
+        if entity is None:
+            domain = self.domain_repository.get(domain_id)
+            raise ValueError(
+                f"Entity with name '{name}' already exists in domain '{domain.name}'"
+            )
+
         return self._to_dict(entity)
 
-    def update(self, id: int, data: Dict) -> Optional[Dict]:
+    def update(
+        self, id: int, data: Dict, expected_version: Optional[int] = None
+    ) -> Optional[Dict]:
         """Update entity.
 
         Args:
             id: Entity ID
             data: Fields to update
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Updated entity dict or None
 
         Raises:
             ValueError: If validation fails
+            StaleVersionError: If the row changed since ``expected_version``
         """
-        entity = self.repository.get(id)
-        if not entity:
-            return None
-
         # Validation
         if "name" in data:
             name = data["name"].strip()
@@ -151,26 +185,31 @@ class EntityService:
             if len(name) > 100:
                 raise ValueError("Entity name must be 100 characters or less")
 
-            # Check unique constraint (excluding current entity)
-            existing = self.repository.get_by_name_and_domain(name, entity.domain_id)
-            if existing and existing.id != id:
-                raise ValueError(f"Entity with name '{name}' already exists in this domain")
+        # Update; the (domain_id, name) unique constraint is enforced by the UPDATE
+        try:
+            updated = self.repository.update(id, data, expected_version)
+        except IntegrityError as e:
+            if is_unique_violation(e):
+                raise ValueError(
+                    f"Entity with name '{data['name'].strip()}' already exists in this domain"
+                ) from e
+            raise
 
-        # Update
-        updated = self.repository.update(id, data)
         return self._to_dict(updated) if updated else None
 
-    def delete(self, id: int) -> Dict:
+    def delete(self, id: int, expected_version: Optional[int] = None) -> Dict:
         """Delete entity with relationship check.
 
         Args:
             id: Entity ID
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Delete impact report
 
         Raises:
             ValueError: If entity not found
+            StaleVersionError: If the row changed since ``expected_version``
         """
         entity = self.repository.get(id)
         if not entity:
@@ -181,7 +220,7 @@ class EntityService:
         relationship_count = len(relationships)
 
         # Delete (cascade will handle attributes and relationships)
-        self.repository.delete(id)
+        self.repository.delete(id, expected_version)
 
         return {
             "message": f"Entity '{entity.name}' deleted successfully",
@@ -207,8 +246,11 @@ class EntityService:
             "domainId": entity.domain_id,
             "name": entity.name,
             "description": entity.description,
-            "createdAt": entity.created_at.isoformat() if entity.created_at else None,
-            "updatedAt": entity.updated_at.isoformat() if entity.updated_at else None,
+            "attributeCount": entity.attribute_count,
+            "relationshipCount": entity.relationship_count,
+            "createdAt": entity.created_at,
+            "updatedAt": entity.updated_at,
+            "version": entity.version,
         }
 
         if include_attributes and hasattr(entity, "attributes"):
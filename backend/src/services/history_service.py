@@ -0,0 +1,241 @@
+"""Undo/redo over the diagram operation journal."""
+import os
+from enum import Enum
+from typing import Any, Dict, List, Mapping, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.diagram_repository import DiagramObject, DiagramOperation, DiagramRelationship
+from ..repositories.diagram_repository import DiagramRepository
+from ..repositories.history_repository import DiagramHistoryRepository
+
+# Number of most recent operations that stay undoable
+DIAGRAM_UNDO_DEPTH = int(os.getenv("DIAGRAM_UNDO_DEPTH", "100"))
+
+# Operations allowed past the undo depth before the journal is compacted
+DIAGRAM_JOURNAL_SLACK = int(os.getenv("DIAGRAM_JOURNAL_SLACK", "50"))
+
+# Maintained on write, so never journaled
+_UNJOURNALED_COLUMNS = frozenset({"created_at", "updated_at"})
+
+# Change record table -> "type" reported to clients
+_CHANGE_TYPES = {
+    DiagramObject.__tablename__: "object",
+    DiagramRelationship.__tablename__: "relationship",
+}
+
+
+def journal_values(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Make a JSON-safe copy of column values for a change record.
+
+    Args:
+        values: Column name -> value (e.g. a row mapping)
+
+    Returns:
+        Copy without timestamps and with enums replaced by their values
+    """
+    return {
+        column: value.value if isinstance(value, Enum) else value
+        for column, value in values.items()
+        if column not in _UNJOURNALED_COLUMNS
+    }
+
+
+def change(
+    table: str,
+    id: int,
+    before: Optional[Mapping[str, Any]] = None,
+    after: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Build a change record.
+
+    Args:
+        table: Table name (diagram_object or diagram_relationship)
+        id: Row ID
+        before: Values before the edit (None for an inserted row)
+        after: Values after the edit (None for a deleted row)
+
+    Returns:
+        Change record
+    """
+    return {
+        "table": table,
+        "id": id,
+        "before": journal_values(before) if before is not None else None,
+        "after": journal_values(after) if after is not None else None,
+    }
+
+
+def _camel(column: str) -> str:
+    """Convert a column name to the camelCase field name used by the API."""
+    head, *rest = column.split("_")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+class DiagramHistoryService:
+    """Service for the per-diagram undo/redo journal.
+
+    Every canvas edit is appended as one operation holding compact
+    before/after deltas of the rows it touched. Undo applies the newest
+    active operation's ``before`` values, redo the oldest undone
+    operation's ``after`` values, each set-wise. A new edit discards the
+    redo stack. Once more than ``DIAGRAM_UNDO_DEPTH + DIAGRAM_JOURNAL_SLACK``
+    operations are active, the oldest are folded into a snapshot, so the
+    journal's size (and the work compaction does) stays bounded however
+    long an editing session runs.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize history service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+        self.repository = DiagramHistoryRepository(db)
+        self.diagram_repository = DiagramRepository(db)
+
+    def record(self, diagram_id: int, kind: str, changes: List[Dict[str, Any]]) -> Optional[int]:
+        """Journal an edit that has just been applied.
+
+        Args:
+            diagram_id: Diagram ID
+            kind: Operation kind (place, move, remove)
+            changes: Change records (see ``change()``) in the order applied
+
+        Returns:
+            Operation ID, or None if the edit changed nothing
+        """
+        if not changes:
+            return None
+
+        self.repository.discard_undone(diagram_id)
+        operation = self.repository.append(diagram_id, kind, changes)
+
+        if self.repository.count_active(diagram_id) > DIAGRAM_UNDO_DEPTH + DIAGRAM_JOURNAL_SLACK:
+            self.compact(diagram_id)
+
+        return operation.id
+
+    def undo(self, diagram_id: int) -> Dict:
+        """Revert a diagram's most recent operation.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Dictionary with the operation, the rows changed and the new
+            undo/redo availability
+
+        Raises:
+            ValueError: If the diagram does not exist or there is nothing to undo
+        """
+        operation = self.repository.latest_active(diagram_id)
+        if operation is None:
+            self._nothing_to(diagram_id, "undo")
+
+        changes = list(reversed(operation.changes))
+        self.repository.apply(changes, "before")
+        self.repository.set_undone(operation, True)
+
+        return self._result(diagram_id, operation, changes, "before")
+
+    def redo(self, diagram_id: int) -> Dict:
+        """Re-apply a diagram's most recently undone operation.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Dictionary with the operation, the rows changed and the new
+            undo/redo availability
+
+        Raises:
+            ValueError: If the diagram does not exist or there is nothing to redo
+        """
+        operation = self.repository.earliest_undone(diagram_id)
+        if operation is None:
+            self._nothing_to(diagram_id, "redo")
+
+        changes = list(operation.changes)
+        self.repository.apply(changes, "after")
+        self.repository.set_undone(operation, False)
+
+        return self._result(diagram_id, operation, changes, "after")
+
+    def compact(self, diagram_id: int) -> Optional[int]:
+        """Fold all but the newest ``DIAGRAM_UNDO_DEPTH`` operations into a snapshot.
+
+        The snapshot is the diagram's current state with the retained
+        operations reverted in memory, i.e. the state the oldest retained
+        operation applies to. It replaces the previous snapshot and the
+        folded operations.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            ID of the last operation folded in, or None if nothing was compacted
+        """
+        operations = self.repository.active_operations(diagram_id)
+        if len(operations) <= DIAGRAM_UNDO_DEPTH:
+            return None
+
+        kept, folded = operations[:DIAGRAM_UNDO_DEPTH], operations[DIAGRAM_UNDO_DEPTH:]
+
+        state = {
+            table: {row["id"]: journal_values(row) for row in rows}
+            for table, rows in self.repository.get_state(diagram_id).items()
+        }
+        for operation in kept:  # newest first
+            for record in reversed(operation.changes):
+                rows = state[record["table"]]
+                if record["before"] is None:
+                    rows.pop(record["id"], None)
+                elif record["after"] is None or record["id"] not in rows:
+                    rows[record["id"]] = dict(record["before"])
+                else:
+                    rows[record["id"]].update(record["before"])
+
+        cutoff = folded[0].id
+        self.repository.replace_snapshot(
+            diagram_id, cutoff, {table: list(rows.values()) for table, rows in state.items()}
+        )
+        return cutoff
+
+    def _nothing_to(self, diagram_id: int, action: str) -> None:
+        """Raise the error for an empty undo or redo stack."""
+        if not self.diagram_repository.exists(diagram_id):
+            raise ValueError(f"Diagram with ID {diagram_id} not found")
+        raise ValueError(f"Nothing to {action}")
+
+    def _result(
+        self,
+        diagram_id: int,
+        operation: DiagramOperation,
+        changes: List[Dict[str, Any]],
+        side: str,
+    ) -> Dict:
+        """Describe an applied undo or redo for the client.
+
+        Each change carries the values now in effect (camelCase); null
+        values mean the row was removed.
+        """
+        return {
+            "operationId": operation.id,
+            "kind": operation.kind,
+            "changes": [
+                {
+                    "type": _CHANGE_TYPES[record["table"]],
+                    "id": record["id"],
+                    "values": (
+                        {_camel(column): value for column, value in record[side].items()}
+                        if record[side] is not None
+                        else None
+                    ),
+                }
+                for record in changes
+            ],
+            "canUndo": self.repository.has_operations(diagram_id, undone=False),
+            "canRedo": self.repository.has_operations(diagram_id, undone=True),
+        }
@@ -0,0 +1,120 @@
+"""Level-of-detail diagram payloads (``?lod=``) for zoomed-in and zoomed-out views."""
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from ..models.diagram_repository import ObjectType
+from ..utils.projection import Projection
+
+# Levels accepted by ?lod=, least detailed first
+LODS = ("overview", "normal", "full")
+
+# Level of requests without ?lod= (the payload the editor always had)
+DEFAULT_LOD = "normal"
+
+
+def parse_lod(raw: Optional[str]) -> str:
+    """Validate a ``?lod=`` parameter.
+
+    Args:
+        raw: Parameter value (None/empty = the default level)
+
+    Returns:
+        Level of detail
+
+    Raises:
+        ValueError: If the level is unknown
+    """
+    if not raw:
+        return DEFAULT_LOD
+    if raw not in LODS:
+        raise ValueError(f"lod must be one of: {', '.join(LODS)}")
+    return raw
+
+
+def fields(projection: Projection, lod: str) -> Tuple[str, ...]:
+    """Get the fields of a collection sent at a level of detail.
+
+    ``full`` adds the fields a projection leaves out by default, such as
+    the routing points of relationship lines.
+
+    Args:
+        projection: Projection of the collection
+        lod: "normal" or "full"
+
+    Returns:
+        Field names
+    """
+    return projection.field_names if lod == "full" else projection.default_fields
+
+
+def pack_overview(object_rows: Sequence[Any], edge_rows: Sequence[Any]) -> Dict[str, Any]:
+    """Pack a diagram's boxes and lines for drawing it zoomed out.
+
+    Domain and superdomain containers are collapsed: objects inside a
+    container placed on the diagram are left out, and lines from them are
+    drawn from the outermost such container instead. Lines within one
+    container disappear and parallel lines are merged. Boxes come in
+    paint order, containers as their fitted bounds, and are sent as one
+    flat list of integer ``[x, y, width, height, ...]``; lines as one flat
+    list of ``[from, to, ...]`` indexes into the box list.
+
+    Args:
+        object_rows: Rows of ``DiagramRepository.get_object_hierarchy_rows()``
+        edge_rows: Rows of ``DiagramRepository.get_edge_rows()``
+
+    Returns:
+        {"objects": {"ids", "types", "rects"}, "edges"}
+    """
+    shown_as: Dict[int, int] = {}
+    index: Dict[int, int] = {}
+    ids, types, rects = [], [], []
+    for row in object_rows:
+        shown_as[row.id] = row.superdomain_box_id or row.domain_box_id or row.id
+        if shown_as[row.id] != row.id:
+            continue
+
+        index[row.id] = len(ids)
+        ids.append(row.id)
+        types.append(row.object_type.value)
+        rects.extend(
+            (round(row.x0), round(row.y0), round(row.x1 - row.x0), round(row.y1 - row.y0))
+        )
+
+    edges = []
+    seen = set()
+    for source_id, target_id in edge_rows:
+        ends = sorted((index[shown_as[source_id]], index[shown_as[target_id]]))
+        if ends[0] != ends[1] and tuple(ends) not in seen:
+            seen.add(tuple(ends))
+            edges.extend(ends)
+
+    return {"objects": {"ids": ids, "types": types, "rects": rects}, "edges": edges}
+
+
+def with_positions(
+    overview: Dict[str, Any], pending: Dict[int, Tuple[float, float]]
+) -> Dict[str, Any]:
+    """Overlay buffered positions on a packed overview.
+
+    Only entities shown on their own are moved; containers keep their
+    last fitted bounds until the buffered moves are flushed.
+
+    Args:
+        overview: Result of ``pack_overview()`` (left unchanged)
+        pending: Object ID -> buffered (x, y)
+
+    Returns:
+        Overview with the boxes of buffered objects moved
+    """
+    objects = overview["objects"]
+    moved = [
+        (i, pending[id])
+        for i, (id, type) in enumerate(zip(objects["ids"], objects["types"], strict=True))
+        if id in pending and type == ObjectType.ENTITY.value
+    ]
+    if not moved:
+        return overview
+
+    rects = list(objects["rects"])
+    for i, (x, y) in moved:
+        rects[4 * i], rects[4 * i + 1] = round(x), round(y)
+    return {**overview, "objects": {**objects, "rects": rects}}
@@ -0,0 +1,39 @@
+"""Write-behind recording of user login timestamps."""
+import os
+from datetime import datetime
+from typing import Dict
+
+from ..repositories.user_repository import UserRepository
+from ..utils.database import get_db_context
+from ..utils.write_behind import WriteBehindBuffer
+
+# Seconds between flushes of buffered last_login_at values
+LAST_LOGIN_FLUSH_SECONDS = float(os.getenv("LAST_LOGIN_FLUSH_SECONDS", "5"))
+
+
+def _flush_logins(logins: Dict[int, datetime]) -> None:
+    """Persist buffered login timestamps in one multi-row UPDATE."""
+    with get_db_context() as db:
+        UserRepository(db).bulk_update_last_login(logins)
+
+
+_buffer = WriteBehindBuffer(_flush_logins, LAST_LOGIN_FLUSH_SECONDS, name="last-login-flusher")
+
+
+def record_login(user_id: int, at: datetime = None) -> None:
+    """Record a successful login without a write on the request path.
+
+    Args:
+        user_id: User who logged in
+        at: Login time (defaults to now)
+    """
+    _buffer.put(user_id, at or datetime.utcnow())
+
+
+def flush_logins() -> int:
+    """Persist buffered login timestamps immediately.
+
+    Returns:
+        Number of users updated
+    """
+    return _buffer.flush()
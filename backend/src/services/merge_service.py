@@ -0,0 +1,201 @@
+"""Conflict-free merging of concurrent edits to diagram placements."""
+import os
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.diagram_repository import DiagramObject, DiagramRelationship
+from ..repositories.diagram_repository import DiagramRepository
+from ..utils.hlc import Timestamp, server_clock
+from ..utils.rank import is_rank
+from . import containers, diagram_events
+
+# Upper bound on ops accepted by one request
+DIAGRAM_OPS_MAX_OPS = int(os.getenv("DIAGRAM_OPS_MAX_OPS", "1000"))
+
+
+def _number(value: Any) -> bool:
+    """Check for an int or float (not a bool)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _optional(check: Callable[[Any], bool]) -> Callable[[Any], bool]:
+    """Extend a validator to accept None."""
+    return lambda value: value is None or check(value)
+
+
+def _anchor(value: Any) -> bool:
+    """Check for an anchor name that fits its column."""
+    return isinstance(value, str) and len(value) <= 20
+
+
+# Op "type" -> (table, API field -> (column, validator))
+MERGEABLE_FIELDS = {
+    "object": (
+        DiagramObject.__table__,
+        {
+            "positionX": ("position_x", _number),
+            "positionY": ("position_y", _number),
+            "width": ("width", _optional(_number)),
+            "height": ("height", _optional(_number)),
+            "zRank": ("z_rank", is_rank),
+            "visualStyle": ("visual_style", _optional(lambda v: isinstance(v, dict))),
+            "isCollapsed": ("is_collapsed", lambda v: isinstance(v, bool)),
+        },
+    ),
+    "relationship": (
+        DiagramRelationship.__table__,
+        {
+            "isVisible": ("is_visible", lambda v: isinstance(v, bool)),
+            "pathPoints": ("path_points", _optional(lambda v: isinstance(v, list))),
+            "sourceAnchor": ("source_anchor", _optional(_anchor)),
+            "targetAnchor": ("target_anchor", _optional(_anchor)),
+            "visualStyle": ("visual_style", _optional(lambda v: isinstance(v, dict))),
+        },
+    ),
+}
+
+# Object columns that move a box, so the containers around it are refitted
+GEOMETRY_COLUMNS = frozenset({"position_x", "position_y", "width", "height"})
+
+
+class DiagramMergeService:
+    """Merges field-level edits of diagram objects and relationship lines.
+
+    Every mergeable field is a last-writer-wins register: the value plus
+    the hybrid logical clock timestamp of the write that set it (kept in
+    ``field_clocks``). Clients stamp each op with their own HLC, so ops
+    made offline can be replayed later in any order and every replica
+    converges on the same values. Ops are merged in memory first (only
+    the newest write per field survives), then applied with one
+    conditional multi-row UPDATE per column; no row is locked up front.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize merge service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+        self.repository = DiagramRepository(db)
+
+    def apply(self, diagram_id: int, ops: List[Dict], max_ops: int = DIAGRAM_OPS_MAX_OPS) -> Dict:
+        """Apply a batch of ops to a diagram.
+
+        Each op is ``{"type": "object" | "relationship", "id": ...,
+        "ts": "<HLC timestamp>", "fields": {"positionX": ..., ...}}``.
+
+        Args:
+            diagram_id: Diagram ID
+            ops: Ops in any order
+            max_ops: Upper bound on ops in the batch
+
+        Returns:
+            Dictionary with the number of field writes applied, the
+            resulting values and clocks of every row touched, the rows not
+            found on the diagram, the containers whose bounds changed, and
+            the server clock to merge
+
+        Raises:
+            ValueError: If the diagram does not exist or an op is invalid
+        """
+        if not isinstance(ops, list) or not ops:
+            raise ValueError("ops must be a non-empty list")
+        if len(ops) > max_ops:
+            raise ValueError(f"At most {max_ops} ops can be applied at once")
+
+        # (type, column) -> row ID -> (value, clock); newest clock wins
+        winners: Dict[Tuple[str, str], Dict[int, Tuple[Any, str]]] = defaultdict(dict)
+        touched: Dict[str, set] = defaultdict(set)
+        for op in ops:
+            op_type, row_id, clock, fields = self._parse(op)
+            columns = MERGEABLE_FIELDS[op_type][1]
+            touched[op_type].add(row_id)
+            for field, value in fields.items():
+                column = columns[field][0]
+                current = winners[(op_type, column)].get(row_id)
+                if current is None or current[1] < clock:
+                    winners[(op_type, column)][row_id] = (value, clock)
+
+        if not self.repository.exists(diagram_id):
+            raise ValueError(f"Diagram with ID {diagram_id} not found")
+
+        applied = 0
+        moved = set()
+        for (op_type, column), writes in winners.items():
+            written = self.repository.merge_field(
+                MERGEABLE_FIELDS[op_type][0],
+                diagram_id,
+                column,
+                [(row_id, value, clock) for row_id, (value, clock) in writes.items()],
+            )
+            applied += len(written)
+            if op_type == "object" and column in GEOMETRY_COLUMNS:
+                moved.update(written)
+
+        results, missing = [], []
+        for op_type, ids in touched.items():
+            table, fields = MERGEABLE_FIELDS[op_type]
+            to_field = {column: field for field, (column, _) in fields.items()}
+            rows = self.repository.get_field_states(table, diagram_id, ids, list(to_field))
+            for row in rows:
+                clocks = row.field_clocks or {}
+                results.append(
+                    {
+                        "type": op_type,
+                        "id": row.id,
+                        "values": {field: getattr(row, column) for column, field in to_field.items()},
+                        "clocks": {
+                            field: clocks[column] for column, field in to_field.items() if column in clocks
+                        },
+                    }
+                )
+            found = {row.id for row in rows}
+            missing += [{"type": op_type, "id": id} for id in sorted(ids - found)]
+
+        if applied:
+            diagram_events.publish(self.db, diagram_id, "merge", results)
+
+        return {
+            "applied": applied,
+            "results": results,
+            "missing": missing,
+            "containers": containers.refit(self.db, diagram_id, moved) if moved else [],
+            "clock": str(server_clock.now()),
+        }
+
+    @staticmethod
+    def _parse(op: Any) -> Tuple[str, int, str, Dict[str, Any]]:
+        """Validate one op and merge its clock into the server clock.
+
+        Returns:
+            Tuple of (type, row ID, clock text, fields)
+        """
+        if not isinstance(op, dict):
+            raise ValueError("Each op must be an object")
+
+        op_type = op.get("type")
+        if op_type not in MERGEABLE_FIELDS:
+            raise ValueError(f"Op type must be one of {', '.join(MERGEABLE_FIELDS)}")
+
+        row_id = op.get("id")
+        if not isinstance(row_id, int) or isinstance(row_id, bool):
+            raise ValueError("Op id must be an integer")
+
+        timestamp = Timestamp.parse(op.get("ts"))
+        server_clock.update(timestamp)
+
+        fields = op.get("fields")
+        if not isinstance(fields, dict) or not fields:
+            raise ValueError("Op fields must be a non-empty object")
+
+        columns = MERGEABLE_FIELDS[op_type][1]
+        for field, value in fields.items():
+            if field not in columns:
+                raise ValueError(f"Field {field} of {op_type} cannot be edited")
+            if not columns[field][1](value):
+                raise ValueError(f"Invalid value for {op_type} field {field}")
+
+        return op_type, row_id, str(timestamp), fields
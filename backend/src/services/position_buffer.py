@@ -0,0 +1,188 @@
+"""Write-behind buffering of diagram object positions while they are dragged."""
+import logging
+import os
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import InterfaceError, OperationalError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..repositories.diagram_repository import DiagramRepository
+from ..utils.cache import LRUCache
+from ..utils.database import get_db_context
+from ..utils.hlc import server_clock
+from ..utils.write_behind import WriteBehindBuffer
+from . import containers, diagram_events
+
+logger = logging.getLogger(__name__)
+
+# Seconds between bulk flushes of buffered positions
+DIAGRAM_POSITION_FLUSH_SECONDS = float(os.getenv("DIAGRAM_POSITION_FLUSH_SECONDS", "0.25"))
+
+Position = Tuple[float, float]
+
+# Moves announced per event, so each event fits in one NOTIFY payload
+_MOVES_PER_EVENT = 100
+
+# Object ID -> position before the first flushed move of the current drag,
+# so the journal entry written when the drag ends can be undone in one step
+_origins = LRUCache(maxsize=10000, ttl=300)
+
+
+def _flush_positions(positions: Dict[Hashable, Tuple[int, float, float]]) -> None:
+    """Persist buffered positions in one multi-row UPDATE, announce them and refit containers.
+
+    Moves are announced as one ``move`` event per diagram carrying the
+    list of moved objects, as the event hub delivers coalesced moves.
+    """
+    with get_db_context() as db:
+        moved = defaultdict(list)
+        for row in _update_positions(db, positions, str(server_clock.now())):
+            if _origins.get(row.id) is None:
+                _origins.set(row.id, (row.old_position_x, row.old_position_y))
+            moved[row.diagram_id].append(
+                {"id": row.id, "positionX": row.position_x, "positionY": row.position_y}
+            )
+
+        for diagram_id, moves in moved.items():
+            for start in range(0, len(moves), _MOVES_PER_EVENT):
+                diagram_events.publish(
+                    db, diagram_id, "move", moves[start : start + _MOVES_PER_EVENT]
+                )
+            containers.refit(db, diagram_id, [move["id"] for move in moves])
+
+
+def _update_positions(
+    db: Session, positions: Dict[Hashable, Tuple[int, float, float]], clock: str
+) -> List[Row]:
+    """Write positions in bulk, isolating rows that make the bulk UPDATE fail.
+
+    If the multi-row UPDATE fails, each position is retried on its own and
+    those that still fail are dropped, so one bad row cannot keep every
+    other diagram's positions from being saved. Connection failures are
+    raised instead, so the whole batch is requeued.
+    """
+    repository = DiagramRepository(db)
+    try:
+        with db.begin_nested():
+            return repository.bulk_update_positions(positions, clock=clock)
+    except (OperationalError, InterfaceError):
+        raise
+    except SQLAlchemyError:
+        logger.exception("Bulk position update failed; retrying positions one by one")
+
+    rows = []
+    for object_id, position in positions.items():
+        try:
+            with db.begin_nested():
+                rows += repository.bulk_update_positions({object_id: position}, clock=clock)
+        except (OperationalError, InterfaceError):
+            raise
+        except SQLAlchemyError:
+            logger.exception("Dropping buffered position of diagram object %s", object_id)
+    return rows
+
+
+_buffer = WriteBehindBuffer(_flush_positions, DIAGRAM_POSITION_FLUSH_SECONDS, name="position-flusher")
+
+
+def record_position(diagram_id: int, object_id: int, position_x: float, position_y: float) -> None:
+    """Buffer an object's latest position without a write on the request path.
+
+    Later positions of the same object replace earlier ones (last writer
+    wins), so however fast a drag reports, each flush writes every dirty
+    object once.
+
+    Args:
+        diagram_id: Diagram ID
+        object_id: DiagramObject ID
+        position_x: New X coordinate
+        position_y: New Y coordinate
+    """
+    _buffer.put(object_id, (diagram_id, position_x, position_y))
+
+
+def is_pending(diagram_id: int, object_id: int) -> bool:
+    """Check whether an object of a diagram has a buffered position.
+
+    Args:
+        diagram_id: Diagram ID
+        object_id: DiagramObject ID
+
+    Returns:
+        True if a position for the object on that diagram is buffered
+    """
+    pending = _buffer.get(object_id)
+    return pending is not None and pending[0] == diagram_id
+
+
+def pending_positions(diagram_id: int) -> Dict[int, Position]:
+    """Get a diagram's buffered positions that are not yet persisted.
+
+    Args:
+        diagram_id: Diagram ID
+
+    Returns:
+        DiagramObject ID -> (x, y)
+    """
+    return {
+        object_id: (x, y)
+        for object_id, (pending_diagram_id, x, y) in _buffer.snapshot().items()
+        if pending_diagram_id == diagram_id
+    }
+
+
+def discard_position(object_id: int) -> Optional[Position]:
+    """End an object's drag: drop its buffered position and its origin.
+
+    Args:
+        object_id: DiagramObject ID
+
+    Returns:
+        Position before the drag's first flushed move, or None if no
+        intermediate position reached the database
+    """
+    _buffer.discard(object_id)
+    origin = _origins.get(object_id)
+    _origins.delete(object_id)
+    return origin
+
+
+def merge_positions(
+    rows: Sequence[Sequence], fields: Sequence[str], pending: Dict[int, Position]
+) -> List[Sequence]:
+    """Overlay buffered positions on object rows read from the database.
+
+    Args:
+        rows: Rows selected with ``DIAGRAM_OBJECT_FIELDS.columns(fields)``
+        fields: The same field names; must include id, positionX and positionY
+        pending: Result of ``pending_positions()``
+
+    Returns:
+        Rows with the positions of buffered objects replaced
+    """
+    if not pending:
+        return list(rows)
+
+    id_index = fields.index("id")
+    x_index = fields.index("positionX")
+    y_index = fields.index("positionY")
+
+    merged = []
+    for row in rows:
+        position = pending.get(row[id_index])
+        if position is not None:
+            row = list(row)
+            row[x_index], row[y_index] = position
+        merged.append(row)
+    return merged
+
+
+def flush_positions() -> int:
+    """Persist buffered positions immediately.
+
+    Returns:
+        Number of objects updated
+    """
+    return _buffer.flush()
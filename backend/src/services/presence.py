@@ -0,0 +1,480 @@
+"""Ephemeral collaborator presence: who is on a diagram, their cursor and selection."""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .diagram_events import DIAGRAM_EVENTS_QUEUE_SIZE, Subscription, format_sse
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_CHANNEL = "diagram_presence"
+
+# "local" (single worker) or "redis" (pub/sub shared by all workers)
+PRESENCE_BACKEND = os.getenv("PRESENCE_BACKEND", "local")
+PRESENCE_REDIS_URL = os.getenv("PRESENCE_REDIS_URL", "redis://localhost:6379/0")
+
+# Seconds without a heartbeat or update before a collaborator is dropped
+DIAGRAM_PRESENCE_TTL_SECONDS = float(os.getenv("DIAGRAM_PRESENCE_TTL_SECONDS", "30"))
+
+# Upper bound on cursor batches per diagram per second
+DIAGRAM_PRESENCE_MAX_RATE = float(os.getenv("DIAGRAM_PRESENCE_MAX_RATE", "15"))
+
+# Largest selection a collaborator may share
+DIAGRAM_PRESENCE_MAX_SELECTION = int(os.getenv("DIAGRAM_PRESENCE_MAX_SELECTION", "500"))
+
+Message = Dict[str, Any]
+
+
+class LocalPresenceBackend:
+    """Delivers presence messages within this process only."""
+
+    def start(self, deliver: Callable[[Message], None]) -> None:
+        """Start delivering published messages.
+
+        Args:
+            deliver: Called with every published message
+        """
+        self._deliver = deliver
+
+    def publish(self, message: Message) -> None:
+        """Publish a message to every hub sharing this backend."""
+        self._deliver(message)
+
+    def close(self) -> None:
+        """Stop delivering messages."""
+
+
+class RedisPresenceBackend:
+    """Shares presence messages between workers over Redis pub/sub.
+
+    Every worker receives every message (including its own) on
+    ``PRESENCE_CHANNEL`` and applies it to its local member table, so any
+    worker can serve any collaborator's stream.
+    """
+
+    def __init__(self, url: str = PRESENCE_REDIS_URL):
+        """Initialize backend.
+
+        Args:
+            url: Redis URL
+
+        Raises:
+            RuntimeError: If the redis package is not installed
+        """
+        if redis is None:
+            raise RuntimeError("PRESENCE_BACKEND=redis requires the redis package")
+        self._client = redis.Redis.from_url(url)
+        self._pubsub = None
+
+    def start(self, deliver: Callable[[Message], None]) -> None:
+        """Subscribe to the channel on a daemon thread.
+
+        Args:
+            deliver: Called with every received message
+        """
+
+        def handle(raw: Dict[str, Any]) -> None:
+            try:
+                deliver(json.loads(raw["data"]))
+            except (ValueError, TypeError):
+                logger.warning("Ignoring malformed presence message: %.200s", raw["data"])
+
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{PRESENCE_CHANNEL: handle})
+        self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publish(self, message: Message) -> None:
+        """Publish a message to every worker."""
+        self._client.publish(PRESENCE_CHANNEL, json.dumps(message, separators=(",", ":")))
+
+    def close(self) -> None:
+        """Unsubscribe and release the connection."""
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+
+def create_backend(name: str = PRESENCE_BACKEND):
+    """Create the configured presence backend.
+
+    Args:
+        name: "local" or "redis"
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name == "local":
+        return LocalPresenceBackend()
+    if name == "redis":
+        return RedisPresenceBackend()
+    raise ValueError(f"Unknown presence backend: {name}")
+
+
+class PresenceHub:
+    """Tracks collaborators per diagram and fans their activity out over SSE.
+
+    Presence is never persisted. Each open presence stream is one member
+    (a session) of its diagram; members expire ``ttl`` seconds after their
+    last heartbeat or update. Joins, leaves and selection changes are
+    broadcast immediately. Cursor moves are coalesced per diagram (latest
+    cursor per session) and published as one batch at most ``max_rate``
+    times a second, both to the backend and to subscribers.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        ttl: float = DIAGRAM_PRESENCE_TTL_SECONDS,
+        max_rate: float = DIAGRAM_PRESENCE_MAX_RATE,
+        queue_size: int = DIAGRAM_EVENTS_QUEUE_SIZE,
+    ):
+        """Initialize hub.
+
+        Args:
+            backend: Message transport between workers (defaults to the
+                configured ``PRESENCE_BACKEND``, created on first use)
+            ttl: Seconds before a silent member expires
+            max_rate: Cursor batches per diagram per second
+            queue_size: Frames buffered per subscriber
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.interval = 1.0 / max_rate
+        self.queue_size = queue_size
+        self._members: Dict[int, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self._expires: Dict[Tuple[int, str], float] = {}
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._cursors: Dict[int, Dict[str, Any]] = {}
+        self._due: Dict[int, float] = {}
+        self._last_flush: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def join(self, diagram_id: int, user: Dict[str, Any]) -> Tuple[str, Subscription]:
+        """Add a collaborator to a diagram and subscribe to its presence.
+
+        Args:
+            diagram_id: Diagram ID
+            user: Authenticated user (user_id, email)
+
+        Returns:
+            Tuple of (session ID, subscription)
+        """
+        self._start()
+        session_id = uuid.uuid4().hex
+        subscription = Subscription(diagram_id, self.queue_size)
+        with self._lock:
+            self._subscribers[diagram_id].add(subscription)
+
+        member = {
+            "sessionId": session_id,
+            "userId": user["user_id"],
+            "email": user.get("email"),
+            "cursor": None,
+            "selection": [],
+        }
+        self.backend.publish({"diagramId": diagram_id, "kind": "join", "member": member})
+        return session_id, subscription
+
+    def leave(self, diagram_id: int, session_id: str, subscription: Subscription) -> None:
+        """Remove a collaborator whose stream closed.
+
+        Args:
+            diagram_id: Diagram ID
+            session_id: Session returned by ``join()``
+            subscription: Subscription returned by ``join()``
+        """
+        with self._lock:
+            subscribers = self._subscribers.get(diagram_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[diagram_id]
+            messages = self._flush(diagram_id, time.monotonic())
+
+        messages.append({"diagramId": diagram_id, "kind": "leave", "sessionId": session_id})
+        self._publish(messages)
+
+    def heartbeat(self, diagram_id: int, session_id: str) -> None:
+        """Keep a collaborator whose stream is idle from expiring.
+
+        Args:
+            diagram_id: Diagram ID
+            session_id: Session ID
+        """
+        self.backend.publish({"diagramId": diagram_id, "kind": "heartbeat", "sessionId": session_id})
+
+    def update(
+        self,
+        diagram_id: int,
+        session_id: str,
+        user_id: int,
+        cursor: Optional[Dict[str, float]] = None,
+        selection: Optional[Sequence[int]] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Share a collaborator's cursor and/or selection.
+
+        Args:
+            diagram_id: Diagram ID
+            session_id: Session ID
+            user_id: Authenticated user (must own the session)
+            cursor: {"x", "y"} in canvas coordinates
+            selection: Selected DiagramObject IDs
+            now: Current monotonic time (for tests)
+
+        Raises:
+            ValueError: If the session is unknown or the values are invalid
+        """
+        now = time.monotonic() if now is None else now
+        cursor = self._validate_cursor(cursor)
+        selection = self._validate_selection(selection)
+        if cursor is None and selection is None:
+            raise ValueError("cursor or selection is required")
+
+        with self._lock:
+            member = self._members.get(diagram_id, {}).get(session_id)
+            if member is None or member["userId"] != user_id:
+                raise ValueError(f"Presence session {session_id} not found")
+
+            messages: List[Message] = []
+            if cursor is not None and selection is None:
+                self._cursors.setdefault(diagram_id, {})[session_id] = cursor
+                if diagram_id not in self._due:
+                    self._due[diagram_id] = max(
+                        now, self._last_flush.get(diagram_id, 0.0) + self.interval
+                    )
+                    self._wake.set()
+                if self._due[diagram_id] <= now:
+                    messages = self._flush(diagram_id, now)
+            else:
+                # Keep order: cursor moves made before this update go out first
+                messages = self._flush(diagram_id, now)
+                pending = self._cursors.get(diagram_id, {}).pop(session_id, None)
+                messages.append(
+                    {
+                        "diagramId": diagram_id,
+                        "kind": "update",
+                        "sessionId": session_id,
+                        "cursor": cursor or pending,
+                        "selection": selection,
+                    }
+                )
+
+        self._publish(messages)
+
+    def members(self, diagram_id: int) -> List[Dict[str, Any]]:
+        """Get a diagram's current collaborators.
+
+        Args:
+            diagram_id: Diagram ID
+
+        Returns:
+            Member dicts (sessionId, userId, email, cursor, selection)
+        """
+        with self._lock:
+            return [dict(member) for member in self._members.get(diagram_id, {}).values()]
+
+    def deliver(self, message: Message, now: Optional[float] = None) -> None:
+        """Apply a message from the backend and forward it to subscribers.
+
+        Args:
+            message: Message published by any worker's hub
+            now: Current monotonic time (for tests)
+        """
+        now = time.monotonic() if now is None else now
+        try:
+            diagram_id = message["diagramId"]
+            kind = message["kind"]
+        except (KeyError, TypeError):
+            logger.warning("Ignoring malformed presence message: %.200s", message)
+            return
+
+        with self._lock:
+            members = self._members[diagram_id]
+            expires = now + self.ttl
+
+            if kind == "join":
+                member = message["member"]
+                members[member["sessionId"]] = member
+                self._expires[(diagram_id, member["sessionId"])] = expires
+                self._broadcast(diagram_id, "join", member)
+            elif kind == "leave":
+                self._drop(diagram_id, message["sessionId"])
+            elif kind == "heartbeat":
+                if message["sessionId"] in members:
+                    self._expires[(diagram_id, message["sessionId"])] = expires
+            elif kind == "update":
+                member = members.get(message["sessionId"])
+                if member is not None:
+                    if message.get("cursor") is not None:
+                        member["cursor"] = message["cursor"]
+                    member["selection"] = message["selection"]
+                    self._expires[(diagram_id, member["sessionId"])] = expires
+                    self._broadcast(diagram_id, "update", member)
+            elif kind == "cursors":
+                moved = []
+                for session_id, cursor in message["cursors"].items():
+                    member = members.get(session_id)
+                    if member is not None:
+                        member["cursor"] = cursor
+                        self._expires[(diagram_id, session_id)] = expires
+                        moved.append({"sessionId": session_id, "cursor": cursor})
+                if moved:
+                    self._broadcast(diagram_id, "cursors", moved)
+
+            if not members:
+                del self._members[diagram_id]
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop members whose TTL has elapsed.
+
+        Every worker expires members on its own, so nothing is published.
+
+        Args:
+            now: Current monotonic time (for tests)
+
+        Returns:
+            Number of members dropped
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [key for key, expires in self._expires.items() if expires <= now]
+            for diagram_id, session_id in expired:
+                self._drop(diagram_id, session_id)
+                if not self._members.get(diagram_id):
+                    self._members.pop(diagram_id, None)
+        return len(expired)
+
+    def flush_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Publish cursor batches whose interval has elapsed.
+
+        Args:
+            now: Current monotonic time (for tests)
+
+        Returns:
+            Seconds until the next batch is due, or None
+        """
+        now = time.monotonic() if now is None else now
+        messages: List[Message] = []
+        with self._lock:
+            for diagram_id, due in list(self._due.items()):
+                if due <= now:
+                    messages += self._flush(diagram_id, now)
+            timeout = max(0.0, min(self._due.values()) - now) if self._due else None
+
+        self._publish(messages)
+        return timeout
+
+    def shutdown(self) -> None:
+        """Stop the background thread and the backend."""
+        self._stop.set()
+        self._wake.set()
+        if self.backend is not None:
+            self.backend.close()
+
+    @staticmethod
+    def _validate_cursor(cursor: Any) -> Optional[Dict[str, float]]:
+        """Check a shared cursor and keep only its coordinates."""
+        if cursor is None:
+            return None
+        try:
+            x, y = cursor["x"], cursor["y"]
+        except (KeyError, TypeError):
+            raise ValueError("cursor must be an object with x and y") from None
+        if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (x, y)):
+            raise ValueError("cursor x and y must be numbers")
+        return {"x": x, "y": y}
+
+    @staticmethod
+    def _validate_selection(selection: Any) -> Optional[List[int]]:
+        """Check a shared selection."""
+        if selection is None:
+            return None
+        if not isinstance(selection, list) or not all(
+            isinstance(id, int) and not isinstance(id, bool) for id in selection
+        ):
+            raise ValueError("selection must be a list of diagram object IDs")
+        if len(selection) > DIAGRAM_PRESENCE_MAX_SELECTION:
+            raise ValueError(
+                f"selection is limited to {DIAGRAM_PRESENCE_MAX_SELECTION} objects"
+            )
+        return selection
+
+    def _flush(self, diagram_id: int, now: float) -> List[Message]:
+        """Take a diagram's pending cursors as a message (caller holds the lock)."""
+        self._due.pop(diagram_id, None)
+        cursors = self._cursors.pop(diagram_id, None)
+        if not cursors:
+            return []
+
+        self._last_flush[diagram_id] = now
+        return [{"diagramId": diagram_id, "kind": "cursors", "cursors": cursors}]
+
+    def _publish(self, messages: List[Message]) -> None:
+        """Publish messages (outside the lock; local delivery re-enters the hub)."""
+        for message in messages:
+            self.backend.publish(message)
+
+    def _drop(self, diagram_id: int, session_id: str) -> None:
+        """Remove a member and announce it (caller holds the lock)."""
+        self._expires.pop((diagram_id, session_id), None)
+        cursors = self._cursors.get(diagram_id)
+        if cursors is not None:
+            cursors.pop(session_id, None)
+        if self._members.get(diagram_id, {}).pop(session_id, None) is not None:
+            self._broadcast(diagram_id, "leave", {"sessionId": session_id})
+
+    def _broadcast(self, diagram_id: int, kind: str, data: Any) -> None:
+        """Queue one event to every local subscriber of a diagram (caller holds the lock)."""
+        subscribers = self._subscribers.get(diagram_id)
+        if not subscribers:
+            return
+
+        frame = format_sse(None, kind, {"kind": kind, "data": data})
+        resync = format_sse(None, "resync", {"kind": "resync", "data": None})
+        for subscription in subscribers:
+            subscription.put(frame, resync)
+
+    def _start(self) -> None:
+        """Connect the backend and start the flush/expiry thread on first use."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            if self.backend is None:
+                self.backend = create_backend()
+            self.backend.start(self.deliver)
+            self._thread = threading.Thread(target=self._run, name="diagram-presence", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Publish cursor batches and expire members until stopped."""
+        while not self._stop.is_set():
+            try:
+                timeout = self.flush_due()
+                self.expire()
+            except Exception:
+                logger.exception("Presence hub iteration failed")
+                timeout = None
+
+            wait = self.ttl / 2 if timeout is None else min(timeout, self.ttl / 2)
+            self._wake.wait(wait)
+            self._wake.clear()
+
+
+# Shared by all requests of this worker
+presence_hub = PresenceHub()
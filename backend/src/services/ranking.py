@@ -0,0 +1,151 @@
+"""Reordering by fractional rank keys, with background rebalancing of long keys."""
+import os
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Type
+
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ..models import Base
+from ..repositories.base_repository import BaseRepository
+from ..utils.database import get_db_context
+from ..utils.rank import key_between
+from ..utils.write_behind import WriteBehindBuffer
+
+# Keys longer than this get their scope rebalanced in the background
+RANK_REBALANCE_LENGTH = int(os.getenv("RANK_REBALANCE_LENGTH", "24"))
+
+# Seconds between rebalancing passes
+RANK_REBALANCE_SECONDS = float(os.getenv("RANK_REBALANCE_SECONDS", "5"))
+
+# Called with (db, scope, rows of id and new key) after a scope is rebalanced
+OnRebalance = Callable[[Session, Any, List[Row]], None]
+
+
+def _rebalance(scopes: Dict[Hashable, Tuple[Type[Base], str, str, Optional[OnRebalance]]]) -> None:
+    """Rebalance every scope queued since the last pass, one transaction each."""
+    for (_, scope), (model, scope_field, rank_field, on_rebalance) in scopes.items():
+        with get_db_context() as db:
+            rows = BaseRepository(model, db).rebalance_ranks(scope_field, scope, rank_field)
+            if rows and on_rebalance is not None:
+                on_rebalance(db, scope, rows)
+
+
+_buffer = WriteBehindBuffer(_rebalance, RANK_REBALANCE_SECONDS, name="rank-rebalancer")
+
+
+def parse_move(data: Any, first: str, last: str) -> Tuple[Optional[int], bool]:
+    """Validate a move request body.
+
+    Accepts ``{"after": <id>}``, ``{"before": <id>}`` or
+    ``{"to": first | last}``.
+
+    Args:
+        data: Request body
+        first: Name of the start of the order (e.g. "back")
+        last: Name of the end of the order (e.g. "front")
+
+    Returns:
+        Tuple of (anchor ID or None for an end, whether to place after it)
+
+    Raises:
+        ValueError: If the body is not exactly one valid instruction
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be an object")
+
+    given = [key for key in ("after", "before", "to") if data.get(key) is not None]
+    if len(given) != 1:
+        raise ValueError("Give exactly one of after, before or to")
+
+    key = given[0]
+    value = data[key]
+    if key == "to":
+        if value not in (first, last):
+            raise ValueError(f"to must be '{first}' or '{last}'")
+        return None, value == last
+
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"{key} must be an integer ID")
+    return value, key == "after"
+
+
+def move(
+    repository: BaseRepository,
+    id: int,
+    scope_field: str,
+    rank_field: str,
+    anchor_id: Optional[int],
+    after: bool,
+    scope: Optional[Any] = None,
+    on_rebalance: Optional[OnRebalance] = None,
+) -> Optional[Tuple[Any, str, str]]:
+    """Work out a row's new rank key.
+
+    Only the moved row needs rewriting: its new key sorts between its new
+    neighbours'. When the key gets long (many moves into the same gap),
+    the scope is queued for a background rebalance.
+
+    Args:
+        repository: Repository of the ranked model
+        id: Primary key of the row to move
+        scope_field: Column whose value groups the order
+        rank_field: Rank key column
+        anchor_id: Row to move next to (None = an end of the order)
+        after: Place after the anchor (or last) rather than before it (or first)
+        scope: Required scope value of the row (None = any)
+        on_rebalance: Hook run in the rebalancing transaction (e.g. to
+            announce the new keys)
+
+    Returns:
+        Tuple of (scope value, current key, new key), or None if the row
+        or the anchor is not in the scope; the keys are equal when the row
+        already sits in the gap
+
+    Raises:
+        ValueError: If the row is asked to move next to itself
+    """
+    if anchor_id == id:
+        raise ValueError("Cannot move an item next to itself")
+
+    neighbours = repository.neighbour_ranks(id, scope_field, rank_field, anchor_id, after, scope)
+    if neighbours is None:
+        return None
+
+    scope, current, lo, hi = neighbours
+    if (lo is None or lo < current) and (hi is None or current < hi):
+        return scope, current, current
+
+    key = key_between(lo, hi)
+    rebalance_if_long(key, repository.model, scope_field, scope, rank_field, on_rebalance)
+    return scope, current, key
+
+
+def rebalance_if_long(
+    key: str,
+    model: Type[Base],
+    scope_field: str,
+    scope: Any,
+    rank_field: str,
+    on_rebalance: Optional[OnRebalance] = None,
+) -> None:
+    """Queue a scope for background rebalancing if a key given out is long.
+
+    Args:
+        key: Rank key just assigned in the scope
+        model: Ranked model
+        scope_field: Column whose value groups the order
+        scope: Scope value
+        rank_field: Rank key column
+        on_rebalance: Hook run in the rebalancing transaction
+    """
+    if len(key) > RANK_REBALANCE_LENGTH:
+        _buffer.put((model.__tablename__, scope), (model, scope_field, rank_field, on_rebalance))
+
+
+def rebalance_now() -> int:
+    """Rebalance queued scopes immediately.
+
+    Returns:
+        Number of scopes rebalanced
+    """
+    return _buffer.flush()
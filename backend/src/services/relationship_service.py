@@ -3,9 +3,28 @@ from typing import Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
-from ..models.relationship import Cardinality
+from ..models.relationship import Cardinality, Relationship
 from ..repositories.entity_repository import EntityRepository
 from ..repositories.relationship_repository import RelationshipRepository
+from ..utils.projection import Projection, enum_value
+
+# Fields selectable on list endpoints (?fields=...)
+RELATIONSHIP_FIELDS = Projection(
+    {
+        "id": Relationship.id,
+        "sourceEntityId": Relationship.source_entity_id,
+        "targetEntityId": Relationship.target_entity_id,
+        "sourceRole": Relationship.source_role,
+        "targetRole": Relationship.target_role,
+        "sourceCardinality": (Relationship.source_cardinality, enum_value),
+        "targetCardinality": (Relationship.target_cardinality, enum_value),
+        "name": Relationship.name,
+        "description": Relationship.description,
+        "createdAt": Relationship.created_at,
+        "updatedAt": Relationship.updated_at,
+        "version": Relationship.version,
+    }
+)
 
 
 class RelationshipService:
@@ -36,21 +55,39 @@ class RelationshipService:
 
         return self._to_dict(relationship)
 
-    def list(self, entity_id: Optional[int] = None) -> Dict:
+    def list(
+        self,
+        entity_id: Optional[int] = None,
+        fields: Optional[str] = None,
+        columnar: bool = False,
+    ) -> Dict:
         """List relationships with optional entity filter.
 
         Args:
             entity_id: Optional entity ID filter
+            fields: Optional sparse fieldset (comma-separated field names)
+            columnar: Return {"columns", "rows"} instead of a list of objects
 
         Returns:
-            Dictionary with data list
+            Dictionary with data list (or columns and rows)
+
+        Raises:
+            ValueError: If an unknown field is requested
         """
+        fields = RELATIONSHIP_FIELDS.parse_fields(fields)
+        columns = RELATIONSHIP_FIELDS.columns(fields)
+
         if entity_id:
-            relationships = self.repository.get_by_entity(entity_id)
+            rows = self.repository.list_rows(
+                columns,
+                (Relationship.source_entity_id == entity_id)
+                | (Relationship.target_entity_id == entity_id),
+                limit=None,
+            )
         else:
-            relationships = self.repository.list(limit=1000)  # Large limit for relationships
+            rows = self.repository.list_rows(columns, limit=1000)  # Large limit for relationships
 
-        return {"data": [self._to_dict(r) for r in relationships]}
+        return RELATIONSHIP_FIELDS.render(rows, fields, columnar)
 
     def create(self, data: Dict, user_id: Optional[int] = None) -> Dict:
         """Create new relationship.
@@ -134,18 +171,22 @@ class RelationshipService:
         relationship = self.repository.create(create_data)
         return self._to_dict(relationship)
 
-    def update(self, id: int, data: Dict) -> Optional[Dict]:
+    def update(
+        self, id: int, data: Dict, expected_version: Optional[int] = None
+    ) -> Optional[Dict]:
         """Update relationship.
 
         Args:
             id: Relationship ID
             data: Fields to update
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Updated relationship dict or None
 
         Raises:
             ValueError: If validation fails
+            StaleVersionError: If the row changed since ``expected_version``
         """
         relationship = self.repository.get(id)
         if not relationship:
@@ -163,26 +204,28 @@ class RelationshipService:
             data["target_cardinality"] = Cardinality(data.pop("targetCardinality"))
 
         # Update
-        updated = self.repository.update(id, data)
+        updated = self.repository.update(id, data, expected_version)
         return self._to_dict(updated) if updated else None
 
-    def delete(self, id: int) -> Dict:
+    def delete(self, id: int, expected_version: Optional[int] = None) -> Dict:
         """Delete relationship.
 
         Args:
             id: Relationship ID
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Success message
 
         Raises:
             ValueError: If relationship not found
+            StaleVersionError: If the row changed since ``expected_version``
         """
         relationship = self.repository.get(id)
         if not relationship:
             raise ValueError("Relationship not found")
 
-        self.repository.delete(id)
+        self.repository.delete(id, expected_version)
 
         return {
             "message": "Relationship deleted successfully",
@@ -207,10 +250,7 @@ class RelationshipService:
             "targetCardinality": relationship.target_cardinality.value,
             "name": relationship.name,
             "description": relationship.description,
-            "createdAt": relationship.created_at.isoformat()
-            if relationship.created_at
-            else None,
-            "updatedAt": relationship.updated_at.isoformat()
-            if relationship.updated_at
-            else None,
+            "createdAt": relationship.created_at,
+            "updatedAt": relationship.updated_at,
+            "version": relationship.version,
         }
@@ -1,9 +1,28 @@
 """Superdomain service for business logic."""
 from typing import Dict, List, Optional
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..models.object_repository import Superdomain
+from ..repositories.base_repository import is_unique_violation
 from ..repositories.superdomain_repository import SuperdomainRepository
+from ..utils.projection import Projection
+from .user_loader import UserLoader
+
+# Fields selectable on list endpoints (?fields=...)
+SUPERDOMAIN_FIELDS = Projection(
+    {
+        "id": Superdomain.id,
+        "name": Superdomain.name,
+        "description": Superdomain.description,
+        "domainCount": Superdomain.domain_count,
+        "createdAt": Superdomain.created_at,
+        "updatedAt": Superdomain.updated_at,
+        "version": Superdomain.version,
+        "createdBy": Superdomain.created_by,
+    }
+)
 
 
 class SuperdomainService:
@@ -17,6 +36,7 @@ class SuperdomainService:
         """
         self.db = db
         self.repository = SuperdomainRepository(db)
+        self.user_loader = UserLoader(db)
 
     def get_by_id(self, id: int) -> Optional[Dict]:
         """Get superdomain by ID.
@@ -33,22 +53,43 @@ class SuperdomainService:
 
         return self._to_dict(superdomain)
 
-    def list(self, page: int = 1, page_size: int = 100) -> Dict:
+    def list(
+        self,
+        page: int = 1,
+        page_size: int = 100,
+        fields: Optional[str] = None,
+        columnar: bool = False,
+    ) -> Dict:
         """List superdomains with pagination.
 
         Args:
             page: Page number (1-indexed)
             page_size: Number of items per page
+            fields: Optional sparse fieldset (comma-separated field names)
+            columnar: Return {"columns", "rows"} instead of a list of objects
 
         Returns:
             Dictionary with data and pagination info
+
+        Raises:
+            ValueError: If an unknown field is requested
         """
+        fields = SUPERDOMAIN_FIELDS.parse_fields(fields)
         skip = (page - 1) * page_size
-        superdomains = self.repository.list(skip=skip, limit=page_size)
+        rows = self.repository.list_rows(
+            SUPERDOMAIN_FIELDS.columns(fields), skip=skip, limit=page_size
+        )
         total = self.repository.count()
 
+        serialisers = None
+        if "createdBy" in fields:
+            # Fetch all creators in one query instead of one per row
+            index = fields.index("createdBy")
+            self.user_loader.prime(row[index] for row in rows)
+            serialisers = {"createdBy": self.user_loader.load}
+
         return {
-            "data": [self._to_dict(s) for s in superdomains],
+            **SUPERDOMAIN_FIELDS.render(rows, fields, columnar, serialisers),
             "pagination": {
                 "page": page,
                 "pageSize": page_size,
@@ -78,38 +119,38 @@ class SuperdomainService:
         if len(name) > 100:
             raise ValueError("Superdomain name must be 100 characters or less")
 
-        # Check unique constraint
-        existing = self.repository.get_by_name(name)
-        if existing:
-            raise ValueError(f"Superdomain with name '{name}' already exists")
-
-        # Create
+        # Create; the unique name constraint is enforced by the INSERT itself
         create_data = {
             "name": name,
             "description": data.get("description"),
             "created_by": user_id,
         }
 
-        superdomain = self.repository.create(create_data)
+        superdomain = self.repository.create_unique(
+            create_data, index_elements=[Superdomain.name]
+        )
+        if superdomain is None:
+            raise ValueError(f"Superdomain with name '{name}' already exists")
+
         return self._to_dict(superdomain)
 
-    def update(self, id: int, data: Dict) -> Optional[Dict]:
+    def update(
+        self, id: int, data: Dict, expected_version: Optional[int] = None
+    ) -> Optional[Dict]:
         """Update superdomain.
 
         Args:
             id: Superdomain ID
             data: Fields to update
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Updated superdomain dict or None
 
         Raises:
             ValueError: If validation fails
+            StaleVersionError: If the row changed since ``expected_version``
         """
-        superdomain = self.repository.get(id)
-        if not superdomain:
-            return None
-
         # Validation
         if "name" in data:
             name = data["name"].strip()
@@ -119,27 +160,34 @@ class SuperdomainService:
             if len(name) > 100:
                 raise ValueError("Superdomain name must be 100 characters or less")
 
-            # Check unique constraint (excluding current superdomain)
-            existing = self.repository.get_by_name(name)
-            if existing and existing.id != id:
-                raise ValueError(f"Superdomain with name '{name}' already exists")
+        # Update; the unique name constraint is enforced by the UPDATE
+        try:
+            updated = self.repository.update(id, data, expected_version)
+        except IntegrityError as e:
+            if is_unique_violation(e):
+                raise ValueError(
+                    f"Superdomain with name '{data['name'].strip()}' already exists"
+                ) from e
+            raise
 
-        # Update
-        updated = self.repository.update(id, data)
         return self._to_dict(updated) if updated else None
 
-    def delete(self, id: int, confirm_cascade: bool = False) -> Dict:
+    def delete(
+        self, id: int, confirm_cascade: bool = False, expected_version: Optional[int] = None
+    ) -> Dict:
         """Delete superdomain with cascade impact analysis.
 
         Args:
             id: Superdomain ID
             confirm_cascade: Whether user confirmed cascade delete
+            expected_version: Version the client last saw (None = any)
 
         Returns:
             Delete impact report
 
         Raises:
             ValueError: If superdomain not found or cascade not confirmed
+            StaleVersionError: If the row changed since ``expected_version``
         """
         superdomain = self.repository.get(id)
         if not superdomain:
@@ -159,7 +207,7 @@ class SuperdomainService:
             }
 
         # Perform delete (cascade handled by database FK constraints)
-        self.repository.delete(id)
+        self.repository.delete(id, expected_version)
 
         return {
             "message": f"Superdomain '{superdomain.name}' deleted successfully",
@@ -181,13 +229,9 @@ class SuperdomainService:
             "id": superdomain.id,
             "name": superdomain.name,
             "description": superdomain.description,
-            "createdAt": superdomain.created_at.isoformat() if superdomain.created_at else None,
-            "updatedAt": superdomain.updated_at.isoformat() if superdomain.updated_at else None,
-            "createdBy": {
-                "id": superdomain.creator.id,
-                "username": superdomain.creator.username,
-                "email": superdomain.creator.email,
-            }
-            if superdomain.creator
-            else None,
+            "domainCount": superdomain.domain_count,
+            "createdAt": superdomain.created_at,
+            "updatedAt": superdomain.updated_at,
+            "version": superdomain.version,
+            "createdBy": self.user_loader.load(superdomain.created_by),
         }
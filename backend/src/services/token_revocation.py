@@ -0,0 +1,132 @@
+"""Per-user token revocation watermarks shared through the database."""
+import atexit
+import calendar
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from ..repositories.user_repository import UserRepository
+from ..utils.database import get_db_context
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls of the user table for new watermarks
+REVOCATION_REFRESH_SECONDS = float(os.getenv("TOKEN_REVOCATION_REFRESH", "5"))
+
+# Tokens never outlive this, so older watermarks can be forgotten
+TOKEN_LIFETIME = timedelta(hours=24)
+
+
+def _to_timestamp(value: datetime) -> float:
+    """Convert a naive UTC datetime to a Unix timestamp."""
+    return calendar.timegm(value.utctimetuple()) + value.microsecond / 1_000_000
+
+
+class TokenRevocationList:
+    """In-memory view of ``user.tokens_valid_after`` for O(1) token checks.
+
+    The database column is the shared source of truth across workers; a
+    daemon thread in each worker re-polls recent watermarks every
+    ``refresh_seconds``, so checking a token never touches the database.
+    A token is revoked when it was issued before its user's watermark.
+    """
+
+    def __init__(self, refresh_seconds: float = REVOCATION_REFRESH_SECONDS):
+        """Initialize revocation list.
+
+        Args:
+            refresh_seconds: Maximum staleness of the in-memory watermarks
+        """
+        self.refresh_seconds = refresh_seconds
+        self._watermarks: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def is_revoked(self, user_id: Optional[int], issued_at: Optional[float]) -> bool:
+        """Check whether a token has been revoked.
+
+        The first check in a worker waits (at most ``refresh_seconds``)
+        for the initial load of watermarks; later checks only read memory.
+
+        Args:
+            user_id: Token subject
+            issued_at: Token ``iat`` claim (Unix timestamp, may be fractional)
+
+        Returns:
+            True if the token was issued before the user's watermark
+        """
+        if user_id is None:
+            return False
+
+        if not self._loaded.is_set():
+            self._start()
+            self._loaded.wait(self.refresh_seconds)
+
+        watermark = self._watermarks.get(user_id)
+        if watermark is None:
+            return False
+
+        # Tokens without iat cannot prove they postdate the watermark
+        return issued_at is None or issued_at < watermark
+
+    def revoke(self, user_id: int, at: Optional[datetime] = None) -> None:
+        """Record a watermark locally without waiting for the next poll.
+
+        Args:
+            user_id: User whose tokens are revoked
+            at: Watermark (defaults to now)
+        """
+        watermark = _to_timestamp(at or datetime.utcnow())
+        with self._lock:
+            self._watermarks[user_id] = max(watermark, self._watermarks.get(user_id, 0.0))
+
+    def shutdown(self) -> None:
+        """Stop the refresh thread."""
+        self._stop.set()
+
+    def _start(self) -> None:
+        """Start the background refresh thread on first use."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="token-revocation", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.shutdown)
+
+    def _run(self) -> None:
+        """Refresh watermarks now and then every ``refresh_seconds``."""
+        while True:
+            self._refresh()
+            # Also after a failed first poll: requests must not keep waiting
+            self._loaded.set()
+            if self._stop.wait(self.refresh_seconds):
+                return
+
+    def _refresh(self) -> None:
+        """Reload recent watermarks from the database."""
+        since = datetime.utcnow() - TOKEN_LIFETIME
+        try:
+            with get_db_context() as db:
+                rows = UserRepository(db).get_revocation_watermarks(since)
+        except Exception:
+            # Keep serving the last known list; retry on the next interval
+            logger.exception("Could not refresh token revocation watermarks")
+            return
+
+        watermarks = {user_id: _to_timestamp(at) for user_id, at in rows.items()}
+        oldest = _to_timestamp(since)
+        with self._lock:
+            # Keep recent local revocations the poll did not see yet
+            for user_id, watermark in self._watermarks.items():
+                if watermark > max(oldest, watermarks.get(user_id, 0.0)):
+                    watermarks[user_id] = watermark
+            self._watermarks = watermarks
+
+
+revocation_list = TokenRevocationList()
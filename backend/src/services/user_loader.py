@@ -0,0 +1,97 @@
+"""Batched loader for user projections embedded in responses."""
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from ..repositories.user_repository import UserRepository
+from ..utils.cache import LRUCache
+
+# Small process-wide cache of {id, username, email}; user profiles change rarely
+_projection_cache = LRUCache(
+    maxsize=int(os.getenv("USER_PROJECTION_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_PROJECTION_CACHE_TTL", "60")),
+)
+
+
+class UserLoader:
+    """DataLoader-style batching of user lookups for a single request.
+
+    Callers ``prime()`` every user ID a page will reference, then ``load()``
+    each one while serialising rows. All primed IDs that miss the shared
+    LRU cache are fetched together, so a list endpoint embedding user info
+    costs at most one extra query regardless of page size.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize user loader.
+
+        Args:
+            db: Database session
+        """
+        self.repository = UserRepository(db)
+        self._loaded: Dict[int, Optional[Dict]] = {}
+        self._pending: Set[int] = set()
+
+    def prime(self, user_ids: Iterable[Optional[int]]) -> None:
+        """Queue user IDs to be fetched in the next batch.
+
+        Args:
+            user_ids: User IDs (None values are ignored)
+        """
+        for user_id in user_ids:
+            if user_id is not None and user_id not in self._loaded:
+                self._pending.add(user_id)
+
+    def load(self, user_id: Optional[int]) -> Optional[Dict]:
+        """Get the projection for one user, dispatching queued IDs if needed.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Dict with id, username and email, or None
+        """
+        if user_id is None:
+            return None
+
+        if user_id not in self._loaded:
+            self._pending.add(user_id)
+            self._dispatch()
+
+        return self._loaded.get(user_id)
+
+    def load_many(self, user_ids: Iterable[Optional[int]]) -> List[Optional[Dict]]:
+        """Get projections for several users with a single batch.
+
+        Args:
+            user_ids: User IDs
+
+        Returns:
+            Projections in the same order as user_ids
+        """
+        user_ids = list(user_ids)
+        self.prime(user_ids)
+        self._dispatch()
+        return [self._loaded.get(user_id) if user_id is not None else None for user_id in user_ids]
+
+    def _dispatch(self) -> None:
+        """Resolve all pending IDs from the shared cache, then one query."""
+        missing = []
+        for user_id in self._pending:
+            cached = _projection_cache.get(user_id)
+            if cached is not None:
+                self._loaded[user_id] = cached
+            else:
+                missing.append(user_id)
+        self._pending.clear()
+
+        if not missing:
+            return
+
+        found = {p["id"]: p for p in self.repository.get_projections(missing)}
+        for user_id in missing:
+            projection = found.get(user_id)
+            self._loaded[user_id] = projection
+            if projection is not None:
+                _projection_cache.set(user_id, projection)
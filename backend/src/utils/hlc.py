@@ -0,0 +1,146 @@
+"""Hybrid logical clocks for ordering concurrent edits across clients."""
+import os
+import re
+import socket
+import threading
+import time
+from typing import Callable, NamedTuple
+
+# Seconds a client clock may run ahead of the server's before ops are refused
+DIAGRAM_CLOCK_MAX_DRIFT_SECONDS = float(os.getenv("DIAGRAM_CLOCK_MAX_DRIFT_SECONDS", "60"))
+
+# Largest counter value; a busier millisecond borrows the next one
+MAX_COUNTER = 99999
+
+# Node IDs are part of the timestamp text, so keep them short and safe
+_TIMESTAMP_PATTERN = re.compile(r"^(\d{13}):(\d{5}):([A-Za-z0-9_.-]{1,64})$")
+
+
+class Timestamp(NamedTuple):
+    """HLC timestamp: wall time (ms), logical counter and node ID.
+
+    ``str()`` gives a fixed-width text form whose byte order equals the
+    timestamp order, so the database can compare clocks as plain text
+    (with ``COLLATE "C"``).
+    """
+
+    wall: int
+    counter: int
+    node: str
+
+    def __str__(self) -> str:
+        return f"{self.wall:013d}:{self.counter:05d}:{self.node}"
+
+    @classmethod
+    def parse(cls, value: str) -> "Timestamp":
+        """Parse a timestamp's text form.
+
+        Args:
+            value: Text as produced by ``str()``
+
+        Returns:
+            Timestamp
+
+        Raises:
+            ValueError: If the text is not a valid timestamp
+        """
+        match = _TIMESTAMP_PATTERN.match(value) if isinstance(value, str) else None
+        if match is None:
+            raise ValueError(f"Invalid clock timestamp: {value!r}")
+        return cls(int(match.group(1)), int(match.group(2)), match.group(3))
+
+
+class HybridLogicalClock:
+    """Monotonic clock combining wall time with a logical counter.
+
+    Timestamps from ``now()`` are strictly increasing and, after
+    ``update()`` with a remote timestamp, greater than it, so causally
+    later edits always order after the edits they saw, however far the
+    participants' wall clocks disagree (within ``max_drift``).
+    """
+
+    def __init__(
+        self,
+        node: str,
+        max_drift: float = 60.0,
+        physical: Callable[[], float] = time.time,
+    ):
+        """Initialize clock.
+
+        Args:
+            node: This participant's node ID
+            max_drift: Seconds a remote clock may run ahead of ours
+            physical: Wall clock in seconds (for tests)
+        """
+        self.node = node
+        self.max_drift_ms = int(max_drift * 1000)
+        self._physical = physical
+        self._wall = 0
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def now(self) -> Timestamp:
+        """Get a timestamp for a local event.
+
+        Returns:
+            Timestamp greater than any previously issued or received
+        """
+        with self._lock:
+            physical = self._physical_ms()
+            if physical > self._wall:
+                self._wall, self._counter = physical, 0
+            else:
+                self._tick()
+            return Timestamp(self._wall, self._counter, self.node)
+
+    def update(self, remote: Timestamp) -> Timestamp:
+        """Merge a received timestamp into the clock.
+
+        Args:
+            remote: Timestamp of a received event
+
+        Returns:
+            Timestamp greater than both ``remote`` and the local clock
+
+        Raises:
+            ValueError: If ``remote`` is further ahead of our wall clock
+                than ``max_drift`` allows
+        """
+        with self._lock:
+            physical = self._physical_ms()
+            if remote.wall > physical + self.max_drift_ms:
+                raise ValueError(f"Clock timestamp {remote} is too far in the future")
+
+            wall = max(self._wall, remote.wall, physical)
+            if wall == self._wall == remote.wall:
+                self._counter = max(self._counter, remote.counter)
+                self._tick()
+            elif wall == self._wall:
+                self._tick()
+            elif wall == remote.wall:
+                self._wall, self._counter = wall, remote.counter
+                self._tick()
+            else:
+                self._wall, self._counter = wall, 0
+            return Timestamp(self._wall, self._counter, self.node)
+
+    def _tick(self) -> None:
+        """Advance the logical counter (caller holds the lock)."""
+        if self._counter >= MAX_COUNTER:
+            self._wall, self._counter = self._wall + 1, 0
+        else:
+            self._counter += 1
+
+    def _physical_ms(self) -> int:
+        """Wall clock in milliseconds."""
+        return int(self._physical() * 1000)
+
+
+def _default_node() -> str:
+    """Node ID of this server process."""
+    host = re.sub(r"[^A-Za-z0-9_.-]", "-", socket.gethostname())[:40] or "server"
+    return f"{host}-{os.getpid()}"
+
+
+# Shared by all requests of this worker
+server_clock = HybridLogicalClock(_default_node(), DIAGRAM_CLOCK_MAX_DRIFT_SECONDS)
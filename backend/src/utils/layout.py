@@ -0,0 +1,144 @@
+"""Initial placement of entities on generated diagrams."""
+import math
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Default entity box and the gaps left between boxes
+NODE_WIDTH = 220.0
+NODE_HEIGHT = 140.0
+GAP_X = 80.0
+GAP_Y = 100.0
+
+# Space between a container (superdomain/domain) and the boxes inside it,
+# and the room above them for the container's title
+CONTAINER_PADDING = 40.0
+CONTAINER_HEADER = 32.0
+
+# Canvas origin of the first box
+ORIGIN_X = 40.0
+ORIGIN_Y = 40.0
+
+Position = Tuple[float, float]
+
+
+def grid_layout(node_ids: Sequence[int], columns: Optional[int] = None) -> Dict[int, Position]:
+    """Place nodes row by row on a near-square grid.
+
+    Args:
+        node_ids: Node IDs in placement order
+        columns: Boxes per row (defaults to ceil(sqrt(n)))
+
+    Returns:
+        Node ID -> (x, y) of the box's top-left corner
+    """
+    if not node_ids:
+        return {}
+
+    columns = columns or math.ceil(math.sqrt(len(node_ids)))
+    return {
+        node_id: (
+            ORIGIN_X + (index % columns) * (NODE_WIDTH + GAP_X),
+            ORIGIN_Y + (index // columns) * (NODE_HEIGHT + GAP_Y),
+        )
+        for index, node_id in enumerate(node_ids)
+    }
+
+
+def layered_layout(
+    node_ids: Sequence[int],
+    edges: Iterable[Tuple[int, int]],
+    roots: Optional[Sequence[int]] = None,
+) -> Dict[int, Position]:
+    """Place nodes in horizontal layers by breadth-first distance.
+
+    Each connected component is layered from its root (a given root, or
+    else its best-connected node), so related entities end up in adjacent
+    rows. Within a layer, nodes are ordered by the mean position of their
+    neighbours in the layer above (one barycenter sweep) to cut down edge
+    crossings. Components are laid out side by side; isolated nodes share
+    a trailing grid. Runs in O(V + E log V).
+
+    Args:
+        node_ids: Node IDs to place
+        edges: (source, target) pairs; direction is ignored and edges to
+            unknown nodes are skipped
+        roots: Preferred layer-0 nodes (e.g. the entity a neighbourhood
+            was generated from)
+
+    Returns:
+        Node ID -> (x, y) of the box's top-left corner
+    """
+    nodes = list(dict.fromkeys(node_ids))
+    known = set(nodes)
+    neighbours: Dict[int, List[int]] = defaultdict(list)
+    for source, target in edges:
+        if source != target and source in known and target in known:
+            neighbours[source].append(target)
+            neighbours[target].append(source)
+
+    # Component seeds: preferred roots first, then by descending degree
+    seeds = [root for root in (roots or ()) if root in known]
+    seeds += sorted(nodes, key=lambda node: (-len(neighbours[node]), node))
+
+    positions: Dict[int, Position] = {}
+    isolated: List[int] = []
+    offset_x = ORIGIN_X
+    seen = set()
+
+    for seed in seeds:
+        if seed in seen:
+            continue
+        if not neighbours[seed]:
+            seen.add(seed)
+            isolated.append(seed)
+            continue
+
+        layers = _bfs_layers(seed, neighbours, seen)
+        _order_layers(layers, neighbours)
+
+        width = max(len(layer) for layer in layers)
+        for depth, layer in enumerate(layers):
+            # Centre narrower layers under the widest one
+            indent = (width - len(layer)) * (NODE_WIDTH + GAP_X) / 2
+            for index, node in enumerate(layer):
+                positions[node] = (
+                    offset_x + indent + index * (NODE_WIDTH + GAP_X),
+                    ORIGIN_Y + depth * (NODE_HEIGHT + GAP_Y),
+                )
+        offset_x += width * (NODE_WIDTH + GAP_X) + GAP_X
+
+    if isolated:
+        for node, (x, y) in grid_layout(isolated).items():
+            positions[node] = (x - ORIGIN_X + offset_x, y)
+
+    return positions
+
+
+def _bfs_layers(seed: int, neighbours: Dict[int, List[int]], seen: set) -> List[List[int]]:
+    """Split the component containing ``seed`` into breadth-first layers."""
+    seen.add(seed)
+    layers = [[seed]]
+    queue = deque([(seed, 0)])
+    while queue:
+        node, depth = queue.popleft()
+        for neighbour in neighbours[node]:
+            if neighbour in seen:
+                continue
+            seen.add(neighbour)
+            if depth + 1 == len(layers):
+                layers.append([])
+            layers[depth + 1].append(neighbour)
+            queue.append((neighbour, depth + 1))
+    return layers
+
+
+def _order_layers(layers: List[List[int]], neighbours: Dict[int, List[int]]) -> None:
+    """Reorder each layer by the barycenter of its neighbours in the layer above."""
+    for above, layer in zip(layers[:-1], layers[1:], strict=True):
+        index = {node: i for i, node in enumerate(above)}
+        barycenters = {}
+        for node in layer:
+            ranks = [index[n] for n in neighbours[node] if n in index]
+            barycenters[node] = sum(ranks) / len(ranks) if ranks else float(len(above))
+
+        layer.sort(key=lambda node: (barycenters[node], node))
@@ -0,0 +1,182 @@
+"""Off-thread bcrypt hashing with bounded concurrency."""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+import bcrypt
+
+# bcrypt work factor (each +1 doubles hashing cost)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Worker processes dedicated to bcrypt (0 = hash inline in the calling thread)
+HASHER_WORKERS = int(os.getenv("PASSWORD_HASHER_WORKERS", "2"))
+
+# Maximum hash/verify jobs queued or running before callers are turned away
+HASHER_MAX_PENDING = int(os.getenv("PASSWORD_HASHER_MAX_PENDING", "16"))
+
+# Seconds suggested to clients via Retry-After when the queue is full
+HASHER_RETRY_AFTER = int(os.getenv("PASSWORD_HASHER_RETRY_AFTER", "1"))
+
+# Seconds to wait for a worker result before giving up
+HASHER_TIMEOUT = float(os.getenv("PASSWORD_HASHER_TIMEOUT", "10"))
+
+
+class HasherBusyError(Exception):
+    """Raised when the password hashing queue is full."""
+
+    def __init__(self, retry_after: int = HASHER_RETRY_AFTER):
+        """Initialize error.
+
+        Args:
+            retry_after: Seconds the client should wait before retrying
+        """
+        super().__init__("Authentication service is busy, please retry shortly")
+        self.retry_after = retry_after
+
+
+def _hash(password: bytes, rounds: int) -> str:
+    """Hash a password (runs in a worker process)."""
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(password: bytes, password_hash: bytes) -> bool:
+    """Verify a password against a hash (runs in a worker process)."""
+    return bcrypt.checkpw(password, password_hash)
+
+
+class PasswordHasher:
+    """Dispatches bcrypt work to a dedicated process pool.
+
+    bcrypt is deliberately CPU-bound; running it inside web workers lets a
+    burst of logins starve every other request. Jobs run in a separate
+    process pool instead, and admission is bounded: once ``max_pending``
+    jobs are in flight, further calls fail fast with ``HasherBusyError``
+    rather than queueing behind the burst.
+    """
+
+    def __init__(
+        self,
+        workers: int = HASHER_WORKERS,
+        max_pending: int = HASHER_MAX_PENDING,
+        rounds: int = BCRYPT_ROUNDS,
+        timeout: float = HASHER_TIMEOUT,
+    ):
+        """Initialize hasher.
+
+        Args:
+            workers: Number of worker processes (0 = run inline)
+            max_pending: Maximum in-flight jobs
+            rounds: bcrypt cost factor for new hashes
+            timeout: Seconds to wait for a job's result
+        """
+        self.workers = workers
+        self.rounds = rounds
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def hash_password(self, password: str) -> str:
+        """Hash a password with the configured cost.
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            bcrypt hash string
+
+        Raises:
+            HasherBusyError: If the hashing queue is full or hashing timed out
+        """
+        return self._run(_hash, password.encode("utf-8"), self.rounds)
+
+    def verify_password(self, password: str, password_hash: str) -> bool:
+        """Verify a password against a stored hash.
+
+        Args:
+            password: Plain text password
+            password_hash: Stored bcrypt hash
+
+        Returns:
+            True if password matches, False otherwise
+
+        Raises:
+            HasherBusyError: If the hashing queue is full or hashing timed out
+        """
+        return self._run(_verify, password.encode("utf-8"), password_hash.encode("utf-8"))
+
+    def shutdown(self) -> None:
+        """Stop worker processes."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _run(self, fn: Callable, *args):
+        """Run a job in the pool, failing fast when the queue is full.
+
+        A slot is held until the job finishes, not until the caller stops
+        waiting, so jobs abandoned on timeout still count against
+        ``max_pending``. A pool whose worker died is replaced.
+
+        Raises:
+            HasherBusyError: If the queue is full, the job timed out or the
+                pool broke
+        """
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusyError()
+
+        if self.workers <= 0:
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._discard_executor(executor)
+            raise HasherBusyError() from None
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Drops the job if it has not started yet (its slot is freed then)
+            future.cancel()
+            raise HasherBusyError() from None
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise HasherBusyError() from None
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken pool so the next job starts a fresh one."""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn avoids forking a multi-threaded web worker
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+
+password_hasher = PasswordHasher()
+atexit.register(password_hasher.shutdown)
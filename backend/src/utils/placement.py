@@ -0,0 +1,238 @@
+"""Free-space placement of new boxes among a diagram's existing ones."""
+import heapq
+import math
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .layout import Position
+
+# Side of a grid cell; placed boxes snap to cell corners
+CELL_SIZE = 20.0
+
+# Space kept clear around every box
+MARGIN = 40.0
+
+# Grid rows per bucket of the row index
+BUCKET_ROWS = 8
+
+# x, y, width, height
+Box = Tuple[float, float, float, float]
+
+# Cells [x0, x1) x [y0, y1) covered by a box and its margin
+CellRect = Tuple[int, int, int, int]
+
+
+class OccupancyGrid:
+    """Spatial index of the boxes on a canvas, on a grid of cells.
+
+    Each box is stored as the cell rectangle it covers (grown by the
+    margin) and indexed by bucket of rows. A new box may sit wherever it
+    covers no stored rectangle. The nearest such slot to a wanted cell
+    lies on the wanted row or on a row where some rectangle starts or
+    ends, so only those rows are tried, nearest first, and on each the
+    free columns come from the few rectangles crossing it; the search
+    stops once no row left can be closer. Queries touch the boxes around
+    the wanted point, not the whole diagram.
+    """
+
+    def __init__(
+        self,
+        boxes: Iterable[Box] = (),
+        cell_size: float = CELL_SIZE,
+        margin: float = MARGIN,
+    ):
+        """Initialize grid.
+
+        Args:
+            boxes: Boxes already on the canvas
+            cell_size: Side of a grid cell
+            margin: Space kept clear around every box
+        """
+        self.cell_size = cell_size
+        self.margin = margin
+        self.rects: List[CellRect] = []
+        self._buckets: Dict[int, List[int]] = defaultdict(list)
+        self._tops: List[int] = []
+        self._bottoms: List[int] = []
+        for box in boxes:
+            self.add(*box)
+
+    def add(self, x: float, y: float, width: float, height: float) -> CellRect:
+        """Mark a box (and its margin) as occupied.
+
+        Returns:
+            Cells covered
+        """
+        rect = self.cover(x, y, width, height)
+        index = len(self.rects)
+        self.rects.append(rect)
+        for bucket in range(rect[1] // BUCKET_ROWS, (rect[3] - 1) // BUCKET_ROWS + 1):
+            self._buckets[bucket].append(index)
+        _insort_unique(self._tops, rect[1])
+        _insort_unique(self._bottoms, rect[3])
+        return rect
+
+    def cover(self, x: float, y: float, width: float, height: float) -> CellRect:
+        """Get the cells a box and its margin overlap."""
+        return (
+            math.floor((x - self.margin) / self.cell_size),
+            math.floor((y - self.margin) / self.cell_size),
+            math.ceil((x + width + self.margin) / self.cell_size),
+            math.ceil((y + height + self.margin) / self.cell_size),
+        )
+
+    def footprint(self, width: float, height: float) -> Tuple[int, int]:
+        """Get the number of cells (columns, rows) a box spans."""
+        return (
+            max(1, math.ceil(width / self.cell_size)),
+            max(1, math.ceil(height / self.cell_size)),
+        )
+
+    def nearest_free(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        min_x: Optional[float] = None,
+        min_y: Optional[float] = None,
+    ) -> Position:
+        """Find the free slot for a box closest to a wanted position.
+
+        Args:
+            x: Wanted x of the box's top-left corner
+            y: Wanted y of the box's top-left corner
+            width: Box width
+            height: Box height
+            min_x: Smallest x allowed (None = unbounded)
+            min_y: Smallest y allowed (None = unbounded)
+
+        Returns:
+            (x, y) of the slot's top-left corner, snapped to the grid; ties
+            go to the upper, then the left slot
+        """
+        columns, rows = self.footprint(width, height)
+        tx, ty = round(x / self.cell_size), round(y / self.cell_size)
+        min_column = None if min_x is None else math.ceil(min_x / self.cell_size)
+        min_row = None if min_y is None else math.ceil(min_y / self.cell_size)
+
+        best: Optional[Tuple[int, int, int]] = None
+        previous = None
+        for distance, cy in self._candidate_rows(ty, rows, min_row):
+            if best is not None and distance * distance > best[0]:
+                break
+            if cy == previous or (min_row is not None and cy < min_row):
+                continue
+            previous = cy
+            cx = self._nearest_column(cy, rows, columns, tx, min_column)
+            candidate = ((cx - tx) ** 2 + distance * distance, cy, cx)
+            if best is None or candidate < best:
+                best = candidate
+
+        _, cy, cx = best
+        return cx * self.cell_size, cy * self.cell_size
+
+    def place(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        min_x: Optional[float] = None,
+        min_y: Optional[float] = None,
+    ) -> Position:
+        """Find the free slot nearest a wanted position and occupy it.
+
+        Takes the arguments of ``nearest_free``.
+
+        Returns:
+            (x, y) of the placed box's top-left corner
+        """
+        position = self.nearest_free(x, y, width, height, min_x, min_y)
+        self.add(*position, width, height)
+        return position
+
+    def _candidate_rows(
+        self, ty: int, rows: int, min_row: Optional[int] = None
+    ) -> Iterator[Tuple[int, int]]:
+        """Yield (distance, row) for the wanted row and the rows touching a rectangle.
+
+        A box of ``rows`` rows clears a rectangle when its top row is the
+        rectangle's bottom or ``rows`` above the rectangle's top. The
+        smallest row allowed is a candidate too.
+        """
+        below = heapq.merge(
+            self._bottoms[bisect_right(self._bottoms, ty):],
+            (top - rows for top in self._tops[bisect_right(self._tops, ty + rows):]),
+        )
+        above = heapq.merge(
+            reversed(self._bottoms[:bisect_right(self._bottoms, ty)]),
+            (top - rows for top in reversed(self._tops[:bisect_right(self._tops, ty + rows)])),
+            reverse=True,
+        )
+        # Ends at the latest on the lowest bottom, where nothing is in the way
+        return heapq.merge(
+            [(0, ty)] if min_row is None else sorted([(0, ty), (abs(min_row - ty), min_row)]),
+            ((cy - ty, cy) for cy in below),
+            ((ty - cy, cy) for cy in above),
+        )
+
+    def _nearest_column(
+        self, cy: int, rows: int, columns: int, tx: int, min_column: Optional[int] = None
+    ) -> int:
+        """Get the free column nearest ``tx`` for a box on rows [cy, cy + rows)."""
+        indexes = set()
+        for bucket in range(cy // BUCKET_ROWS, (cy + rows - 1) // BUCKET_ROWS + 1):
+            indexes.update(self._buckets.get(bucket, ()))
+
+        # Columns where the box would overlap a rectangle: [x0 - columns + 1, x1)
+        blocked = sorted(
+            (x0 - columns + 1, x1)
+            for x0, y0, x1, y1 in map(self.rects.__getitem__, indexes)
+            if y0 < cy + rows and y1 > cy
+        )
+        if min_column is not None:
+            blocked.insert(0, (-math.inf, min_column))
+
+        start = end = None
+        for lo, hi in blocked:
+            if end is not None and lo <= end:
+                end = max(end, hi)
+                continue
+            if start is not None and start <= tx < end:
+                break
+            start, end = lo, hi
+        if start is None or not start <= tx < end:
+            return tx
+        return start - 1 if tx - (start - 1) <= end - tx else end
+
+
+def place_many(
+    grid: OccupancyGrid,
+    boxes: Sequence[Box],
+    min_x: Optional[float] = None,
+    min_y: Optional[float] = None,
+) -> List[Position]:
+    """Place boxes one after another, each in the free slot nearest its position.
+
+    Each placed box goes into the index right away, so later boxes avoid
+    earlier ones without rebuilding anything.
+
+    Args:
+        grid: Occupancy of the canvas; the placed boxes are added to it
+        boxes: Wanted (x, y, width, height) of each box
+        min_x: Smallest x allowed (None = unbounded)
+        min_y: Smallest y allowed (None = unbounded)
+
+    Returns:
+        (x, y) of each placed box, in the order given
+    """
+    return [grid.place(*box, min_x, min_y) for box in boxes]
+
+
+def _insort_unique(values: List[int], value: int) -> None:
+    """Insert a value into a sorted list unless already there."""
+    index = bisect_left(values, value)
+    if index == len(values) or values[index] != value:
+        values.insert(index, value)
@@ -0,0 +1,189 @@
+"""Column projections for serialising rows without hydrating ORM instances."""
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from sqlalchemy.sql.elements import ColumnElement
+
+FieldSpec = Union[ColumnElement, Tuple[ColumnElement, Callable[[Any], Any]]]
+
+
+def enum_value(value: Optional[Enum]) -> Any:
+    """Serialise an enum member as its value (None passes through)."""
+    return value.value if value is not None else None
+
+
+class Projection:
+    """Maps output field names to the columns they are read from.
+
+    Services declare one projection per resource, e.g.::
+
+        ATTRIBUTE_FIELDS = Projection({
+            "id": Attribute.id,
+            "name": Attribute.name,
+            "dataType": Attribute.data_type,
+        })
+
+    ``columns()`` returns labelled columns for a Core ``select()`` that
+    fetches only the requested fields, and ``to_dicts()`` / ``to_tuples()``
+    turn the result rows straight into response payloads. Fields listed in
+    ``default_exclude`` (wide ``Text``/JSONB columns) are only fetched when
+    explicitly requested through a sparse fieldset.
+    """
+
+    def __init__(self, fields: Mapping[str, FieldSpec], default_exclude: Iterable[str] = ()):
+        """Initialize projection.
+
+        Args:
+            fields: Output field name -> column, or (column, serialiser)
+            default_exclude: Fields omitted unless explicitly requested
+        """
+        self._columns: Dict[str, ColumnElement] = {}
+        self._serialisers: Dict[str, Callable[[Any], Any]] = {}
+        for name, spec in fields.items():
+            if isinstance(spec, tuple):
+                column, serialiser = spec
+                self._serialisers[name] = serialiser
+            else:
+                column = spec
+            self._columns[name] = column.label(name)
+
+        self.default_fields: Tuple[str, ...] = tuple(
+            name for name in self._columns if name not in set(default_exclude)
+        )
+
+    @property
+    def field_names(self) -> Tuple[str, ...]:
+        """All selectable field names."""
+        return tuple(self._columns)
+
+    def parse_fields(self, raw: Optional[str], required: Sequence[str] = ("id",)) -> Tuple[str, ...]:
+        """Parse a ``?fields=a,b,c`` sparse fieldset.
+
+        Args:
+            raw: Comma-separated field names (None/empty = default fields)
+            required: Fields always included (e.g. the primary key)
+
+        Returns:
+            Ordered tuple of field names
+
+        Raises:
+            ValueError: If an unknown field is requested
+        """
+        if not raw:
+            return self.default_fields
+
+        requested = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = [name for name in requested if name not in self._columns]
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s): {', '.join(unknown)}. "
+                f"Must be one of: {', '.join(self._columns)}"
+            )
+
+        fields = [name for name in required if name in self._columns and name not in requested]
+        fields.extend(dict.fromkeys(requested))
+        return tuple(fields)
+
+    def columns(self, fields: Optional[Sequence[str]] = None) -> List[ColumnElement]:
+        """Get labelled columns to select.
+
+        Args:
+            fields: Field names (defaults to the default fields)
+
+        Returns:
+            List of labelled column expressions
+        """
+        return [self._columns[name] for name in (fields or self.default_fields)]
+
+    def to_dicts(
+        self,
+        rows: Iterable[Sequence[Any]],
+        fields: Sequence[str],
+        serialisers: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Convert result rows to output dicts.
+
+        Args:
+            rows: Rows selected with ``columns(fields)``
+            fields: The same field names, in the same order
+            serialisers: Per-call serialisers overriding the declared ones
+
+        Returns:
+            One dict per row
+        """
+        applicable = self._row_serialisers(fields, serialisers)
+        if not applicable:
+            return [dict(zip(fields, row, strict=True)) for row in rows]
+
+        result = []
+        for row in rows:
+            item = dict(zip(fields, row, strict=True))
+            for name, serialiser in applicable:
+                item[name] = serialiser(item[name])
+            result.append(item)
+        return result
+
+    def to_tuples(
+        self,
+        rows: Iterable[Sequence[Any]],
+        fields: Sequence[str],
+        serialisers: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """Convert result rows to serialised tuples (column order = fields).
+
+        Args:
+            rows: Rows selected with ``columns(fields)``
+            fields: The same field names, in the same order
+            serialisers: Per-call serialisers overriding the declared ones
+
+        Returns:
+            One tuple per row
+        """
+        applicable = self._row_serialisers(fields, serialisers)
+        if not applicable:
+            return [tuple(row) for row in rows]
+
+        positions = {name: index for index, name in enumerate(fields)}
+        result = []
+        for row in rows:
+            values = list(row)
+            for name, serialiser in applicable:
+                index = positions[name]
+                values[index] = serialiser(values[index])
+            result.append(tuple(values))
+        return result
+
+    def render(
+        self,
+        rows: Iterable[Sequence[Any]],
+        fields: Sequence[str],
+        columnar: bool = False,
+        serialisers: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+    ) -> Dict[str, Any]:
+        """Render rows as a response fragment.
+
+        Row-oriented output is ``{"data": [{...}, ...]}``; columnar output is
+        ``{"columns": [...], "rows": [[...], ...]}``, which names each field
+        once instead of once per row.
+
+        Args:
+            rows: Rows selected with ``columns(fields)``
+            fields: The same field names, in the same order
+            columnar: Whether to emit the columnar shape
+            serialisers: Per-call serialisers overriding the declared ones
+
+        Returns:
+            Response fragment to merge into the payload
+        """
+        if columnar:
+            return {"columns": list(fields), "rows": self.to_tuples(rows, fields, serialisers)}
+        return {"data": self.to_dicts(rows, fields, serialisers)}
+
+    def _row_serialisers(
+        self,
+        fields: Sequence[str],
+        overrides: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+    ) -> List[Tuple[str, Callable[[Any], Any]]]:
+        """Get the serialisers that apply to a field list."""
+        serialisers = {**self._serialisers, **(overrides or {})}
+        return [(name, serialisers[name]) for name in fields if name in serialisers]
@@ -0,0 +1,127 @@
+"""Fractional rank keys: orderings where any item moves by rewriting only itself."""
+import re
+from typing import List, Optional
+
+# Base-62 digits in ASCII order, so keys sort correctly as plain bytes
+# (columns holding them use COLLATE "C")
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+# Room kept in rank columns; rebalancing keeps keys far shorter
+MAX_RANK_LENGTH = 128
+
+# A key is a base-62 fraction without trailing zeros, so there is always
+# room for a key below it
+_RANK_PATTERN = re.compile(r"^[0-9A-Za-z]*[1-9A-Za-z]$")
+
+
+def is_rank(value) -> bool:
+    """Check for a well-formed rank key."""
+    return (
+        isinstance(value, str)
+        and len(value) <= MAX_RANK_LENGTH
+        and _RANK_PATTERN.match(value) is not None
+    )
+
+
+def key_between(lo: Optional[str], hi: Optional[str]) -> str:
+    """Get a key that sorts strictly between two keys.
+
+    Args:
+        lo: Key of the item before (None = start of the order)
+        hi: Key of the item after (None = end of the order)
+
+    Returns:
+        New key; as short as the gap between ``lo`` and ``hi`` allows
+
+    Raises:
+        ValueError: If ``lo`` does not sort before ``hi``
+    """
+    if hi is None:
+        return keys_between(lo, None, 1)[0]
+    if lo is not None and lo >= hi:
+        raise ValueError(f"Rank {lo!r} must sort before {hi!r}")
+    return _midpoint(lo or "", hi)
+
+
+def keys_between(lo: Optional[str], hi: Optional[str], count: int) -> List[str]:
+    """Get ascending keys that all sort strictly between two keys.
+
+    Keys have the smallest common length that fits ``count`` of them, so
+    placing many items at once (or rebalancing an order whose keys grew
+    long) yields short keys. They are evenly spaced, except after the
+    last key of an order (``hi`` is None) where they take consecutive
+    values: items appended one by one then lengthen keys by one digit
+    per 61 appends instead of one per halving of the remaining gap.
+
+    Args:
+        lo: Key of the item before (None = start of the order)
+        hi: Key of the item after (None = end of the order)
+        count: Number of keys
+
+    Returns:
+        ``count`` ascending keys
+
+    Raises:
+        ValueError: If ``lo`` does not sort before ``hi``
+    """
+    if lo is not None and hi is not None and lo >= hi:
+        raise ValueError(f"Rank {lo!r} must sort before {hi!r}")
+    if count <= 0:
+        return []
+
+    length = max(len(lo or ""), 1)
+    while True:
+        low = _to_int(lo or "", length)
+        high = _to_int(hi, length) if hi is not None else len(DIGITS) ** length
+        if high - low > count:
+            break
+        length += 1
+
+    if lo is not None and hi is None:
+        return [_from_int(low + i, length) for i in range(1, count + 1)]
+    return [
+        _from_int(low + i * (high - low) // (count + 1), length) for i in range(1, count + 1)
+    ]
+
+
+def spread(count: int) -> List[str]:
+    """Get ``count`` evenly spaced keys spanning the whole key space."""
+    return keys_between(None, None, count)
+
+
+def _to_int(key: str, length: int) -> int:
+    """Read the first ``length`` digits of a key (zero-padded) as an integer."""
+    value = 0
+    for digit in key[:length].ljust(length, "0"):
+        value = value * len(DIGITS) + DIGITS.index(digit)
+    return value
+
+
+def _from_int(value: int, length: int) -> str:
+    """Write an integer as a ``length``-digit key without trailing zeros."""
+    digits = []
+    for _ in range(length):
+        value, digit = divmod(value, len(DIGITS))
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def _midpoint(lo: str, hi: Optional[str]) -> str:
+    """Key between ``lo`` ("" = 0) and ``hi`` (None = 1), read as base-62 fractions."""
+    if hi is not None:
+        # Keep the common prefix (``lo`` is padded with zeros)
+        n = 0
+        while n < len(hi) and (lo[n] if n < len(lo) else "0") == hi[n]:
+            n += 1
+        if n:
+            return hi[:n] + _midpoint(lo[n:], hi[n:])
+
+    low = DIGITS.index(lo[0]) if lo else 0
+    high = DIGITS.index(hi[0]) if hi is not None else len(DIGITS)
+    if high - low > 1:
+        return DIGITS[(low + high) // 2]
+
+    # Adjacent first digits: hi's first digit alone fits if hi has more
+    if hi is not None and len(hi) > 1:
+        return hi[0]
+    return DIGITS[low] + _midpoint(lo[1:], None)
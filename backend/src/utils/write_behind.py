@@ -0,0 +1,120 @@
+"""Write-behind buffering for high-frequency, loss-tolerant updates."""
+import atexit
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Keeps the latest value per key in memory and flushes them in bulk.
+
+    ``put()`` never touches the database; a daemon thread hands everything
+    buffered since the last flush to ``flush_fn`` every ``interval`` seconds,
+    and once more at interpreter shutdown. If a flush fails, its items are
+    put back unless a newer value arrived in the meantime.
+    """
+
+    def __init__(self, flush_fn: Callable[[Dict[Hashable, Any]], None], interval: float, name: str):
+        """Initialize buffer.
+
+        Args:
+            flush_fn: Persists a batch of {key: value} items
+            interval: Seconds between flushes
+            name: Thread name (for diagnostics)
+        """
+        self.flush_fn = flush_fn
+        self.interval = interval
+        self.name = name
+        self._pending: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Buffer a value, replacing any pending value for the same key.
+
+        Args:
+            key: Row identifier
+            value: Latest value
+        """
+        with self._lock:
+            self._pending[key] = value
+            if self._thread is None:
+                self._start()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get the pending (not yet flushed) value for a key.
+
+        Args:
+            key: Row identifier
+            default: Returned when nothing is pending
+
+        Returns:
+            Pending value or default
+        """
+        with self._lock:
+            return self._pending.get(key, default)
+
+    def discard(self, key: Hashable) -> Any:
+        """Drop a pending value so it is never flushed.
+
+        Waits for an in-flight flush to finish first, so once this returns
+        no buffered value for ``key`` can still reach the database.
+
+        Args:
+            key: Row identifier
+
+        Returns:
+            The discarded value, or None if nothing was pending
+        """
+        with self._flush_lock:
+            with self._lock:
+                return self._pending.pop(key, None)
+
+    def snapshot(self) -> Dict[Hashable, Any]:
+        """Get a copy of all pending values."""
+        with self._lock:
+            return dict(self._pending)
+
+    def flush(self) -> int:
+        """Persist all pending values now.
+
+        Returns:
+            Number of items flushed
+        """
+        with self._flush_lock:
+            with self._lock:
+                items, self._pending = self._pending, {}
+
+            if not items:
+                return 0
+
+            try:
+                self.flush_fn(items)
+            except Exception:
+                logger.exception("%s flush failed; %d item(s) requeued", self.name, len(items))
+                with self._lock:
+                    for key, value in items.items():
+                        self._pending.setdefault(key, value)
+                return 0
+
+            return len(items)
+
+    def shutdown(self) -> None:
+        """Stop the flush thread and persist whatever is still pending."""
+        self._stop.set()
+        self.flush()
+
+    def _start(self) -> None:
+        """Start the background flush thread (caller holds the lock)."""
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def _run(self) -> None:
+        """Flush periodically until shut down."""
+        while not self._stop.wait(self.interval):
+            self.flush()
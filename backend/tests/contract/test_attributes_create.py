@@ -3,6 +3,8 @@
 Validates AttributeCreate schema with dataType enum.
 Expected to FAIL until implementation (TDD).
 """
+import uuid
+
 import pytest
 
 
@@ -160,6 +162,31 @@ def test_create_attribute_duplicate_name_returns_400(api_client, auth_headers, s
     assert response.status_code == 400
 
 
+def test_create_attribute_duplicate_keeps_original(api_client, auth_headers, sample_entity_id):
+    """Test a duplicate attribute POST reports the conflict and changes nothing."""
+    name = f'conflict_attr{uuid.uuid4().hex[:8]}'
+    api_client.post(
+        f'/api/v1/entities/{sample_entity_id}/attributes',
+        headers=auth_headers,
+        json={'name': name, 'dataType': 'String', 'isNullable': True}
+    )
+
+    response = api_client.post(
+        f'/api/v1/entities/{sample_entity_id}/attributes',
+        headers=auth_headers,
+        json={'name': name, 'dataType': 'Integer', 'isNullable': False}
+    )
+
+    # ON CONFLICT DO NOTHING: the existing row wins and the error names it
+    assert response.status_code == 400
+    assert 'already exists in entity' in response.json['message']
+    attributes = api_client.get(
+        f'/api/v1/entities/{sample_entity_id}/attributes', headers=auth_headers
+    ).json['data']
+    stored = [attr for attr in attributes if attr['name'] == name]
+    assert [attr['dataType'] for attr in stored] == ['String']
+
+
 def test_create_attribute_invalid_entity_returns_404(api_client, auth_headers):
     """Test POST /entities/{entityId}/attributes with invalid entity returns 404."""
     response = api_client.post(
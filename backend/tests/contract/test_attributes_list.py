@@ -58,6 +58,18 @@ def test_list_attributes_validates_attribute_schema(api_client, auth_headers, sa
         assert attribute['dataType'] in valid_types
 
 
+def test_list_attributes_sparse_fields(api_client, auth_headers, sample_entity_id):
+    """Test GET /entities/{entityId}/attributes?fields= returns only those fields plus id."""
+    response = api_client.get(
+        f'/api/v1/entities/{sample_entity_id}/attributes?fields=name,dataType',
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    for attribute in response.json['data']:
+        assert set(attribute) == {'id', 'name', 'dataType'}
+
+
 def test_list_attributes_invalid_entity_returns_404(api_client, auth_headers):
     """Test GET /entities/{entityId}/attributes with invalid entity returns 404."""
     response = api_client.get('/api/v1/entities/99999/attributes', headers=auth_headers)
@@ -0,0 +1,77 @@
+"""Contract test for PUT /attributes/{id}/position endpoint.
+
+Validates reordering an entity's attributes by rank key.
+"""
+import pytest
+
+
+@pytest.fixture
+def three_attributes(api_client, auth_headers, sample_entity_id) -> list:
+    """Create three attributes on the sample entity and return their IDs."""
+    ids = []
+    for name in ('position_a', 'position_b', 'position_c'):
+        response = api_client.post(
+            f'/api/v1/entities/{sample_entity_id}/attributes',
+            headers=auth_headers,
+            json={'name': name, 'dataType': 'String'}
+        )
+        ids.append(response.json['id'])
+    return ids
+
+
+def _order(api_client, auth_headers, entity_id, ids) -> list:
+    """List the entity's attributes and keep the given ones, in order."""
+    response = api_client.get(
+        f'/api/v1/entities/{entity_id}/attributes', headers=auth_headers
+    )
+    return [item['id'] for item in response.json['data'] if item['id'] in ids]
+
+
+def test_new_attributes_are_appended(api_client, auth_headers, sample_entity_id, three_attributes):
+    """Test created attributes are listed in creation order."""
+    assert _order(api_client, auth_headers, sample_entity_id, three_attributes) == three_attributes
+
+
+def test_move_attribute_to_first(api_client, auth_headers, sample_entity_id, three_attributes):
+    """Test moving the last attribute first rewrites only its position."""
+    a, b, c = three_attributes
+    before = api_client.get(f'/api/v1/attributes/{a}', headers=auth_headers).json
+
+    response = api_client.put(
+        f'/api/v1/attributes/{c}/position', headers=auth_headers, json={'to': 'first'}
+    )
+
+    assert response.status_code == 200
+    assert response.json['position'] < before['position']
+    assert _order(api_client, auth_headers, sample_entity_id, three_attributes) == [c, a, b]
+    assert api_client.get(f'/api/v1/attributes/{a}', headers=auth_headers).json == before
+
+
+def test_move_attribute_between_neighbours(api_client, auth_headers, sample_entity_id, three_attributes):
+    """Test moving an attribute directly after another."""
+    a, b, c = three_attributes
+    response = api_client.put(
+        f'/api/v1/attributes/{a}/position', headers=auth_headers, json={'after': b}
+    )
+
+    assert response.status_code == 200
+    assert _order(api_client, auth_headers, sample_entity_id, three_attributes) == [b, a, c]
+
+
+def test_move_attribute_invalid_body_returns_400(api_client, auth_headers, three_attributes):
+    """Test a body with more than one instruction returns 400."""
+    a, b, _ = three_attributes
+    response = api_client.put(
+        f'/api/v1/attributes/{a}/position',
+        headers=auth_headers,
+        json={'after': b, 'to': 'last'}
+    )
+
+    assert response.status_code == 400
+
+
+def test_move_attribute_requires_auth(api_client):
+    """Test PUT /attributes/{id}/position without auth returns 401."""
+    response = api_client.put('/api/v1/attributes/1/position', json={'to': 'first'})
+
+    assert response.status_code == 401
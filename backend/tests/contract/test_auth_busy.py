@@ -0,0 +1,63 @@
+"""Contract test for POST /auth/login when password hashing is saturated.
+
+Validates the fast 503 with Retry-After for a full queue and a timed-out job.
+"""
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from src.utils.password_hasher import password_hasher
+
+
+class _StalledExecutor:
+    """Executor whose jobs never finish."""
+
+    def submit(self, fn, *args):
+        """Accept a job without ever running it."""
+        return Future()
+
+    def shutdown(self, **kwargs):
+        """Nothing to stop."""
+
+
+@pytest.fixture
+def credentials() -> dict:
+    """Return the seeded test user's credentials."""
+    return {'email': 'test@example.com', 'password': 'Test123!'}
+
+
+def test_login_with_full_queue_returns_503(api_client, credentials, monkeypatch):
+    """Test login returns 503 with Retry-After when no hashing slot is free."""
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(password_hasher, '_slots', slots)
+
+    response = api_client.post('/api/v1/auth/login', json=credentials)
+
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_login_with_timed_out_hash_returns_503(api_client, credentials, monkeypatch):
+    """Test login returns 503 (not 500) when the hashing job times out."""
+    monkeypatch.setattr(password_hasher, 'workers', 1)
+    monkeypatch.setattr(password_hasher, 'timeout', 0.01)
+    monkeypatch.setattr(password_hasher, '_get_executor', lambda: _StalledExecutor())
+
+    response = api_client.post('/api/v1/auth/login', json=credentials)
+
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
+
+
+def test_timed_out_job_that_never_started_frees_its_slot(api_client, credentials, monkeypatch):
+    """Test a timed-out queued job does not keep holding a hashing slot."""
+    monkeypatch.setattr(password_hasher, '_slots', threading.BoundedSemaphore(1))
+    monkeypatch.setattr(password_hasher, 'workers', 1)
+    monkeypatch.setattr(password_hasher, 'timeout', 0.01)
+    monkeypatch.setattr(password_hasher, '_get_executor', lambda: _StalledExecutor())
+
+    api_client.post('/api/v1/auth/login', json=credentials)
+
+    assert password_hasher._slots.acquire(blocking=False)
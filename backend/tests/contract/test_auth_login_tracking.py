@@ -0,0 +1,52 @@
+"""Contract test for write-behind tracking of user logins.
+
+Validates that POST /auth/login records last_login_at once the buffer is
+flushed, and that a failed flush keeps the timestamp for the next one.
+"""
+from datetime import datetime
+
+import pytest
+
+from src.repositories.user_repository import UserRepository
+from src.services import login_tracker
+from src.utils.database import get_db_context
+
+
+@pytest.fixture
+def credentials() -> dict:
+    """Return the seeded test user's credentials."""
+    return {'email': 'test@example.com', 'password': 'Test123!'}
+
+
+def _last_login_at(email: str) -> datetime:
+    """Read the persisted last_login_at of a user."""
+    with get_db_context() as db:
+        return UserRepository(db).get_by_email(email).last_login_at
+
+
+def test_login_updates_last_login_after_flush(api_client, credentials):
+    """Test a login reaches users.last_login_at on the next flush."""
+    started = datetime.utcnow()
+
+    response = api_client.post('/api/v1/auth/login', json=credentials)
+    assert response.status_code == 200
+
+    assert login_tracker.flush_logins() >= 1
+    assert _last_login_at(credentials['email']) >= started
+
+
+def test_failed_flush_requeues_logins(api_client, credentials, monkeypatch):
+    """Test logins from a failed flush are written by the following one."""
+    login_tracker.flush_logins()
+    started = datetime.utcnow()
+    api_client.post('/api/v1/auth/login', json=credentials)
+
+    def fail(logins):
+        raise RuntimeError('database unavailable')
+
+    with monkeypatch.context() as patched:
+        patched.setattr(login_tracker._buffer, 'flush_fn', fail)
+        assert login_tracker.flush_logins() == 0
+
+    assert login_tracker.flush_logins() >= 1
+    assert _last_login_at(credentials['email']) >= started
@@ -0,0 +1,65 @@
+"""Contract test for POST /auth/logout endpoint.
+
+Validates that logout revokes the user's tokens, including ones this worker
+has already verified and cached, while other tokens keep working.
+"""
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def user_headers(api_client) -> dict:
+    """Register a fresh user and return its authentication headers."""
+    name = f'logout{uuid.uuid4().hex[:8]}'
+    response = api_client.post('/api/v1/auth/register', json={
+        'email': f'{name}@example.com',
+        'username': name,
+        'password': 'Logout123!'
+    })
+    return {
+        'email': f'{name}@example.com',
+        'headers': {'Authorization': f'Bearer {response.json["token"]}'},
+    }
+
+
+def test_logout_revokes_cached_token(api_client, user_headers):
+    """Test a token used before logout gets 401 afterwards."""
+    headers = user_headers['headers']
+    assert api_client.get('/api/v1/superdomains', headers=headers).status_code == 200
+
+    response = api_client.post('/api/v1/auth/logout', headers=headers)
+
+    assert response.status_code == 200
+    assert api_client.get('/api/v1/superdomains', headers=headers).status_code == 401
+
+
+def test_login_right_after_logout_works(api_client, user_headers):
+    """Test a token issued in the same second as the logout is accepted."""
+    api_client.post('/api/v1/auth/logout', headers=user_headers['headers'])
+
+    token = api_client.post('/api/v1/auth/login', json={
+        'email': user_headers['email'],
+        'password': 'Logout123!'
+    }).json['token']
+
+    response = api_client.get(
+        '/api/v1/superdomains', headers={'Authorization': f'Bearer {token}'}
+    )
+    assert response.status_code == 200
+
+
+def test_logout_leaves_other_tokens_working(api_client, auth_headers, user_headers):
+    """Test another user's token is untouched by a logout."""
+    api_client.post('/api/v1/auth/logout', headers=user_headers['headers'])
+
+    response = api_client.get('/api/v1/superdomains', headers=auth_headers)
+
+    assert response.status_code == 200
+
+
+def test_logout_requires_auth(api_client):
+    """Test POST /auth/logout without auth returns 401."""
+    response = api_client.post('/api/v1/auth/logout')
+
+    assert response.status_code == 401
@@ -0,0 +1,94 @@
+"""Contract test for POST /batch endpoint.
+
+Validates ordered execution, result references and all-or-nothing failure.
+"""
+import pytest
+
+
+def test_batch_runs_operations_in_order(api_client, auth_headers):
+    """Test POST /batch returns one result per operation."""
+    response = api_client.post(
+        '/api/v1/batch',
+        headers=auth_headers,
+        json={
+            'operations': [
+                {'method': 'GET', 'path': '/api/v1/superdomains?pageSize=1'},
+                {'method': 'GET', 'path': '/api/v1/domains?pageSize=$0.pagination.pageSize'},
+            ]
+        }
+    )
+
+    # Should return 200 OK
+    assert response.status_code == 200
+    data = response.json
+    assert 'results' in data
+    assert len(data['results']) == 2
+
+    for result in data['results']:
+        assert result['status'] == 200
+        assert 'data' in result['body']
+
+    # The reference was resolved from the first result
+    assert data['results'][1]['body']['pagination']['pageSize'] == 1
+
+
+def test_batch_stops_at_first_failure(api_client, auth_headers):
+    """Test POST /batch aborts on the first failing operation."""
+    response = api_client.post(
+        '/api/v1/batch',
+        headers=auth_headers,
+        json={
+            'operations': [
+                {'method': 'GET', 'path': '/api/v1/superdomains'},
+                {'method': 'GET', 'path': '/api/v1/does-not-exist'},
+                {'method': 'GET', 'path': '/api/v1/domains'},
+            ]
+        }
+    )
+
+    # Should carry the failing operation's status
+    assert response.status_code == 404
+    data = response.json
+    assert data['failedIndex'] == 1
+    assert len(data['results']) == 2
+
+
+def test_batch_forward_reference_returns_400(api_client, auth_headers):
+    """Test POST /batch rejects references to operations that have not run."""
+    response = api_client.post(
+        '/api/v1/batch',
+        headers=auth_headers,
+        json={'operations': [{'method': 'GET', 'path': '/api/v1/entities/$1.id'}]}
+    )
+
+    assert response.status_code == 400
+    assert response.json['failedIndex'] == 0
+
+
+def test_batch_rejects_streaming_endpoints(api_client, auth_headers):
+    """Test POST /batch refuses operations on SSE streams such as /events."""
+    response = api_client.post(
+        '/api/v1/batch',
+        headers=auth_headers,
+        json={'operations': [{'method': 'GET', 'path': '/api/v1/diagrams/1/events'}]}
+    )
+
+    assert response.status_code == 400
+    assert response.json['failedIndex'] == 0
+
+
+def test_batch_empty_operations_returns_400(api_client, auth_headers):
+    """Test POST /batch without operations returns 400."""
+    response = api_client.post('/api/v1/batch', headers=auth_headers, json={'operations': []})
+
+    assert response.status_code == 400
+
+
+def test_batch_requires_auth(api_client):
+    """Test POST /batch without auth returns 401."""
+    response = api_client.post(
+        '/api/v1/batch',
+        json={'operations': [{'method': 'GET', 'path': '/api/v1/superdomains'}]}
+    )
+
+    assert response.status_code == 401
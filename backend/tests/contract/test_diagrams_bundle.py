@@ -0,0 +1,76 @@
+"""Contract test for GET /diagrams/{id}/bundle endpoint.
+
+Validates the editor bootstrap payload and change-version revalidation.
+"""
+import pytest
+
+
+@pytest.fixture
+def sample_diagram_id() -> int:
+    """Return a sample diagram ID for testing."""
+    return 1
+
+
+def test_get_diagram_bundle_returns_referenced_data(api_client, auth_headers, sample_diagram_id):
+    """Test GET /diagrams/{id}/bundle returns the diagram and its references."""
+    response = api_client.get(
+        f'/api/v1/diagrams/{sample_diagram_id}/bundle',
+        headers=auth_headers
+    )
+
+    # Should return 200 OK
+    assert response.status_code == 200
+    assert response.content_type == 'application/json'
+
+    data = response.json
+    for key in (
+        'diagram', 'objects', 'diagramRelationships', 'superdomains',
+        'domains', 'entities', 'attributes', 'relationships',
+    ):
+        assert key in data
+
+    assert data['diagram']['id'] == sample_diagram_id
+    assert isinstance(data['diagram']['changeVersion'], int)
+
+    # Every placed entity is resolved
+    entity_ids = {e['id'] for e in data['entities']}
+    for obj in data['objects']:
+        if obj['objectType'] == 'ENTITY':
+            assert obj['objectId'] in entity_ids
+
+    # Relationships carry cardinalities
+    for relationship in data['relationships']:
+        assert 'sourceCardinality' in relationship
+        assert 'targetCardinality' in relationship
+
+
+def test_get_diagram_bundle_revalidates_with_etag(api_client, auth_headers, sample_diagram_id):
+    """Test GET /diagrams/{id}/bundle returns 304 for an unchanged version."""
+    response = api_client.get(
+        f'/api/v1/diagrams/{sample_diagram_id}/bundle',
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    response = api_client.get(
+        f'/api/v1/diagrams/{sample_diagram_id}/bundle',
+        headers={**auth_headers, 'If-None-Match': etag}
+    )
+
+    # Should return 304 Not Modified
+    assert response.status_code == 304
+
+
+def test_get_diagram_bundle_not_found_returns_404(api_client, auth_headers):
+    """Test GET /diagrams/{id}/bundle with invalid ID returns 404."""
+    response = api_client.get('/api/v1/diagrams/99999/bundle', headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+def test_get_diagram_bundle_requires_auth(api_client, sample_diagram_id):
+    """Test GET /diagrams/{id}/bundle without auth returns 401."""
+    response = api_client.get(f'/api/v1/diagrams/{sample_diagram_id}/bundle')
+
+    assert response.status_code == 401
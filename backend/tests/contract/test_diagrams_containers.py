@@ -0,0 +1,117 @@
+"""Contract test for container bounds and paint order on diagram reads and writes.
+
+Validates that domain containers are fitted around their entities and
+drawn below them.
+"""
+import pytest
+
+
+@pytest.fixture
+def diagram_id(api_client, auth_headers) -> int:
+    """Create an empty diagram and return its ID."""
+    response = api_client.post(
+        '/api/v1/diagrams',
+        headers=auth_headers,
+        json={'name': 'Container Test'}
+    )
+    return response.json['id']
+
+
+@pytest.fixture
+def domain_with_entity(api_client, auth_headers) -> dict:
+    """Create a domain holding one entity and return both IDs."""
+    superdomain = api_client.post(
+        '/api/v1/superdomains',
+        headers=auth_headers,
+        json={'name': 'Container Superdomain'}
+    ).json
+    domain = api_client.post(
+        '/api/v1/domains',
+        headers=auth_headers,
+        json={'name': 'Container Domain', 'superdomainId': superdomain['id']}
+    ).json
+    entity = api_client.post(
+        '/api/v1/entities',
+        headers=auth_headers,
+        json={'name': 'Container Entity', 'domainId': domain['id']}
+    ).json
+    return {'domainId': domain['id'], 'entityId': entity['id']}
+
+
+@pytest.fixture
+def placed(api_client, auth_headers, diagram_id, domain_with_entity) -> dict:
+    """Place the domain and its entity on the diagram; return the object IDs."""
+    objects = api_client.post(
+        f'/api/v1/diagrams/{diagram_id}/objects/bulk',
+        headers=auth_headers,
+        json={'objects': [
+            {'objectType': 'DOMAIN', 'objectId': domain_with_entity['domainId'],
+             'positionX': 0, 'positionY': 0},
+            {'objectType': 'ENTITY', 'objectId': domain_with_entity['entityId'],
+             'positionX': 100, 'positionY': 100, 'width': 220, 'height': 140},
+        ]}
+    ).json['objects']
+    return {'domain': objects[0]['id'], 'entity': objects[1]['id']}
+
+
+def _encloses(bounds: dict, x: float, y: float, width: float, height: float) -> bool:
+    """Check whether container bounds contain a box."""
+    return (
+        bounds['x'] <= x and bounds['y'] <= y
+        and x + width <= bounds['x'] + bounds['width']
+        and y + height <= bounds['y'] + bounds['height']
+    )
+
+
+def test_container_bounds_follow_moved_child(api_client, auth_headers, diagram_id, placed):
+    """Test PUT /diagrams/{id}/objects/{object_id} refits the enclosing domain."""
+    response = api_client.put(
+        f'/api/v1/diagrams/{diagram_id}/objects/{placed["entity"]}',
+        headers=auth_headers,
+        json={'positionX': 600, 'positionY': 400}
+    )
+
+    assert response.status_code == 200
+    changed = {item['id']: item['bounds'] for item in response.json['containers']}
+    assert _encloses(changed[placed['domain']], 600, 400, 220, 140)
+
+    diagram = api_client.get(f'/api/v1/diagrams/{diagram_id}', headers=auth_headers).json
+    domain = next(obj for obj in diagram['objects'] if obj['id'] == placed['domain'])
+    assert domain['bounds'] == changed[placed['domain']]
+
+
+def test_container_is_painted_below_contents(api_client, auth_headers, diagram_id, placed):
+    """Test GET /diagrams/{id} lists a container before the objects inside it."""
+    # Raise the domain above its entity; it still has to be drawn first
+    api_client.put(
+        f'/api/v1/diagrams/{diagram_id}/objects/{placed["domain"]}/z-order',
+        headers=auth_headers,
+        json={'to': 'front'}
+    )
+
+    response = api_client.get(f'/api/v1/diagrams/{diagram_id}', headers=auth_headers)
+
+    assert response.status_code == 200
+    ids = [obj['id'] for obj in response.json['objects']]
+    assert ids.index(placed['domain']) < ids.index(placed['entity'])
+
+
+def test_removing_last_child_clears_bounds(api_client, auth_headers, diagram_id, placed):
+    """Test DELETE /diagrams/{id}/objects/{object_id} clears an emptied container's bounds."""
+    response = api_client.delete(
+        f'/api/v1/diagrams/{diagram_id}/objects/{placed["entity"]}',
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert {'id': placed['domain'], 'bounds': None} in response.json['containers']
+
+
+def test_container_bounds_require_auth(api_client):
+    """Test PUT /diagrams/{id}/objects/{object_id} without auth returns 401."""
+    response = api_client.put(
+        '/api/v1/diagrams/1/objects/1',
+        json={'positionX': 600, 'positionY': 400}
+    )
+
+    assert response.status_code == 401
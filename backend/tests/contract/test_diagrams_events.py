@@ -0,0 +1,41 @@
+"""Contract test for GET /diagrams/{id}/events endpoint.
+
+Validates the Server-Sent Events change feed handshake.
+"""
+import json
+
+
+def test_diagram_events_stream_starts_with_ready(api_client, auth_headers):
+    """Test GET /diagrams/{id}/events opens an SSE stream with a ready event."""
+    response = api_client.get(
+        '/api/v1/diagrams/1/events', headers=auth_headers, buffered=False
+    )
+
+    # Should return 200 OK as an event stream
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    frames = iter(response.response)
+    assert next(frames).startswith(b'retry:')
+
+    ready = next(frames).decode()
+    assert ready.startswith('event: ready\n')
+    data = json.loads(ready.split('data: ', 1)[1])
+    assert isinstance(data['data']['changeVersion'], int)
+
+    response.close()
+
+
+def test_diagram_events_not_found_returns_404(api_client, auth_headers):
+    """Test GET /diagrams/{id}/events with invalid ID returns 404."""
+    response = api_client.get('/api/v1/diagrams/99999/events', headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+def test_diagram_events_requires_auth(api_client):
+    """Test GET /diagrams/{id}/events without auth returns 401."""
+    response = api_client.get('/api/v1/diagrams/1/events')
+
+    assert response.status_code == 401
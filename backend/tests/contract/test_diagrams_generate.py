@@ -0,0 +1,83 @@
+"""Contract test for POST /diagrams/generate endpoint.
+
+Validates generated diagrams for domains and entity neighbourhoods.
+"""
+import pytest
+
+
+def test_generate_diagram_from_domain(api_client, auth_headers):
+    """Test POST /diagrams/generate places every entity of a domain."""
+    domain = api_client.get('/api/v1/domains?pageSize=1', headers=auth_headers).json['data'][0]
+
+    response = api_client.post(
+        '/api/v1/diagrams/generate',
+        headers=auth_headers,
+        json={'domainId': domain['id'], 'layout': 'grid'}
+    )
+
+    # Should return 201 Created
+    assert response.status_code == 201
+    data = response.json
+    assert 'id' in data
+    assert data['name']
+    assert len(data['objects']) == domain['entityCount']
+
+    for obj in data['objects']:
+        assert obj['objectType'] == 'ENTITY'
+        assert 'positionX' in obj
+        assert 'positionY' in obj
+
+    # No two entities share a position
+    positions = {(obj['positionX'], obj['positionY']) for obj in data['objects']}
+    assert len(positions) == len(data['objects'])
+
+
+def test_generate_diagram_from_entity_neighbourhood(api_client, auth_headers):
+    """Test POST /diagrams/generate includes the entity and its relationships."""
+    relationship = api_client.get(
+        '/api/v1/relationships?pageSize=1', headers=auth_headers
+    ).json['data'][0]
+
+    response = api_client.post(
+        '/api/v1/diagrams/generate',
+        headers=auth_headers,
+        json={'entityId': relationship['sourceEntityId'], 'depth': 1, 'name': 'Neighbourhood'}
+    )
+
+    assert response.status_code == 201
+    data = response.json
+    assert data['name'] == 'Neighbourhood'
+
+    placed = {obj['objectId'] for obj in data['objects']}
+    assert relationship['sourceEntityId'] in placed
+    assert relationship['targetEntityId'] in placed
+    assert relationship['id'] in {r['relationshipId'] for r in data['relationships']}
+
+
+def test_generate_diagram_requires_one_source(api_client, auth_headers):
+    """Test POST /diagrams/generate without exactly one source returns 400."""
+    response = api_client.post(
+        '/api/v1/diagrams/generate',
+        headers=auth_headers,
+        json={'domainId': 1, 'entityId': 1}
+    )
+
+    assert response.status_code == 400
+
+
+def test_generate_diagram_invalid_domain_returns_404(api_client, auth_headers):
+    """Test POST /diagrams/generate with invalid domain returns 404."""
+    response = api_client.post(
+        '/api/v1/diagrams/generate',
+        headers=auth_headers,
+        json={'domainId': 99999}
+    )
+
+    assert response.status_code == 404
+
+
+def test_generate_diagram_requires_auth(api_client):
+    """Test POST /diagrams/generate without auth returns 401."""
+    response = api_client.post('/api/v1/diagrams/generate', json={'domainId': 1})
+
+    assert response.status_code == 401
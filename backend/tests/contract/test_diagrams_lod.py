@@ -0,0 +1,77 @@
+"""Contract test for ?lod= on GET /diagrams/{id} and /diagrams/{id}/bundle.
+
+Validates packed overview payloads and the extra fields of the full level.
+"""
+import pytest
+
+
+@pytest.fixture
+def sample_diagram_id() -> int:
+    """Return a sample diagram ID for testing."""
+    return 1
+
+
+def test_get_diagram_overview_is_packed(api_client, auth_headers, sample_diagram_id):
+    """Test GET /diagrams/{id}?lod=overview returns ids, flat rects and edge indexes."""
+    response = api_client.get(
+        f'/api/v1/diagrams/{sample_diagram_id}?lod=overview',
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    data = response.json
+    assert data['lod'] == 'overview'
+    assert 'relationships' not in data
+
+    objects = data['objects']
+    assert len(objects['rects']) == 4 * len(objects['ids'])
+    assert len(objects['types']) == len(objects['ids'])
+    assert len(data['edges']) % 2 == 0
+    assert all(0 <= index < len(objects['ids']) for index in data['edges'])
+
+
+def test_get_bundle_overview_skips_references(api_client, auth_headers, sample_diagram_id):
+    """Test GET /diagrams/{id}/bundle?lod=overview leaves out entities and attributes."""
+    normal = api_client.get(
+        f'/api/v1/diagrams/{sample_diagram_id}/bundle', headers=auth_headers
+    )
+    response = api_client.get(
+        f'/api/v1/diagrams/{sample_diagram_id}/bundle?lod=overview',
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    data = response.json
+    assert data['diagram']['id'] == sample_diagram_id
+    for key in ('entities', 'attributes', 'relationships', 'diagramRelationships'):
+        assert key not in data
+    assert response.headers['ETag'] != normal.headers['ETag']
+
+
+def test_get_bundle_full_includes_path_points(api_client, auth_headers, sample_diagram_id):
+    """Test GET /diagrams/{id}/bundle?lod=full adds relationship routing points."""
+    response = api_client.get(
+        f'/api/v1/diagrams/{sample_diagram_id}/bundle?lod=full',
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    for placement in response.json['diagramRelationships']:
+        assert 'pathPoints' in placement
+
+
+def test_unknown_lod_returns_400(api_client, auth_headers, sample_diagram_id):
+    """Test GET /diagrams/{id}?lod=... with an unknown level returns 400."""
+    response = api_client.get(
+        f'/api/v1/diagrams/{sample_diagram_id}?lod=tiny',
+        headers=auth_headers
+    )
+
+    assert response.status_code == 400
+
+
+def test_overview_requires_auth(api_client, sample_diagram_id):
+    """Test GET /diagrams/{id}/bundle?lod=overview without auth returns 401."""
+    response = api_client.get(f'/api/v1/diagrams/{sample_diagram_id}/bundle?lod=overview')
+
+    assert response.status_code == 401
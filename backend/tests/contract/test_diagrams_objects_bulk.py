@@ -0,0 +1,81 @@
+"""Contract test for POST /diagrams/{id}/objects/bulk endpoint.
+
+Validates bulk placement and automatic relationship placement.
+"""
+import pytest
+
+
+@pytest.fixture
+def diagram_id(api_client, auth_headers) -> int:
+    """Create an empty diagram and return its ID."""
+    response = api_client.post(
+        '/api/v1/diagrams',
+        headers=auth_headers,
+        json={'name': 'Bulk Placement Test'}
+    )
+    return response.json['id']
+
+
+@pytest.fixture
+def related_entity_ids(api_client, auth_headers) -> list:
+    """Return the IDs of two entities joined by a relationship."""
+    response = api_client.get('/api/v1/relationships?pageSize=1', headers=auth_headers)
+    relationship = response.json['data'][0]
+    return [relationship['sourceEntityId'], relationship['targetEntityId']]
+
+
+def test_bulk_add_objects_places_relationships(
+    api_client, auth_headers, diagram_id, related_entity_ids
+):
+    """Test POST /diagrams/{id}/objects/bulk places relationships between the entities."""
+    objects = [
+        {'objectType': 'ENTITY', 'objectId': entity_id, 'positionX': 100 * i, 'positionY': 0}
+        for i, entity_id in enumerate(dict.fromkeys(related_entity_ids))
+    ]
+
+    response = api_client.post(
+        f'/api/v1/diagrams/{diagram_id}/objects/bulk',
+        headers=auth_headers,
+        json={'objects': objects}
+    )
+
+    # Should return 201 Created
+    assert response.status_code == 201
+    data = response.json
+    assert len(data['objects']) == len(objects)
+    assert len(data['relationships']) >= 1
+
+    for relationship in data['relationships']:
+        assert 'relationshipId' in relationship
+        assert relationship['isVisible'] is True
+
+
+def test_bulk_add_objects_duplicate_returns_400(api_client, auth_headers, diagram_id):
+    """Test POST /diagrams/{id}/objects/bulk with a repeated object returns 400."""
+    obj = {'objectType': 'ENTITY', 'objectId': 1, 'positionX': 0, 'positionY': 0}
+
+    response = api_client.post(
+        f'/api/v1/diagrams/{diagram_id}/objects/bulk',
+        headers=auth_headers,
+        json={'objects': [obj, obj]}
+    )
+
+    assert response.status_code == 400
+
+
+def test_bulk_add_objects_invalid_diagram_returns_404(api_client, auth_headers):
+    """Test POST /diagrams/{id}/objects/bulk with invalid diagram returns 404."""
+    response = api_client.post(
+        '/api/v1/diagrams/99999/objects/bulk',
+        headers=auth_headers,
+        json={'objects': [{'objectType': 'ENTITY', 'objectId': 1, 'positionX': 0, 'positionY': 0}]}
+    )
+
+    assert response.status_code == 404
+
+
+def test_bulk_add_objects_requires_auth(api_client):
+    """Test POST /diagrams/{id}/objects/bulk without auth returns 401."""
+    response = api_client.post('/api/v1/diagrams/1/objects/bulk', json={'objects': []})
+
+    assert response.status_code == 401
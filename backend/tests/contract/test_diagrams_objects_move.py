@@ -0,0 +1,98 @@
+"""Contract test for PUT /diagrams/{id}/objects/{object_id} endpoint.
+
+Validates that drag positions are buffered and read back before they are flushed.
+"""
+import pytest
+
+
+@pytest.fixture
+def placed_object(api_client, auth_headers) -> dict:
+    """Create a diagram with one entity on it and return the placement."""
+    diagram = api_client.post(
+        '/api/v1/diagrams', headers=auth_headers, json={'name': 'Move Test'}
+    ).json
+    entity = api_client.get('/api/v1/entities?pageSize=1', headers=auth_headers).json['data'][0]
+    obj = api_client.post(
+        f"/api/v1/diagrams/{diagram['id']}/objects",
+        headers=auth_headers,
+        json={'objectType': 'ENTITY', 'objectId': entity['id'], 'positionX': 10, 'positionY': 20}
+    ).json
+    return {'diagramId': diagram['id'], 'objectId': obj['id']}
+
+
+def test_intermediate_move_is_read_back(api_client, auth_headers, placed_object):
+    """Test a buffered drag position is visible through GET /diagrams/{id}."""
+    diagram_id, object_id = placed_object['diagramId'], placed_object['objectId']
+    response = api_client.put(
+        f'/api/v1/diagrams/{diagram_id}/objects/{object_id}',
+        headers=auth_headers,
+        json={'positionX': 110, 'positionY': 120, 'final': False}
+    )
+
+    # Should return 202 Accepted
+    assert response.status_code == 202
+    assert response.json == {'id': object_id, 'positionX': 110, 'positionY': 120}
+
+    diagram = api_client.get(f'/api/v1/diagrams/{diagram_id}', headers=auth_headers).json
+    obj = next(obj for obj in diagram['objects'] if obj['id'] == object_id)
+    assert (obj['positionX'], obj['positionY']) == (110, 120)
+
+    bundle = api_client.get(f'/api/v1/diagrams/{diagram_id}/bundle', headers=auth_headers).json
+    obj = next(obj for obj in bundle['objects'] if obj['id'] == object_id)
+    assert (obj['positionX'], obj['positionY']) == (110, 120)
+
+
+def test_drag_is_undone_in_one_step(api_client, auth_headers, placed_object):
+    """Test undo after a drag restores the position the drag started from."""
+    diagram_id, object_id = placed_object['diagramId'], placed_object['objectId']
+    url = f'/api/v1/diagrams/{diagram_id}/objects/{object_id}'
+    for x in (50, 100, 150):
+        api_client.put(url, headers=auth_headers, json={'positionX': x, 'positionY': 20, 'final': False})
+
+    response = api_client.put(url, headers=auth_headers, json={'positionX': 200, 'positionY': 20})
+    assert response.status_code == 200
+
+    response = api_client.post(f'/api/v1/diagrams/{diagram_id}/undo', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json['changes'][0]['values'] == {'positionX': 10, 'positionY': 20}
+
+
+def test_move_without_position_returns_400(api_client, auth_headers, placed_object):
+    """Test PUT without positionX/positionY returns 400."""
+    response = api_client.put(
+        f"/api/v1/diagrams/{placed_object['diagramId']}/objects/{placed_object['objectId']}",
+        headers=auth_headers,
+        json={'final': False}
+    )
+
+    assert response.status_code == 400
+
+
+def test_move_with_non_numeric_position_returns_400(api_client, auth_headers, placed_object):
+    """Test a drag position that is not a number is refused, not buffered."""
+    response = api_client.put(
+        f"/api/v1/diagrams/{placed_object['diagramId']}/objects/{placed_object['objectId']}",
+        headers=auth_headers,
+        json={'positionX': 'abc', 'positionY': 20, 'final': False}
+    )
+
+    assert response.status_code == 400
+
+
+def test_intermediate_move_of_unknown_object_returns_404(api_client, auth_headers, placed_object):
+    """Test a drag position for an object not on the diagram returns 404."""
+    response = api_client.put(
+        f"/api/v1/diagrams/{placed_object['diagramId']}/objects/999999",
+        headers=auth_headers,
+        json={'positionX': 10, 'positionY': 20, 'final': False}
+    )
+
+    assert response.status_code == 404
+
+
+def test_move_requires_auth(api_client):
+    """Test PUT /diagrams/{id}/objects/{object_id} without auth returns 401."""
+    response = api_client.put('/api/v1/diagrams/1/objects/1', json={'positionX': 0, 'positionY': 0})
+
+    assert response.status_code == 401
@@ -0,0 +1,83 @@
+"""Contract test for placement=auto on POST /diagrams/{id}/objects and /objects/bulk.
+
+Validates that automatically placed objects land in free space.
+"""
+import pytest
+
+
+@pytest.fixture
+def diagram_id(api_client, auth_headers) -> int:
+    """Create an empty diagram and return its ID."""
+    response = api_client.post(
+        '/api/v1/diagrams',
+        headers=auth_headers,
+        json={'name': 'Auto Placement Test'}
+    )
+    return response.json['id']
+
+
+def _overlaps(a: dict, b: dict) -> bool:
+    """Check whether two placed default-sized objects overlap."""
+    width, height = 220, 140
+    return (
+        a['positionX'] < b['positionX'] + width and b['positionX'] < a['positionX'] + width
+        and a['positionY'] < b['positionY'] + height and b['positionY'] < a['positionY'] + height
+    )
+
+
+def test_auto_placement_avoids_existing_objects(api_client, auth_headers, diagram_id):
+    """Test POST /diagrams/{id}/objects?placement=auto moves off an occupied spot."""
+    first = api_client.post(
+        f'/api/v1/diagrams/{diagram_id}/objects',
+        headers=auth_headers,
+        json={'objectType': 'ENTITY', 'objectId': 1, 'positionX': 100, 'positionY': 100}
+    ).json
+
+    response = api_client.post(
+        f'/api/v1/diagrams/{diagram_id}/objects?placement=auto',
+        headers=auth_headers,
+        json={'objectType': 'ENTITY', 'objectId': 2, 'positionX': 100, 'positionY': 100}
+    )
+
+    assert response.status_code == 201
+    assert not _overlaps(response.json, first)
+
+
+def test_bulk_auto_placement_spreads_objects(api_client, auth_headers, diagram_id):
+    """Test POST /diagrams/{id}/objects/bulk?placement=auto keeps objects apart."""
+    objects = [{'objectType': 'ENTITY', 'objectId': entity_id} for entity_id in (1, 2, 3)]
+
+    response = api_client.post(
+        f'/api/v1/diagrams/{diagram_id}/objects/bulk?placement=auto',
+        headers=auth_headers,
+        json={'objects': objects}
+    )
+
+    assert response.status_code == 201
+    placed = response.json['objects']
+    assert len(placed) == len(objects)
+    for i, a in enumerate(placed):
+        assert a['positionX'] >= 0 and a['positionY'] >= 0
+        for b in placed[i + 1:]:
+            assert not _overlaps(a, b)
+
+
+def test_unknown_placement_returns_400(api_client, auth_headers, diagram_id):
+    """Test POST /diagrams/{id}/objects with an unknown placement returns 400."""
+    response = api_client.post(
+        f'/api/v1/diagrams/{diagram_id}/objects?placement=random',
+        headers=auth_headers,
+        json={'objectType': 'ENTITY', 'objectId': 1}
+    )
+
+    assert response.status_code == 400
+
+
+def test_auto_placement_requires_auth(api_client):
+    """Test POST /diagrams/{id}/objects?placement=auto without auth returns 401."""
+    response = api_client.post(
+        '/api/v1/diagrams/1/objects?placement=auto',
+        json={'objectType': 'ENTITY', 'objectId': 1}
+    )
+
+    assert response.status_code == 401
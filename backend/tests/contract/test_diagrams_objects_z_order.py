@@ -0,0 +1,86 @@
+"""Contract test for PUT /diagrams/{id}/objects/{object_id}/z-order endpoint.
+
+Validates restacking diagram objects by rank key.
+"""
+import pytest
+
+
+@pytest.fixture
+def stacked_objects(api_client, auth_headers) -> dict:
+    """Create a diagram with three entities on it, bottom to top."""
+    diagram = api_client.post(
+        '/api/v1/diagrams', headers=auth_headers, json={'name': 'Z-Order Test'}
+    ).json
+    entities = api_client.get('/api/v1/entities?pageSize=3', headers=auth_headers).json['data']
+    objects = api_client.post(
+        f"/api/v1/diagrams/{diagram['id']}/objects/bulk",
+        headers=auth_headers,
+        json={'objects': [
+            {'objectType': 'ENTITY', 'objectId': entity['id'], 'positionX': 0, 'positionY': 0}
+            for entity in entities
+        ]}
+    ).json['objects']
+    return {'diagramId': diagram['id'], 'objectIds': [obj['id'] for obj in objects]}
+
+
+def _stack(api_client, auth_headers, diagram_id) -> list:
+    """Read a diagram's object IDs in drawing order."""
+    objects = api_client.get(f'/api/v1/diagrams/{diagram_id}', headers=auth_headers).json['objects']
+    return [obj['id'] for obj in sorted(objects, key=lambda obj: (obj['zRank'], obj['id']))]
+
+
+def test_new_objects_stack_in_order(api_client, auth_headers, stacked_objects):
+    """Test objects placed together are stacked in the order given."""
+    assert _stack(api_client, auth_headers, stacked_objects['diagramId']) == stacked_objects['objectIds']
+
+
+def test_bring_object_to_front(api_client, auth_headers, stacked_objects):
+    """Test moving the bottom object to the front."""
+    diagram_id = stacked_objects['diagramId']
+    bottom, middle, top = stacked_objects['objectIds']
+
+    response = api_client.put(
+        f'/api/v1/diagrams/{diagram_id}/objects/{bottom}/z-order',
+        headers=auth_headers,
+        json={'to': 'front'}
+    )
+
+    assert response.status_code == 200
+    assert response.json['id'] == bottom
+    assert _stack(api_client, auth_headers, diagram_id) == [middle, top, bottom]
+
+
+def test_restack_below_object_and_undo(api_client, auth_headers, stacked_objects):
+    """Test moving an object directly below another is one undoable operation."""
+    diagram_id = stacked_objects['diagramId']
+    bottom, middle, top = stacked_objects['objectIds']
+
+    response = api_client.put(
+        f'/api/v1/diagrams/{diagram_id}/objects/{top}/z-order',
+        headers=auth_headers,
+        json={'before': middle}
+    )
+    assert response.status_code == 200
+    assert _stack(api_client, auth_headers, diagram_id) == [bottom, top, middle]
+
+    api_client.post(f'/api/v1/diagrams/{diagram_id}/undo', headers=auth_headers)
+    assert _stack(api_client, auth_headers, diagram_id) == [bottom, middle, top]
+
+
+def test_restack_unknown_anchor_returns_404(api_client, auth_headers, stacked_objects):
+    """Test an anchor that is not on the diagram returns 404."""
+    diagram_id = stacked_objects['diagramId']
+    response = api_client.put(
+        f"/api/v1/diagrams/{diagram_id}/objects/{stacked_objects['objectIds'][0]}/z-order",
+        headers=auth_headers,
+        json={'after': 999999}
+    )
+
+    assert response.status_code == 404
+
+
+def test_restack_requires_auth(api_client):
+    """Test PUT z-order without auth returns 401."""
+    response = api_client.put('/api/v1/diagrams/1/objects/1/z-order', json={'to': 'front'})
+
+    assert response.status_code == 401
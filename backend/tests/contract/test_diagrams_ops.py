@@ -0,0 +1,99 @@
+"""Contract test for POST /diagrams/{id}/ops endpoint.
+
+Validates last-writer-wins merging of field edits by hybrid logical clock.
+"""
+import time
+
+import pytest
+
+
+def _ts(offset_ms: int = 0, counter: int = 0, node: str = 'client-a') -> str:
+    """Build an HLC timestamp relative to now."""
+    return f'{int(time.time() * 1000) + offset_ms:013d}:{counter:05d}:{node}'
+
+
+@pytest.fixture
+def placed_object(api_client, auth_headers) -> dict:
+    """Create a diagram with one entity on it and return the placement."""
+    diagram = api_client.post(
+        '/api/v1/diagrams', headers=auth_headers, json={'name': 'Ops Test'}
+    ).json
+    entity = api_client.get('/api/v1/entities?pageSize=1', headers=auth_headers).json['data'][0]
+    obj = api_client.post(
+        f"/api/v1/diagrams/{diagram['id']}/objects",
+        headers=auth_headers,
+        json={'objectType': 'ENTITY', 'objectId': entity['id'], 'positionX': 10, 'positionY': 20}
+    ).json
+    return {'diagramId': diagram['id'], 'objectId': obj['id']}
+
+
+def test_newest_clock_wins_in_any_order(api_client, auth_headers, placed_object):
+    """Test a replayed older op does not overwrite a newer one."""
+    diagram_id, object_id = placed_object['diagramId'], placed_object['objectId']
+    newer, older = _ts(counter=1, node='client-b'), _ts(-5000)
+    response = api_client.post(
+        f'/api/v1/diagrams/{diagram_id}/ops',
+        headers=auth_headers,
+        json={'ops': [
+            {'type': 'object', 'id': object_id, 'ts': newer, 'fields': {'positionX': 300}},
+            {'type': 'object', 'id': object_id, 'ts': older, 'fields': {'positionX': 100, 'zRank': 'k'}},
+        ]}
+    )
+
+    # Should return 200 OK with the merged values and clocks
+    assert response.status_code == 200
+    result = response.json['results'][0]
+    assert result['values']['positionX'] == 300
+    assert result['values']['zRank'] == 'k'
+    assert result['clocks']['positionX'] == newer
+    assert 'clock' in response.json
+
+    replay = api_client.post(
+        f'/api/v1/diagrams/{diagram_id}/ops',
+        headers=auth_headers,
+        json={'ops': [{'type': 'object', 'id': object_id, 'ts': older, 'fields': {'positionX': 100}}]}
+    )
+    assert replay.json['applied'] == 0
+    assert replay.json['results'][0]['values']['positionX'] == 300
+
+
+def test_ops_invalid_field_returns_400(api_client, auth_headers, placed_object):
+    """Test an op editing a non-mergeable field returns 400."""
+    response = api_client.post(
+        f"/api/v1/diagrams/{placed_object['diagramId']}/ops",
+        headers=auth_headers,
+        json={'ops': [{'type': 'object', 'id': placed_object['objectId'], 'ts': _ts(),
+                       'fields': {'objectId': 1}}]}
+    )
+
+    assert response.status_code == 400
+
+
+def test_ops_clock_far_ahead_returns_400(api_client, auth_headers, placed_object):
+    """Test an op stamped far in the future is refused."""
+    response = api_client.post(
+        f"/api/v1/diagrams/{placed_object['diagramId']}/ops",
+        headers=auth_headers,
+        json={'ops': [{'type': 'object', 'id': placed_object['objectId'], 'ts': _ts(3600 * 1000),
+                       'fields': {'positionX': 1}}]}
+    )
+
+    assert response.status_code == 400
+
+
+def test_ops_invalid_diagram_returns_404(api_client, auth_headers):
+    """Test POST /diagrams/{id}/ops with invalid diagram returns 404."""
+    response = api_client.post(
+        '/api/v1/diagrams/99999/ops',
+        headers=auth_headers,
+        json={'ops': [{'type': 'object', 'id': 1, 'ts': _ts(), 'fields': {'positionX': 1}}]}
+    )
+
+    assert response.status_code == 404
+
+
+def test_ops_requires_auth(api_client):
+    """Test POST /diagrams/{id}/ops without auth returns 401."""
+    response = api_client.post('/api/v1/diagrams/1/ops', json={'ops': []})
+
+    assert response.status_code == 401
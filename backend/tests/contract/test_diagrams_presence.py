@@ -0,0 +1,82 @@
+"""Contract test for GET/POST /diagrams/{id}/presence endpoints.
+
+Validates joining a diagram's presence stream and sharing a selection.
+"""
+import json
+
+
+def _frames(response):
+    """Iterate over a streamed response's SSE frames as text."""
+    for chunk in response.response:
+        yield chunk.decode()
+
+
+def test_presence_stream_starts_with_ready(api_client, auth_headers):
+    """Test GET /diagrams/{id}/presence joins and lists the caller as a member."""
+    response = api_client.get(
+        '/api/v1/diagrams/1/presence', headers=auth_headers, buffered=False
+    )
+
+    # Should return 200 OK as an event stream
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+
+    frames = _frames(response)
+    assert next(frames).startswith('retry:')
+
+    ready = json.loads(next(frames).split('data: ', 1)[1])
+    session_id = ready['data']['sessionId']
+    assert session_id in {m['sessionId'] for m in ready['data']['members']}
+
+    response.close()
+
+
+def test_presence_update_is_broadcast(api_client, auth_headers):
+    """Test POST /diagrams/{id}/presence shares the selection with the stream."""
+    response = api_client.get(
+        '/api/v1/diagrams/1/presence', headers=auth_headers, buffered=False
+    )
+    frames = _frames(response)
+    next(frames)
+    session_id = json.loads(next(frames).split('data: ', 1)[1])['data']['sessionId']
+    assert next(frames).startswith('event: join')
+
+    update = api_client.post(
+        '/api/v1/diagrams/1/presence',
+        headers=auth_headers,
+        json={'sessionId': session_id, 'selection': [1, 2]}
+    )
+
+    # Should return 202 Accepted
+    assert update.status_code == 202
+
+    frame = next(frames)
+    assert frame.startswith('event: update')
+    assert json.loads(frame.split('data: ', 1)[1])['data']['selection'] == [1, 2]
+
+    response.close()
+
+
+def test_presence_update_unknown_session_returns_404(api_client, auth_headers):
+    """Test POST /diagrams/{id}/presence with an unknown session returns 404."""
+    response = api_client.post(
+        '/api/v1/diagrams/1/presence',
+        headers=auth_headers,
+        json={'sessionId': 'unknown', 'cursor': {'x': 1, 'y': 2}}
+    )
+
+    assert response.status_code == 404
+
+
+def test_presence_not_found_returns_404(api_client, auth_headers):
+    """Test GET /diagrams/{id}/presence with invalid ID returns 404."""
+    response = api_client.get('/api/v1/diagrams/99999/presence', headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+def test_presence_requires_auth(api_client):
+    """Test GET /diagrams/{id}/presence without auth returns 401."""
+    response = api_client.get('/api/v1/diagrams/1/presence')
+
+    assert response.status_code == 401
@@ -0,0 +1,82 @@
+"""Contract test for POST /diagrams/{id}/undo and /redo endpoints.
+
+Validates that canvas edits can be undone and redone in order.
+"""
+import pytest
+
+
+@pytest.fixture
+def placed_object(api_client, auth_headers) -> dict:
+    """Create a diagram with one entity on it and return the placement."""
+    diagram = api_client.post(
+        '/api/v1/diagrams', headers=auth_headers, json={'name': 'Undo Test'}
+    ).json
+    entity = api_client.get('/api/v1/entities?pageSize=1', headers=auth_headers).json['data'][0]
+    obj = api_client.post(
+        f"/api/v1/diagrams/{diagram['id']}/objects",
+        headers=auth_headers,
+        json={'objectType': 'ENTITY', 'objectId': entity['id'], 'positionX': 10, 'positionY': 20}
+    ).json
+    return {'diagramId': diagram['id'], 'objectId': obj['id']}
+
+
+def test_undo_redo_move(api_client, auth_headers, placed_object):
+    """Test undo restores a moved object's position and redo re-applies it."""
+    diagram_id, object_id = placed_object['diagramId'], placed_object['objectId']
+    api_client.put(
+        f'/api/v1/diagrams/{diagram_id}/objects/{object_id}',
+        headers=auth_headers,
+        json={'positionX': 300, 'positionY': 400}
+    )
+
+    response = api_client.post(f'/api/v1/diagrams/{diagram_id}/undo', headers=auth_headers)
+
+    # Should return 200 OK with the restored position
+    assert response.status_code == 200
+    data = response.json
+    assert data['kind'] == 'move'
+    assert data['canRedo'] is True
+    assert data['changes'][0]['values'] == {'positionX': 10, 'positionY': 20}
+
+    response = api_client.post(f'/api/v1/diagrams/{diagram_id}/redo', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json['changes'][0]['values'] == {'positionX': 300, 'positionY': 400}
+    assert response.json['canRedo'] is False
+
+
+def test_undo_remove_restores_object(api_client, auth_headers, placed_object):
+    """Test undoing a removal puts the object back on the diagram."""
+    diagram_id, object_id = placed_object['diagramId'], placed_object['objectId']
+    api_client.delete(f'/api/v1/diagrams/{diagram_id}/objects/{object_id}', headers=auth_headers)
+
+    response = api_client.post(f'/api/v1/diagrams/{diagram_id}/undo', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json['kind'] == 'remove'
+
+    diagram = api_client.get(f'/api/v1/diagrams/{diagram_id}', headers=auth_headers).json
+    assert object_id in {obj['id'] for obj in diagram['objects']}
+
+
+def test_redo_without_undo_returns_400(api_client, auth_headers, placed_object):
+    """Test POST /diagrams/{id}/redo with an empty redo stack returns 400."""
+    response = api_client.post(
+        f"/api/v1/diagrams/{placed_object['diagramId']}/redo", headers=auth_headers
+    )
+
+    assert response.status_code == 400
+
+
+def test_undo_invalid_diagram_returns_404(api_client, auth_headers):
+    """Test POST /diagrams/{id}/undo with invalid diagram returns 404."""
+    response = api_client.post('/api/v1/diagrams/99999/undo', headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+def test_undo_requires_auth(api_client):
+    """Test POST /diagrams/{id}/undo without auth returns 401."""
+    response = api_client.post('/api/v1/diagrams/1/undo')
+
+    assert response.status_code == 401
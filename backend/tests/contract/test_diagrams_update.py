@@ -0,0 +1,78 @@
+"""Contract test for PUT /diagrams/{id} endpoint.
+
+Validates that a metadata update returns the diagram's metadata only.
+"""
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def diagram_id(api_client, auth_headers) -> int:
+    """Create a diagram with one entity on it and return its ID."""
+    superdomain = api_client.post(
+        '/api/v1/superdomains',
+        headers=auth_headers,
+        json={'name': f'Update Superdomain {uuid.uuid4().hex[:8]}'}
+    ).json
+    domain = api_client.post(
+        '/api/v1/domains',
+        headers=auth_headers,
+        json={'name': 'Update Domain', 'superdomainId': superdomain['id']}
+    ).json
+    entity = api_client.post(
+        '/api/v1/entities',
+        headers=auth_headers,
+        json={'name': 'Update Entity', 'domainId': domain['id']}
+    ).json
+    diagram = api_client.post(
+        '/api/v1/diagrams',
+        headers=auth_headers,
+        json={'name': 'Update Test'}
+    ).json
+    api_client.post(
+        f'/api/v1/diagrams/{diagram["id"]}/objects',
+        headers=auth_headers,
+        json={'objectType': 'ENTITY', 'objectId': entity['id'],
+              'positionX': 10, 'positionY': 20}
+    )
+    return diagram['id']
+
+
+def test_update_diagram_returns_metadata_only(api_client, auth_headers, diagram_id):
+    """Test PUT /diagrams/{id} returns the new metadata without the canvas contents."""
+    response = api_client.put(
+        f'/api/v1/diagrams/{diagram_id}',
+        headers=auth_headers,
+        json={'name': 'Renamed', 'tags': ['sales']}
+    )
+
+    assert response.status_code == 200
+    data = response.json
+    assert data['name'] == 'Renamed'
+    assert data['tags'] == ['sales']
+    assert 'objects' not in data
+    assert 'relationships' not in data
+    assert response.headers['ETag'] == f'"{data["version"]}"'
+
+    # The canvas is still read through GET
+    diagram = api_client.get(f'/api/v1/diagrams/{diagram_id}', headers=auth_headers).json
+    assert len(diagram['objects']) == 1
+
+
+def test_update_diagram_empty_name_returns_400(api_client, auth_headers, diagram_id):
+    """Test PUT /diagrams/{id} with a blank name returns 400."""
+    response = api_client.put(
+        f'/api/v1/diagrams/{diagram_id}',
+        headers=auth_headers,
+        json={'name': '   '}
+    )
+
+    assert response.status_code == 400
+
+
+def test_update_diagram_requires_auth(api_client):
+    """Test PUT /diagrams/{id} without auth returns 401."""
+    response = api_client.put('/api/v1/diagrams/1', json={'name': 'Renamed'})
+
+    assert response.status_code == 401
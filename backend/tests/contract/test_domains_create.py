@@ -3,6 +3,8 @@
 Validates DomainCreate schema with superdomainId.
 Expected to FAIL until implementation (TDD).
 """
+import uuid
+
 import pytest
 
 
@@ -87,6 +89,28 @@ def test_create_domain_duplicate_name_in_superdomain_returns_400(api_client, aut
     assert response.status_code == 400
 
 
+def test_create_domain_duplicate_keeps_original(api_client, auth_headers, sample_superdomain_id):
+    """Test a duplicate POST /domains reports the conflict and changes nothing."""
+    name = f'ConflictDomain{uuid.uuid4().hex[:8]}'
+    original = api_client.post('/api/v1/domains', headers=auth_headers, json={
+        'superdomainId': sample_superdomain_id,
+        'name': name,
+        'description': 'Original'
+    }).json
+
+    response = api_client.post('/api/v1/domains', headers=auth_headers, json={
+        'superdomainId': sample_superdomain_id,
+        'name': name,
+        'description': 'Duplicate'
+    })
+
+    # ON CONFLICT DO NOTHING: the existing row wins and the error names it
+    assert response.status_code == 400
+    assert 'already exists in superdomain' in response.json['message']
+    stored = api_client.get(f'/api/v1/domains/{original["id"]}', headers=auth_headers)
+    assert stored.json['description'] == 'Original'
+
+
 def test_create_domain_requires_auth(api_client, sample_superdomain_id):
     """Test POST /domains without auth returns 401."""
     response = api_client.post('/api/v1/domains', json={
@@ -59,6 +59,16 @@ def test_list_domains_validates_domain_schema(api_client, auth_headers):
         assert isinstance(domain['name'], str)
 
 
+def test_list_domains_sparse_fields(api_client, auth_headers):
+    """Test GET /domains?fields= returns only the requested fields plus id."""
+    response = api_client.get('/api/v1/domains?fields=name', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert 'pagination' in response.json
+    for domain in response.json['data']:
+        assert set(domain) == {'id', 'name'}
+
+
 def test_list_domains_requires_auth(api_client):
     """Test GET /domains without auth returns 401."""
     response = api_client.get('/api/v1/domains')
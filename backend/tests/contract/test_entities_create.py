@@ -3,6 +3,8 @@
 Validates EntityCreate schema with domainId.
 Expected to FAIL until implementation (TDD).
 """
+import uuid
+
 import pytest
 
 
@@ -99,6 +101,28 @@ def test_create_entity_duplicate_name_in_domain_returns_400(api_client, auth_hea
     assert response.status_code == 400
 
 
+def test_create_entity_duplicate_keeps_original(api_client, auth_headers, sample_domain_id):
+    """Test a duplicate POST /entities reports the conflict and changes nothing."""
+    name = f'ConflictEntity{uuid.uuid4().hex[:8]}'
+    original = api_client.post('/api/v1/entities', headers=auth_headers, json={
+        'domainId': sample_domain_id,
+        'name': name,
+        'description': 'Original'
+    }).json
+
+    response = api_client.post('/api/v1/entities', headers=auth_headers, json={
+        'domainId': sample_domain_id,
+        'name': name,
+        'description': 'Duplicate'
+    })
+
+    # ON CONFLICT DO NOTHING: the existing row wins and the error names it
+    assert response.status_code == 400
+    assert 'already exists in domain' in response.json['message']
+    stored = api_client.get(f'/api/v1/entities/{original["id"]}', headers=auth_headers)
+    assert stored.json['description'] == 'Original'
+
+
 def test_create_entity_requires_auth(api_client, sample_domain_id):
     """Test POST /entities without auth returns 401."""
     response = api_client.post('/api/v1/entities', json={
@@ -59,6 +59,35 @@ def test_list_entities_validates_entity_schema(api_client, auth_headers):
         assert isinstance(entity['name'], str)
 
 
+def test_list_entities_pagination_shape(api_client, auth_headers):
+    """Test GET /entities honours pageSize and reports {data, pagination}."""
+    response = api_client.get('/api/v1/entities?page=1&pageSize=1', headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json
+    assert set(data) == {'data', 'pagination'}
+    assert len(data['data']) <= 1
+    assert data['pagination']['page'] == 1
+    assert data['pagination']['pageSize'] == 1
+    assert data['pagination']['totalPages'] == data['pagination']['total']
+
+
+def test_list_entities_sparse_fields(api_client, auth_headers):
+    """Test GET /entities?fields= returns only the requested fields plus id."""
+    response = api_client.get('/api/v1/entities?fields=name,domainId', headers=auth_headers)
+
+    assert response.status_code == 200
+    for entity in response.json['data']:
+        assert set(entity) == {'id', 'name', 'domainId'}
+
+
+def test_list_entities_unknown_field_returns_400(api_client, auth_headers):
+    """Test GET /entities?fields= with an unknown field returns 400."""
+    response = api_client.get('/api/v1/entities?fields=name,secret', headers=auth_headers)
+
+    assert response.status_code == 400
+
+
 def test_list_entities_requires_auth(api_client):
     """Test GET /entities without auth returns 401."""
     response = api_client.get('/api/v1/entities')
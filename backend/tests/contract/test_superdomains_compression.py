@@ -0,0 +1,94 @@
+"""Contract test for response compression and streaming on /superdomains.
+
+Validates Accept-Encoding negotiation, the minimum size threshold, Vary
+and streamed (chunk-by-chunk compressed) large responses.
+"""
+import gzip
+import json
+import uuid
+
+import pytest
+
+from src.api import representation
+
+
+@pytest.fixture
+def large_superdomain_id(api_client, auth_headers, sample_superdomain_id) -> int:
+    """Give the sample superdomain a description big enough to compress."""
+    api_client.put(
+        f'/api/v1/superdomains/{sample_superdomain_id}',
+        headers=auth_headers,
+        json={'description': 'x' * 4096}
+    )
+    return sample_superdomain_id
+
+
+def test_large_response_is_gzipped(api_client, auth_headers, large_superdomain_id):
+    """Test GET with Accept-Encoding: gzip returns a gzip body that decodes to JSON."""
+    response = api_client.get(
+        f'/api/v1/superdomains/{large_superdomain_id}',
+        headers={**auth_headers, 'Accept-Encoding': 'gzip'}
+    )
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert b'"description"' in gzip.decompress(response.get_data())
+
+
+def test_identity_only_client_gets_plain_body(api_client, auth_headers, large_superdomain_id):
+    """Test a client refusing gzip gets an uncompressed body that still varies."""
+    response = api_client.get(
+        f'/api/v1/superdomains/{large_superdomain_id}',
+        headers={**auth_headers, 'Accept-Encoding': 'gzip;q=0, identity'}
+    )
+
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.json['description'] == 'x' * 4096
+
+
+def test_small_response_is_not_compressed(api_client, auth_headers):
+    """Test a response below COMPRESS_MIN_SIZE is sent as-is."""
+    superdomain_id = api_client.post(
+        '/api/v1/superdomains',
+        headers=auth_headers,
+        json={'name': f'Small {uuid.uuid4().hex[:8]}'}
+    ).json['id']
+
+    response = api_client.get(
+        f'/api/v1/superdomains/{superdomain_id}',
+        headers={**auth_headers, 'Accept-Encoding': 'gzip'}
+    )
+
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert response.json['id'] == superdomain_id
+
+
+def test_large_list_is_streamed_gzipped(api_client, auth_headers, monkeypatch):
+    """Test a list over STREAM_MIN_SIZE is streamed and gzipped chunk by chunk."""
+    monkeypatch.setattr(representation, 'STREAM_MIN_SIZE', 64)
+
+    response = api_client.get(
+        '/api/v1/superdomains',
+        headers={**auth_headers, 'Accept-Encoding': 'gzip'}
+    )
+
+    assert response.status_code == 200
+    assert 'Content-Length' not in response.headers
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'data' in json.loads(gzip.decompress(response.get_data()))
+
+
+def test_large_list_is_streamed_uncompressed(api_client, auth_headers, monkeypatch):
+    """Test a streamed list decodes to the same document without compression."""
+    expected = api_client.get('/api/v1/superdomains', headers=auth_headers).json
+    monkeypatch.setattr(representation, 'STREAM_MIN_SIZE', 64)
+
+    response = api_client.get('/api/v1/superdomains', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert 'Content-Length' not in response.headers
+    assert response.json == expected
@@ -0,0 +1,64 @@
+"""Contract test for the denormalised domainCount on /superdomains/{id}.
+
+Validates that the trigger-maintained counter follows inserts and deletes
+and that the reconcile-counters command repairs drift.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture
+def superdomain_id(api_client, auth_headers) -> int:
+    """Create an empty superdomain and return its ID."""
+    response = api_client.post(
+        '/api/v1/superdomains',
+        headers=auth_headers,
+        json={'name': f'Counter Superdomain {uuid.uuid4().hex[:8]}'}
+    )
+    return response.json['id']
+
+
+def _domain_count(api_client, auth_headers, superdomain_id: int) -> int:
+    """Read the superdomain's domainCount."""
+    return api_client.get(
+        f'/api/v1/superdomains/{superdomain_id}', headers=auth_headers
+    ).json['domainCount']
+
+
+def test_domain_count_follows_inserts_and_deletes(api_client, auth_headers, superdomain_id):
+    """Test domainCount rises on POST /domains and falls on DELETE /domains/{id}."""
+    assert _domain_count(api_client, auth_headers, superdomain_id) == 0
+
+    ids = [
+        api_client.post(
+            '/api/v1/domains',
+            headers=auth_headers,
+            json={'name': f'Counter Domain {n}', 'superdomainId': superdomain_id}
+        ).json['id']
+        for n in range(2)
+    ]
+    assert _domain_count(api_client, auth_headers, superdomain_id) == 2
+
+    api_client.delete(f'/api/v1/domains/{ids[0]}', headers=auth_headers)
+    assert _domain_count(api_client, auth_headers, superdomain_id) == 1
+
+
+def test_reconcile_counters_repairs_drift(api_client, auth_headers, superdomain_id):
+    """Test flask reconcile-counters resets a drifted counter to the real count."""
+    from src.api.app import create_app
+    from src.utils.database import get_db_context
+
+    with get_db_context() as db:
+        db.execute(
+            text('UPDATE superdomain SET domain_count = 7 WHERE id = :id'),
+            {'id': superdomain_id}
+        )
+    assert _domain_count(api_client, auth_headers, superdomain_id) == 7
+
+    result = create_app().test_cli_runner().invoke(args=['reconcile-counters'])
+
+    assert result.exit_code == 0
+    assert 'domainCount:' in result.output
+    assert _domain_count(api_client, auth_headers, superdomain_id) == 0
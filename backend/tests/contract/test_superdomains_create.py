@@ -3,6 +3,8 @@
 Validates SuperdomainCreate schema and 201 response.
 Expected to FAIL until implementation (TDD).
 """
+import uuid
+
 import pytest
 
 
@@ -70,6 +72,26 @@ def test_create_superdomain_duplicate_name_returns_400(api_client, auth_headers)
     assert response.status_code == 400
 
 
+def test_create_superdomain_duplicate_keeps_original(api_client, auth_headers):
+    """Test a duplicate POST /superdomains reports the conflict and changes nothing."""
+    name = f'ConflictSuperdomain{uuid.uuid4().hex[:8]}'
+    original = api_client.post('/api/v1/superdomains', headers=auth_headers, json={
+        'name': name,
+        'description': 'Original'
+    }).json
+
+    response = api_client.post('/api/v1/superdomains', headers=auth_headers, json={
+        'name': name,
+        'description': 'Duplicate'
+    })
+
+    # ON CONFLICT DO NOTHING: the existing row wins and the error names it
+    assert response.status_code == 400
+    assert 'already exists' in response.json['message']
+    stored = api_client.get(f'/api/v1/superdomains/{original["id"]}', headers=auth_headers)
+    assert stored.json['description'] == 'Original'
+
+
 def test_create_superdomain_requires_auth(api_client):
     """Test POST /superdomains without auth returns 401."""
     response = api_client.post('/api/v1/superdomains', json={
@@ -0,0 +1,104 @@
+"""Contract test for If-Match preconditions on /superdomains/{id}.
+
+Validates row versions exposed as ETags and compare-and-set writes.
+"""
+import pytest
+
+
+def test_get_superdomain_returns_version_etag(api_client, auth_headers, sample_superdomain_id):
+    """Test GET /superdomains/{id} exposes the row version as its ETag."""
+    response = api_client.get(
+        f'/api/v1/superdomains/{sample_superdomain_id}', headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] == f'"{response.json["version"]}"'
+
+
+def test_update_with_current_etag_bumps_version(api_client, auth_headers, sample_superdomain_id):
+    """Test PUT with a matching If-Match succeeds and returns the next version."""
+    etag = api_client.get(
+        f'/api/v1/superdomains/{sample_superdomain_id}', headers=auth_headers
+    ).headers['ETag']
+
+    response = api_client.put(
+        f'/api/v1/superdomains/{sample_superdomain_id}',
+        headers={**auth_headers, 'If-Match': etag},
+        json={'description': 'Conditional update'}
+    )
+
+    assert response.status_code == 200
+    assert response.json['version'] == int(etag.strip('"')) + 1
+    assert response.headers['ETag'] == f'"{response.json["version"]}"'
+
+
+def test_update_with_stale_etag_returns_412(api_client, auth_headers, sample_superdomain_id):
+    """Test PUT with an outdated If-Match is refused and changes nothing."""
+    etag = api_client.get(
+        f'/api/v1/superdomains/{sample_superdomain_id}', headers=auth_headers
+    ).headers['ETag']
+    api_client.put(
+        f'/api/v1/superdomains/{sample_superdomain_id}',
+        headers=auth_headers,
+        json={'description': 'Concurrent update'}
+    )
+
+    response = api_client.put(
+        f'/api/v1/superdomains/{sample_superdomain_id}',
+        headers={**auth_headers, 'If-Match': etag},
+        json={'description': 'Lost update'}
+    )
+
+    assert response.status_code == 412
+    current = api_client.get(
+        f'/api/v1/superdomains/{sample_superdomain_id}', headers=auth_headers
+    ).json
+    assert current['description'] == 'Concurrent update'
+
+
+def test_delete_with_stale_etag_returns_412(api_client, auth_headers, sample_superdomain_id):
+    """Test DELETE with an outdated If-Match keeps the superdomain."""
+    response = api_client.delete(
+        f'/api/v1/superdomains/{sample_superdomain_id}?confirm=true',
+        headers={**auth_headers, 'If-Match': '"999999"'}
+    )
+
+    assert response.status_code == 412
+    assert api_client.get(
+        f'/api/v1/superdomains/{sample_superdomain_id}', headers=auth_headers
+    ).status_code == 200
+
+
+def test_update_with_compressed_etag_succeeds(api_client, auth_headers):
+    """Test PUT accepts the ETag of a gzip-compressed GET as If-Match."""
+    created = api_client.post(
+        '/api/v1/superdomains',
+        headers=auth_headers,
+        json={'name': 'Compressed ETag', 'description': 'x' * 4096}
+    ).json
+    response = api_client.get(
+        f'/api/v1/superdomains/{created["id"]}',
+        headers={**auth_headers, 'Accept-Encoding': 'gzip'}
+    )
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'] == f'"{created["version"]}-gzip"'
+
+    response = api_client.put(
+        f'/api/v1/superdomains/{created["id"]}',
+        headers={**auth_headers, 'If-Match': response.headers['ETag']},
+        json={'description': 'Conditional update'}
+    )
+
+    assert response.status_code == 200
+    assert response.json['version'] == created['version'] + 1
+
+
+def test_conditional_update_requires_auth(api_client, sample_superdomain_id):
+    """Test PUT with If-Match but without auth returns 401."""
+    response = api_client.put(
+        f'/api/v1/superdomains/{sample_superdomain_id}',
+        headers={'If-Match': '"1"'},
+        json={'name': 'Test'}
+    )
+
+    assert response.status_code == 401
@@ -0,0 +1,60 @@
+"""Contract test for content negotiation on GET /superdomains.
+
+Validates MessagePack and columnar representations and the JSON fallback.
+"""
+import pytest
+
+
+def test_list_as_msgpack(api_client, auth_headers):
+    """Test Accept: application/msgpack returns a MessagePack body."""
+    msgpack = pytest.importorskip('msgpack')
+
+    response = api_client.get(
+        '/api/v1/superdomains', headers={**auth_headers, 'Accept': 'application/msgpack'}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/msgpack'
+    assert 'Accept' in response.headers['Vary']
+    data = msgpack.unpackb(response.data)
+    assert 'data' in data and 'pagination' in data
+
+
+def test_list_as_columnar_via_query(api_client, auth_headers):
+    """Test ?format=columnar names each field once and sends rows as arrays."""
+    response = api_client.get('/api/v1/superdomains?format=columnar', headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json
+    assert 'id' in data['columns']
+    assert all(len(row) == len(data['columns']) for row in data['rows'])
+
+
+def test_list_as_columnar_via_accept(api_client, auth_headers):
+    """Test the columnar media type is echoed as the Content-Type."""
+    response = api_client.get(
+        '/api/v1/superdomains',
+        headers={**auth_headers, 'Accept': 'application/vnd.diagramdesigner.columnar+json'}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/vnd.diagramdesigner.columnar+json'
+    assert 'columns' in response.json
+
+
+def test_unsupported_accept_falls_back_to_json(api_client, auth_headers):
+    """Test an Accept without a supported type gets JSON rather than 406."""
+    response = api_client.get(
+        '/api/v1/superdomains', headers={**auth_headers, 'Accept': 'text/csv'}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert 'data' in response.json
+
+
+def test_msgpack_requires_auth(api_client):
+    """Test GET /superdomains with Accept: application/msgpack without auth returns 401."""
+    response = api_client.get('/api/v1/superdomains', headers={'Accept': 'application/msgpack'})
+
+    assert response.status_code == 401